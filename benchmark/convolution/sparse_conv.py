@@ -0,0 +1,46 @@
+import sys, timeit
+import numpy
+import theano
+
+try:
+    img_shape =  int(sys.argv[1]), int(sys.argv[2])
+    ker_shape =  int(sys.argv[3]), int(sys.argv[4])
+    dtype = sys.argv[5]
+except:
+    print >> sys.stderr, "Usage: %s <img rows> <img cols> <ker rows> <ker cols> <dtype> [nb_call]" % sys.argv[0]
+    sys.exit(-1)
+
+nb_call = 1
+if len(sys.argv)>6:
+    nb_call=int(sys.argv[6])
+
+setup="""
+import sys, timeit, time
+import numpy
+import theano, theano.tensor.nnet.conv
+from theano.sparse.sandbox import sp
+
+img_shape =  int(sys.argv[1]), int(sys.argv[2])
+ker_shape =  int(sys.argv[3]), int(sys.argv[4])
+dtype = sys.argv[5]
+
+img = theano.shared(numpy.ones((1,) + img_shape, dtype=dtype))
+ker = theano.shared(numpy.ones((1, numpy.prod(ker_shape)), dtype=dtype))
+"""
+
+T = timeit.Timer("sp.ConvolutionIndices._cache.clear(); sp.convolution_indices.conv_eval((1,) + img_shape, ker_shape)",
+                 setup)
+time_indices = T.repeat(repeat=3, number=nb_call)
+print min(time_indices), 'sparse indices'
+
+T = timeit.Timer("f()", setup+"""f = theano.function([],
+    sp.convolve(ker, ker_shape, 1, img.flatten(2), img_shape)[0])""")
+time_sparse = T.repeat(repeat=3, number=nb_call)
+print min(time_sparse), 'theano sparse'
+
+T = timeit.Timer("f()", setup+"""f = theano.function([],
+    theano.tensor.nnet.conv.conv2d(img.dimshuffle(0, 'x', 1, 2),
+        ker.reshape((1, 1) + ker_shape)[:, :, ::-1, ::-1],
+        image_shape=(1, 1) + img_shape, filter_shape=(1, 1) + ker_shape))""")
+time_convop = T.repeat(repeat=3, number=nb_call)
+print min(time_convop), 'theano ConvOp'
@@ -69,7 +69,8 @@ FancyModule = Module
 
 from theano.printing import pprint, pp
 
-from theano.scan_module import scan, map, reduce, foldl, foldr, clone
+from theano.scan_module import (scan, map, reduce, foldl, foldr, clone,
+                                scan_checkpoints, scan_stream)
 
 from theano.updates import Updates, OrderedUpdates
 
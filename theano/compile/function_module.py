@@ -589,6 +589,11 @@ class Function(object):
                         % getattr(self.inv_finder[c], 'variable',
                                   self.inv_finder[c]))
 
+        if profile:
+            # Only the sampled calls time their thunks
+            sampled = profile.sample_next_call()
+            self.fn.time_thunks = sampled and profile.flag_time_thunks
+
         # Do the actual work
         t0_fn = time.time()
         try:
@@ -668,8 +673,12 @@ class Function(object):
         if profile:
             profile.fct_callcount += 1
             profile.fct_call_time += dt_call
-            if hasattr(self.fn, 'update_profile'):
-                self.fn.update_profile(profile)
+            profile.call_latency.push(dt_call)
+            if sampled:
+                profile.sampled_callcount += 1
+                profile.sampled_call_time += dt_call
+                if hasattr(self.fn, 'update_profile'):
+                    self.fn.update_profile(profile)
 
         if self.return_none:
             return None
@@ -1418,6 +1427,8 @@ class FunctionMaker(object):
         fn = self.function_builder(_fn, _i, _o, self.indices, self.outputs,
                 defaults, self.unpack_single, self.return_none, self)
         fn.profile = self.profile
+        if getattr(_fn, 'trace', None) is not None:
+            theano.compile.profiling.register_trace(_fn.trace, fn)
         return fn
 
 
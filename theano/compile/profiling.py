@@ -16,16 +16,19 @@ __contact__ = "theano-dev <theano-dev@googlegroups.com>"
 __docformat__ = "restructuredtext en"
 import atexit
 import copy
+import json
 import os
 import sys
 import time
+import weakref
 from theano.compat.python2x import defaultdict
 
 import numpy
 
 import theano
 from theano.gof import graph
-from theano.configparser import AddConfigVar, BoolParam, IntParam, StrParam
+from theano.configparser import (AddConfigVar, BoolParam, FloatParam,
+                                 IntParam, StrParam)
 
 
 import_time = time.time()
@@ -33,12 +36,45 @@ config = theano.config
 
 _atexit_print_list = []
 _atexit_registered = False
+# (weak reference to a function, its vm.Trace) for the live functions
+_trace_list = []
+# Events of the traces of the deleted functions, oldest first
+_trace_records = []
+_trace_registered = False
 
 AddConfigVar('profiling.time_thunks',
              """Time individual thunks when profiling""",
              BoolParam(True),
              in_c_key=False)
 
+AddConfigVar('profiling.sample_every',
+             """Time the thunks of only one call out of this many calls to
+             a profiled function. The other calls only update the
+             function-level counters, which keeps the overhead of an
+             always-on profile low""",
+             IntParam(1, lambda i: i > 0),
+             in_c_key=False)
+
+AddConfigVar('profiling.sample_period',
+             """If positive, time the thunks of all the calls made during
+             the first profiling.sample_window seconds of each period of
+             this many seconds, instead of using profiling.sample_every""",
+             FloatParam(0., lambda f: f >= 0),
+             in_c_key=False)
+
+AddConfigVar('profiling.sample_window',
+             """Length in seconds of the timed window in each
+             profiling.sample_period""",
+             FloatParam(1., lambda f: f > 0),
+             in_c_key=False)
+
+AddConfigVar('profiling.n_latency_samples',
+             """Number of the most recent latencies kept per Apply node
+             and per function to compute the percentiles returned by
+             ProfileStats.snapshot()""",
+             IntParam(1024, lambda i: i > 0),
+             in_c_key=False)
+
 AddConfigVar('profiling.n_apply',
              "Number of Apply instances to print by default",
              IntParam(20, lambda i: i > 0),
@@ -72,6 +108,101 @@ AddConfigVar('profiling.destination',
              StrParam('stderr'),
              in_c_key=False)
 
+AddConfigVar('profiling.trace_file',
+             """If not empty, record the start and end time of every thunk
+             call of the functions compiled with a VM linker, and write them
+             to this file at exit, in the Chrome trace event format (that can
+             be loaded in chrome://tracing or Perfetto)""",
+             StrParam(''),
+             in_c_key=False)
+
+AddConfigVar('profiling.trace_buffer_size',
+             """Number of the most recent thunk calls kept per function
+             for profiling.trace_file""",
+             IntParam(16384, lambda i: i > 0),
+             in_c_key=False)
+
+
+def register_trace(trace, fn):
+    """
+    Add the vm.Trace of the function fn to the ones written by
+    write_trace(). When fn is deleted, the events of its trace are kept
+    with those of the other deleted functions, among which only the last
+    profiling.trace_buffer_size ones are kept, and the trace is released.
+    """
+    global _trace_registered
+    if not _trace_registered:
+        atexit.register(write_trace)
+        _trace_registered = True
+
+    def flush(fn_ref):
+        for idx, (ref, trace) in enumerate(_trace_list):
+            if ref is fn_ref:
+                del _trace_list[idx]
+                _trace_records.extend(_records_of_trace(trace))
+                del _trace_records[:-config.profiling.trace_buffer_size]
+                break
+    _trace_list.append((weakref.ref(fn, flush), trace))
+
+
+def _records_of_trace(trace):
+    """
+    Return the events kept by trace as tuples (name, category, args,
+    thread id, start time, end time), that do not reference the graph.
+    """
+    fct_name = trace.fgraph.name or 'Theano function'
+    names = {}  # Only compute the node names once per trace.
+    records = []
+    for node, tid, nbytes, t0, t1 in trace:
+        if node is None:
+            records.append((fct_name, 'function', None, tid, t0, t1))
+        else:
+            if node not in names:
+                names[node] = (str(node.op), str(node))
+            records.append((names[node][0], type(node.op).__name__,
+                            {'function': fct_name,
+                             'apply': names[node][1],
+                             'output_bytes': nbytes},
+                            tid, t0, t1))
+    return records
+
+
+def write_trace(filename=None):
+    """
+    Write the events kept by the registered traces to filename (default
+    profiling.trace_file, if set) in the Chrome trace event format.
+
+    Each call of a function and of each of its thunks is a complete
+    event, whose timestamps are in microseconds since Theano was
+    imported. The thunk events also give the function name, the Apply
+    node and the size in bytes of its outputs. The calls of the inner
+    functions of Scan and OpFromGraph are recorded by their own VM, so
+    they nest under the event of the node that called them.
+    """
+    if filename is None:
+        filename = config.profiling.trace_file
+        if not filename:
+            return
+    pid = os.getpid()
+    records = list(_trace_records)
+    for ref, trace in _trace_list:
+        records.extend(_records_of_trace(trace))
+    events = []
+    for name, cat, args, tid, t0, t1 in records:
+        ev = {'ph': 'X', 'pid': pid, 'tid': tid,
+              'ts': (t0 - import_time) * 1e6,
+              'dur': (t1 - t0) * 1e6,
+              'name': name, 'cat': cat}
+        if args is not None:
+            ev['args'] = args
+        events.append(ev)
+    events.sort(key=lambda ev: ev['ts'])
+    f = open(filename, 'w')
+    try:
+        json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, f)
+    finally:
+        f.close()
+
 
 def _atexit_print_fn():
     """Print ProfileStat objects in _atexit_print_list to _atexit_print_file
@@ -103,13 +234,15 @@ def _atexit_print_fn():
         cum.message = msg
         for ps in to_sum[1:]:
             for attr in ["compile_time", "fct_call_time", "fct_callcount",
-                         "vm_call_time", "optimizer_time", "linker_time",
-                         "validate_time"]:
+                         "sampled_callcount", "sampled_call_time",
+                         "vm_call_time",
+                         "optimizer_time", "linker_time", "validate_time"]:
                 setattr(cum, attr, getattr(cum, attr) + getattr(ps, attr))
 
             # merge dictonary
-            for attr in ["apply_time", "apply_callcount",
-                         "apply_cimpl", "variable_shape", "variable_strides"]:
+            for attr in ["apply_time", "apply_callcount", "apply_cimpl",
+                         "apply_latency", "variable_shape",
+                         "variable_strides"]:
                 cum_attr = getattr(cum, attr)
                 for key, val in getattr(ps, attr).iteritems():
                     assert key not in cum_attr
@@ -128,6 +261,46 @@ def _atexit_print_fn():
                     n_apply_to_print=config.profiling.n_apply)
 
 
+class LatencySamples(object):
+
+    """
+    Fixed-size ring buffer of the most recent latencies, in seconds.
+
+    A sample can stand for several calls that took the same time, e.g.
+    the mean time of a node over all the steps of a scan.
+    """
+
+    def __init__(self, size=None):
+        if size is None:
+            size = config.profiling.n_latency_samples
+        self.samples = numpy.zeros(size)
+        self.weights = numpy.zeros(size, dtype='int64')
+        self.count = 0
+
+    def push(self, t, weight=1):
+        idx = self.count % len(self.samples)
+        self.samples[idx] = t
+        self.weights[idx] = weight
+        self.count += 1
+
+    def percentiles(self, q):
+        """dict 'p<q>' -> latency for each percentile in q, plus 'max' and
+        'n', the number of calls they were computed from."""
+        n = min(self.count, len(self.samples))
+        rval = {'n': int(self.weights[:n].sum())}
+        if n == 0:
+            return rval
+        order = numpy.argsort(self.samples[:n])
+        samples = self.samples[order]
+        cum_weights = numpy.cumsum(self.weights[order])
+        for qi in q:
+            idx = numpy.searchsorted(cum_weights,
+                                     qi / 100. * cum_weights[-1])
+            rval['p%g' % qi] = float(samples[min(idx, n - 1)])
+        rval['max'] = float(samples[-1])
+        return rval
+
+
 class ProfileStats(object):
 
     """
@@ -155,6 +328,15 @@ class ProfileStats(object):
     # Number of calls to Function.__call__
     #
 
+    sampled_callcount = 0
+    # Number of calls to Function.__call__ whose thunks were timed
+    # (see profiling.sample_every and profiling.sample_period)
+    #
+
+    sampled_call_time = 0.0
+    # The time spent in those calls to Function.__call__
+    #
+
     vm_call_time = 0.0
     # Total time spent in Function.fn.__call__
     #
@@ -171,6 +353,15 @@ class ProfileStats(object):
     # dict from node -> bool (1 if c, 0 if py)
     #
 
+    apply_latency = None
+    # dict from node -> LatencySamples of its runtime, one sample per
+    # timed call holding the mean time of its executions in that call
+    #
+
+    call_latency = None
+    # LatencySamples of the time spent in Function.__call__
+    #
+
     message = None
     # pretty string to print in summary, to identify this output
     #
@@ -194,6 +385,13 @@ class ProfileStats(object):
     linker_time = 0.0
     # time spent linking graph (FunctionMaker.create)
 
+    sample_every = 1
+    sample_period = 0.
+    sample_window = 1.
+    # Which calls have their thunks timed, initialized from the
+    # profiling.sample_* flags (see sample_next_call)
+    #
+
     line_width = config.profiling.output_line_width
 
     optimizer_profile = None
@@ -224,6 +422,11 @@ class ProfileStats(object):
         self.output_size = {}
         self.apply_time = {}
         self.apply_cimpl = {}
+        self.apply_latency = {}
+        self.call_latency = LatencySamples()
+        self.sample_every = config.profiling.sample_every
+        self.sample_period = config.profiling.sample_period
+        self.sample_window = config.profiling.sample_window
         self.variable_shape = {}
         self.variable_strides = {}
         if flag_time_thunks is None:
@@ -240,6 +443,62 @@ class ProfileStats(object):
                 atexit.register(_atexit_print_fn)
                 _atexit_registered = True
 
+    def sample_next_call(self):
+        """Return True if the thunks of the next call should be timed."""
+        if self.sample_period > 0:
+            return ((time.time() - import_time) % self.sample_period <
+                    self.sample_window)
+        return self.fct_callcount % self.sample_every == 0
+
+    def record_apply_latency(self, node, t, count=1):
+        """Record that node ran count times in t seconds in a call."""
+        if node not in self.apply_latency:
+            self.apply_latency[node] = LatencySamples()
+        self.apply_latency[node].push(t / count, count)
+
+    def snapshot(self, percentiles=(50, 90, 99)):
+        """
+        Return the current state of the profile as a dict that only holds
+        numbers, strings, lists and dicts, so it can be passed to
+        json.dumps. This is meant to be polled while the function runs,
+        e.g. by a metrics exporter.
+
+        The latencies of the function and of each Apply node are given
+        at the requested percentiles, computed over the most recent
+        profiling.n_latency_samples timed calls.
+        """
+        topos = {}  # Only do the topo once per fct.
+        apply = []
+        for a, t in self.apply_time.items():
+            if a.fgraph not in topos:
+                topos[a.fgraph] = dict(
+                    (node, i) for i, node in enumerate(a.fgraph.toposort()))
+            if a in self.apply_latency:
+                latency = self.apply_latency[a].percentiles(percentiles)
+            else:
+                latency = {'n': 0}
+            apply.append({
+                'id': topos[a.fgraph][a],
+                'apply': str(a),
+                'op': str(a.op),
+                'op_class': type(a.op).__name__,
+                'impl': self.apply_cimpl.get(a) and 'C' or 'Py',
+                'time': t,
+                'callcount': self.apply_callcount.get(a, 0),
+                'latency': latency})
+        del topos
+        apply.sort(key=lambda x: x['time'], reverse=True)
+        return {
+            'message': self.message,
+            'compile_time': self.compile_time,
+            'fct_callcount': self.fct_callcount,
+            'sampled_callcount': self.sampled_callcount,
+            'fct_call_time': self.fct_call_time,
+            'sampled_call_time': self.sampled_call_time,
+            'vm_call_time': self.vm_call_time,
+            'call_latency': self.call_latency.percentiles(percentiles),
+            'apply': apply}
+
     def class_time(self):
         """dict op -> total time on thunks"""
         # timing is stored by node, we compute timing by class on demand
@@ -609,14 +868,18 @@ class ProfileStats(object):
         print >> file, '  Message: %s' % self.message
         print >> file, '  Time in %i calls to Function.__call__: %es' % (
             self.fct_callcount, self.fct_call_time)
+        if self.sampled_callcount != self.fct_callcount:
+            print >> file, '  Thunks timed in %i of those calls' % (
+                self.sampled_callcount)
         if self.fct_call_time > 0:
             print >> file, '  Time in Function.fn.__call__: %es (%.3f%%)' % (
                 self.vm_call_time,
                 100 * self.vm_call_time / self.fct_call_time)
+            # Only the thunks of the sampled calls are timed
             local_time = sum(self.apply_time.values())
-            if local_time > 0:
+            if local_time > 0 and self.sampled_call_time > 0:
                 print >> file, '  Time in thunks: %es (%.3f%%)' % (
-                    local_time, 100 * local_time / self.fct_call_time)
+                    local_time, 100 * local_time / self.sampled_call_time)
         print >> file, '  Total compile time: %es' % self.compile_time
         print >> file, '    Number of Apply nodes: %s' % len(self.apply_time)
         print >> file, '    Theano Optimizer time: %es' % self.optimizer_time
@@ -1511,6 +1774,13 @@ class ScanProfileStats(ProfileStats):
     callcount = 0.0
     nbsteps = 0.0
     call_time = 0.0
+    # Bytes copied by the scan loop from the outputs of the inner function
+    # to the output buffers of scan. Outputs computed in place in those
+    # buffers are not counted.
+    bytes_copied = 0.0
+    # Number of Scan ops that reused this inner function instead of
+    # compiling their own (see Scan.inner_function)
+    inner_fn_cache_hits = 0
 
     def __init__(self, atexit_print=True, name=None, **kwargs):
         super(ScanProfileStats, self).__init__(atexit_print, **kwargs)
@@ -1549,4 +1819,11 @@ class ScanProfileStats(ProfileStats):
             val = 100. - self.vm_call_time * 100 / self.call_time
         print >> file, '  Total overhead (computing slices..) %es (%.3f%%)' % (
             self.call_time - self.vm_call_time, val)
+        val = 0
+        if self.nbsteps > 0:
+            val = self.bytes_copied / self.nbsteps
+        print >> file, '  Bytes copied from the inner outputs %dB (%.1fB per step)' % (
+            self.bytes_copied, val)
+        print >> file, ('  Inner function compiled once and reused by %d '
+                        'other Scan ops' % self.inner_fn_cache_hits)
         print >> file, ''
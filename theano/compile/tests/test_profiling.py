@@ -2,9 +2,14 @@
 Test of memory profiling
 
 """
+import gc
+import json
+import os
 import StringIO
+import tempfile
 
 import numpy
+from nose.plugins.skip import SkipTest
 
 import theano
 import theano.tensor as T
@@ -99,6 +104,131 @@ def test_ifelse():
         theano.config.profile_memory = config2
 
 
+def test_sampling():
+    x = T.dvector('x')
+    y = T.exp(x).sum()
+
+    if theano.config.mode in ["DebugMode", "DEBUG_MODE", "FAST_COMPILE"]:
+        m = "FAST_RUN"
+    else:
+        m = None
+
+    # sample_every, sample_period, sample_window, nb of timed calls
+    for kwargs, n_timed in [
+            (dict(sample_every=1), 10),
+            (dict(sample_every=3), 4),
+            (dict(sample_period=1e6, sample_window=1e6), 10),
+            (dict(sample_period=1e6, sample_window=1e-9), 0)]:
+        p = theano.ProfileStats(False, **kwargs)
+        f = theano.function([x], y, profile=p, mode=m)
+        for i in range(10):
+            f(numpy.arange(10.))
+
+        snap = f.profile.snapshot()
+        json.dumps(snap)
+        assert snap['fct_callcount'] == 10
+        assert snap['sampled_callcount'] == n_timed
+        assert snap['call_latency']['n'] == 10
+        assert snap['call_latency']['p50'] <= snap['call_latency']['p99']
+        if n_timed == 0 or not hasattr(f.fn, 'update_profile'):
+            # Only the VM linkers time the Apply nodes
+            assert snap['apply'] == []
+            continue
+        assert len(snap['apply']) == len(f.maker.fgraph.apply_nodes)
+        for a in snap['apply']:
+            assert a['callcount'] == n_timed
+            assert a['latency']['n'] == n_timed
+            assert a['latency']['max'] >= a['latency']['p90']
+        # The thunks are only timed in the sampled calls
+        assert (sum(a['time'] for a in snap['apply']) <=
+                snap['sampled_call_time'] <= snap['fct_call_time'])
+
+        buf = StringIO.StringIO()
+        f.profile.summary(buf)
+        assert ("Thunks timed in %i of those calls" % n_timed in
+                buf.getvalue()) == (n_timed != 10)
+
+
+def test_latency_samples():
+    # A sample can stand for several calls, e.g. the steps of a scan.
+    samples = theano.compile.profiling.LatencySamples(size=3)
+    samples.push(1., 3)
+    samples.push(10.)
+    p = samples.percentiles((50, 75, 90))
+    assert p == {'n': 4, 'p50': 1., 'p75': 1., 'p90': 10., 'max': 10.}, p
+    # Only the most recent samples are kept
+    for t in [2., 3., 4.]:
+        samples.push(t)
+    p = samples.percentiles((50,))
+    assert p == {'n': 3, 'p50': 3., 'max': 4.}, p
+
+
+def test_trace():
+    config1 = theano.config.profiling.trace_file
+    config2 = theano.config.profiling.trace_buffer_size
+    fd, filename = tempfile.mkstemp(suffix='.json')
+    os.close(fd)
+    try:
+        theano.config.profiling.trace_file = filename
+        theano.config.profiling.trace_buffer_size = 8
+
+        if theano.config.mode in ["DebugMode", "DEBUG_MODE", "FAST_COMPILE"]:
+            m = "FAST_RUN"
+        else:
+            m = None
+
+        x = T.dvector('x')
+        acc, _ = theano.scan(lambda v, acc: acc + T.exp(v), sequences=x,
+                             outputs_info=T.zeros_like(x[0]),
+                             name='test_trace_scan')
+        f = theano.function([x], acc[-1], name='test_trace', mode=m)
+        if getattr(f.fn, 'trace', None) is None:
+            raise SkipTest("The linker does not record traces")
+        f(numpy.arange(100.))
+        theano.compile.profiling.write_trace()
+
+        events = json.load(open(filename))['traceEvents']
+        fct_events = [ev for ev in events if ev['cat'] == 'function']
+        node_events = [ev for ev in events if ev['cat'] != 'function']
+        assert all(ev['ph'] == 'X' and ev['dur'] >= 0 for ev in events)
+        # The outer function has less than 8 nodes, so all its events
+        # are kept. Only the last 8 steps of the scan are kept.
+        assert len([ev for ev in fct_events
+                    if ev['name'] == 'test_trace']) == 1
+        assert len([ev for ev in fct_events
+                    if ev['name'] == 'test_trace_scan']) == 4
+        scan_events = [ev for ev in node_events if ev['cat'] == 'Scan']
+        assert len(scan_events) == 1
+        assert scan_events[0]['args']['function'] == 'test_trace'
+        # The inner steps are recorded while the Scan node runs
+        scan_end = scan_events[0]['ts'] + scan_events[0]['dur']
+        for ev in node_events:
+            if ev['args']['function'] == 'test_trace_scan':
+                assert scan_events[0]['ts'] <= ev['ts'] <= scan_end
+                assert ev['args']['output_bytes'] == 8
+
+        # The trace of a deleted function is released, its events are
+        # still written.
+        n_traces = len(theano.compile.profiling._trace_list)
+        g = theano.function([x], T.exp(x), name='test_trace_deleted',
+                            mode=m)
+        assert len(theano.compile.profiling._trace_list) == n_traces + 1
+        g(numpy.arange(3.))
+        del g
+        gc.collect()
+        assert len(theano.compile.profiling._trace_list) == n_traces
+        theano.compile.profiling.write_trace()
+        events = json.load(open(filename))['traceEvents']
+        assert len([ev for ev in events
+                    if ev['name'] == 'test_trace_deleted']) == 1
+    finally:
+        theano.config.profiling.trace_file = config1
+        theano.config.profiling.trace_buffer_size = config2
+        os.remove(filename)
+
+
 if __name__ == '__main__':
     test_profiling()
     test_ifelse()
+    test_sampling()
+    test_trace()
@@ -566,6 +566,22 @@ AddConfigVar('openmp_elemwise_minsize',
              in_c_key=False,
          )
 
+AddConfigVar('openmp_sparse_minsize',
+             "If OpenMP is enabled, this is the minimum number of "
+             "multiplications for which the openmp parallelization is "
+             "enabled in the products of sparse and dense matrices.",
+             IntParam(200000),
+             in_c_key=False,
+         )
+
+AddConfigVar('openmp_mrg_minsize',
+             "If OpenMP is enabled, this is the minimum number of samples "
+             "for which the openmp parallelization is enabled in the "
+             "MRG31k3p random number generators on the CPU.",
+             IntParam(200000),
+             in_c_key=False,
+         )
+
 AddConfigVar('check_input',
              "Specify if types should check their input in their C code. "
              "It can be used to speed up compilation, reduce overhead "
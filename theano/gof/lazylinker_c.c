@@ -1,5 +1,6 @@
 #include <Python.h>
 #include "structmember.h"
+#include "pythread.h"
 #include <sys/time.h>
 
 // Old Python compatibility from here:
@@ -119,8 +120,16 @@ typedef struct {
 
     void ** thunk_cptr_fn;
     void ** thunk_cptr_data;
-    PyObject * call_times;
-    PyObject * call_counts;
+    PyObject ** thunk_pre_call; // NULL or a callable to call before the cthunk
+    PyObject * call_times; // array of n_applies doubles
+    PyObject * call_counts; // array of n_applies longs
+    double * call_times_buf; // points into the buffer of call_times
+    long * call_counts_buf; // points into the buffer of call_counts
+    PyObject * trace; // None or a vm.Trace recording every thunk call
+    long * trace_events; // points into the buffers of trace
+    double * trace_times;
+    long * trace_count;
+    Py_ssize_t trace_size;
     int do_timing;
     int need_update_inputs;
     int position_of_error; // -1 for no error, otw the index into `thunks` that failed.
@@ -133,6 +142,14 @@ CLazyLinker_dealloc(PyObject* _self)
   CLazyLinker* self = (CLazyLinker *) _self;
   free(self->thunk_cptr_fn);
   free(self->thunk_cptr_data);
+  if (self->thunk_pre_call)
+    {
+      for (int i = 0; i < self->n_applies; ++i)
+        {
+          Py_XDECREF(self->thunk_pre_call[i]);
+        }
+    }
+  free(self->thunk_pre_call);
 
   free(self->is_lazy);
 
@@ -182,6 +199,7 @@ CLazyLinker_dealloc(PyObject* _self)
   Py_XDECREF(self->thunks);
   Py_XDECREF(self->call_times);
   Py_XDECREF(self->call_counts);
+  Py_XDECREF(self->trace);
   Py_XDECREF(self->pre_call_clear);
   Py_TYPE(self)->tp_free((PyObject*)self);
 }
@@ -226,8 +244,16 @@ CLazyLinker_new(PyTypeObject *type, PyObject *args, PyObject *kwds)
 
       self->thunk_cptr_data = NULL;
       self->thunk_cptr_fn = NULL;
+      self->thunk_pre_call = NULL;
       self->call_times = NULL;
       self->call_counts = NULL;
+      self->call_times_buf = NULL;
+      self->call_counts_buf = NULL;
+      self->trace = NULL;
+      self->trace_events = NULL;
+      self->trace_times = NULL;
+      self->trace_count = NULL;
+      self->trace_size = 0;
       self->do_timing = 0;
 
       self->need_update_inputs = 0;
@@ -260,6 +286,7 @@ CLazyLinker_init(CLazyLinker *self, PyObject *args, PyObject *kwds)
       (char*)"node_output_size",
       (char*)"update_storage",
       (char*)"dependencies",
+      (char*)"trace",
       NULL};
 
     PyObject *compute_map_list=NULL,
@@ -275,10 +302,11 @@ CLazyLinker_init(CLazyLinker *self, PyObject *args, PyObject *kwds)
              *node_prereqs=NULL,
              *node_output_size=NULL,
              *update_storage=NULL,
-             *dependencies=NULL;
+             *dependencies=NULL,
+             *trace=NULL;
 
     assert(!self->nodes);
-    if (! PyArg_ParseTupleAndKeywords(args, kwds, "OOOiOOOOOOOOOOOOOOOO", kwlist,
+    if (! PyArg_ParseTupleAndKeywords(args, kwds, "OOOiOOOOOOOOOOOOOOOO|O", kwlist,
                                       &self->nodes,
                                       &self->thunks,
                                       &self->pre_call_clear,
@@ -298,7 +326,8 @@ CLazyLinker_init(CLazyLinker *self, PyObject *args, PyObject *kwds)
                                       &node_prereqs,
                                       &node_output_size,
                                       &update_storage,
-                                      &dependencies
+                                      &dependencies,
+                                      &trace
                                       ))
         return -1;
     Py_INCREF(self->nodes);
@@ -313,14 +342,73 @@ CLazyLinker_init(CLazyLinker *self, PyObject *args, PyObject *kwds)
     self->n_vars = PyList_Size(var_owner);
 
     if (PyList_Size(self->thunks) != n_applies) return -1;
-    if (PyList_Size(self->call_counts) != n_applies) return -1;
-    if (PyList_Size(self->call_times) != n_applies) return -1;
+
+    // The timers are updated in place for every thunk call, so we keep
+    // pointers to the buffers of the arrays instead of boxing each value.
+    // The arrays must not be resized while we are alive.
+    void * timer_buf;
+    Py_ssize_t timer_buf_len;
+    if (PyObject_AsWriteBuffer(self->call_times, &timer_buf, &timer_buf_len))
+      return -1;
+    if (timer_buf_len != n_applies * (Py_ssize_t)sizeof(double))
+      {
+        PyErr_SetString(PyExc_ValueError,
+                        "call_times must be an array of one double per node");
+        return -1;
+      }
+    self->call_times_buf = (double*)timer_buf;
+    if (PyObject_AsWriteBuffer(self->call_counts, &timer_buf, &timer_buf_len))
+      return -1;
+    if (timer_buf_len != n_applies * (Py_ssize_t)sizeof(long))
+      {
+        PyErr_SetString(PyExc_ValueError,
+                        "call_counts must be an array of one long per node");
+        return -1;
+      }
+    self->call_counts_buf = (long*)timer_buf;
+
+    if (trace && trace != Py_None)
+      {
+        // Same as above for the ring buffer of the trace
+        PyObject * size = PyObject_GetAttrString(trace, "size");
+        if (!size) return -1;
+        self->trace_size = PyNumber_AsSsize_t(size, PyExc_OverflowError);
+        Py_DECREF(size);
+        if (PyErr_Occurred()) return -1;
+        const char * attrs[3] = {"events", "times", "count"};
+        Py_ssize_t lens[3] = {3 * self->trace_size * (Py_ssize_t)sizeof(long),
+                              2 * self->trace_size * (Py_ssize_t)sizeof(double),
+                              (Py_ssize_t)sizeof(long)};
+        void * bufs[3];
+        for (int i = 0; i < 3; ++i)
+          {
+            PyObject * arr = PyObject_GetAttrString(trace, attrs[i]);
+            if (!arr) return -1;
+            // arr is kept alive by trace
+            int err = PyObject_AsWriteBuffer(arr, &bufs[i], &timer_buf_len);
+            Py_DECREF(arr);
+            if (err) return -1;
+            if (timer_buf_len != lens[i])
+              {
+                PyErr_Format(PyExc_ValueError,
+                             "trace.%s does not have the expected size",
+                             attrs[i]);
+                return -1;
+              }
+          }
+        self->trace_events = (long*)bufs[0];
+        self->trace_times = (double*)bufs[1];
+        self->trace_count = (long*)bufs[2];
+        self->trace = trace;
+        Py_INCREF(self->trace);
+      }
 
     // allocated and initialize thunk_cptr_data and thunk_cptr_fn
     if (n_applies)
       {
         self->thunk_cptr_data = (void**)calloc(n_applies, sizeof(void*));
         self->thunk_cptr_fn = (void**)calloc(n_applies, sizeof(void*));
+        self->thunk_pre_call = (PyObject**)calloc(n_applies, sizeof(PyObject*));
         self->is_lazy = (int*)calloc(n_applies, sizeof(int));
         self->node_prereqs = (Py_ssize_t**)calloc(n_applies, sizeof(Py_ssize_t*));
         self->node_n_prereqs = (Py_ssize_t*)calloc(n_applies, sizeof(Py_ssize_t));
@@ -329,6 +417,7 @@ CLazyLinker_init(CLazyLinker *self, PyObject *args, PyObject *kwds)
         assert(self->is_lazy);
         assert(self->thunk_cptr_fn);
         assert(self->thunk_cptr_data);
+        assert(self->thunk_pre_call);
 
         for (int i = 0; i < n_applies; ++i)
           {
@@ -343,6 +432,12 @@ CLazyLinker_init(CLazyLinker *self, PyObject *args, PyObject *kwds)
                 self->thunk_cptr_data[i] = PyCObject_GetDesc(cthunk);
                 Py_DECREF(cthunk);
                 // cthunk is kept alive by membership in self->thunks
+                if (PyObject_HasAttrString(thunk, "pre_call"))
+                  {
+                    // new reference, released in dealloc
+                    self->thunk_pre_call[i] = PyObject_GetAttrString(
+                        thunk, "pre_call");
+                  }
               }
 
             PyObject * el_i = PyList_GetItem(is_lazy, i);
@@ -487,13 +582,44 @@ static void set_position_of_error(CLazyLinker * self, int owner_idx)
       self->position_of_error = owner_idx;
     }
 }
+static void trace_record(CLazyLinker * self, Py_ssize_t node_idx,
+                         double t0, double t1, long nbytes)
+{
+  Py_ssize_t i = self->trace_count[0] % self->trace_size;
+  self->trace_count[0] += 1;
+  self->trace_events[3 * i] = node_idx;
+  self->trace_events[3 * i + 1] = (long)PyThread_get_thread_ident();
+  self->trace_events[3 * i + 2] = nbytes;
+  self->trace_times[2 * i] = t0;
+  self->trace_times[2 * i + 1] = t1;
+}
+// Size in bytes of the values of the outputs of a node, for the trace
+static long outputs_nbytes(CLazyLinker * self, Py_ssize_t node_idx)
+{
+  long nbytes = 0;
+  for (int i = 0; i < self->node_n_outputs[node_idx]; ++i)
+    {
+      Py_ssize_t out_idx = self->node_outputs[node_idx][i];
+      PyObject * value = PyList_GetItem(self->var_value_cells[out_idx], 0);
+      // refcounting - value is borrowed
+      PyObject * n = PyObject_GetAttrString(value, "nbytes");
+      if (n)
+        {
+          nbytes += PyInt_AsLong(n);
+          Py_DECREF(n);
+        }
+      if (PyErr_Occurred())
+        PyErr_Clear();
+    }
+  return nbytes;
+}
 static PyObject * pycall(CLazyLinker * self, Py_ssize_t node_idx, int verbose)
 {
   // call thunk to see which inputs it wants
   PyObject * thunk = PyList_GetItem(self->thunks, node_idx);
   // refcounting - thunk is borrowed
   PyObject * rval = NULL;
-  if (self->do_timing)
+  if (self->do_timing || self->trace)
     {
       double t0 = pytime(NULL);
       if (verbose) fprintf(stderr, "calling via Python (node %i)\n", (int)node_idx);
@@ -501,14 +627,14 @@ static PyObject * pycall(CLazyLinker * self, Py_ssize_t node_idx, int verbose)
       if (rval)
         {
           double t1 = pytime(NULL);
-          double ti = PyFloat_AsDouble(
-                         PyList_GetItem(self->call_times, node_idx));
-          PyList_SetItem(self->call_times, node_idx,
-                         PyFloat_FromDouble(t1 - t0 + ti));
-          PyObject * count = PyList_GetItem(self->call_counts, node_idx);
-          long icount = PyInt_AsLong(count);
-          PyList_SetItem(self->call_counts, node_idx,
-                         PyInt_FromLong(icount + 1));
+          if (self->do_timing)
+            {
+              self->call_times_buf[node_idx] += t1 - t0;
+              self->call_counts_buf[node_idx] += 1;
+            }
+          if (self->trace)
+            trace_record(self, node_idx, t0, t1,
+                         outputs_nbytes(self, node_idx));
       }
     }
   else
@@ -527,16 +653,30 @@ static int c_call(CLazyLinker * self, Py_ssize_t node_idx, int verbose)
   int (*fn)(void*) = (int (*)(void*))(ptr_addr);
   if (verbose) fprintf(stderr, "calling non-lazy shortcut (node %i)\n", (int)node_idx);
   int err = 0;
-  if (self->do_timing)
+  if (self->thunk_pre_call[node_idx])
+    {
+      // e.g. give the node the storage in which to compute its outputs
+      PyObject * r = PyObject_CallObject(self->thunk_pre_call[node_idx], NULL);
+      if (!r)
+        {
+          set_position_of_error(self, node_idx);
+          return -1;
+        }
+      Py_DECREF(r);
+    }
+  if (self->do_timing || self->trace)
     {
       double t0 = pytime(NULL);
       err = fn(self->thunk_cptr_data[node_idx]);
       double t1 = pytime(NULL);
-      double ti = PyFloat_AsDouble(PyList_GetItem(self->call_times, node_idx));
-      PyList_SetItem(self->call_times, node_idx, PyFloat_FromDouble(t1 - t0 + ti));
-      PyObject * count = PyList_GetItem(self->call_counts, node_idx);
-      long icount = PyInt_AsLong(count);
-      PyList_SetItem(self->call_counts, node_idx, PyInt_FromLong(icount+1));
+      if (self->do_timing)
+        {
+          self->call_times_buf[node_idx] += t1 - t0;
+          self->call_counts_buf[node_idx] += 1;
+        }
+      if (self->trace && !err)
+        trace_record(self, node_idx, t0, t1,
+                     outputs_nbytes(self, node_idx));
     }
   else
     {
@@ -808,6 +948,7 @@ CLazyLinker_call(PyObject *_self, PyObject *args, PyObject *kwds)
                                     &n_calls))
     return NULL;
   int err = 0;
+  double t_call = self->trace ? pytime(NULL) : 0;
   self->position_of_error = -1;
   // create constants used to fill the var_compute_cells
   PyObject * one = PyInt_FromLong(1);
@@ -918,6 +1059,8 @@ CLazyLinker_call(PyObject *_self, PyObject *args, PyObject *kwds)
       Py_DECREF(rval);
       return NULL;
     }
+  if (self->trace)
+    trace_record(self, -1, t_call, pytime(NULL), 0);
   return rval;
 }
 
@@ -963,10 +1106,12 @@ static PyMemberDef CLazyLinker_members[] = {
      (char*)"list of nodes"},
     {(char*)"thunks", T_OBJECT_EX, offsetof(CLazyLinker, thunks), 0,
      (char*)"list of thunks in program"},
-    {(char*)"call_counts", T_OBJECT_EX, offsetof(CLazyLinker, call_counts), 0,
+    {(char*)"call_counts", T_OBJECT_EX, offsetof(CLazyLinker, call_counts), READONLY,
      (char*)"number of calls of each thunk"},
-    {(char*)"call_times", T_OBJECT_EX, offsetof(CLazyLinker, call_times), 0,
+    {(char*)"call_times", T_OBJECT_EX, offsetof(CLazyLinker, call_times), READONLY,
      (char*)"total runtime in each thunk"},
+    {(char*)"trace", T_OBJECT, offsetof(CLazyLinker, trace), READONLY,
+     (char*)"None or the vm.Trace recording the thunk calls"},
     {(char*)"position_of_error", T_INT, offsetof(CLazyLinker, position_of_error), 0,
      (char*)"position of failed thunk"},
     {(char*)"time_thunks", T_INT, offsetof(CLazyLinker, do_timing), 0,
@@ -1024,7 +1169,7 @@ static PyTypeObject lazylinker_ext_CLazyLinkerType = {
 
 static PyObject * get_version(PyObject *dummy, PyObject *args)
 {
-  PyObject *result = PyFloat_FromDouble(0.21);
+  PyObject *result = PyFloat_FromDouble(0.213);
   return result;
 }
 
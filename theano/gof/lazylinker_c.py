@@ -14,7 +14,7 @@ from theano.gof import cmodule
 _logger = logging.getLogger('theano.gof.lazylinker_c')
 
 force_compile = False
-version = 0.21  # must match constant returned in function get_version()
+version = 0.213  # must match constant returned in function get_version()
 
 
 def try_import():
@@ -564,6 +564,60 @@ def gc_helper(node_list):
     return computed, last_user
 
 
+def wrap_output_destinations(order, thunks, storage_map):
+    """
+    :param order: list of Apply instances in program execution order
+    :param thunks: list of the thunks of the nodes in `order`
+    :param storage_map: dict variable -> one-element-list
+
+    :returns: a new list of thunks, where the thunks computing an input
+        listed in the `input_destinations` of another thunk (see
+        `Op.make_thunk`) put that destination in their output storage
+        before running.
+
+    This allows e.g. a `Join` to receive inputs that were computed
+    directly in its output, instead of copying them there.
+    """
+    thunks = list(thunks)
+    position = dict((node, i) for i, node in enumerate(order))
+    for node, thunk in zip(order, list(thunks)):
+        destinations = getattr(thunk, 'input_destinations', None)
+        if destinations is None:
+            continue
+        for i in destinations.inputs:
+            var = node.inputs[i]
+            pos = position[var.owner]
+            thunks[pos] = _destination_thunk(thunks[pos], storage_map[var],
+                                             destinations, i)
+    return thunks
+
+
+def _destination_thunk(thunk, storage, destinations, i):
+    def place():
+        destination = destinations.destination(i)
+        if destination is not None:
+            storage[0] = destination
+
+    def rval():
+        place()
+        return thunk()
+    for attr in ('inputs', 'outputs', 'lazy', 'perform', 'cthunk'):
+        if hasattr(thunk, attr):
+            setattr(rval, attr, getattr(thunk, attr))
+    if hasattr(thunk, 'cthunk'):
+        # The CVM calls the C code directly, after calling pre_call. The
+        # thunk is already wrapped if another Join uses one of its outputs.
+        inner = getattr(thunk, 'pre_call', None)
+        if inner is None:
+            rval.pre_call = place
+        else:
+            def pre_call():
+                inner()
+                place()
+            rval.pre_call = pre_call
+    return rval
+
+
 class PerformLinker(LocalLinker):
     """WRITEME
 
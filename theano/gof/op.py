@@ -637,6 +637,20 @@ class PureOp(object):
         """
         return True
 
+    def accepts_output_destination(self, node, i):
+        """
+        Return True if the implementation of `node` computes its output
+        `i` directly into the ndarray already present in its output
+        storage, whatever its strides, when that ndarray has the right
+        shape and dtype.
+
+        This allows the linker to give that output a view of the
+        output of the node that consumes it, so that the value does
+        not have to be copied there afterward. See `Op.make_thunk` and
+        `theano.gof.link.wrap_output_destinations`.
+        """
+        return False
+
 
 class Op(utils.object2, PureOp, CLinkerOp):
     """Convenience class to bundle `PureOp` and `CLinkerOp`"""
@@ -698,6 +712,16 @@ class Op(utils.object2, PureOp, CLinkerOp):
             no_recycling list will have a value of None in the storage map.  If
             the thunk can potentially cache return values (like CLinker does),
             then it must not do so for variables in the no_recycling list.
+
+        :note: The returned thunk can have an `input_destinations`
+            attribute. Its `inputs` attribute lists the indices of the
+            inputs of `node` that should be written directly in memory
+            owned by the thunk, and its `destination(i)` method returns
+            the ndarray where input `i` should be computed in the next
+            call, or None. The linker then calls it before the thunk
+            computing that input, if that input's Op accepts it (see
+            `PureOp.accepts_output_destination`). The thunk must still
+            work if the inputs it receives are not those destinations.
         """
         logger = logging.getLogger('theano.gof.op.Op')
 
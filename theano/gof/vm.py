@@ -3,10 +3,12 @@ VMs that run Theano graph computations.
 A VM is not actually different from a Linker, we just decided
 VM was a better name at some point.
 """
+import array
 import link
 import logging
 import os
 import sys
+import thread
 import time
 import warnings
 
@@ -52,6 +54,61 @@ AddConfigVar('vm.lazy',
              ConfigParam('None', filter_vm_lazy),
              in_c_key=False)
 
+def _outputs_nbytes(thunk):
+    return sum(getattr(o[0], 'nbytes', 0) for o in thunk.outputs)
+
+
+class Trace(object):
+
+    """
+    Bounded ring buffer of the thunk calls made by a VM, exported by
+    profiling.trace_file.
+
+    Each event is stored as (node index, thread id, size in bytes of the
+    node outputs) in `events` and as (start time, end time) in `times`.
+    The node index is -1 for the call of the whole VM. Only the last
+    `size` events are kept, so memory use does not grow with the number
+    of calls.
+
+    The arrays have a fixed size: the CVM writes into their buffers.
+    """
+
+    def __init__(self, fgraph, nodes, size):
+        self.fgraph = fgraph
+        self.nodes = nodes
+        self.size = size
+        self.events = array.array('l', [0]) * (3 * size)
+        self.times = array.array('d', [0.]) * (2 * size)
+        # Total number of events recorded
+        self.count = array.array('l', [0])
+
+    def record(self, node_idx, t0, t1, nbytes=0):
+        i = self.count[0] % self.size
+        self.count[0] += 1
+        self.events[3 * i] = node_idx
+        self.events[3 * i + 1] = thread.get_ident()
+        self.events[3 * i + 2] = nbytes
+        self.times[2 * i] = t0
+        self.times[2 * i + 1] = t1
+
+    def __iter__(self):
+        """
+        Yield the kept events, oldest first, as tuples (node, thread id,
+        output bytes, start time, end time). node is None for the call of
+        the whole VM.
+        """
+        count = self.count[0]
+        for j in xrange(max(0, count - self.size), count):
+            i = j % self.size
+            node_idx = self.events[3 * i]
+            if node_idx >= 0:
+                node = self.nodes[node_idx]
+            else:
+                node = None
+            yield (node, self.events[3 * i + 1], self.events[3 * i + 2],
+                   self.times[2 * i], self.times[2 * i + 1])
+
+
 class VM(object):
 
     """
@@ -68,13 +125,18 @@ class VM(object):
 
     Attributes:
 
-    call_counts - list of integers, one for each thunk. call_count[i] is the
-        number of times thunks[i] was called in the course of computations
-        performed by call_with_timers().
+    call_counts - array of integers, one for each thunk. call_count[i] is
+        the number of times thunks[i] was called in the course of
+        computations performed while time_thunks is True.
 
-    call_times - list of floats, one for each thunk. call_times[i] is
+    call_times - array of doubles, one for each thunk. call_times[i] is
         the amount of runtime spent on thunks[i] in the course of
-        computations performed by call_with_timers().
+        computations performed while time_thunks is True.
+
+    Both arrays have a fixed size (the CVM writes into their buffers) and
+    are reset by update_profile().
+
+    trace - None or a Trace in which every thunk call is recorded.
 
     need_update_inputs - bool. True indicates that Function.__call__
         must implement the feedback from output storage to input
@@ -98,9 +160,10 @@ class VM(object):
         self.nodes = nodes
         self.thunks = thunks
         self.pre_call_clear = pre_call_clear
-        self.call_counts = [0] * len(nodes)
-        self.call_times = [0] * len(nodes)
+        self.call_counts = array.array('l', [0]) * len(nodes)
+        self.call_times = array.array('d', [0.]) * len(nodes)
         self.time_thunks = False
+        self.trace = None
 
         # This variable (self.need_update_inputs) is overshadowed by
         # CLazyLinker in CVM which has an attribute of the same name that
@@ -138,6 +201,9 @@ class VM(object):
 
             profile.apply_cimpl[node] = hasattr(thunk, 'cthunk')
 
+            if c:
+                profile.record_apply_latency(node, t, c)
+
         if hasattr(self, 'variable_shape'):
             profile.variable_shape = self.variable_shape.copy()
             profile.variable_strides = self.variable_strides.copy()
@@ -165,7 +231,9 @@ class Loop(VM):
     """
 
     def __call__(self):
-        if self.time_thunks:
+        if self.time_thunks or self.trace is not None:
+            trace = self.trace
+            t_call = time.time()
             for cont in self.pre_call_clear:
                 cont[0] = None
             try:
@@ -174,10 +242,15 @@ class Loop(VM):
                     t0 = time.time()
                     thunk()
                     t1 = time.time()
-                    self.call_counts[i] += 1
-                    self.call_times[i] += t1 - t0
+                    if self.time_thunks:
+                        self.call_counts[i] += 1
+                        self.call_times[i] += t1 - t0
+                    if trace is not None:
+                        trace.record(i, t0, t1, _outputs_nbytes(thunk))
             except:
                 link.raise_with_op(node, thunk)
+            if trace is not None:
+                trace.record(-1, t_call, time.time())
         else:
             for cont in self.pre_call_clear:
                 cont[0] = None
@@ -202,7 +275,9 @@ class LoopGC(VM):
             raise ValueError()
 
     def __call__(self):
-        if self.time_thunks:
+        if self.time_thunks or self.trace is not None:
+            trace = self.trace
+            t_call = time.time()
             for cont in self.pre_call_clear:
                 cont[0] = None
             try:
@@ -213,13 +288,18 @@ class LoopGC(VM):
                     t0 = time.time()
                     thunk()
                     t1 = time.time()
-                    self.call_counts[i] += 1
-                    self.call_times[i] += t1 - t0
+                    if self.time_thunks:
+                        self.call_counts[i] += 1
+                        self.call_times[i] += t1 - t0
+                    if trace is not None:
+                        trace.record(i, t0, t1, _outputs_nbytes(thunk))
                     for old_s in old_storage:
                         old_s[0] = None
                     i += 1
             except:
                 link.raise_with_op(node, thunk)
+            if trace is not None:
+                trace.record(-1, t_call, time.time())
         else:
             for cont in self.pre_call_clear:
                 cont[0] = None
@@ -320,6 +400,9 @@ class Stack(VM):
         # Profile output looks buggy if a node has run but takes 0 time.
         # (and profile code might hide real bugs if it rounds up 0)
         dt = max(time.time() - t0, 1e-10)
+        if self.trace is not None:
+            self.trace.record(idx, t0, t0 + dt,
+                              _outputs_nbytes(self.thunks[idx]))
         if self.callback is not None:
             self.callback(
                 node=node,
@@ -330,6 +413,7 @@ class Stack(VM):
         return rval, dt
 
     def __call__(self):
+        t_call = time.time()
         storage_map = self.storage_map
         compute_map = self.compute_map
         thunks = self.thunks
@@ -398,8 +482,9 @@ class Stack(VM):
                         del _
                         if config.profile:
                             current_idx = self.node_idx[current_apply]
-                            self.call_counts[current_idx] += 1
-                            self.call_times[current_idx] += dt
+                            if self.time_thunks:
+                                self.call_counts[current_idx] += 1
+                                self.call_times[current_idx] += dt
                             # Computing the memory footprint of the the op
                             # ?? What about inplace .. if the op is inplace
                             # you don't actually ask for more memory!
@@ -487,9 +572,10 @@ class Stack(VM):
 
                 try:
                     requires, dt = self.run_thunk_of_node(current_apply)
-                    current_idx = self.node_idx[current_apply]
-                    self.call_counts[current_idx] += 1
-                    self.call_times[current_idx] += dt
+                    if self.time_thunks:
+                        current_idx = self.node_idx[current_apply]
+                        self.call_counts[current_idx] += 1
+                        self.call_times[current_idx] += dt
 
                 except Exception:
                     link.raise_with_op(current_apply,
@@ -563,6 +649,9 @@ class Stack(VM):
 
         self.node_cleared_order.append(final_index)
 
+        if self.trace is not None:
+            self.trace.record(-1, t_call, time.time())
+
 
 try:
     import lazylinker_c
@@ -719,6 +808,12 @@ class VM_Linker(link.LocalLinker):
 
         pre_call_clear = [storage_map[v] for v in self.no_recycling]
 
+        if config.profiling.trace_file:
+            trace = Trace(self.fgraph, nodes,
+                          config.profiling.trace_buffer_size)
+        else:
+            trace = None
+
         if (self.callback is not None or
                 (config.profile and config.profile_memory)):
 
@@ -827,8 +922,8 @@ class VM_Linker(link.LocalLinker):
                 thunks,
                 pre_call_clear,
                 allow_gc=self.allow_gc,
-                call_counts=[0] * len(nodes),
-                call_times=[0.0] * len(nodes),
+                call_counts=array.array('l', [0]) * len(nodes),
+                call_times=array.array('d', [0.]) * len(nodes),
                 compute_map_list=compute_map_list,
                 storage_map_list=storage_map_list,
                 base_input_output_list=base_input_output_list,
@@ -843,6 +938,7 @@ class VM_Linker(link.LocalLinker):
                 node_output_size=node_output_size,
                 update_storage=update_storage,
                 dependencies=dependency_map_list,
+                trace=trace,
             )
             assert c0 == sys.getrefcount(node_n_inputs)
         else:
@@ -873,6 +969,9 @@ class VM_Linker(link.LocalLinker):
                     self.fgraph, self.allow_gc,
                     dependencies=deps
                 )
+        if trace is not None and vm.trace is None:
+            # The CVM got it in its constructor
+            vm.trace = trace
         return vm
 
     def make_all(self, profiler=None, input_storage=None,
@@ -907,6 +1006,7 @@ class VM_Linker(link.LocalLinker):
         for node, thunk in zip(order, thunks):
             thunk.inputs = [storage_map[v] for v in node.inputs]
             thunk.outputs = [storage_map[v] for v in node.outputs]
+        thunks = link.wrap_output_destinations(order, thunks, storage_map)
 
         computed, last_user = link.gc_helper(order)
         if self.allow_gc:
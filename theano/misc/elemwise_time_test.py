@@ -15,6 +15,11 @@ parser.add_option('-N', '--N', action='store', dest='N',
 parser.add_option('--script', action='store_true', dest='script',
                   default=False,
                   help="Run program as script and print results on stdoutput")
+parser.add_option('--layouts', action='store_true', dest='layouts',
+                  default=False,
+                  help="Compute the time of a fast elemwise operation on"
+                  " a matrix of about N elements with inputs of different"
+                  " memory layouts (transposed, strided, broadcasted)")
 
 
 def evalTime(f, v, script=False, loops=1000):
@@ -45,12 +50,55 @@ def ElemwiseOpTime(N, script=False, loops=1000):
     costlyTime = evalTime(f1, v, script=script, loops=loops)
     return (ceapTime, costlyTime)
 
+
+def ElemwiseLayoutTime(N, script=False, loops=1000):
+    """Time x + y on matrices of about N elements for different layouts.
+
+    Return a list of (layout name, time) pairs. The inputs are views
+    built with numpy, like the ones DimShuffle and Subtensor return.
+    """
+    x = T.matrix('x')
+    y = T.matrix('y')
+    r = T.row('r')
+    np.random.seed(1235)
+    n = max(int(np.sqrt(N)), 1)
+
+    def rand(*shp):
+        return np.random.random(shp).astype(theano.config.floatX)
+    f = theano.function([x, y], x + y)
+    fr = theano.function([x, r], x + r)
+    a = rand(n, n)
+    b = rand(n, n)
+    layouts = [
+        ('c contiguous', f, (a, b)),
+        ('fortran', f, (a.T, b.T)),
+        ('one transposed', f, (a, b.T)),
+        ('strided rows', f, (rand(2 * n, n)[::2], b)),
+        ('strided columns', f, (rand(n, 2 * n)[:, ::2], b)),
+        ('reversed', f, (a[::-1, ::-1], b)),
+        ('broadcasted row', fr, (a.T, rand(1, n))),
+    ]
+    times = []
+    for name, fn, args in layouts:
+        if not script:
+            print "%-16s" % name,
+        times.append((name, evalTime(lambda v: fn(*v), args,
+                                     script=script, loops=loops)))
+    return times
+
 if __name__ == '__main__':
     options, arguments = parser.parse_args(sys.argv)
     if hasattr(options, "help"):
         print options.help
         sys.exit(0)
 
+    if options.layouts:
+        times = ElemwiseLayoutTime(N=options.N, script=options.script)
+        if options.script:
+            sys.stdout.write(" ".join("%2.9f" % t for _, t in times) + "\n")
+            sys.stdout.flush()
+        sys.exit(0)
+
     (cheapTime, costlyTime) = ElemwiseOpTime(N=options.N,
                                              script=options.script)
 
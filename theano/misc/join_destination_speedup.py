@@ -0,0 +1,61 @@
+"""
+Compare the time of join(0, exp(x), x * y), whose inputs are computed
+directly in the output of the Join, with the time of computing exp(x)
+and x * y alone, and of computing them then concatenating them.
+"""
+from optparse import OptionParser
+import sys
+import time
+
+import numpy as np
+
+import theano
+import theano.tensor as T
+
+parser = OptionParser(usage='%prog <options>\n Compute time for'
+                      ' a Join of Elemwise outputs')
+parser.add_option('-N', '--N', action='store', dest='N',
+                  default=2000, type="int",
+                  help="Number of rows of the inputs")
+parser.add_option('-M', '--M', action='store', dest='M',
+                  default=2000, type="int",
+                  help="Number of columns of the inputs")
+parser.add_option('--loops', action='store', dest='loops',
+                  default=20, type="int",
+                  help="Number of calls, the best time is kept")
+
+
+def evalTime(f, args, loops):
+    best = 1e10
+    for i in xrange(loops):
+        t0 = time.time()
+        f(*args)
+        best = min(best, time.time() - t0)
+    return best
+
+
+def joinTimes(N, M, loops):
+    rng = np.random.RandomState(1235)
+    x_val = rng.uniform(-1, 1, size=(N, M)).astype(theano.config.floatX)
+    y_val = rng.uniform(-1, 1, size=(N, M)).astype(theano.config.floatX)
+    x = T.matrix('x')
+    y = T.matrix('y')
+    inputs = theano.function([x, y], [T.exp(x), x * y])
+    join = theano.function([x, y], T.join(0, T.exp(x), x * y))
+
+    def concatenate(x_val, y_val):
+        return np.concatenate(inputs(x_val, y_val))
+    return [(name, evalTime(f, (x_val, y_val), loops))
+            for name, f in [('inputs only', inputs),
+                            ('join', join),
+                            ('inputs + concatenate', concatenate)]]
+
+if __name__ == '__main__':
+    options, arguments = parser.parse_args(sys.argv)
+    times = joinTimes(options.N, options.M, options.loops)
+    print "join(0, exp(x), x * y) on %d x %d inputs" % (options.N, options.M)
+    for name, t in times:
+        print "%-22s %fs" % (name, t)
+    t_inputs = times[0][1]
+    print "join overhead %fs, concatenate overhead %fs" % (
+        times[1][1] - t_inputs, times[2][1] - t_inputs)
@@ -0,0 +1,105 @@
+"""
+Compare the time of the C sparse ops with and without openmp on a sparse
+matrix whose row lengths follow a power law, as the adjacency matrices of
+graphs do. The number of threads is set with OMP_NUM_THREADS.
+"""
+from optparse import OptionParser
+import sys
+import time
+
+import numpy as np
+import scipy.sparse as sp
+
+import theano
+import theano.tensor as T
+from theano import sparse
+from theano.sparse import opt
+
+parser = OptionParser(usage='%prog <options>\n Compute time for'
+                      ' the C sparse ops with and without openmp')
+parser.add_option('-N', '--N', action='store', dest='N',
+                  default=20000, type="int",
+                  help="Number of rows and columns of the sparse matrix")
+parser.add_option('-K', '--K', action='store', dest='K',
+                  default=64, type="int",
+                  help="Number of columns of the dense matrix")
+parser.add_option('-a', '--alpha', action='store', dest='alpha',
+                  default=1.8, type="float",
+                  help="Exponent of the Zipf law of the row lengths")
+parser.add_option('--loops', action='store', dest='loops',
+                  default=20, type="int",
+                  help="Number of calls, the best time is kept")
+
+
+def power_law_matrix(N, alpha, rng):
+    """Return a N x N csr matrix with Zipf distributed row lengths."""
+    row_nnz = np.minimum(rng.zipf(alpha, size=N), N)
+    indptr = np.concatenate([[0], np.cumsum(row_nnz)]).astype('int32')
+    indices = np.concatenate([rng.randint(0, N, size=n)
+                              for n in row_nnz]).astype('int32')
+    data = rng.uniform(-1, 1, size=indptr[-1]).astype(theano.config.floatX)
+    m = sp.csr_matrix((data, indices, indptr), shape=(N, N))
+    m.sum_duplicates()
+    return m
+
+
+def evalTime(f, args, loops):
+    best = 1e10
+    for i in xrange(loops):
+        t0 = time.time()
+        f(*args)
+        best = min(best, time.time() - t0)
+    return best
+
+
+def sparseOpTimes(N, K, alpha, loops, openmp):
+    rng = np.random.RandomState(1235)
+    x_csr = power_law_matrix(N, alpha, rng)
+    x_csc = x_csr.tocsc()
+    y_val = rng.uniform(-1, 1, size=(N, K)).astype(theano.config.floatX)
+    z_val = rng.uniform(-1, 1, size=(N, K)).astype(theano.config.floatX)
+
+    y = T.matrix('y')
+    z = T.matrix('z')
+    x = sparse.csr_matrix('x')
+    xc = sparse.csc_matrix('xc')
+    x_d, x_i, x_p, x_s = sparse.csm_properties(x)
+    xc_d, xc_i, xc_p, xc_s = sparse.csm_properties(xc)
+    ops = [
+        ('StructuredDotCSR', [x, y], (x_csr, y_val),
+         opt.StructuredDotCSR(openmp=openmp)(x_d, x_i, x_p, y)),
+        ('StructuredDotCSC', [xc, y], (x_csc, y_val),
+         opt.StructuredDotCSC(openmp=openmp)(xc_d, xc_i, xc_p, xc_s[0], y)),
+    ]
+    if theano.config.blas.ldflags:
+        ops += [
+            ('UsmmCscDense', [xc, y, z], (x_csc, y_val, z_val),
+             opt.UsmmCscDense(inplace=False, openmp=openmp)(
+                 np.ones((1, 1), dtype=theano.config.floatX),
+                 xc_d, xc_i, xc_p, xc_s[0], y, z)),
+            ('SamplingDotCSR', [x, y, z], (x_csr, y_val, z_val),
+             opt.SamplingDotCSR(openmp=openmp)(
+                 y, z, x_d, x_i, x_p, x_s[1])[0]),
+        ]
+    times = []
+    for name, inputs, args, out in ops:
+        f = theano.function(inputs, out)
+        times.append((name, evalTime(f, args, loops)))
+    return x_csr.nnz, times
+
+if __name__ == '__main__':
+    options, arguments = parser.parse_args(sys.argv)
+    theano.config.openmp_sparse_minsize = 0
+    nnz, times = sparseOpTimes(options.N, options.K, options.alpha,
+                               options.loops, openmp=False)
+    nnz, times_omp = sparseOpTimes(options.N, options.K, options.alpha,
+                                   options.loops, openmp=True)
+    print "%d x %d matrix with %d non-zero elements" % (options.N, options.N,
+                                                      nnz)
+    for (name, t), (_, t_omp) in zip(times, times_omp):
+        if t > t_omp:
+            speed = "speedup %2.2f" % (t / t_omp)
+        else:
+            speed = "slowdown %2.2f" % (t_omp / t)
+        print "%-16s without openmp %fs with openmp %fs %s" % (
+            name, t, t_omp, speed)
@@ -38,7 +38,8 @@ from theano.tensor.nlinalg import ( MatrixInverse,
                                     svd,
                                     lstsq,
                                     matrix_power,
-                                    norm
+                                    norm,
+                                    inv_as_solve
                                     )
 
 from theano.tensor.slinalg import ( Cholesky,
@@ -48,7 +49,8 @@ from theano.tensor.slinalg import ( Cholesky,
                                     solve,
                                     Eigvalsh,
                                     EigvalshGrad,
-                                    eigvalsh
+                                    eigvalsh,
+                                    tag_solve_triangular
                                     )
 
 try:
@@ -268,48 +270,6 @@ def transinv_to_invtrans(node):
                     return [A.owner.op(node.op(X))]
 
 
-@register_stabilize
-@local_optimizer([Dot, Dot22])
-def inv_as_solve(node):
-    if not imported_scipy:
-        return False
-    if isinstance(node.op, (Dot, Dot22)):
-        l, r = node.inputs
-        if l.owner and l.owner.op == matrix_inverse:
-            return [solve(l.owner.inputs[0], r)]
-        if r.owner and r.owner.op == matrix_inverse:
-            if is_symmetric(r.owner.inputs[0]):
-                return [solve(r.owner.inputs[0], l.T).T]
-            else:
-                return [solve(r.owner.inputs[0].T, l.T).T]
-
-
-@register_stabilize
-@register_canonicalize
-@local_optimizer([Solve])
-def tag_solve_triangular(node):
-    """
-    If a general solve() is applied to the output of a cholesky op, then
-    replace it with a triangular solve.
-    """
-    if node.op == solve:
-        if node.op.A_structure == 'general':
-            A, b = node.inputs  # result is solution Ax=b
-            if A.owner and isinstance(A.owner.op, type(cholesky)):
-                if A.owner.op.lower:
-                    return [Solve('lower_triangular')(A, b)]
-                else:
-                    return [Solve('upper_triangular')(A, b)]
-            if (A.owner and isinstance(A.owner.op, DimShuffle)
-                and A.owner.op.new_order == (1, 0)):
-                A_T, = A.owner.inputs
-                if A_T.owner and isinstance(A_T.owner.op, type(cholesky)):
-                    if A_T.owner.op.lower:
-                        return [Solve('upper_triangular')(A, b)]
-                    else:
-                        return [Solve('lower_triangular')(A, b)]
-
-
 @register_canonicalize
 @register_stabilize
 @register_specialize
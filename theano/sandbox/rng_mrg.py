@@ -16,7 +16,7 @@ from theano.tensor import (raw_random, TensorType, as_tensor_variable,
                            get_vector_length, cast, opt, scal)
 from theano.tensor import sqrt, log, sin, cos, join, prod
 from theano.compile import optdb
-from theano.gof import local_optimizer
+from theano.gof import local_optimizer, OpenMPOp
 from theano.gof.python25 import all, any
 
 import multinomial
@@ -35,6 +35,19 @@ def matVecModM(A, s, m):
     return numpy.int32(numpy.sum((A*s) % m, 1) % m)
 
 
+def matMatModM(A, B, m):
+    """
+    Product of the matrices A and B modulo m, without overflow for
+    entries smaller than 2**31.
+    """
+    assert A.dtype == 'int64' and B.dtype == 'int64'
+    r = numpy.zeros((A.shape[0], B.shape[1]), dtype='int64')
+    for k in xrange(A.shape[1]):
+        r += (A[:, k, None] * B[None, k, :]) % m
+        r %= m
+    return r
+
+
 def multMatVect(v, A, m1, B, m2):
     """
     multiply the first half of v by A with a modulo of m1
@@ -221,6 +234,41 @@ A2p134 = numpy.asarray(
     dtype='int64')
 np_int32_vals = [numpy.int32(i) for i in (0, 7, 9, 15, 16, 22, 24)]
 
+# The pairs (A1p72 ** 2 ** k, A2p72 ** 2 ** k) modulo (M1, M2), which jump
+# 2 ** k substreams ahead, computed when needed.
+_substream_jumps = [(A1p72, A2p72)]
+
+
+def substream_jump(k):
+    """Return the matrices jumping 2 ** (72 + k) samples ahead."""
+    while len(_substream_jumps) <= k:
+        A1, A2 = _substream_jumps[-1]
+        _substream_jumps.append((matMatModM(A1, A1, int(M1)),
+                                 matMatModM(A2, A2, int(M2))))
+    return _substream_jumps[k]
+
+
+def substream_rstates(rstate, n_streams):
+    """
+    Return the states of the n_streams first substreams starting at
+    rstate, spaced by 2**72 samples.
+
+    The states are computed by doubling: the substreams n to 2n - 1 are
+    the substreams 0 to n - 1 moved 2**72 * n samples ahead, all at once.
+    """
+    rval = numpy.zeros((n_streams, 6), dtype='int64')
+    rval[0] = rstate
+    n = 1
+    k = 0
+    while n < n_streams:
+        m = min(n, n_streams - n)
+        A1, A2 = substream_jump(k)
+        rval[n:n + m, :3] = matMatModM(rval[:m, :3], A1.T, int(M1))
+        rval[n:n + m, 3:] = matMatModM(rval[:m, 3:], A2.T, int(M2))
+        n += m
+        k += 1
+    return rval.astype('int32')
+
 
 def ff_2p134(rstate):
     return multMatVect(rstate, A1p134, M1, A2p134, M2)
@@ -303,6 +351,9 @@ class mrg_uniform_base(Op):
             s = "no_inplace"
         return self.__class__.__name__ + "{%s,%s}" % (self.output_type, s)
 
+    def clone_inplace(self):
+        return self.__class__(self.output_type, inplace=True)
+
     def make_node(self, rstate, size):
         # error checking slightly redundant here, since
         # this op should not be called directly.
@@ -322,57 +373,180 @@ class mrg_uniform_base(Op):
         return [None for i in eval_points]
 
 
-class mrg_uniform(mrg_uniform_base):
-    #CPU VERSION
+# C code of one step of a MRG31k3p stream, shared by the CPU samplers
+# below. It is the same computation as mrg_next_value.
+_mrg_support_code = """
+#ifndef THEANO_MRG_NEXT
+#define THEANO_MRG_NEXT
+// Move the stream whose state is the 6 integers at `state` one sample
+// forward. Return the difference of its two components, in [1, 2^31 - 1],
+// which times NORM is a uniform sample in ]0, 1[.
+static inline npy_int32 mrg_next(npy_int32* state)
+{
+    const npy_int32 i7 = 7;
+    const npy_int32 i9 = 9;
+    const npy_int32 i15 = 15;
+    const npy_int32 i16 = 16;
+    const npy_int32 i22 = 22;
+    const npy_int32 i24 = 24;
+
+    const npy_int32 M1 = 2147483647;      //2^31 - 1
+    const npy_int32 M2 = 2147462579;      //2^31 - 21069
+    const npy_int32 MASK12 = 511;       //2^9 - 1
+    const npy_int32 MASK13 = 16777215;  //2^24 - 1
+    const npy_int32 MASK2 = 65535;      //2^16 - 1
+    const npy_int32 MULT2 = 21069;
+
+    npy_int32 y1, y2, x11, x12, x13, x21, x22, x23;
+
+    x11 = state[0];
+    x12 = state[1];
+    x13 = state[2];
+    x21 = state[3];
+    x22 = state[4];
+    x23 = state[5];
+
+    y1 = ((x12 & MASK12) << i22) + (x12 >> i9) + ((x13 & MASK13) << i7) + (x13 >> i24);
+    if ((y1 < 0 || y1 >= M1))     //must also check overflow
+        y1 -= M1;
+    y1 += x13;
+    if ((y1 < 0 or y1 >= M1))
+        y1 -= M1;
+    x13 = x12;
+    x12 = x11;
+    x11 = y1;
+
+    y1 = ((x21 & MASK2) << i15) + (MULT2 * (x21 >> i16));
+    if (y1 < 0 || y1 >= M2)
+        y1 -= M2;
+    y2 = ((x23 & MASK2) << i15) + (MULT2 * (x23 >> i16));
+    if (y2 < 0 || y2 >= M2)
+        y2 -= M2;
+    y2 += x23;
+    if (y2 < 0 || y2 >= M2)
+        y2 -= M2;
+    y2 += y1;
+    if (y2 < 0 or y2 >= M2)
+        y2 -= M2;
+
+    x23 = x22;
+    x22 = x21;
+    x21 = y2;
+
+    state[0] = x11;
+    state[1] = x12;
+    state[2] = x13;
+    state[3] = x21;
+    state[4] = x22;
+    state[5] = x23;
+
+    if (x11 <= x21)
+        return x11 - x21 + M1;
+    else
+        return x11 - x21;
+}
+#endif
+"""
+
+
+def _mrg_norm(dtype):
+    """Return the C type and the C constant turning the result of
+    mrg_next into a uniform sample of type `dtype`."""
+    if dtype == 'float32':
+        # numpy.float32(1.0/(2**31+65))
+        # this was determined by finding the biggest number such that
+        # numpy.float32(number * M1) < 1.0
+        return 'float', '4.6566126e-10f'
+    else:
+        return 'double', '4.656612873077392578125e-10'
+
+
+def _mrg_uniform_draws(rstate, n_draws, dtype):
+    """Python version of the draws of mrg_uniform: the sample i is drawn
+    from the stream i % n_streams."""
+    n_streams = rstate.shape[0]
+    rval = numpy.zeros(n_draws, dtype=dtype)
+    for i in xrange(n_draws):
+        rval[i] = mrg_next_value(rstate[i % n_streams],
+                                 rstate[i % n_streams])
+    return rval
+
+
+class mrg_distribution(mrg_uniform_base, OpenMPOp):
+    """
+    Base of the CPU ops sampling a distribution directly from the
+    MRG31k3p streams.
+
+    The sample i is computed from the stream i % n_streams, so that the
+    streams can be sampled in parallel. The subclasses define
+    `c_code_stream`, the C code computing the samples of the streams, and
+    `sample`, its python version.
+    """
+    def __init__(self, output_type, inplace=False, openmp=None):
+        mrg_uniform_base.__init__(self, output_type, inplace)
+        OpenMPOp.__init__(self, openmp=openmp)
 
     @classmethod
-    def new(cls, rstate, ndim, dtype, size):
+    def new(cls, rstate, ndim, dtype, size, *inputs):
         v_size = as_tensor_variable(size)
         if ndim is None:
             ndim = get_vector_length(v_size)
         op = cls(TensorType(dtype, (False,)*ndim))
-        return op(rstate, cast(v_size, 'int32'))
-
-    def perform(self, node, inp, out):
-        rstate, size = inp
-        o_rstate, o_sample = out
-        numpy_version = numpy.__version__.split('.')
+        return op(rstate, cast(v_size, 'int32'), *inputs)
 
-        if (not self.warned_numpy_version and
-            int(numpy_version[0]) <= 1 and
-            int(numpy_version[1]) < 3):
+    def make_node(self, rstate, size, *inputs):
+        inputs = [as_tensor_variable(i) for i in inputs]
+        return Apply(self,
+                     [rstate, size] + inputs,
+                     [rstate.type(), self.output_type()])
 
-            print "Warning: you must use numpy version 1.3.0 or higher with the python version of this op. Otherwise numpy leak memory. and numpy"
-            self.warned_numpy_version = True
+    def clone_inplace(self):
+        return self.__class__(self.output_type, inplace=True,
+                              openmp=self.openmp)
 
-        n_elements = 1
+    def perform(self, node, inp, out):
+        rstate, size = inp[:2]
+        o_rstate, o_sample = out
 
-        rstate = numpy.asarray(rstate)  # bring state from GPU if necessary
+        rstate = numpy.asarray(rstate)
         if not self.inplace:
             rstate = rstate.copy()
 
+        n_elements = 1
         for s in size:
             n_elements *= s
 
-        n_streams, _ = rstate.shape
-
-        rval = numpy.zeros(n_elements, dtype=self.output_type.dtype)
-
         err_orig = numpy.seterr(over='ignore')
         try:
-            for i in xrange(n_elements):
-                sample = mrg_next_value(rstate[i % n_streams],
-                                        rstate[i % n_streams])
-                rval[i] = sample
+            rval = self.sample(rstate, n_elements, *inp[2:])
         finally:
             numpy.seterr(**err_orig)
 
-        # send to GPU if necessary
         o_rstate[0] = node.outputs[0].type.filter(rstate)
         o_sample[0] = node.outputs[1].type.filter(rval.reshape(size))
 
+    def _omp_parallel(self):
+        """
+        Return the pragma sharing the iterations of the following loop
+        between threads when there are config.openmp_mrg_minsize samples.
+        """
+        self.update_self_openmp()
+        if not self.openmp:
+            return ""
+        return "#pragma omp parallel for if(n_elements >= %d)" % (
+            config.openmp_mrg_minsize)
+
+    def c_headers(self):
+        return OpenMPOp.c_headers(self) + ['<math.h>']
+
+    def c_support_code(self):
+        return _mrg_support_code
+
+    def c_code_cache_version(self):
+        return (3, self.openmp, config.openmp_mrg_minsize)
+
     def c_code(self, node, name, inp, out, sub):
-        rstate, size = inp
+        rstate, size = inp[:2]
         o_rstate, o_sample = out
         if self.inplace:
             o_rstate_requirement = 'NPY_ARRAY_C_CONTIGUOUS|NPY_ARRAY_ALIGNED'
@@ -381,41 +555,19 @@ class mrg_uniform(mrg_uniform_base):
         ndim = self.output_type.ndim
         o_type_num = numpy.asarray(0, dtype=self.output_type.dtype).dtype.num
         fail = sub['fail']
-        if self.output_type.dtype == 'float32':
-            otype = 'float'
-            NORM = '4.6566126e-10f'  # numpy.float32(1.0/(2**31+65))
-            # this was determined by finding the biggest number such that
-            # numpy.float32(number * M1) < 1.0
-        else:
-            otype = 'double'
-            NORM = '4.656612873077392578125e-10'
+        stream_code = self.c_code_stream(node, name, inp[2:], o_sample, sub)
         return """
-        //////// <code generated by mrg_uniform>
+        //////// <code generated by %(name)s>
 
         npy_intp odims[%(ndim)s];
-        int n_elements = 1;
-        int n_streams = 0;
+        npy_intp n_elements = 1;
+        npy_intp n_streams = 0;
         int must_alloc_sample = ((NULL == %(o_sample)s)
                                  || (PyArray_NDIM(%(o_sample)s) != %(ndim)s)
                                  || !(PyArray_ISCONTIGUOUS(%(o_sample)s)));
-        %(otype)s * sample_data;
+        dtype_%(o_sample)s * sample_data;
         npy_int32 * state_data;
 
-        const npy_int32 i0 = 0;
-        const npy_int32 i7 = 7;
-        const npy_int32 i9 = 9;
-        const npy_int32 i15 = 15;
-        const npy_int32 i16 = 16;
-        const npy_int32 i22 = 22;
-        const npy_int32 i24 = 24;
-
-        const npy_int32 M1 = 2147483647;      //2^31 - 1
-        const npy_int32 M2 = 2147462579;      //2^31 - 21069
-        const npy_int32 MASK12 = 511;       //2^9 - 1
-        const npy_int32 MASK13 = 16777215;  //2^24 - 1
-        const npy_int32 MASK2 = 65535;      //2^16 - 1
-        const npy_int32 MULT2 = 21069;
-
         if (PyArray_NDIM(%(size)s) != 1)
         {
             PyErr_SetString(PyExc_ValueError, "size must be vector");
@@ -437,20 +589,22 @@ class mrg_uniform(mrg_uniform_base):
             odims[i] = ((npy_int32*)(PyArray_BYTES(%(size)s) + PyArray_STRIDES(%(size)s)[0] * i))[0];
             n_elements *= odims[i];
             must_alloc_sample = must_alloc_sample || (PyArray_DIMS(%(o_sample)s)[i] != odims[i]);
-            //fprintf(stderr, "size %%i %%i\\n", i, (int)odims[i]);
         }
         if (must_alloc_sample)
         {
             Py_XDECREF(%(o_sample)s);
             %(o_sample)s = (PyArrayObject*)PyArray_SimpleNew(%(ndim)s, odims, %(o_type_num)s);
             if(!%(o_sample)s) {
-                PyErr_SetString(PyExc_MemoryError, "failed to alloc mrg_uniform output");
+                PyErr_SetString(PyExc_MemoryError, "failed to alloc %(name)s output");
                 %(fail)s
             }
         }
         Py_XDECREF(%(o_rstate)s);
         %(o_rstate)s = (PyArrayObject*)PyArray_FromAny(py_%(rstate)s, NULL, 0, 0, %(o_rstate_requirement)s,NULL);
-
+        if (!%(o_rstate)s)
+        {
+            %(fail)s
+        }
         if (PyArray_NDIM(%(o_rstate)s) != 2)
         {
             PyErr_SetString(PyExc_ValueError, "rstate must be matrix");
@@ -468,69 +622,252 @@ class mrg_uniform(mrg_uniform_base):
         }
         n_streams = PyArray_DIMS(%(o_rstate)s)[0];
 
-        sample_data = (%(otype)s *) PyArray_DATA(%(o_sample)s);
+        sample_data = (dtype_%(o_sample)s *) PyArray_DATA(%(o_sample)s);
         state_data = (npy_int32 *) PyArray_DATA(%(o_rstate)s);
-        for (int i = 0; i < n_elements; ++i)
+        %(stream_code)s
+        //////// </ code generated by %(name)s>
+        """ % locals()
+
+
+class mrg_uniform(mrg_distribution):
+    #CPU VERSION
+
+    def sample(self, rstate, n_elements):
+        return _mrg_uniform_draws(rstate, n_elements,
+                                  self.output_type.dtype)
+
+    def c_code_stream(self, node, name, inputs, o_sample, sub):
+        otype, NORM = _mrg_norm(self.output_type.dtype)
+        omp_parallel = self._omp_parallel()
+        return """
+        // Each stream gives the samples i, i + n_streams, ... in the same
+        // order as with one thread, so the samples do not depend on the
+        // number of threads.
+        %(omp_parallel)s
+        for (npy_intp s = 0; s < n_streams; ++s)
         {
-            npy_int32 * state_data_i = state_data + (i%%n_streams)*6;
-            npy_int32 y1, y2, x11, x12, x13, x21, x22, x23;
+            npy_int32 * state_data_s = state_data + s * 6;
+            for (npy_intp i = s; i < n_elements; i += n_streams)
+            {
+                sample_data[i] = mrg_next(state_data_s) * %(NORM)s;
+            }
+        }
+        """ % locals()
+
 
-            x11 = state_data_i[0];
-            x12 = state_data_i[1];
-            x13 = state_data_i[2];
-            x21 = state_data_i[3];
-            x22 = state_data_i[4];
-            x23 = state_data_i[5];
-
-            y1 = ((x12 & MASK12) << i22) + (x12 >> i9) + ((x13 & MASK13) << i7) + (x13 >> i24);
-            if ((y1 < 0 || y1 >= M1))     //must also check overflow
-                y1 -= M1;
-            y1 += x13;
-            if ((y1 < 0 or y1 >= M1))
-                y1 -= M1;
-            x13 = x12;
-            x12 = x11;
-            x11 = y1;
-
-            y1 = ((x21 & MASK2) << i15) + (MULT2 * (x21 >> i16));
-            if (y1 < 0 || y1 >= M2)
-                y1 -= M2;
-            y2 = ((x23 & MASK2) << i15) + (MULT2 * (x23 >> i16));
-            if (y2 < 0 || y2 >= M2)
-                y2 -= M2;
-            y2 += x23;
-            if (y2 < 0 || y2 >= M2)
-                y2 -= M2;
-            y2 += y1;
-            if (y2 < 0 or y2 >= M2)
-                y2 -= M2;
-
-            x23 = x22;
-            x22 = x21;
-            x21 = y2;
-
-            if (x11 <= x21) {
-                assert((x11 - x21 + M1) <= M1);
-                sample_data[i] = (x11 - x21 + M1) * %(NORM)s;
+class mrg_normal(mrg_distribution):
+    """
+    Standard normal samples, computed with the Box-Muller transform of
+    the uniform samples of the streams.
+
+    The samples are the ones of MRG_RandomStreams.normal built from
+    mrg_uniform: an even number of uniform samples is drawn, the first
+    half gives the radii and the second half the angles.
+    """
+    def sample(self, rstate, n_elements):
+        dtype = self.output_type.dtype
+        n_draws = n_elements + n_elements % 2
+        u = _mrg_uniform_draws(rstate, n_draws, dtype)
+        u1 = u[:n_draws // 2]
+        u2 = u[n_draws // 2:]
+        r = numpy.sqrt(numpy.asarray(-2.0, dtype=dtype) * numpy.log(u1))
+        t = numpy.asarray(2.0 * numpy.pi, dtype=dtype) * u2
+        return numpy.concatenate([r * numpy.cos(t),
+                                  r * numpy.sin(t)])[:n_elements]
+
+    def c_code_stream(self, node, name, inputs, o_sample, sub):
+        otype, NORM = _mrg_norm(self.output_type.dtype)
+        omp_parallel = self._omp_parallel()
+        return """
+        {
+            // The uniform samples are drawn in the output. When the
+            // number of elements is odd, the last one is kept in `extra`.
+            const npy_intp n_draws = n_elements + n_elements %% 2;
+            const npy_intp half = n_draws / 2;
+            const %(otype)s minus_two = -2.0;
+            const %(otype)s two_pi = 2.0 * M_PI;
+            %(otype)s extra = 0;
+
+            %(omp_parallel)s
+            for (npy_intp s = 0; s < n_streams; ++s)
+            {
+                npy_int32 * state_data_s = state_data + s * 6;
+                for (npy_intp i = s; i < n_draws; i += n_streams)
+                {
+                    const %(otype)s u = mrg_next(state_data_s) * %(NORM)s;
+                    if (i < n_elements)
+                        sample_data[i] = u;
+                    else
+                        extra = u;
+                }
             }
-            else
+
+            %(omp_parallel)s
+            for (npy_intp j = 0; j < half; ++j)
             {
-                assert(x11 - x21 <= M1);
-                sample_data[i] = (x11 - x21) * %(NORM)s;
+                const %(otype)s u1 = sample_data[j];
+                const %(otype)s u2 = (j + half < n_elements) ? sample_data[j + half] : extra;
+                const %(otype)s r = sqrt(minus_two * log(u1));
+                const %(otype)s t = two_pi * u2;
+                sample_data[j] = r * cos(t);
+                if (j + half < n_elements)
+                    sample_data[j + half] = r * sin(t);
             }
+        }
+        """ % locals()
+
+
+class mrg_truncated_normal(mrg_distribution):
+    """
+    Standard normal samples truncated to [-2, 2].
 
-            state_data_i[0]= x11;
-            state_data_i[1]= x12;
-            state_data_i[2]= x13;
-            state_data_i[3]= x21;
-            state_data_i[4]= x22;
-            state_data_i[5]= x23;
+    Each sample comes from pairs of uniform samples of its own stream,
+    given to the Box-Muller transform until one of the two normal samples
+    is in the interval.
+    """
+    bound = 2.0
+
+    def sample(self, rstate, n_elements):
+        dtype = self.output_type.dtype
+        n_streams = rstate.shape[0]
+        bound = numpy.asarray(self.bound, dtype=dtype)
+        minus_two = numpy.asarray(-2.0, dtype=dtype)
+        two_pi = numpy.asarray(2.0 * numpy.pi, dtype=dtype)
+        rval = numpy.zeros(n_elements, dtype=dtype)
+        for s in xrange(min(n_streams, n_elements)):
+            for i in xrange(s, n_elements, n_streams):
+                while True:
+                    u1, u2 = numpy.asarray(
+                        [mrg_next_value(rstate[s], rstate[s]),
+                         mrg_next_value(rstate[s], rstate[s])], dtype=dtype)
+                    r = numpy.sqrt(minus_two * numpy.log(u1))
+                    t = two_pi * u2
+                    z = r * numpy.cos(t)
+                    if -bound <= z <= bound:
+                        break
+                    z = r * numpy.sin(t)
+                    if -bound <= z <= bound:
+                        break
+                rval[i] = z
+        return rval
+
+    def c_code_stream(self, node, name, inputs, o_sample, sub):
+        otype, NORM = _mrg_norm(self.output_type.dtype)
+        bound = self.bound
+        omp_parallel = self._omp_parallel()
+        return """
+        {
+            const %(otype)s bound = %(bound)s;
+            const %(otype)s minus_two = -2.0;
+            const %(otype)s two_pi = 2.0 * M_PI;
+
+            %(omp_parallel)s
+            for (npy_intp s = 0; s < n_streams; ++s)
+            {
+                npy_int32 * state_data_s = state_data + s * 6;
+                for (npy_intp i = s; i < n_elements; i += n_streams)
+                {
+                    %(otype)s z;
+                    while (1)
+                    {
+                        const %(otype)s u1 = mrg_next(state_data_s) * %(NORM)s;
+                        const %(otype)s u2 = mrg_next(state_data_s) * %(NORM)s;
+                        const %(otype)s r = sqrt(minus_two * log(u1));
+                        const %(otype)s t = two_pi * u2;
+                        z = r * cos(t);
+                        if (z >= -bound && z <= bound)
+                            break;
+                        z = r * sin(t);
+                        if (z >= -bound && z <= bound)
+                            break;
+                    }
+                    sample_data[i] = z;
+                }
+            }
         }
-        //////// </ code generated by mrg_uniform>
         """ % locals()
 
-    def c_code_cache_version(self):
-        return (2,)
+
+class mrg_bernoulli(mrg_distribution):
+    """
+    Samples equal to 1 with probability `p` and to 0 otherwise.
+
+    They are the ones of `uniform < p`, with uniform samples of type
+    `uniform_dtype` drawn by mrg_uniform.
+    """
+    def __init__(self, output_type, inplace=False, openmp=None,
+                 uniform_dtype=None):
+        mrg_distribution.__init__(self, output_type, inplace, openmp)
+        if uniform_dtype is None:
+            uniform_dtype = config.floatX
+        self.uniform_dtype = uniform_dtype
+
+    def __eq__(self, other):
+        return (mrg_distribution.__eq__(self, other) and
+                self.uniform_dtype == other.uniform_dtype)
+
+    def __hash__(self):
+        return mrg_distribution.__hash__(self) ^ hash(self.uniform_dtype)
+
+    def __str__(self):
+        if self.inplace:
+            s = "inplace"
+        else:
+            s = "no_inplace"
+        return self.__class__.__name__ + "{%s,%s,%s}" % (
+            self.output_type, self.uniform_dtype, s)
+
+    @classmethod
+    def new(cls, rstate, ndim, dtype, size, p, uniform_dtype):
+        v_size = as_tensor_variable(size)
+        if ndim is None:
+            ndim = get_vector_length(v_size)
+        op = cls(TensorType(dtype, (False,)*ndim),
+                 uniform_dtype=uniform_dtype)
+        return op(rstate, cast(v_size, 'int32'), p)
+
+    def make_node(self, rstate, size, p):
+        p = as_tensor_variable(p)
+        if p.ndim != 0:
+            raise TypeError("p must be a scalar", p)
+        return mrg_distribution.make_node(self, rstate, size, p)
+
+    def clone_inplace(self):
+        return self.__class__(self.output_type, inplace=True,
+                              openmp=self.openmp,
+                              uniform_dtype=self.uniform_dtype)
+
+    def sample(self, rstate, n_elements, p):
+        u = _mrg_uniform_draws(rstate, n_elements, self.uniform_dtype)
+        # Compare in double precision, as the C code.
+        return numpy.asarray(numpy.asarray(u, dtype='float64') < p,
+                             dtype=self.output_type.dtype)
+
+    def c_code_stream(self, node, name, inputs, o_sample, sub):
+        p, = inputs
+        utype, NORM = _mrg_norm(self.uniform_dtype)
+        omp_parallel = self._omp_parallel()
+        return """
+        if (PyArray_NDIM(%(p)s) != 0)
+        {
+            PyErr_SetString(PyExc_ValueError, "p must be a scalar");
+            %(fail)s
+        }
+        {
+            const double p = ((dtype_%(p)s*)PyArray_DATA(%(p)s))[0];
+
+            %(omp_parallel)s
+            for (npy_intp s = 0; s < n_streams; ++s)
+            {
+                npy_int32 * state_data_s = state_data + s * 6;
+                for (npy_intp i = s; i < n_elements; i += n_streams)
+                {
+                    const %(utype)s u = mrg_next(state_data_s) * %(NORM)s;
+                    sample_data[i] = ((double)u < p) ? 1 : 0;
+                }
+            }
+        }
+        """ % dict(locals(), **sub)
 
 
 class GPU_mrg_uniform(mrg_uniform_base, GpuOp):
@@ -1044,6 +1381,35 @@ def guess_n_streams(size, warn=True):
         return 60 * 256
 
 
+# The results of MRG_RandomStreams.get_substream_rstates, by seed and number
+# of streams, for the graphs that are built several times. Only the last
+# ones are kept.
+_substream_rstates_cache = {}
+_substream_rstates_cache_keys = []
+
+
+def _check_size(size):
+    """
+    Raise an error if `size` is not a valid size argument of the methods
+    of MRG_RandomStreams.
+    """
+    if isinstance(size, tuple):
+        msg = "size must be a tuple of int or a Theano variable"
+        assert all([isinstance(i, (numpy.integer, int, Variable))
+                    for i in size]), msg
+        if any([isinstance(i, (numpy.integer, int)) and i <= 0
+                for i in size]):
+            raise ValueError(
+                "The specified size contains a dimension with value <= 0",
+                size)
+
+    else:
+        if not (isinstance(size, Variable) and size.ndim == 1):
+            raise TypeError("size must be a tuple of int or a Theano "
+                            "Variable with 1 dimension, got " + str(size) +
+                            " of type " + str(type(size)))
+
+
 class MRG_RandomStreams(object):
     """Module component with similar interface to numpy.random (numpy.random.RandomState)"""
 
@@ -1098,30 +1464,21 @@ class MRG_RandomStreams(object):
     def get_substream_rstates(self, n_streams, inc_rstate=True):
         """Initialize a matrix in which each row is a MRG stream state,
         and they are spaced by 2**72 samples.
+
+        The states of the last seeds and numbers of streams are cached.
         """
         assert n_streams < 2**72
         assert n_streams > 0
-        rval = numpy.zeros((n_streams, 6), dtype='int32')
-        rval[0] = self.rstate
-
-        # If multMatVect.dot_modulo isn't compiled, compile it.
-        if multMatVect.dot_modulo is None:
-            multMatVect(rval[0], A1p72, M1, A2p72, M2)
-
-        # This way of calling the Theano fct is done to bypass Theano overhead.
-        f = multMatVect.dot_modulo
-        f.input_storage[0].storage[0] = A1p72
-        f.input_storage[2].storage[0] = M1
-        f.input_storage[3].storage[0] = A2p72
-        f.input_storage[5].storage[0] = M2
-        for i in xrange(1, n_streams):
-            # Inline the following call to bypass Python overhead
-            #rval[i] = ff_2p72(rval[i - 1])
-            v = rval[i - 1]
-            f.input_storage[1].storage[0] = v[:3]
-            f.input_storage[4].storage[0] = v[3:]
-            f.fn()
-            rval[i] = f.output_storage[0].storage[0]
+        key = (tuple(self.rstate), n_streams)
+        rval = _substream_rstates_cache.get(key)
+        if rval is None:
+            rval = substream_rstates(self.rstate, n_streams)
+            if len(_substream_rstates_cache) >= 32:
+                del _substream_rstates_cache[
+                    _substream_rstates_cache_keys.pop(0)]
+            _substream_rstates_cache[key] = rval
+            _substream_rstates_cache_keys.append(key)
+        rval = rval.copy()
 
         if inc_rstate:
             self.inc_rstate()
@@ -1175,21 +1532,7 @@ class MRG_RandomStreams(object):
         low = cast(low, dtype=dtype)
         high = cast(high, dtype=dtype)
 
-        if isinstance(size, tuple):
-            msg = "size must be a tuple of int or a Theano variable"
-            assert all([isinstance(i, (numpy.integer, int, Variable))
-                        for i in size]), msg
-            if any([isinstance(i, (numpy.integer, int)) and i <= 0
-                    for i in size]):
-                raise ValueError(
-                    "The specified size contains a dimension with value <= 0",
-                    size)
-
-        else:
-            if not (isinstance(size, Variable) and size.ndim == 1):
-                raise TypeError("size must be a tuple of int or a Theano "
-                                "Variable with 1 dimension, got " + str(size) +
-                                " of type " + str(type(size)))
+        _check_size(size)
 
         if nstreams is None:
             nstreams = self.n_streams(size)
@@ -1234,9 +1577,23 @@ class MRG_RandomStreams(object):
                  nstreams=None):
         if n == 1:
             if dtype == 'float32' and self.use_cuda:
-                x = self.uniform(size=size, dtype=dtype, nstreams=nstreams)
+                uniform_dtype = dtype
             else:
-                x = self.uniform(size=size, nstreams=nstreams)
+                uniform_dtype = config.floatX
+            p = as_tensor_variable(p)
+            if p.ndim == 0 and not (self.use_cuda and
+                                    uniform_dtype == 'float32'):
+                # Compare the uniform samples to p as they are drawn.
+                _check_size(size)
+                if nstreams is None:
+                    nstreams = self.n_streams(size)
+                node_rstate = shared(self.get_substream_rstates(nstreams))
+                return self.pretty_return(
+                    node_rstate,
+                    *mrg_bernoulli.new(node_rstate, ndim, dtype, size, p,
+                                       uniform_dtype))
+            x = self.uniform(size=size, dtype=uniform_dtype,
+                             nstreams=nstreams)
             return cast(x < p, dtype)
         else:
             raise NotImplementedError("MRG_RandomStreams.binomial with n > 1")
@@ -1331,6 +1688,23 @@ class MRG_RandomStreams(object):
         else:
             #if even, don't change, if odd, +1
             n_samples = prod(size) + (prod(size) % 2)
+
+        if not (self.use_cuda and dtype == 'float32'):
+            # mrg_normal draws the same uniform samples as the graph
+            # below, and transforms them as they are drawn.
+            _check_size((n_samples,))
+            if nstreams is None:
+                nstreams = self.n_streams((n_samples,))
+            node_rstate = shared(self.get_substream_rstates(nstreams))
+            if not size:
+                size = tensor.constant(size, dtype='int64')
+            final_samples = self.pretty_return(
+                node_rstate,
+                *mrg_normal.new(node_rstate, ndim, dtype, size))
+            final_samples = avg + std * final_samples
+            assert final_samples.dtype == dtype
+            return final_samples
+
         flattened = self.uniform(size=(n_samples,), dtype=dtype,
                                  nstreams=nstreams)
 
@@ -1371,6 +1745,52 @@ class MRG_RandomStreams(object):
         assert final_samples.dtype == dtype
         return final_samples
 
+    def truncated_normal(self, size, avg=0.0, std=1.0, ndim=None,
+                         dtype=None, nstreams=None):
+        """
+        Sample a tensor of given size from a normal distribution of mean
+        `avg` and standard deviation `std`, truncated to the values at
+        most 2 standard deviations away from the mean.
+
+        :param size:
+          Can be a list of integers or Theano variables (ex: the shape
+          of another Theano Variable)
+
+        :param dtype:
+          The output data type. If dtype is not specified, it will be
+          inferred from the dtype of avg and std, but will be at
+          least as precise as floatX.
+
+        :param nstreams:
+          Number of streams.
+
+        .. note::
+            The samples are always computed on the CPU.
+
+        """
+        avg = as_tensor_variable(avg)
+        std = as_tensor_variable(std)
+
+        if dtype is None:
+            dtype = scal.upcast(config.floatX, avg.dtype, std.dtype)
+
+        avg = cast(avg, dtype)
+        std = cast(std, dtype)
+
+        _check_size(size)
+        if nstreams is None:
+            nstreams = self.n_streams(size)
+        node_rstate = shared(self.get_substream_rstates(nstreams))
+        if not size:
+            size = tensor.constant(size, dtype='int64')
+        samples = self.pretty_return(
+            node_rstate,
+            *mrg_truncated_normal.new(node_rstate, ndim, dtype, size))
+        samples = avg + std * samples
+
+        assert samples.dtype == dtype
+        return samples
+
 from theano.sandbox.gpuarray.opt import (register_opt as register_gpua,
                                          host_from_gpu as host_from_gpua)
 
@@ -1386,13 +1806,14 @@ def local_gpua_mrg(node):
         return [outs[0], host_from_gpua(outs[1])]
 
 
-MRG_RNGs = (mrg_uniform, GPU_mrg_uniform, GPUA_mrg_uniform)
+MRG_RNGs = (mrg_uniform, GPU_mrg_uniform, GPUA_mrg_uniform,
+            mrg_normal, mrg_truncated_normal, mrg_bernoulli)
 @local_optimizer(MRG_RNGs)
 def mrg_random_make_inplace(node):
     op = node.op
     if isinstance(op, MRG_RNGs) and not op.inplace:
         # op might be gpu version
-        new_op = op.__class__(op.output_type, inplace=True)
+        new_op = op.clone_inplace()
         return new_op.make_node(*node.inputs).outputs
     return False
 optdb.register('random_make_inplace_mrg',
@@ -0,0 +1,72 @@
+"""
+Compare the throughput of the CPU MRG31k3p samplers with and without
+openmp. The number of threads is set with OMP_NUM_THREADS.
+"""
+from optparse import OptionParser
+import sys
+import time
+
+import numpy
+
+import theano
+from theano import tensor
+from theano.sandbox import rng_mrg
+from theano.sandbox.rng_mrg import MRG_RandomStreams
+
+parser = OptionParser(usage='%prog <options>\n Compute the throughput of'
+                      ' the CPU MRG samplers with and without openmp')
+parser.add_option('-N', '--N', action='store', dest='N',
+                  default=10 ** 7, type="int",
+                  help="Number of samples")
+parser.add_option('--nstreams', action='store', dest='nstreams',
+                  default=None, type="int",
+                  help="Number of streams, guessed from N by default")
+parser.add_option('--loops', action='store', dest='loops',
+                  default=10, type="int",
+                  help="Number of calls, the best time is kept")
+
+
+def evalTime(f, loops):
+    best = 1e10
+    for i in xrange(loops):
+        t0 = time.time()
+        f()
+        best = min(best, time.time() - t0)
+    return best
+
+
+def samplerTimes(N, nstreams, loops, openmp):
+    rng = MRG_RandomStreams(1234)
+    rstate = theano.shared(rng.get_substream_rstates(nstreams))
+    size = tensor.as_tensor_variable(numpy.asarray([N], dtype='int32'))
+    p = tensor.constant(numpy.asarray(0.3, dtype=theano.config.floatX))
+    times = []
+    for name, op, inputs in [
+        ('mrg_uniform', rng_mrg.mrg_uniform, []),
+        ('mrg_normal', rng_mrg.mrg_normal, []),
+        ('mrg_truncated_normal', rng_mrg.mrg_truncated_normal, []),
+        ('mrg_bernoulli', rng_mrg.mrg_bernoulli, [p])]:
+        out_type = tensor.TensorType(theano.config.floatX, (False,))
+        new_rstate, sample = op(out_type, openmp=openmp)(
+            rstate, size, *inputs)
+        f = theano.function([], [], updates=[(rstate, new_rstate)])
+        times.append((name, evalTime(f, loops)))
+    return times
+
+if __name__ == '__main__':
+    options, arguments = parser.parse_args(sys.argv)
+    nstreams = options.nstreams
+    if nstreams is None:
+        nstreams = rng_mrg.guess_n_streams((options.N,), warn=False)
+    theano.config.openmp_mrg_minsize = 0
+    times = samplerTimes(options.N, nstreams, options.loops, openmp=False)
+    times_omp = samplerTimes(options.N, nstreams, options.loops,
+                             openmp=True)
+    print "%d samples from %d streams" % (options.N, nstreams)
+    for (name, t), (_, t_omp) in zip(times, times_omp):
+        if t > t_omp:
+            speed = "speedup %2.2f" % (t / t_omp)
+        else:
+            speed = "slowdown %2.2f" % (t_omp / t)
+        print "%-20s without openmp %.1fM/s with openmp %.1fM/s %s" % (
+            name, options.N / t / 1e6, options.N / t_omp / 1e6, speed)
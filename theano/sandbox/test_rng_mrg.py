@@ -942,6 +942,107 @@ def test_multMatVect():
     assert numpy.allclose(r_a2, r_b[3:])
 
 
+def test_substream_rstates():
+    # The substreams computed by doubling are the ones computed one after
+    # the other, and the cached states are not shared.
+    rng = MRG_RandomStreams(numpy.random.randint(1, 2147462579))
+    rstate = rng.rstate.copy()
+    rstates = rng.get_substream_rstates(37)
+    assert rstates.dtype == 'int32'
+    assert not numpy.all(rng.rstate == rstate)
+
+    expected = [rstate]
+    for i in range(36):
+        expected.append(rng_mrg.ff_2p72(expected[-1]))
+    assert numpy.all(rstates == numpy.asarray(expected))
+
+    rng.rstate = rstate
+    rstates[0] = 0
+    assert numpy.all(rng.get_substream_rstates(37) == expected)
+    assert numpy.all(rng_mrg.matMatModM(
+        rng_mrg.A1p72, rng_mrg.A1p72, int(rng_mrg.M1)) ==
+        rng_mrg.substream_jump(1)[0])
+
+
+def test_fused_samplers():
+    # The fused CPU samplers give the samples of the graphs built from
+    # mrg_uniform, in C and in python, with and without openmp.
+    py_mode = theano.compile.Mode(linker='py', optimizer='fast_run')
+    for dtype in ['float32', 'float64']:
+        for size in [(), (1,), (7,), (10, 5)]:
+            n_elements = int(numpy.prod(size))
+            n_samples = n_elements + n_elements % 2
+            R = MRG_RandomStreams(234, use_cuda=False)
+            u = R.uniform((n_samples,), dtype=dtype, nstreams=3)
+            r = tensor.sqrt(-2.0 * tensor.log(u[:n_samples // 2]))
+            t = numpy.array(2.0 * numpy.pi, dtype=dtype) * u[n_samples // 2:]
+            normal = tensor.join(0, r * tensor.cos(t), r * tensor.sin(t))
+            u = R.uniform((max(n_elements, 1),), nstreams=3)
+            expected = theano.function([], [normal[:n_elements],
+                                            tensor.cast(u < 0.3, 'int8')])()
+
+            for openmp in [False, True]:
+                for f_mode in [mode, py_mode]:
+                    R = MRG_RandomStreams(234, use_cuda=False)
+                    outs = [R.normal(size, dtype=dtype, nstreams=3),
+                            R.binomial(size, p=0.3, dtype='int8',
+                                       nstreams=3)]
+                    f = theano.function([], outs, mode=f_mode)
+                    nodes = f.maker.fgraph.toposort()
+                    assert any([isinstance(node.op, rng_mrg.mrg_normal)
+                                for node in nodes])
+                    assert any([isinstance(node.op, rng_mrg.mrg_bernoulli)
+                                for node in nodes])
+                    for node in nodes:
+                        if isinstance(node.op, rng_mrg.mrg_distribution):
+                            node.op.openmp = openmp
+                    normal_val, bernoulli_val = f()
+                    utt.assert_allclose(normal_val.flatten(), expected[0])
+                    assert numpy.all(bernoulli_val.flatten() == expected[1])
+
+
+def test_uniform_openmp():
+    # The samples do not depend on the use of openmp.
+    rstate = MRG_RandomStreams(234).get_substream_rstates(7)
+    rstate = tensor.constant(rstate)
+    size = tensor.constant(numpy.asarray([1001, 3], dtype='int32'))
+    orig_minsize = config.openmp_mrg_minsize
+    try:
+        config.openmp_mrg_minsize = 0
+        outs = []
+        for openmp in [False, True]:
+            op = rng_mrg.mrg_uniform(tensor.TensorType(config.floatX,
+                                                       (False, False)),
+                                     openmp=openmp)
+            f = theano.function([], op(rstate, size), mode=mode)
+            outs.append(f())
+        assert numpy.all(outs[0][0] == outs[1][0])
+        assert numpy.all(outs[0][1] == outs[1][1])
+    finally:
+        config.openmp_mrg_minsize = orig_minsize
+
+def test_truncated_normal():
+    x = tensor.matrix()
+    py_mode = theano.compile.Mode(linker='py', optimizer='fast_run')
+    for size, input in [((100, 50), []),
+                        (x.shape, [numpy.zeros((99, 50),
+                                               dtype=config.floatX)])]:
+        outs = []
+        for f_mode in [mode, py_mode]:
+            R = MRG_RandomStreams(234, use_cuda=False)
+            n = R.truncated_normal(size, avg=-5., std=2., nstreams=60)
+            f = theano.function([x], n, on_unused_input='ignore',
+                                mode=f_mode)
+            outs.append(f(*(input or [numpy.zeros((1, 1),
+                                                  dtype=config.floatX)])))
+        out = outs[0]
+        assert out.dtype == config.floatX
+        assert numpy.all(out >= -9.) and numpy.all(out <= -1.)
+        assert abs(out.mean() + 5.) < 0.05
+        # The std of a normal truncated to 2 std is 0.88 std.
+        assert abs(out.std() - 1.76) < 0.05
+        utt.assert_allclose(out, outs[1])
+
 if __name__ == "__main__":
     rng = MRG_RandomStreams(numpy.random.randint(2147462579))
     import time
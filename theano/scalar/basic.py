@@ -3191,8 +3191,10 @@ class Composite(ScalarOp):
     def impl(self, *inputs):
         output_storage = [[None] for i in xrange(self.nout)]
         self.perform(None, inputs, output_storage)
-        return utils.to_return_values([storage[0] for storage in
-                                       output_storage])
+        # Return a tuple, as numpy.frompyfunc (used by Elemwise.perform)
+        # requires one when there are many outputs.
+        return utils.to_return_values(tuple([storage[0] for storage in
+                                             output_storage]))
 
     def grad(self, inputs, output_grads):
         raise NotImplementedError("grad is not implemented for Composite")
@@ -44,6 +44,7 @@ __contact__ = "Razvan Pascanu <r.pascanu@gmail>"
 
 import itertools
 import logging
+import multiprocessing
 import numpy
 
 from theano.compile import SharedVariable, function
@@ -75,7 +76,9 @@ def scan(fn,
          mode=None,
          name=None,
          profile=False,
-         allow_gc=None):
+         allow_gc=None,
+         unroll=1,
+         n_jobs=1):
     """
     This function constructs and applies a Scan op to the provided
     arguments.
@@ -314,6 +317,31 @@ def scan(fn,
         Set the value of allow gc for the internal graph of scan.  If
         set to None, this will use the value of config.scan.allow_gc.
 
+    :param unroll:
+        Number of consecutive steps computed by each iteration of the
+        loop. ``fn`` is called ``unroll`` times in a row to build the
+        inner graph, so the per-iteration overhead of scan is paid once
+        every ``unroll`` steps and the graph optimizations (e.g. the
+        elemwise fusion) can work across consecutive steps. When the
+        number of steps is not a multiple of ``unroll``, the last
+        iteration computes a few extra steps on a copy of the last
+        element of the sequences, and their results are dropped. Only
+        sequences with a tap of 0 and outputs with a tap of -1 are
+        supported, and ``fn`` can not return updates or a stopping
+        condition.
+
+    :param n_jobs:
+        Number of threads computing the steps of the loop, -1 meaning one
+        per processor. Only scans without outputs fed back to ``fn``
+        (like ``map``), without updates and without a stopping condition
+        can use more than one thread. The steps are split in contiguous
+        blocks, one per thread, each running its own copy of the inner
+        function and writing its results in its own part of the outputs,
+        so the outputs are the same as with one thread. The threads only
+        run at the same time while an op of the inner function releases
+        the GIL, like the BLAS calls of the dot products or the numpy
+        functions used by the python implementations of ops.
+
     :rtype: tuple
     :return: tuple of the form (outputs, updates); ``outputs`` is either a
              Theano variable or a list of Theano variables representing the
@@ -430,6 +458,17 @@ def scan(fn,
             # with an empty OrdereDict() to simplify handling
             outs_info[i] = OrderedDict()
 
+    if n_jobs == -1:
+        n_jobs = multiprocessing.cpu_count()
+    elif n_jobs != int(n_jobs) or n_jobs < 1:
+        raise ValueError('n_jobs must be a positive integer or -1', n_jobs)
+    n_jobs = int(n_jobs)
+
+    if unroll != 1 and n_fixed_steps not in [1, -1]:
+        return _scan_unrolled(fn, seqs, outs_info, non_seqs, n_steps,
+                              unroll, truncate_gradient, go_backwards,
+                              mode, name, profile, allow_gc, n_jobs)
+
     ##
     ###   Step 2. Generate inputs and outputs of the inner functions
     ###           for compiling a dummy function (Iteration #1)
@@ -988,6 +1027,13 @@ def scan(fn,
     info['as_while'] = as_while
     info['profile'] = profile
     info['allow_gc'] = allow_gc
+    if n_jobs > 1:
+        if n_mit_mot + n_mit_sot + n_sit_sot + n_shared_outs > 0 or as_while:
+            raise ValueError(
+                'scan can only use several threads (n_jobs > 1) when no '
+                'output is fed back to fn and fn returns neither updates '
+                'nor a stopping condition')
+    info['n_jobs'] = n_jobs
 
     local_op = scan_op.Scan(inner_inputs, new_outs, info)
 
@@ -1088,3 +1134,137 @@ def scan(fn,
     elif len(scan_out_list) == 0:
         scan_out_list = None
     return (scan_out_list, update_map)
+
+
+def _scan_unrolled(fn, seqs, outs_info, non_seqs, n_steps, unroll,
+                   truncate_gradient, go_backwards, mode, name, profile,
+                   allow_gc, n_jobs):
+    """
+    Implement ``scan(..., unroll=unroll)``.
+
+    `seqs` and `outs_info` are the lists of dictionaries built by `scan`.
+    A scan over blocks of `unroll` steps is built, whose inner function
+    calls `fn` `unroll` times. The sequences are padded by repeating their
+    last element up to a multiple of `unroll` steps, as scan can not run
+    0 iterations for a remainder loop; the steps computed on the padding
+    come after all the real steps and are dropped from the outputs.
+
+    The name of the scan over the blocks starts with 'unrolled_', which
+    tells the scan_unroll optimization not to unroll it again.
+    """
+    if unroll != int(unroll) or unroll < 1:
+        raise ValueError('unroll must be a positive integer', unroll)
+    unroll = int(unroll)
+    if truncate_gradient != -1 or go_backwards:
+        raise NotImplementedError(
+            'scan with unroll > 1 does not support truncate_gradient '
+            'and go_backwards')
+    for seq in seqs:
+        if seq['taps'] != [0]:
+            raise NotImplementedError(
+                'scan with unroll > 1 only supports sequences with a '
+                'tap of 0', seq['taps'])
+    for out in outs_info:
+        if out and out['taps'] != [-1]:
+            raise NotImplementedError(
+                'scan with unroll > 1 only supports outputs with a '
+                'tap of -1', out['taps'])
+
+    sequences = [tensor.as_tensor_variable(seq['input']) for seq in seqs]
+    has_state = [bool(out) for out in outs_info]
+    initial = [tensor.as_tensor_variable(out['initial'])
+               for out in outs_info if out]
+
+    if n_steps is None:
+        if not sequences:
+            raise ValueError('No information about the number of steps '
+                             'provided. Either provide a value for '
+                             'n_steps argument of scan or provide an input '
+                             'sequence')
+        n_steps = sequences[0].shape[0]
+        for seq in sequences[1:]:
+            n_steps = tensor.minimum(n_steps, seq.shape[0])
+    n_steps = tensor.as_tensor_variable(n_steps)
+    n_blocks = (n_steps + unroll - 1) // unroll
+    n_pad = n_blocks * unroll - n_steps
+
+    # Split every sequence into `unroll` sequences over the blocks, the
+    # j-th one holding the j-th step of every block.
+    block_seqs = []
+    for seq in sequences:
+        seq = seq[:n_steps]
+        pad = tensor.alloc(seq[-1], n_pad,
+                           *[seq.shape[i] for i in range(1, seq.ndim)])
+        seq = tensor.join(0, seq, pad)
+        seq = seq.reshape([n_blocks, unroll] +
+                          [seq.shape[i] for i in range(1, seq.ndim)],
+                          ndim=seq.ndim + 1)
+        block_seqs.extend(seq[:, j] for j in xrange(unroll))
+
+    n_seqs = len(sequences)
+    n_states = len(initial)
+    n_outs = len(outs_info)
+
+    def block_step(*args):
+        i_seqs = args[:n_seqs * unroll]
+        states = list(args[n_seqs * unroll:n_seqs * unroll + n_states])
+        i_non_seqs = list(args[n_seqs * unroll + n_states:])
+        steps = []
+        for j in xrange(unroll):
+            condition, outputs, updates = \
+                scan_utils.get_updates_and_outputs(
+                    fn(*(list(i_seqs[j::unroll]) + states + i_non_seqs)))
+            if condition is not None or updates:
+                raise NotImplementedError(
+                    'scan with unroll > 1 does not support fn returning '
+                    'updates or a stopping condition')
+            if len(outputs) != n_outs:
+                raise ValueError(
+                    'Please provide None as outputs_info for any output '
+                    'that does not feed back into scan (i.e. it behaves '
+                    'like a map) ')
+            states = [out for out, state in zip(outputs, has_state)
+                      if state]
+            steps.extend(outputs)
+        return steps
+
+    # Only the states computed by the last step of a block feed back into
+    # the loop, the outputs of the other steps are nit_sot.
+    initial_of = iter(initial)
+    last_step_info = [next(initial_of) if state else None
+                      for state in has_state]
+    results, _ = scan(block_step,
+                      sequences=block_seqs,
+                      outputs_info=([None] * (n_outs * (unroll - 1)) +
+                                    last_step_info),
+                      non_sequences=non_seqs,
+                      n_steps=n_blocks,
+                      mode=mode,
+                      name='unrolled_%s' % (name or 'scan_fn'),
+                      profile=profile,
+                      allow_gc=allow_gc,
+                      n_jobs=n_jobs)
+    if not isinstance(results, list):
+        results = [results]
+
+    scan_out_list = []
+    for k in xrange(n_outs):
+        # Interleave the steps of the blocks: (n_blocks, unroll, ...)
+        out = tensor.stack(*results[k::n_outs])
+        out = out.dimshuffle([1, 0] + range(2, out.ndim))
+        # The shape of a state is the one of its initial value. Taking it
+        # from there rather than from the scan outputs keeps the shape
+        # graph from holding on the scan node once it gets optimized.
+        if has_state[k]:
+            shape = last_step_info[k].shape
+        else:
+            shape = out.shape[2:]
+        out = out.reshape([n_blocks * unroll] +
+                          [shape[i] for i in range(out.ndim - 2)],
+                          ndim=out.ndim - 1)
+        scan_out_list.append(out[:n_steps])
+    if len(scan_out_list) == 1:
+        scan_out_list = scan_out_list[0]
+    elif len(scan_out_list) == 0:
+        scan_out_list = None
+    return (scan_out_list, OrderedUpdates())
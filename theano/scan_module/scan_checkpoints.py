@@ -0,0 +1,173 @@
+"""
+This module provides ``scan_checkpoints``, a memory-bounded variant of
+``scan`` for long recurrences.
+
+See scan.py for details on scan
+"""
+
+__docformat__ = 'restructedtext en'
+__copyright__ = "(c) 2010, Universite de Montreal"
+
+
+import logging
+
+from theano import tensor
+from theano.scan_module.scan import scan
+
+# Logging function for sending warning or info
+_logger = logging.getLogger('theano.scan_module.scan_checkpoints')
+
+
+def scan_checkpoints(fn,
+                     sequences=None,
+                     outputs_info=None,
+                     non_sequences=None,
+                     n_steps=None,
+                     save_every_N=None,
+                     mode=None,
+                     name=None):
+    """
+    Scan function that uses less memory for the gradient, at the cost of
+    recomputing the forward pass.
+
+    The recurrence is split into segments of ``save_every_N`` steps. An
+    outer scan iterates over the segments and, for every segment, runs an
+    inner scan over its ``save_every_N`` steps, keeping only the state
+    reached at the end of the segment. The gradient of the outer scan
+    therefore only stores the states at the segment boundaries, and the
+    gradient of each inner scan recomputes the states of its segment
+    while going backward. For ``T`` steps this keeps
+    ``O(T / save_every_N + save_every_N)`` states in memory instead of
+    ``O(T)``, for roughly one extra forward pass. The default
+    ``save_every_N`` of ``ceil(sqrt(T))`` minimizes that bound.
+
+    Contrary to ``scan``, the returned outputs only hold the state at the
+    end of every segment; the final state of the recurrence is
+    ``outputs[-1]``.
+
+    :param fn: See ``scan``. ``fn`` may only return outputs whose
+        ``outputs_info`` is a tensor variable (i.e. a single tap of -1).
+
+    :param sequences: List of sequences over which the recurrence iterates
+        (see ``scan``). Only a tap of 0 is supported. When the number of
+        steps is not a multiple of ``save_every_N``, the sequences are
+        padded with zeros, which ``fn`` never sees.
+
+    :param outputs_info: List of initial states, one per output of ``fn``
+        (see ``scan``). Dictionaries with taps and ``None`` entries are not
+        supported.
+
+    :param non_sequences: See ``scan``.
+
+    :param n_steps: See ``scan``. Defaults to the length of the first
+        sequence.
+
+    :param save_every_N: Number of steps between two saved states. Can be
+        a python int or a symbolic integer scalar. Defaults to
+        ``ceil(sqrt(n_steps))``.
+
+    :param mode: See ``scan``.
+
+    :param name: See ``scan``.
+
+    :rtype: tuple
+    :return: a tuple of the form (outputs, updates), as for ``scan``.
+    """
+    def wrap_into_list(x):
+        if x is None:
+            return []
+        elif not isinstance(x, (list, tuple)):
+            return [x]
+        else:
+            return list(x)
+
+    seqs = wrap_into_list(sequences)
+    outs_info = wrap_into_list(outputs_info)
+    non_seqs = wrap_into_list(non_sequences)
+
+    for seq in seqs:
+        if isinstance(seq, dict):
+            raise NotImplementedError(
+                'scan_checkpoints only supports sequences with a tap of 0')
+    for out in outs_info:
+        if out is None or isinstance(out, dict):
+            raise NotImplementedError(
+                'scan_checkpoints requires one initial state, with a tap '
+                'of -1, for every output')
+
+    seqs = [tensor.as_tensor_variable(s) for s in seqs]
+    outs_info = [tensor.as_tensor_variable(o) for o in outs_info]
+    non_seqs = [tensor.as_tensor_variable(x) for x in non_seqs]
+
+    if n_steps is None:
+        if not seqs:
+            raise ValueError('scan_checkpoints needs either sequences or '
+                             'n_steps to know the number of steps')
+        n_steps = seqs[0].shape[0]
+    n_steps = tensor.as_tensor_variable(n_steps)
+    # Sequences longer than the requested number of steps are cut, as
+    # scan would do.
+    seqs = [s[:n_steps] for s in seqs]
+
+    if save_every_N is None:
+        save_every_N = tensor.cast(
+            tensor.ceil(tensor.sqrt(tensor.cast(n_steps, 'float64'))),
+            'int64')
+    save_every_N = tensor.maximum(
+        tensor.as_tensor_variable(save_every_N), 1)
+
+    n_segments = (n_steps + save_every_N - 1) // save_every_N
+    n_pad = n_segments * save_every_N - n_steps
+
+    # Pad and reshape every sequence to (n_segments, save_every_N, ...)
+    o_sequences = []
+    for s in seqs:
+        pad = tensor.zeros([n_pad] + [s.shape[i] for i in range(1, s.ndim)],
+                           dtype=s.dtype)
+        s = tensor.join(0, s, pad)
+        o_sequences.append(
+            s.reshape([n_segments, save_every_N] +
+                      [s.shape[i] for i in range(1, s.ndim)],
+                      ndim=s.ndim + 1))
+    # Number of steps of every segment; only the last one can be shorter
+    segment_steps = tensor.set_subtensor(
+        tensor.alloc(save_every_N, n_segments)[-1],
+        n_steps - (n_segments - 1) * save_every_N)
+    o_sequences.append(segment_steps)
+
+    n_seqs = len(seqs)
+    n_outs = len(outs_info)
+    if name is None:
+        inner_name = 'scan_checkpoints_inner'
+    else:
+        inner_name = name + '_inner'
+
+    def outer_step(*args):
+        i_sequences = list(args[:n_seqs])
+        i_n_steps = args[n_seqs]
+        i_prev_outputs = list(args[n_seqs + 1:n_seqs + 1 + n_outs])
+        i_non_sequences = list(args[n_seqs + 1 + n_outs:])
+
+        results, updates = scan(fn=fn,
+                                sequences=i_sequences,
+                                outputs_info=i_prev_outputs,
+                                non_sequences=i_non_sequences,
+                                n_steps=i_n_steps,
+                                mode=mode,
+                                name=inner_name)
+        results = wrap_into_list(results)
+        if len(results) != n_outs:
+            raise ValueError(
+                'scan_checkpoints expects fn to return one output per '
+                'initial state given in outputs_info (%d), got %d' %
+                (n_outs, len(results)))
+        # Keep only the last step of every output, but all the updates
+        return [r[-1] for r in results], updates
+
+    results, updates = scan(fn=outer_step,
+                            sequences=o_sequences,
+                            outputs_info=outs_info,
+                            non_sequences=non_seqs,
+                            mode=mode,
+                            name=name)
+    return results, updates
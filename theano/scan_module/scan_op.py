@@ -12,9 +12,13 @@ __authors__ = ("Razvan Pascanu "
 __copyright__ = "(c) 2010, Universite de Montreal"
 __contact__ = "Razvan Pascanu <r.pascanu@gmail>"
 
+import copy
 import itertools
 import logging
+import sys
+import threading
 import time
+import weakref
 from itertools import izip
 
 import numpy
@@ -37,12 +41,58 @@ from theano.scan_module.scan_utils import safe_new, forced_replace
 _logger = logging.getLogger('theano.scan_module.scan_op')
 
 
-from theano.configparser import AddConfigVar, BoolParam
+from theano.configparser import AddConfigVar, BoolParam, IntParam
 
 AddConfigVar('scan.allow_gc',
              "Allow/disallow gc inside of Scan (default: config.allow_gc)",
              BoolParam(lambda: config.allow_gc))
 
+AddConfigVar('scan.unroll',
+             "Number of steps computed by each iteration of the scans "
+             "unrolled by the scan_unroll optimization",
+             IntParam(4, lambda i: i >= 1),
+             in_c_key=False)
+
+AddConfigVar('scan.allow_output_prealloc',
+             "Allow the inner function of Scan to compute its outputs in "
+             "place, in the output buffers of Scan",
+             BoolParam(True),
+             in_c_key=False)
+
+AddConfigVar('scan.inner_fn_cache_size',
+             "Number of Scan ops whose compiled inner function can be "
+             "copied by the Scan ops computing the same inner graph with "
+             "the same mode, while they are alive (0 disables this cache)",
+             IntParam(100, lambda i: i >= 0),
+             in_c_key=False)
+
+AddConfigVar('scan.keep_buffers',
+             "Keep the output buffers of a Scan node between the calls of "
+             "the function, instead of letting the garbage collection of "
+             "the function free them, when their shape does not change",
+             BoolParam(True),
+             in_c_key=False)
+
+
+# Ops whose inner function can be copied by Scan.make_thunk, as
+# (key, weak reference to the op) entries where the key holds the hash of
+# the inner graph and the compilation settings. The least recently used
+# ones come first. Only the ops hold their inner function, so it is freed
+# with them. This is not a dictionary indexed by the ops as their hash
+# changes when their info is updated.
+_inner_fn_cache = []
+
+
+def _nbytes(value):
+    """
+    Number of bytes of `value`, which can also be a CudaNdarray.
+    """
+    try:
+        return value.nbytes
+    except AttributeError:
+        return (int(numpy.prod(value.shape)) *
+                numpy.dtype(value.dtype).itemsize)
+
 
 class Scan(PureOp):
     def __init__(self,
@@ -76,6 +126,8 @@ class Scan(PureOp):
         """
         if 'gpua' not in info:
             info['gpua'] = False
+        if 'n_jobs' not in info:
+            info['n_jobs'] = 1
         # adding properties into self
         self.inputs = inputs
         self.outputs = outputs
@@ -458,7 +510,7 @@ class Scan(PureOp):
                          'as_while', 'n_mit_sot', 'destroy_map',
                          'n_nit_sot', 'n_shared_outs',
                          'n_sit_sot', 'gpu', 'gpua', 'n_mit_mot_outs',
-                         'n_mit_mot', 'mit_mot_out_slices']
+                         'n_mit_mot', 'mit_mot_out_slices', 'n_jobs']
         # This are some safety checks ( namely that the inner graph has the
         # same number of inputs and same number of outputs )
         if not len(self.inputs) == len(other.inputs):
@@ -553,9 +605,20 @@ class Scan(PureOp):
                   self.n_mit_sot +
                   self.n_sit_sot +
                   self.n_nit_sot)
-        wrapped_inputs = [Param(x, borrow=True) for x in self.inputs]
-        wrapped_outputs = [Out(x, borrow=False) for x in
-                           self.outputs[:slices]]
+        # The inputs holding the previous steps of the states are views
+        # of the output buffers of scan, which can be overwritten before
+        # an output is copied. They are not borrowed, so that the outputs
+        # that are views of them (even after the optimizations) are copied
+        # by the inner function.
+        n_taps = sum(len(taps) for taps in self.tap_array)
+        wrapped_inputs = [
+            Param(x, borrow=not (self.n_seqs <= idx < self.n_seqs + n_taps))
+            for idx, x in enumerate(self.inputs)]
+        # When the outputs are borrowed, the inner function can compute
+        # them in place, in the output buffers of scan given in its
+        # output_storage. They are copied right after each step if needed.
+        wrapped_outputs = [Out(x, borrow=config.scan.allow_output_prealloc)
+                           for x in self.outputs[:slices]]
         wrapped_outputs += self.outputs[slices:]
         profile = None
         if (theano.config.profile or
@@ -570,12 +633,8 @@ class Scan(PureOp):
         # make_thunk can be called many times on the same op
         # we do not want to recompile the inner fct every time.
         if not getattr(self, 'fn', None):
-            self.fn = function(wrapped_inputs,
-                               wrapped_outputs,
-                               mode=self.mode_instance,
-                               name=self.name,
-                               profile=profile,
-                               on_unused_input='ignore')
+            self.fn = self.inner_function(wrapped_inputs, wrapped_outputs,
+                                          profile)
 
         try:
             cython_mintaps = numpy.asarray(self.mintaps, dtype='int32')
@@ -645,15 +704,43 @@ class Scan(PureOp):
                         self, node)
         except (ImportError, theano.gof.cmodule.MissingGXX):
             p = self.execute
+        if (self.n_jobs > 1 and self.n_outs == 0 and
+                self.n_shared_outs == 0 and not self.as_while):
+            # The copies of the inner function share its ops, which must
+            # not hold any state while they run. Scan ops hold their inner
+            # function.
+            if any(isinstance(inner_node.op, Scan)
+                   for inner_node in self.fn.maker.fgraph.apply_nodes):
+                _logger.info('%s runs its steps on one thread, its inner '
+                             'function contains Scan ops', self.name)
+            else:
+                p = self.execute_parallel
         # default arguments are stored in the closure of `rval`
 
         # Big ugly hack since we can't get the real value of allow_gc
         # for the englobing function.
         allow_gc = config.allow_gc and not self.allow_gc
 
+        # Output buffers of the previous call, given back to perform when
+        # the garbage collection of the englobing function freed them.
+        # Buffers that can be returned to the user (no_recycling) or that
+        # are the destroyed initial states are not kept.
+        n_buffers = self.n_outs + self.n_nit_sot
+        kept_buffers = [None] * n_buffers
+        keep_buffers = [config.scan.keep_buffers and
+                        node.outputs[idx] not in no_recycling and
+                        idx not in getattr(self, 'destroy_map', {})
+                        for idx in xrange(n_buffers)]
+
         def rval(p=p, i=node_input_storage, o=node_output_storage, n=node,
                  allow_gc=allow_gc):
+            for idx in xrange(n_buffers):
+                if kept_buffers[idx] is not None and o[idx][0] is None:
+                    o[idx][0] = kept_buffers[idx]
             r = p(n, [x[0] for x in i], o)
+            for idx in xrange(n_buffers):
+                if keep_buffers[idx]:
+                    kept_buffers[idx] = o[idx][0]
             for o in node.outputs:
                 compute_map[o][0] = True
             if allow_gc:
@@ -665,6 +752,53 @@ class Scan(PureOp):
         rval.lazy = False
         return rval
 
+    def inner_function(self, wrapped_inputs, wrapped_outputs, profile):
+        """
+        Compile the inner function, or copy the one compiled for an op
+        computing the same inner graph with the same mode. Such ops are
+        created by identical stacked layers or by recompiling the same
+        graph, and would otherwise each optimize their inner graph.
+
+        The copy shares the optimized graph of the function it is made
+        from, but has its own storage: the functions containing the two
+        ops can be called at the same time from different threads.
+        """
+        cache_size = config.scan.inner_fn_cache_size
+        fn = None
+        if (cache_size == 0 or
+                isinstance(self.mode_instance,
+                           compile.profilemode.ProfileMode)):
+            key = None
+        else:
+            mode = self.mode
+            if mode is None:
+                mode = compile.mode.get_mode(None)
+            key = (self._hash_inner_graph, mode, self.allow_gc,
+                   config.scan.allow_output_prealloc,
+                   profile is not None)
+            for entry_key, op_ref in _inner_fn_cache:
+                op = op_ref()
+                if (entry_key == key and op is not None and op == self and
+                        getattr(op, 'fn', None) is not None):
+                    fn = copy.copy(op.fn)
+                    if isinstance(fn.maker.profile, ScanProfileStats):
+                        fn.maker.profile.inner_fn_cache_hits += 1
+                    break
+
+        if fn is None:
+            fn = function(wrapped_inputs,
+                          wrapped_outputs,
+                          mode=self.mode_instance,
+                          name=self.name,
+                          profile=profile,
+                          on_unused_input='ignore')
+        if key is not None:
+            _inner_fn_cache[:] = [entry for entry in _inner_fn_cache
+                                  if entry[1]() is not None]
+            _inner_fn_cache.append((key, weakref.ref(self)))
+            del _inner_fn_cache[:-cache_size]
+        return fn
+
     def inner_seqs(self, list_inputs):
         # Given the list of inner inputs this function grabs those
         # corresponding to sequences
@@ -906,6 +1040,10 @@ class Scan(PureOp):
         for idx in xrange(len(other_args)):
             input_storage[idx + offset].storage[0] = other_args[idx]
 
+        # Entry of each output buffer given to the inner function at the
+        # current step
+        out_slices = [None] * (self.n_outs + self.n_nit_sot)
+        bytes_copied = 0
         i = 0
         cond = True
         ############## THE MAIN LOOP #########################
@@ -949,21 +1087,22 @@ class Scan(PureOp):
             for idx in xrange(self.n_mit_mot_outs):
                 output_storage[idx].storage[0] = None
 
+            # The inner function computes the mit_sot, sit_sot and nit_sot
+            # outputs in place, in the entry of the output buffer where
+            # they are stored, unless that entry is also read through an
+            # input tap or, at the first step, the nit_sot buffer is not
+            # allocated yet.
             offset = self.n_mit_mot_outs
-            if i != 0 and self.n_nit_sot > 0:
-                for idx in xrange(self.n_outs + self.n_nit_sot -
-                                  self.n_mit_mot):
-                    if (store_steps[idx + self.n_mit_mot] == 1 or
-                        self.vector_outs[idx + self.n_mit_mot]):
-                        output_storage[idx + offset].storage[0] = None
-                    else:
-                        _pos0 = idx + self.n_mit_mot
-                        output_storage[idx + offset].storage[0] =\
-                            outs[_pos0][0][pos[_pos0]]
-            else:
-                for idx in xrange(self.n_outs + self.n_nit_sot -
-                                  self.n_mit_mot):
-                    output_storage[idx + offset].storage[0] = None
+            for idx in xrange(self.n_outs + self.n_nit_sot -
+                              self.n_mit_mot):
+                _pos0 = idx + self.n_mit_mot
+                if (store_steps[_pos0] <= -self.mintaps[_pos0] or
+                        self.vector_outs[_pos0] or
+                        (i == 0 and _pos0 >= self.n_outs)):
+                    out_slices[_pos0] = None
+                else:
+                    out_slices[_pos0] = outs[_pos0][0][pos[_pos0]]
+                output_storage[idx + offset].storage[0] = out_slices[_pos0]
 
             offset += self.n_outs + self.n_nit_sot - self.n_mit_mot
             for idx in xrange(self.n_shared_outs):
@@ -1003,8 +1142,9 @@ class Scan(PureOp):
             # 5.1 Copy over the values for mit_mot outputs
             for j in xrange(self.n_mit_mot):
                 for k in self.mit_mot_out_slices[j]:
-                    outs[j][0][k + pos[j]] = \
-                            output_storage[offset_out].storage[0]
+                    value = output_storage[offset_out].storage[0]
+                    outs[j][0][k + pos[j]] = value
+                    bytes_copied += _nbytes(value)
                     offset_out += 1
 
             # 5.2 Copy over the values for mit_sot/sit_sot outputs
@@ -1013,11 +1153,10 @@ class Scan(PureOp):
             offset_out -= self.n_mit_mot
 
             for j in xrange(begin, end):
-                if (store_steps[j] == 1 or self.vector_outs[j] or
-                    outs[j][0][pos[j]] is not
-                      output_storage[offset_out + j].storage[0]):
-                    outs[j][0][pos[j]] = \
-                            output_storage[offset_out + j].storage[0]
+                value = output_storage[offset_out + j].storage[0]
+                if value is not out_slices[j]:
+                    outs[j][0][pos[j]] = value
+                    bytes_copied += _nbytes(value)
 
             # 5.3 Copy over the values for nit_sot outputs
             begin = end
@@ -1038,11 +1177,12 @@ class Scan(PureOp):
                     elif outs[j][0].shape[0] != store_steps[j]:
                         outs[j][0] = outs[j][0][:store_steps[j]]
                     outs[j][0][pos[j]] = output_storage[jout].storage[0]
-                elif (store_steps[j] == 1 or self.vector_outs[j] or
-                      outs[j][0][pos[j]] is not
-                      output_storage[j + offset_out].storage[0]):
-                    outs[j][0][pos[j]] = \
-                            output_storage[j + offset_out].storage[0]
+                    bytes_copied += _nbytes(output_storage[jout].storage[0])
+                else:
+                    value = output_storage[j + offset_out].storage[0]
+                    if value is not out_slices[j]:
+                        outs[j][0][pos[j]] = value
+                        bytes_copied += _nbytes(value)
 
             # 5.4 Copy over the values for outputs corresponding to shared
             # variables
@@ -1128,6 +1268,7 @@ class Scan(PureOp):
             profile.nbsteps += n_steps
             profile.call_time += t_call
             profile.vm_call_time += t_fn
+            profile.bytes_copied += bytes_copied
             if hasattr(self.fn.fn, 'update_profile'):
                 self.fn.fn.update_profile(profile)
 
@@ -1142,6 +1283,155 @@ class Scan(PureOp):
         self.t_call = t_call
         self.t_fn = t_fn
 
+    def parallel_functions(self, n_jobs):
+        """
+        Return `n_jobs` inner functions with their own storage: the inner
+        function followed by copies of it, made on the first call.
+        """
+        fns = getattr(self, '_parallel_fns', None)
+        if fns is None or fns[0] is not self.fn:
+            fns = [self.fn]
+        while len(fns) < n_jobs:
+            fns.append(copy.copy(self.fn))
+        self._parallel_fns = fns
+        return fns[:n_jobs]
+
+    def execute_parallel(self, node, args, outs):
+        """
+        Run the steps of a Scan op without states on `self.n_jobs` threads.
+
+        The arguments are the ones of `execute`. The first step is computed
+        by the calling thread to allocate the outputs, then the other
+        steps are split in contiguous blocks, one per thread. Each thread
+        runs its own copy of the inner function and writes the outputs of
+        its steps in their entry of the output buffers, so the outputs do
+        not depend on the order in which the threads run.
+        """
+        t0_call = time.time()
+        n_steps = args[0]
+        store_steps = args[self.nit_sot_arg_offset:
+                           self.nit_sot_arg_offset + self.n_nit_sot]
+        if (n_steps < 3 or
+                any(store != n_steps for store in store_steps)):
+            # The outputs of which only the last steps are kept are ring
+            # buffers, whose entries are overwritten in order.
+            return self.execute(node, args, outs)
+        seqs = args[1:self.seqs_arg_offset]
+        for idx, seq in enumerate(seqs):
+            if seq.shape[0] < n_steps:
+                raise ValueError(('Sequence is shorter then the required '
+                                 'number of steps : (n_steps, seq, '
+                                  'seq.shape):'), n_steps,
+                                  node.inputs[1 + idx],
+                                  seq.shape)
+        other_args = args[self.nit_sot_arg_offset + self.n_nit_sot:]
+        fns = self.parallel_functions(min(self.n_jobs, n_steps - 1))
+
+        def run_steps(f, begin, end):
+            # Compute the steps begin to end - 1 with the inner function
+            # `f`, return the number of bytes copied to the outputs.
+            input_storage = f.input_storage
+            output_storage = f.output_storage
+            for idx, arg in enumerate(other_args):
+                input_storage[self.n_seqs + idx].storage[0] = arg
+            out_slices = [None] * self.n_nit_sot
+            bytes_copied = 0
+            for i in xrange(begin, end):
+                for idx in xrange(self.n_seqs):
+                    if self.vector_seqs[idx]:
+                        input_storage[idx].storage[0] = \
+                                seqs[idx][i:i + 1].reshape(())
+                    else:
+                        input_storage[idx].storage[0] = seqs[idx][i]
+                for j in xrange(self.n_nit_sot):
+                    if outs[j][0] is None or self.vector_outs[j]:
+                        out_slices[j] = None
+                    else:
+                        out_slices[j] = outs[j][0][i]
+                    output_storage[j].storage[0] = out_slices[j]
+                try:
+                    f.fn()
+                except Exception:
+                    if hasattr(f.fn, 'position_of_error'):
+                        if hasattr(f.fn, 'thunks'):
+                            gof.vm.raise_with_op(
+                                f.fn.nodes[f.fn.position_of_error],
+                                f.fn.thunks[f.fn.position_of_error])
+                        else:
+                            gof.vm.raise_with_op(
+                                f.fn.nodes[f.fn.position_of_error])
+                    raise
+                for j in xrange(self.n_nit_sot):
+                    value = output_storage[j].storage[0]
+                    if outs[j][0] is None:
+                        # First step: allocate the output, or reuse the
+                        # buffer of the previous call
+                        if value.ndim == 0:
+                            self.vector_outs[j] = True
+                        shape = (n_steps,) + value.shape
+                        buf = previous[j]
+                        if (buf is None or buf.shape != shape or
+                                buf.dtype != value.dtype):
+                            buf = node.outputs[j].type.value_zeros(shape)
+                        outs[j][0] = buf
+                    if value is not out_slices[j]:
+                        outs[j][0][i] = value
+                        bytes_copied += _nbytes(value)
+            return bytes_copied
+
+        previous = [outs[j][0] for j in xrange(self.n_nit_sot)]
+        for j in xrange(self.n_nit_sot):
+            outs[j][0] = None
+        t0_fn = time.time()
+        bytes_copied = run_steps(fns[0], 0, 1)
+
+        # Split the other steps in contiguous blocks, one per thread
+        bounds = [1 + ((n_steps - 1) * k) // len(fns)
+                  for k in xrange(len(fns) + 1)]
+        results = [None] * len(fns)
+        errors = [None] * len(fns)
+
+        def worker(k):
+            try:
+                results[k] = run_steps(fns[k], bounds[k], bounds[k + 1])
+            except Exception:
+                errors[k] = sys.exc_info()
+
+        threads = [threading.Thread(target=worker, args=(k,))
+                   for k in xrange(1, len(fns))]
+        for thread in threads:
+            thread.start()
+        worker(0)
+        for thread in threads:
+            thread.join()
+        t_fn = time.time() - t0_fn
+
+        for f in fns:
+            for i_s in f.input_storage:
+                i_s.storage[0] = None
+            for o_s in f.output_storage:
+                o_s.storage[0] = None
+        # The error of the first block that failed is raised, as the loop
+        # of `execute` would do.
+        for error in errors:
+            if error is not None:
+                raise error[0], error[1], error[2]
+        bytes_copied += sum(results)
+
+        t_call = time.time() - t0_call
+        if hasattr(self.fn.maker, 'profile') and self.fn.maker.profile:
+            profile = self.fn.maker.profile
+            profile.callcount += 1
+            profile.nbsteps += n_steps
+            profile.call_time += t_call
+            profile.vm_call_time += t_fn
+            profile.bytes_copied += bytes_copied
+            for f in fns:
+                if hasattr(f.fn, 'update_profile'):
+                    f.fn.update_profile(profile)
+        self.t_call = t_call
+        self.t_fn = t_fn
+
     ### Infer Shape
     def infer_shape(self, node, input_shapes):
         # input_shapes correspond to the shapes of node.inputs
@@ -2074,6 +2364,7 @@ class Scan(PureOp):
             info['name'] = None
         info['mode'] = self.mode
         info['allow_gc'] = self.allow_gc
+        info['n_jobs'] = self.n_jobs
         info['mit_mot_out_slices'] = self.mit_mot_out_slices * 2
         info['destroy_map'] = OrderedDict()
         new_tap_array = []
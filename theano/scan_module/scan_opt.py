@@ -18,6 +18,7 @@ How the are registered:
 optdb: scan_eqopt1 (.1), scan_eqopt2(1.6), scan_inplace(75)
 scan_eqopt1 -> scan_seqopt1
 scan_seqopt1 -> in2out(remove_constants_and_unused_inputs_scan)(1),
+                in2out(scan_vectorize_map)(1.5),
                 PushOutNonSeqScan(2),
                 PushOutSeqScan(3), PushOutDot1(4)
 scan_eqopt2 -> They are all global optimizer. (in2out convert local to global).
@@ -73,6 +74,7 @@ from theano.compile.function_module import deep_copy_op
 
 from theano.scan_module import scan_op
 from theano.scan_module import scan_utils
+from theano.scan_module.scan import _scan_unrolled
 from theano.scan_module.scan_utils import equal_computations, find_up, scan_args
 from theano.gof.opt import pre_constant_merge, pre_greedy_local_optimizer
 
@@ -1076,6 +1078,18 @@ class ScanSaveMem(gof.Optimizer):
         # or not
         flag_store = False
 
+        def min_store_steps(i):
+            # Minimal number of entries kept for the i-th output. One more
+            # entry than the number of taps lets the inner function compute
+            # a mit_sot or sit_sot state in place, in an entry that it does
+            # not read at the same step (see scan_perform). That is not
+            # worth it for scalar states.
+            if (i >= op.n_mit_mot + op.n_mit_sot + op.n_sit_sot or
+                    node.outputs[i].ndim < 2 or
+                    not theano.config.scan.allow_output_prealloc):
+                return init_l[i]
+            return init_l[i] + 1
+
         # 2.2 Loop over the clients
         for i, out in enumerate(node.outputs[:c_outs]):
             # look at all its clients
@@ -1230,7 +1244,7 @@ class ScanSaveMem(gof.Optimizer):
                         store_steps[i] = 0
                     else:
                         pval = select_max(nw_steps - start + init_l[i],
-                                          init_l[i])
+                                          min_store_steps(i))
                         if store_steps[i] != -1:
                             pval = select_max(pval, store_steps[i])
 
@@ -1275,6 +1289,8 @@ class ScanSaveMem(gof.Optimizer):
 
                     if idx + op.n_mit_mot in required:
                         val = 1
+                        if min_store_steps(i) > init_l[i]:
+                            val = min_store_steps(i)
                     else:
                         val = _val
                     # If the memory for this output has been pre-allocated
@@ -1503,6 +1519,8 @@ class ScanMerge(gof.Optimizer):
         info['as_while'] = as_while
         info['profile'] = nodes[0].op.profile
         info['allow_gc'] = nodes[0].op.allow_gc
+        # The merged loop only runs on several threads if all of them did
+        info['n_jobs'] = min([nd.op.n_jobs for nd in nodes])
 
         # We keep the inner_ins and inner_outs of each original node separated.
         # To be able to recombine them in the right order after the clone,
@@ -2078,6 +2096,299 @@ class PushOutDot1(gof.Optimizer):
 # I've added an equilibrium because later scan optimization in the sequence
 # can make it such that earlier optimizations should apply. However, in
 # general I do not expect the sequence to run more then once
+def _vectorize_inner_node(nd, inputs, batched):
+    """
+    Build the computation of the inner node `nd` over all the steps of a
+    map-like scan at once.
+
+    `inputs` are the outer variables computing the inputs of `nd`, and
+    `batched[i]` tells if `inputs[i]` has the extra leading dimension
+    indexing the steps (otherwise it is the same for every step).
+
+    Return the list of the outer variables computing the outputs of `nd`
+    over a new leading dimension, or None if `nd` can not be lifted.
+    """
+    op = nd.op
+
+    def add_batch_dim(x):
+        return x.dimshuffle(('x',) + tuple(range(x.ndim)))
+
+    if isinstance(op, tensor.Elemwise):
+        if op.inplace_pattern:
+            op = tensor.Elemwise(op.scalar_op, name=op.name,
+                                 nfunc_spec=op.nfunc_spec)
+        inputs = [x if b else add_batch_dim(x)
+                  for x, b in zip(inputs, batched)]
+        return op(*inputs, **dict(return_list=True))
+
+    if isinstance(op, tensor.DimShuffle):
+        new_order = (0,) + tuple(o if o == 'x' else o + 1
+                                 for o in op.new_order)
+        return [inputs[0].dimshuffle(new_order)]
+
+    if isinstance(op, tensor.elemwise.CAReduce):
+        axis = op.axis
+        if axis is None:
+            axis = range(nd.inputs[0].ndim)
+        axis = tuple((a % nd.inputs[0].ndim) + 1 for a in axis)
+        new_op = _careduce_over_axis(op, axis)
+        if new_op is None:
+            return None
+        return [new_op(inputs[0])]
+
+    if isinstance(op, tensor.MaxAndArgmax):
+        if batched[1]:
+            return None
+        if isinstance(inputs[1], tensor.TensorConstant):
+            axis = int(inputs[1].data)
+        elif nd.inputs[0].ndim == 1:
+            # axis is None, which is the same as 0 for a vector
+            axis = 0
+        else:
+            return None
+        return op(inputs[0], axis + 1, **dict(return_list=True))
+
+    if isinstance(op, tensor.Shape):
+        return [inputs[0].shape[1:]]
+
+    if isinstance(op, tensor.basic.ScalarFromTensor):
+        # The scalars of all the steps are kept in a vector, only
+        # Subtensor knows how to use them (see below).
+        return [inputs[0]]
+
+    if isinstance(op, tensor.Subtensor):
+        if not any(batched[1:]):
+            new_op = tensor.Subtensor([slice(None, None, None)] +
+                                      list(op.idx_list))
+            return [new_op(*inputs)]
+        # x[i] where i depends on the step
+        if len(op.idx_list) != 1 or isinstance(op.idx_list[0], slice):
+            return None
+        x, idx = inputs
+        if not batched[0]:
+            return [tensor.subtensor.advanced_subtensor1(x, idx)]
+        elif x.ndim == 2:
+            return [x[tensor.arange(x.shape[0]), idx]]
+        return None
+
+    if isinstance(op, tensor.Dot):
+        x, y = inputs
+        if batched[0] and batched[1]:
+            if x.ndim > 3 or y.ndim > 3:
+                return None
+            return [tensor.batched_dot(x, y)]
+        elif batched[0]:
+            # Only the first axis of y is summed over, the steps of x
+            # stay in front.
+            return [tensor.tensordot(x, y, [[x.ndim - 1], [0]])]
+        else:
+            rval = tensor.tensordot(x, y, [[x.ndim - 1], [1]])
+            order = ([x.ndim - 1] + range(x.ndim - 1) +
+                     range(x.ndim, rval.ndim))
+            return [rval.dimshuffle(order)]
+
+    return None
+
+
+def _careduce_over_axis(op, axis):
+    """
+    Return a reduction like `op` over `axis`, or None for reductions we
+    do not know how to build.
+    """
+    elemwise = tensor.elemwise
+    if type(op) in (elemwise.All, elemwise.Any):
+        return type(op)(axis)
+    if type(op) in (elemwise.Sum, elemwise.ProdWithoutZeros):
+        return type(op)(axis, dtype=op.dtype, acc_dtype=op.acc_dtype)
+    if type(op) is elemwise.Prod:
+        return elemwise.Prod(axis, dtype=op.dtype, acc_dtype=op.acc_dtype,
+                             no_zeros_in_input=op.no_zeros_in_input)
+    if type(op) is elemwise.CAReduceDtype:
+        return elemwise.CAReduceDtype(op.scalar_op, axis, dtype=op.dtype,
+                                      acc_dtype=op.acc_dtype)
+    if type(op) is elemwise.CAReduce:
+        return elemwise.CAReduce(op.scalar_op, axis)
+    return None
+
+
+@gof.local_optimizer([scan_op.Scan])
+def scan_vectorize_map(node):
+    """
+    Replace a map-like scan, i.e. one whose steps do not depend on each
+    other, by the computation of all its steps at once.
+
+    Every node of the inner graph is lifted to work on the whole
+    sequences, with an extra leading dimension indexing the steps
+    (see `_vectorize_inner_node`). If the inner graph contains a node
+    that can not be lifted, the scan is left as it is.
+
+    This is not done in fast_run, as every lifted intermediate result
+    holds all the steps at once (e.g. a dot between the steps of a
+    sequence and a matrix can need much more memory than its output).
+    Include 'scan_vectorize_map' in the mode to enable it.
+    """
+    if not isinstance(node.op, scan_op.Scan):
+        return False
+    op = node.op
+    if (op.n_nit_sot == 0 or op.n_mit_mot != 0 or op.n_mit_sot != 0 or
+            op.n_sit_sot != 0 or op.n_shared_outs != 0 or op.as_while or
+            op.info['gpu'] or op.info.get('gpua', False)):
+        return False
+
+    n_steps = node.inputs[0]
+    # For each inner variable, the outer variable computing it and whether
+    # it has the leading dimension indexing the steps.
+    outer = OrderedDict()
+    for x, y in zip(op.inner_seqs(op.inputs), op.outer_seqs(node.inputs)):
+        outer[x] = (y[:n_steps], True)
+    for x, y in zip(op.inner_non_seqs(op.inputs),
+                    op.outer_non_seqs(node.inputs)):
+        outer[x] = (y, False)
+
+    def get_outer(x):
+        if x not in outer and isinstance(x, theano.Constant):
+            outer[x] = (x.clone(), False)
+        return outer[x]
+
+    for nd in gof.graph.io_toposort(op.inputs, op.outputs):
+        inputs = [get_outer(x)[0] for x in nd.inputs]
+        batched = [get_outer(x)[1] for x in nd.inputs]
+        if not any(batched):
+            new_outs = nd.op(*inputs, **dict(return_list=True))
+        else:
+            new_outs = _vectorize_inner_node(nd, inputs, batched)
+            if new_outs is None:
+                return False
+        # The outputs depend on the step if an input does. All the steps
+        # of the sequences have the same shape, so shapes do not.
+        out_batched = (any(batched) and
+                       not isinstance(nd.op, tensor.Shape))
+        for x, y in zip(nd.outputs, new_outs):
+            if y.ndim != getattr(x.type, 'ndim', 0) + int(out_batched):
+                return False
+            outer[x] = (y, out_batched)
+
+    rval = []
+    for x, out in zip(op.outputs, node.outputs):
+        y, batched = get_outer(x)
+        if not batched:
+            y = tensor.alloc(y, n_steps, *[y.shape[i] for i in range(y.ndim)])
+        if y.dtype != out.dtype:
+            y = tensor.cast(y, out.dtype)
+        if y.type != out.type:
+            y = tensor.patternbroadcast(y, out.broadcastable)
+        if y.type != out.type:
+            return False
+        rval.append(y)
+    return rval
+
+
+@gof.local_optimizer([scan_op.Scan])
+def scan_batched_dot(node):
+    """
+    Replace a scan that only computes dot(x[t], y[t]) over two sequences
+    of matrices by a BatchedDot on those sequences.
+    """
+    if not isinstance(node.op, scan_op.Scan):
+        return False
+    op = node.op
+    if (op.n_seqs != 2 or op.n_nit_sot != 1 or op.n_mit_mot != 0 or
+            op.n_mit_sot != 0 or op.n_sit_sot != 0 or
+            op.n_shared_outs != 0 or op.as_while or
+            len(op.inputs) != 2 or len(op.outputs) != 1):
+        return False
+    out = op.outputs[0]
+    if not (out.owner and
+            isinstance(out.owner.op, (tensor.Dot, tensor.blas.Dot22)) and
+            out.owner.inputs[0].ndim == 2 and
+            out.owner.inputs[1].ndim == 2):
+        return False
+    inner_seqs = op.inner_seqs(op.inputs)
+    outer_seqs = op.outer_seqs(node.inputs)
+    if out.owner.inputs == inner_seqs:
+        x, y = outer_seqs
+    elif out.owner.inputs == inner_seqs[::-1]:
+        y, x = outer_seqs
+    else:
+        return False
+    n_steps = node.inputs[0]
+    rval = tensor.blas._batched_dot(x[:n_steps], y[:n_steps])
+    if rval.type != node.outputs[0].type:
+        rval = tensor.patternbroadcast(rval,
+                                       node.outputs[0].broadcastable)
+    if rval.type != node.outputs[0].type:
+        return False
+    return [rval]
+
+
+# Scans whose inner graph has more nodes than this are not unrolled by
+# scan_unroll: their per-step overhead is small compared to their body.
+unroll_max_inner_nodes = 20
+
+
+@gof.local_optimizer([scan_op.Scan])
+def scan_unroll(node):
+    """
+    Unroll the loop of a scan with a small inner graph, so that each
+    iteration computes config.scan.unroll steps (see the ``unroll``
+    argument of ``scan``).
+
+    This is not done in fast_run, as the outputs of the unrolled scan
+    always hold all the steps, which ScanSaveMem can not reduce when only
+    the last ones are used. Include 'scan_unroll' in the mode to enable
+    it.
+    """
+    if not isinstance(node.op, scan_op.Scan):
+        return False
+    op = node.op
+    unroll = theano.config.scan.unroll
+    if (unroll < 2 or op.n_mit_mot != 0 or op.n_mit_sot != 0 or
+            op.n_shared_outs != 0 or op.as_while or
+            op.truncate_gradient != -1 or
+            op.info['gpu'] or op.info.get('gpua', False) or
+            op.name.startswith('unrolled_')):
+        return False
+    if (len(gof.graph.io_toposort(op.inputs, op.outputs)) >
+            unroll_max_inner_nodes):
+        return False
+
+    n_steps = node.inputs[0]
+    inner_ins = (op.inner_seqs(op.inputs) +
+                 op.inner_sitsot(op.inputs) +
+                 op.inner_non_seqs(op.inputs))
+    inner_outs = (op.inner_sitsot_outs(op.outputs) +
+                  op.inner_nitsot_outs(op.outputs))
+
+    def fn(*args):
+        return scan_utils.clone(inner_outs,
+                                replace=OrderedDict(zip(inner_ins, args)))
+
+    seqs = [OrderedDict([('input', x[:n_steps]), ('taps', [0])])
+            for x in op.outer_seqs(node.inputs)]
+    outs_info = ([OrderedDict([('initial', x[0]), ('taps', [-1])])
+                  for x in op.outer_sitsot(node.inputs)] +
+                 [OrderedDict() for x in op.outer_nitsot(node.inputs)])
+    outs, _ = _scan_unrolled(
+        fn, seqs, outs_info, op.outer_non_seqs(node.inputs), n_steps,
+        unroll, -1, False, op.mode, op.name, op.profile, op.allow_gc,
+        op.n_jobs)
+    if not isinstance(outs, list):
+        outs = [outs]
+
+    rval = []
+    for idx, (out, y) in enumerate(zip(node.outputs, outs)):
+        if idx < op.n_sit_sot:
+            # The output buffer of a sit_sot also holds its initial state
+            y = tensor.set_subtensor(op.outer_sitsot(node.inputs)[idx][1:],
+                                     y)
+        if y.type != out.type:
+            y = tensor.patternbroadcast(y, out.broadcastable)
+        if y.type != out.type:
+            return False
+        rval.append(y)
+    return rval
+
+
 scan_eqopt1 = theano.gof.EquilibriumDB()
 scan_seqopt1 = theano.gof.SequenceDB()
 
@@ -2107,6 +2418,11 @@ scan_seqopt1.register('scanOp_remove_constants_and_unused_inputs0',
                       'scan')
 
 
+scan_seqopt1.register('scan_vectorize_map',
+                      opt.in2out(scan_vectorize_map, ignore_newtrees=True),
+                      1.5)
+
+
 scan_seqopt1.register('scanOp_pushout_nonseqs_ops',
                       PushOutNonSeqScan(),
                       2,
@@ -2137,6 +2453,18 @@ scan_seqopt1.register('scanOp_pushout_output',
                       'scan')
 
 
+scan_seqopt1.register('scan_batched_dot',
+                      opt.in2out(scan_batched_dot, ignore_newtrees=True),
+                      6,
+                      'fast_run',
+                      'scan')
+
+
+scan_seqopt1.register('scan_unroll',
+                      opt.in2out(scan_unroll, ignore_newtrees=True),
+                      7)
+
+
 scan_eqopt2.register('constant_folding_for_scan2',
                       opt.in2out(tensor.opt.constant_folding,
                                  ignore_newtrees=True),
@@ -61,8 +61,74 @@ import time
 import copy
 
 
+cdef extern from "numpy/arrayobject.h":
+    ctypedef struct PyArrayObject_fields:
+        char *data
+
+# We call the NumPy C API directly (see move_view and copy_out).
+numpy.import_array()
+
+
 def get_version():
-    return 0.283
+    return 0.286
+
+
+cdef object step_view(object a, bint vector):
+    """
+    Return a view of a[0] that `move_view` can then move along the first
+    dimension of `a`, or None if `a` is not a numpy.ndarray (e.g. it is
+    on the GPU) and has to be sliced at each step.
+
+    Moving such a view only changes its data pointer, so it costs no
+    allocation and no Python call, unlike indexing `a`.
+    """
+    if not isinstance(a, numpy.ndarray) or a.shape[0] == 0:
+        return None
+    if vector:
+        return a[0:1].reshape(())
+    return a[0]
+
+
+cdef inline void move_view(numpy.ndarray view, numpy.ndarray a,
+                           Py_ssize_t idx):
+    (<PyArrayObject_fields*>view).data = (numpy.PyArray_BYTES(a) +
+                                          idx * numpy.PyArray_STRIDES(a)[0])
+    numpy.PyArray_UpdateFlags(view, numpy.NPY_ALIGNED)
+
+
+cdef Py_ssize_t copy_out(object value, object buf, Py_ssize_t idx,
+                         object view, bint do_profile) except -1:
+    """
+    Store `value` as buf[idx]. `view` is the view of buf returned by
+    `step_view`, or None.
+
+    Return the number of bytes copied. When `value` is stored without
+    `view`, they are only counted if `do_profile`.
+    """
+    if view is None or not isinstance(value, numpy.ndarray):
+        buf[idx] = value
+        if do_profile:
+            return value_nbytes(value)
+        return 0
+    elif value is not view:
+        # When value is view, the inner function computed it in place.
+        move_view(view, buf, idx)
+        if numpy.PyArray_CopyInto(view, value) < 0:
+            return -1
+        return numpy.PyArray_NBYTES(value)
+    return 0
+
+
+def value_nbytes(value):
+    """
+    Number of bytes of `value`, which can also be a CudaNdarray.
+    """
+    try:
+        return value.nbytes
+    except AttributeError:
+        return (int(numpy.prod(value.shape)) *
+                numpy.dtype(value.dtype).itemsize)
+
 
 @cython.boundscheck(False)
 def perform(
@@ -171,9 +237,11 @@ def perform(
                                             n_shared_outs)
     cdef unsigned int offset_out
     cdef unsigned int lenpos = n_outs + n_nit_sot
-    cdef int pos[500] # put a maximum of 500 outputs
+    cdef numpy.ndarray[numpy.int32_t, ndim=1] pos = numpy.zeros(
+        lenpos, dtype='int32')
     cdef unsigned int len_store_steps = n_mit_mot + n_mit_sot + n_sit_sot + n_nit_sot
-    cdef int store_steps[500]
+    cdef numpy.ndarray[numpy.int32_t, ndim=1] store_steps = numpy.zeros(
+        len_store_steps, dtype='int32')
     cdef unsigned int l
     cdef unsigned int offset
     cdef int tap
@@ -191,6 +259,12 @@ def perform(
     cdef unsigned int begin
     cdef unsigned int end
     cdef int cond
+    cdef bint do_profile
+    cdef Py_ssize_t bytes_copied = 0
+    cdef list seq_views
+    cdef list tap_views
+    cdef list out_views
+    cdef list views
 
 
     if n_steps < 0:
@@ -260,6 +334,33 @@ def perform(
         input_storage[<unsigned int>(idx+offset)].storage[0] = other_args[idx]
 
 
+    # 2.2 Bind to the inner function views of the sequences and of the
+    # input taps, and build views of the output buffers. They are moved at
+    # each step instead of slicing the arrays again (see step_view).
+    seq_views = []
+    for idx in range(n_seqs):
+        view = step_view(args[<unsigned int>(1+idx)], vector_seqs[idx])
+        seq_views.append(view)
+        input_storage[idx].storage[0] = view
+    tap_views = []
+    offset = n_seqs
+    for idx in range(n_outs):
+        for tdx in range(tap_array_len[idx]):
+            view = step_view(outs[idx][0], vector_outs[idx])
+            tap_views.append(view)
+            input_storage[offset].storage[0] = view
+            offset += 1
+    out_views = [None] * (n_outs + n_nit_sot)
+    for idx in range(n_mit_mot, n_outs):
+        out_views[idx] = step_view(outs[idx][0], vector_outs[idx])
+    views = [view for view in seq_views + tap_views + out_views
+             if view is not None]
+
+    do_profile = False
+    if hasattr(fnct.maker, 'profile'):
+        profile = fnct.maker.profile
+        do_profile = type(profile) is not bool and profile
+
     i = 0
     cond = 1
     ############## THE MAIN LOOP #########################
@@ -268,7 +369,10 @@ def perform(
         # sequences over which scan iterates
         # 3. collect input slices
         for idx in range(n_seqs):
-            if vector_seqs[idx] == 1:
+            view = seq_views[idx]
+            if view is not None:
+                move_view(view, args[<unsigned int>(1+idx)], i)
+            elif vector_seqs[idx] == 1:
                 input_storage[idx].storage[0] = args[\
                             <unsigned int>(1+idx)][i:<unsigned int>(i+1)].reshape(())
             else:
@@ -277,19 +381,18 @@ def perform(
 
         offset = n_seqs
         for idx in range(n_outs):
-            if vector_outs[idx] == 1:
-                for tdx in range(tap_array_len[idx]):
-                    tap = tap_array[idx,tdx]
-                    _idx = (pos[idx]+tap)%store_steps[idx]
+            for tdx in range(tap_array_len[idx]):
+                tap = tap_array[idx,tdx]
+                _idx = (pos[idx]+tap)%store_steps[idx]
+                view = tap_views[<unsigned int>(offset - n_seqs)]
+                if view is not None:
+                    move_view(view, outs[idx][0], _idx)
+                elif vector_outs[idx] == 1:
                     input_storage[offset].storage[0] =\
                             outs[idx][0][_idx:<unsigned int>(_idx+1)].reshape(())
-                    offset += 1
-            else:
-                for tdx in range(tap_array_len[idx]):
-                    tap = tap_array[idx,tdx]
-                    _idx = (pos[idx]+tap)%store_steps[idx]
+                else:
                     input_storage[offset].storage[0] = outs[idx][0][_idx]
-                    offset += 1
+                offset += 1
 
 
         a_offset = shared_arg_offset
@@ -307,19 +410,25 @@ def perform(
         for idx in range(n_mit_mot_outs):
             output_storage[idx].storage[0] = None
 
+        # The inner function computes the mit_sot, sit_sot and nit_sot
+        # outputs in place, in the entry of the output buffer where they
+        # are stored, unless that entry is also read through an input tap
+        # or, at the first step, the nit_sot buffer is not allocated yet.
         offset = n_mit_mot_outs
-        if i !=0 and n_nit_sot >0:
-            for idx in range(n_outs + n_nit_sot - n_mit_mot):
-                if ( store_steps[<unsigned int>(idx+n_mit_mot)] == 1 or
-                    vector_outs[<unsigned int>(idx+n_mit_mot)] == 1):
-                    output_storage[<unsigned int>(idx+offset)].storage[0] = None
-                else:
-                    output_storage[<unsigned int>(idx+offset)].storage[0] =\
-                        outs[<unsigned int>(idx+n_mit_mot)][0][pos[\
-                                            <unsigned int>(idx+n_mit_mot)]]
-        else:
-            for idx in range(n_outs + n_nit_sot - n_mit_mot):
+        for idx in range(n_outs + n_nit_sot - n_mit_mot):
+            jout = idx + n_mit_mot
+            if (store_steps[jout] <= -mintaps[jout] or
+                    (i == 0 and jout >= n_outs)):
                 output_storage[<unsigned int>(idx+offset)].storage[0] = None
+            elif out_views[jout] is not None:
+                view = out_views[jout]
+                move_view(view, outs[jout][0], pos[jout])
+                output_storage[<unsigned int>(idx+offset)].storage[0] = view
+            elif vector_outs[jout] == 1:
+                output_storage[<unsigned int>(idx+offset)].storage[0] = None
+            else:
+                output_storage[<unsigned int>(idx+offset)].storage[0] =\
+                    outs[jout][0][pos[jout]]
 
         offset += n_outs+n_nit_sot - n_mit_mot
         for idx in range(n_shared_outs):
@@ -328,7 +437,8 @@ def perform(
             pdx = offset + n_shared_outs
             output_storage[<unsigned int>pdx].storage[0] = None
         # 5. compute outputs
-        t0_fn = time.time()
+        if do_profile:
+            t0_fn = time.time()
 
         try:
             fn()
@@ -342,8 +452,8 @@ def perform(
                 # old-style linkers raise their own exceptions
                 raise
 
-        dt_fn = time.time() - t0_fn
-        t_fn += dt_fn
+        if do_profile:
+            t_fn += time.time() - t0_fn
         if self.as_while:
             pdx = offset + n_shared_outs
             cond = output_storage[pdx].storage[0] == 0
@@ -354,7 +464,10 @@ def perform(
         for j in range(n_mit_mot):
             for kdx in range(mit_mot_out_nslices[j]):
                 k = mit_mot_out_slices[j,kdx]
-                outs[j][0][<unsigned int>(k+pos[j])] = output_storage[offset_out].storage[0]
+                value = output_storage[offset_out].storage[0]
+                outs[j][0][<unsigned int>(k+pos[j])] = value
+                if do_profile:
+                    bytes_copied += value_nbytes(value)
                 offset_out += 1
 
         # 5.2 Copy over the values for mit_sot/sit_sot outputs
@@ -363,10 +476,9 @@ def perform(
         offset_out -= n_mit_mot
 
         for j in range(begin, end):
-            if ( store_steps[j] == 1 or vector_outs[j] ==1 or
-                outs[j][0][pos[j]] is not output_storage[<unsigned int>(offset_out+j)].storage[0]):
-
-                outs[j][0][pos[j]] = output_storage[<unsigned int>(offset_out+j)].storage[0]
+            bytes_copied += copy_out(
+                output_storage[<unsigned int>(offset_out+j)].storage[0],
+                outs[j][0], pos[j], out_views[j], do_profile)
 
         # 5.3 Copy over the values for nit_sot outputs
         begin  = end
@@ -386,9 +498,16 @@ def perform(
                 elif outs[j][0].shape[0] != store_steps[j]:
                     outs[j][0] = outs[j][0][:store_steps[j]]
                 outs[j][0][pos[j]] = output_storage[jout].storage[0]
-            elif (store_steps[j] == 1 or vector_outs[j] == 1 or
-                  outs[j][0][pos[j]] is not output_storage[j+offset_out].storage[0]):
-                outs[j][0][pos[j]] = output_storage[j+offset_out].storage[0]
+                if do_profile:
+                    bytes_copied += value_nbytes(
+                        output_storage[jout].storage[0])
+                out_views[j] = step_view(outs[j][0], vector_outs[j])
+                if out_views[j] is not None:
+                    views.append(out_views[j])
+            else:
+                bytes_copied += copy_out(
+                    output_storage[<unsigned int>(offset_out+j)].storage[0],
+                    outs[j][0], pos[j], out_views[j], do_profile)
 
 
         # 5.4 Copy over the values for outputs corresponding to shared
@@ -397,7 +516,15 @@ def perform(
         end   += n_shared_outs
         for j in range(begin,end):
             jout = j +offset_out
-            outs[j][0] = output_storage[jout].storage[0]
+            value = output_storage[jout].storage[0]
+            # The views will be moved, so they can not be kept.
+            for view in views:
+                if value is view:
+                    value = value.copy()
+                    if do_profile:
+                        bytes_copied += value_nbytes(value)
+                    break
+            outs[j][0] = value
 
         for idx in range(lenpos):
             pos[idx] = (pos[idx]+1)%store_steps[idx]
@@ -469,6 +596,7 @@ def perform(
         profile = fnct.maker.profile
         if type(profile) is not bool and profile:
             profile.vm_call_time +=  t_fn
+            profile.bytes_copied += bytes_copied
             profile.callcount += 1
             profile.nbsteps += n_steps
             profile.call_time += t_call
@@ -0,0 +1,239 @@
+"""
+This module provides ``scan_stream``, which compiles a recurrence to be run
+over a stream, one chunk of its sequences at a time.
+
+See scan.py for details on scan
+"""
+
+__docformat__ = 'restructedtext en'
+__copyright__ = "(c) 2010, Universite de Montreal"
+
+
+import logging
+from itertools import izip
+
+import numpy
+
+from theano import compile, tensor
+from theano.compile import function, Out, shared, SharedVariable
+from theano.compile.function_module import deep_copy_op
+from theano.gof import Constant, Variable
+from theano.scan_module.scan import scan
+
+# Logging function for sending warning or info
+_logger = logging.getLogger('theano.scan_module.scan_stream')
+
+
+class ScanStream(object):
+    """
+    Callable returned by `scan_stream`.
+
+    Calling it with one chunk of every sequence (and the values of the
+    symbolic non-sequences, in that order) runs the recurrence over the
+    chunk, starting from the state reached at the end of the previous
+    call, and returns the outputs of every step of the chunk.
+
+    :ivar function: the compiled theano function run on every chunk.
+
+    :ivar states: the shared variables holding the state of the
+        recurrence between two calls, one per output with an initial
+        state.
+    """
+
+    def __init__(self, fn, states, initial_states, return_list=True):
+        self.function = fn
+        self.states = states
+        self.initial_states = initial_states
+        self.return_list = return_list
+
+    def __call__(self, *chunks):
+        outputs = self.function(*chunks)
+        if self.return_list:
+            return outputs
+        return outputs[0]
+
+    def reset(self):
+        """
+        Set the state back to the initial state given to `scan_stream`.
+        """
+        for state, value in izip(self.states, self.initial_states):
+            state.set_value(value)
+
+    def snapshot(self):
+        """
+        Return a copy of the current state, to be given to `restore`.
+        """
+        return [state.get_value() for state in self.states]
+
+    def restore(self, snapshot):
+        """
+        Set the state to one previously returned by `snapshot`.
+        """
+        if len(snapshot) != len(self.states):
+            raise ValueError('Expected a snapshot of %d states, got %d' %
+                             (len(self.states), len(snapshot)))
+        for state, value in izip(self.states, snapshot):
+            state.set_value(value)
+
+
+def scan_stream(fn,
+                sequences=None,
+                outputs_info=None,
+                non_sequences=None,
+                mode=None,
+                name=None,
+                borrow=False):
+    """
+    Compile a recurrence that processes a stream one chunk at a time,
+    keeping its state between the chunks.
+
+    The state of every recurrent output is kept in a shared variable
+    updated at the end of each chunk, so the next call starts where the
+    previous one stopped, as if a single scan had been run over the
+    concatenation of the chunks.
+
+    .. code-block:: python
+
+        x = T.matrix()
+        stream = theano.scan_stream(
+            lambda x_t, h_tm1, W: T.tanh(T.dot(h_tm1, W) + x_t),
+            sequences=[x], outputs_info=[numpy.zeros(n_hid)],
+            non_sequences=[W])
+        for chunk in chunks:
+            h = stream(chunk)
+
+    :param fn: See ``scan``.
+
+    :param sequences: List of symbolic variables standing for one chunk of
+        each sequence (see ``scan``). Only a tap of 0 is supported. The
+        chunks given to a call must be at least 1 step long.
+
+    :param outputs_info: List with one entry per output of ``fn``: ``None``
+        for outputs that are not fed back to ``fn``, the value of the
+        initial state (a numpy ndarray or a shared variable, whose value at
+        that time is the initial state), or a dictionary with the keys
+        ``initial`` (a value, as above) and ``taps`` (see ``scan``).
+
+    :param non_sequences: See ``scan``. The non-sequences that are neither
+        shared variables nor constants become inputs of the returned
+        callable, given after the chunks of the sequences.
+
+    :param mode: See ``scan``. It is also used to compile the function run
+        on every chunk.
+
+    :param name: See ``scan``.
+
+    :param borrow: If True, the returned outputs are the output buffers of
+        the function, reused (and overwritten) by the next call with chunks
+        of the same length, instead of new arrays for every chunk.
+
+    :rtype: `ScanStream`
+    :return: a callable running the recurrence over one chunk, which also
+        has ``reset``, ``snapshot`` and ``restore`` methods to manage its
+        state.
+    """
+    def wrap_into_list(x):
+        if x is None:
+            return []
+        elif not isinstance(x, (list, tuple)):
+            return [x]
+        else:
+            return list(x)
+
+    seqs = wrap_into_list(sequences)
+    outs_info = wrap_into_list(outputs_info)
+    non_seqs = wrap_into_list(non_sequences)
+
+    if not seqs:
+        raise ValueError('scan_stream needs at least one sequence, which '
+                         'gives the length of the chunks')
+    for seq in seqs:
+        if isinstance(seq, dict):
+            raise NotImplementedError(
+                'scan_stream only supports sequences with a tap of 0')
+    seqs = [tensor.as_tensor_variable(s) for s in seqs]
+
+    # Create the shared variables keeping the state between the chunks
+    states = []
+    initial_states = []
+    state_taps = []
+    scan_outs_info = []
+    for idx, info in enumerate(outs_info):
+        if info is None:
+            scan_outs_info.append(None)
+            continue
+        taps = [-1]
+        if isinstance(info, dict):
+            if 'initial' not in info or info['initial'] is None:
+                scan_outs_info.append(info)
+                continue
+            taps = info.get('taps', [-1])
+            if not taps or any(tap >= 0 for tap in taps):
+                raise ValueError('scan_stream only supports negative taps '
+                                 'for the outputs', taps)
+            value = info['initial']
+        else:
+            value = info
+        if isinstance(value, SharedVariable):
+            value = value.get_value()
+        value = numpy.array(value)
+        if taps != [-1] and value.shape[:1] != (-min(taps),):
+            raise ValueError(
+                'The initial state of output %d, with taps %s, should hold '
+                '%d steps, got %s' % (idx, taps, -min(taps), value.shape))
+        if name is None:
+            state_name = 'state_%d' % idx
+        else:
+            state_name = '%s_state_%d' % (name, idx)
+        state = shared(value, name=state_name)
+        states.append(state)
+        initial_states.append(value.copy())
+        state_taps.append(taps)
+        if taps == [-1]:
+            scan_outs_info.append(state)
+        else:
+            scan_outs_info.append(dict(initial=state, taps=taps))
+
+    outputs, updates = scan(fn=fn,
+                            sequences=seqs,
+                            outputs_info=scan_outs_info,
+                            non_sequences=non_seqs,
+                            mode=mode,
+                            name=name)
+    if outputs is None:
+        raise ValueError('scan_stream expects fn to return outputs')
+    return_list = isinstance(outputs, (list, tuple))
+    outputs = wrap_into_list(outputs)
+
+    state_outputs = [out for out, info in izip(outputs, scan_outs_info)
+                     if info is not None and
+                     not (isinstance(info, dict) and
+                          info.get('initial') is None)]
+    for state, taps, out in izip(states, state_taps, state_outputs):
+        if taps == [-1]:
+            new_state = out[-1]
+        else:
+            # The chunk can be shorter than the number of steps kept
+            new_state = tensor.join(0, state, out)[min(taps):]
+        # The state is copied out of the output buffer of scan. An update
+        # viewing that buffer would make the function allocate it again
+        # for every chunk.
+        updates[state] = deep_copy_op(new_state)
+
+    # The garbage collection of the function is disabled, so that the
+    # buffers allocated for a chunk are reused for the next one.
+    f_mode = compile.mode.get_mode(mode)
+    if type(f_mode) is compile.Mode:
+        f_mode = compile.Mode(linker=f_mode.linker.clone(allow_gc=False),
+                              optimizer=f_mode.provided_optimizer)
+
+    inputs = seqs + [x for x in non_seqs
+                     if isinstance(x, Variable) and
+                     not isinstance(x, (SharedVariable, Constant))]
+    f = function(inputs,
+                 [Out(out, borrow=borrow) for out in outputs],
+                 updates=updates,
+                 mode=f_mode,
+                 name=name,
+                 on_unused_input='ignore')
+    return ScanStream(f, states, initial_states, return_list)
@@ -33,7 +33,8 @@ def map(fn,
         truncate_gradient=-1,
         go_backwards=False,
         mode=None,
-        name=None):
+        name=None,
+        n_jobs=1):
     """
     Similar behaviour as python's map.
 
@@ -57,6 +58,9 @@ def map(fn,
     :param mode: See ``scan``.
 
     :param name: See ``scan``.
+
+    :param n_jobs: Number of threads computing the steps, -1 meaning one
+                   per processor (see ``scan`` for more info).
     """
     return scan(fn=fn,
                      sequences=sequences,
@@ -65,7 +69,8 @@ def map(fn,
                      truncate_gradient=truncate_gradient,
                      go_backwards=go_backwards,
                      mode=mode,
-                     name=name)
+                     name=name,
+                     n_jobs=n_jobs)
 
 
 # The ``reduce`` view of Scan Op.
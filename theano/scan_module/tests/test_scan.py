@@ -1,9 +1,12 @@
+import gc
 import os
 import shutil
 import sys
 from tempfile import mkdtemp
+import threading
 import time
 import unittest
+import weakref
 
 import cPickle
 import numpy
@@ -301,6 +304,40 @@ class T_Scan(unittest.TestCase):
         assert all(i.value is None for i in scan_node.op.fn.input_storage)
         assert all(o.value is None for o in scan_node.op.fn.output_storage)
 
+    def test_more_than_500_outputs(self):
+        # The Cython loop used to handle at most 500 outputs.
+        x = theano.tensor.vector('x')
+        mode = theano.Mode(linker='cvm', optimizer=None)
+        outs, _ = theano.scan(lambda x_t: [x_t + 1] * 510,
+                              sequences=x, mode=mode)
+        f = theano.function([x], outs, mode=mode)
+        x_v = numpy.arange(3).astype(theano.config.floatX)
+        out_v = f(x_v)
+        assert len(out_v) == 510
+        utt.assert_allclose(out_v[509], x_v + 1)
+
+    def test_outputs_aliasing_step_views(self):
+        # The inner function gets views of the sequences and of the
+        # outputs buffers that are moved from one step to the next. Outputs
+        # and updates that are these views must still be right.
+        x = theano.tensor.matrix('x')
+        s = theano.shared(numpy.zeros(3, dtype=theano.config.floatX))
+
+        def step(x_t, h_tm1):
+            return [x_t, h_tm1 + x_t, h_tm1], {s: x_t}
+
+        h0 = theano.tensor.zeros_like(x[0, ::2])
+        outs, updates = theano.scan(step, sequences=x[::-1, ::2],
+                                    outputs_info=[None, h0, None])
+        f = theano.function([x], outs, updates=updates)
+        rng = numpy.random.RandomState(utt.fetch_seed())
+        x_v = rng.uniform(size=(4, 6)).astype(theano.config.floatX)
+        x_t, h, h_tm1 = f(x_v)
+        utt.assert_allclose(x_t, x_v[::-1, ::2])
+        utt.assert_allclose(h, numpy.cumsum(x_v[::-1, ::2], axis=0))
+        utt.assert_allclose(h_tm1[1:], h[:-1])
+        utt.assert_allclose(s.get_value(), x_v[0, ::2])
+
     # generator network, only one output , type scalar ; no sequence or
     # non sequence arguments
     def test_generator_one_output_scalar(self):
@@ -4205,3 +4242,491 @@ def test_constant_folding_n_steps():
         theano.function([], res)()
     finally:
         theano.config.on_opt_error = on_opt_error
+
+
+class TestScanCheckpoint(unittest.TestCase):
+
+    def setUp(self):
+        utt.seed_rng()
+        self.x = tensor.matrix('x')
+        self.h0 = tensor.vector('h0')
+        self.W = tensor.matrix('W')
+        self.step = lambda x_t, h_tm1, W: tensor.tanh(
+            tensor.dot(h_tm1, W) + x_t)
+        rng = numpy.random.RandomState(utt.fetch_seed())
+        self.x_val = asarrayX(rng.uniform(-1, 1, size=(17, 4)))
+        self.h0_val = asarrayX(rng.uniform(-1, 1, size=(4,)))
+        self.W_val = asarrayX(rng.uniform(-1, 1, size=(4, 4)))
+
+    def check_against_scan(self, save_every_N):
+        out, _ = theano.scan(self.step,
+                             sequences=[self.x],
+                             outputs_info=[self.h0],
+                             non_sequences=[self.W])
+        out_ck, _ = theano.scan_checkpoints(self.step,
+                                            sequences=[self.x],
+                                            outputs_info=[self.h0],
+                                            non_sequences=[self.W],
+                                            save_every_N=save_every_N)
+        inputs = [self.x, self.h0, self.W]
+        f = theano.function(
+            inputs, [out[-1]] + tensor.grad(out[-1].sum(), inputs))
+        f_ck = theano.function(
+            inputs, [out_ck[-1]] + tensor.grad(out_ck[-1].sum(), inputs))
+        values = [self.x_val, self.h0_val, self.W_val]
+        for v, v_ck in zip(f(*values), f_ck(*values)):
+            utt.assert_allclose(v, v_ck)
+
+    def test_divisible(self):
+        self.check_against_scan(1)
+        self.check_against_scan(17)
+
+    def test_not_divisible(self):
+        self.check_against_scan(5)
+        self.check_against_scan(30)
+
+    def test_default_sqrt(self):
+        self.check_against_scan(None)
+        out_ck, _ = theano.scan_checkpoints(self.step,
+                                            sequences=[self.x],
+                                            outputs_info=[self.h0],
+                                            non_sequences=[self.W])
+        # ceil(sqrt(17)) == 5 steps per segment, so 4 saved states
+        f = theano.function([self.x, self.h0, self.W], out_ck.shape)
+        assert tuple(f(self.x_val, self.h0_val, self.W_val)) == (4, 4)
+
+    def test_n_steps_no_sequence(self):
+        out, _ = theano.scan(lambda h: h * 2, outputs_info=[self.h0],
+                             n_steps=10)
+        out_ck, _ = theano.scan_checkpoints(lambda h: h * 2,
+                                            outputs_info=[self.h0],
+                                            n_steps=10, save_every_N=3)
+        f = theano.function([self.h0], [out[-1], out_ck[-1]])
+        v, v_ck = f(self.h0_val)
+        utt.assert_allclose(v, v_ck)
+
+    def test_unsupported_outputs_info(self):
+        self.assertRaises(NotImplementedError, theano.scan_checkpoints,
+                          self.step, sequences=[self.x],
+                          outputs_info=[None], non_sequences=[self.W])
+        self.assertRaises(NotImplementedError, theano.scan_checkpoints,
+                          self.step, sequences=[self.x],
+                          outputs_info=[dict(initial=self.x, taps=[-2])],
+                          non_sequences=[self.W])
+
+
+class TestScanUnroll(unittest.TestCase):
+
+    def setUp(self):
+        utt.seed_rng()
+        self.x = tensor.matrix('x')
+        self.h0 = tensor.vector('h0')
+        self.c0 = tensor.vector('c0')
+        self.W = tensor.matrix('W')
+
+        def step(x_t, h_tm1, c_tm1, W):
+            i_t = tensor.nnet.sigmoid(tensor.dot(h_tm1, W) + x_t)
+            c_t = c_tm1 * 0.9 + i_t * tensor.tanh(x_t)
+            return tensor.tanh(c_t) * i_t, c_t, h_tm1.sum()
+        self.step = step
+        self.rng = numpy.random.RandomState(utt.fetch_seed())
+
+    def check_against_scan(self, n_steps, unroll):
+        inputs = [self.x, self.h0, self.c0, self.W]
+        values = [asarrayX(self.rng.uniform(-1, 1, size=(n_steps, 4))),
+                  asarrayX(self.rng.uniform(-1, 1, size=(4,))),
+                  asarrayX(self.rng.uniform(-1, 1, size=(4,))),
+                  asarrayX(self.rng.uniform(-1, 1, size=(4, 4)))]
+        rvals = []
+        for k in [1, unroll]:
+            outs, _ = theano.scan(self.step,
+                                  sequences=[self.x],
+                                  outputs_info=[self.h0, self.c0, None],
+                                  non_sequences=[self.W],
+                                  unroll=k)
+            cost = outs[0][-1].sum() + outs[1].sum() + outs[2].sum()
+            f = theano.function(inputs,
+                                outs + tensor.grad(cost, inputs))
+            rvals.append(f(*values))
+        for v, v_unroll in zip(*rvals):
+            utt.assert_allclose(v, v_unroll)
+
+    def test_multiple_of_unroll(self):
+        self.check_against_scan(8, 4)
+
+    def test_not_multiple_of_unroll(self):
+        self.check_against_scan(7, 3)
+
+    def test_shorter_than_unroll(self):
+        self.check_against_scan(2, 4)
+
+    def test_n_steps_no_sequence(self):
+        x0 = tensor.vector('x0')
+        out, _ = theano.scan(lambda x: x * 2, outputs_info=[x0],
+                             n_steps=7, unroll=3)
+        f = theano.function([x0], out)
+        utt.assert_allclose(f(numpy.ones(2, dtype=theano.config.floatX)),
+                            2. ** numpy.arange(1, 8)[:, None] *
+                            numpy.ones((7, 2)))
+        assert any(n.op.name == 'unrolled_scan_fn'
+                   for n in f.maker.fgraph.toposort()
+                   if isinstance(n.op, Scan))
+
+    def test_unsupported_taps(self):
+        self.assertRaises(NotImplementedError, theano.scan,
+                          lambda x_tm2, x_tm1: x_tm2 + x_tm1,
+                          outputs_info=[dict(initial=self.x, taps=[-2, -1])],
+                          n_steps=5, unroll=2)
+
+    def test_scan_unroll_opt(self):
+        outs, _ = theano.scan(self.step,
+                              sequences=[self.x],
+                              outputs_info=[self.h0, self.c0, None],
+                              non_sequences=[self.W])
+        inputs = [self.x, self.h0, self.c0, self.W]
+        mode = theano.compile.get_default_mode()
+        f = theano.function(inputs, outs, mode=mode)
+        f_unroll = theano.function(inputs, outs,
+                                   mode=mode.including('scan_unroll'))
+        names = [n.op.name for n in f_unroll.maker.fgraph.toposort()
+                 if isinstance(n.op, Scan)]
+        assert names == ['unrolled_scan_fn'], names
+        values = [asarrayX(self.rng.uniform(-1, 1, size=(7, 4))),
+                  asarrayX(self.rng.uniform(-1, 1, size=(4,))),
+                  asarrayX(self.rng.uniform(-1, 1, size=(4,))),
+                  asarrayX(self.rng.uniform(-1, 1, size=(4, 4)))]
+        for v, v_unroll in zip(f(*values), f_unroll(*values)):
+            utt.assert_allclose(v, v_unroll)
+
+
+class TestScanOutputPrealloc(unittest.TestCase):
+
+    def setUp(self):
+        utt.seed_rng()
+        self.rng = numpy.random.RandomState(utt.fetch_seed())
+
+    def scan_profile(self, f):
+        return [node.op.fn.maker.profile
+                for node in f.maker.fgraph.toposort()
+                if isinstance(node.op, Scan)][0]
+
+    def test_sitsot_last_step_no_copy(self):
+        x = tensor.matrix('x')
+        h0 = tensor.vector('h0')
+        out, _ = theano.scan(lambda x_t, h: h * 0.5 + x_t,
+                             sequences=[x],
+                             outputs_info=[h0],
+                             profile=theano.compile.ScanProfileStats(
+                                 atexit_print=False))
+        f = theano.function([x, h0], out[-1])
+        x_v = asarrayX(self.rng.uniform(size=(9, 4)))
+        h_v = asarrayX(self.rng.uniform(size=(4,)))
+        expected = h_v
+        for x_t in x_v:
+            expected = expected * 0.5 + x_t
+        # The second call reuses the output buffers of the first one
+        for i in xrange(2):
+            utt.assert_allclose(f(x_v, h_v), expected)
+        profile = self.scan_profile(f)
+        assert profile.nbsteps == 18
+        assert profile.bytes_copied == 0, profile.bytes_copied
+
+    def test_mitsot_taps(self):
+        x0 = tensor.matrix('x0')
+        out, _ = theano.scan(lambda a, b: tensor.tanh(a + b * 0.5),
+                             outputs_info=[dict(initial=x0, taps=[-2, -1])],
+                             n_steps=10)
+        f = theano.function([x0], [out[-1], out[-2:]])
+        x0_v = asarrayX(self.rng.uniform(size=(2, 3)))
+        a, b = x0_v
+        for i in xrange(10):
+            a, b = b, numpy.tanh(a + b * 0.5)
+        for i in xrange(2):
+            last, last_two = f(x0_v)
+            utt.assert_allclose(last, b)
+            utt.assert_allclose(last_two, numpy.asarray([a, b]))
+
+    def test_no_prealloc(self):
+        x = tensor.matrix('x')
+        h0 = tensor.vector('h0')
+        out, _ = theano.scan(lambda x_t, h: [h + x_t, x_t * 2],
+                             sequences=[x],
+                             outputs_info=[h0, None])
+        x_v = asarrayX(self.rng.uniform(size=(5, 3)))
+        h_v = asarrayX(self.rng.uniform(size=(3,)))
+        values = []
+        prealloc = theano.config.scan.allow_output_prealloc
+        try:
+            for flag in [True, False]:
+                theano.config.scan.allow_output_prealloc = flag
+                f = theano.function([x, h0], [out[0][-1], out[1]])
+                values.append(f(x_v, h_v))
+        finally:
+            theano.config.scan.allow_output_prealloc = prealloc
+        utt.assert_allclose(values[0][0], h_v + x_v.sum(0))
+        utt.assert_allclose(values[0][1], x_v * 2)
+        for v_prealloc, v in zip(*values):
+            utt.assert_allclose(v_prealloc, v)
+
+
+class TestScanStream(unittest.TestCase):
+
+    def setUp(self):
+        utt.seed_rng()
+        self.rng = numpy.random.RandomState(utt.fetch_seed())
+        self.x = tensor.matrix('x')
+        self.W = theano.shared(asarrayX(self.rng.uniform(-.1, .1,
+                                                         size=(4, 4))))
+        self.x_v = asarrayX(self.rng.uniform(size=(12, 4)))
+
+    def step(self, x_t, h_tm1, W):
+        return tensor.tanh(tensor.dot(h_tm1, W) + x_t), x_t.sum()
+
+    def full_scan(self, h0):
+        outs, _ = theano.scan(self.step,
+                              sequences=[self.x],
+                              outputs_info=[h0, None],
+                              non_sequences=[self.W])
+        return theano.function([self.x], outs)(self.x_v)
+
+    def test_chunks(self):
+        h0 = asarrayX(self.rng.uniform(size=(4,)))
+        stream = theano.scan_stream(self.step,
+                                    sequences=[self.x],
+                                    outputs_info=[h0, None],
+                                    non_sequences=[self.W])
+        chunks = [stream(self.x_v[i:i + 3]) for i in xrange(0, 12, 3)]
+        for out, expected in zip(zip(*chunks), self.full_scan(h0)):
+            utt.assert_allclose(numpy.concatenate(out), expected)
+
+    def test_mitsot_chunks(self):
+        x0 = asarrayX(self.rng.uniform(size=(2, 4)))
+        fn = lambda x_t, h_tm2, h_tm1: h_tm2 * 0.5 + h_tm1 * 0.25 + x_t
+        stream = theano.scan_stream(
+            fn, sequences=[self.x],
+            outputs_info=[dict(initial=x0, taps=[-2, -1])])
+        outs, _ = theano.scan(
+            fn, sequences=[self.x],
+            outputs_info=[dict(initial=tensor.constant(x0),
+                               taps=[-2, -1])])
+        expected = theano.function([self.x], outs)(self.x_v)
+        # A chunk of one step is shorter than the state
+        chunks = [stream(self.x_v[:1]), stream(self.x_v[1:5]),
+                  stream(self.x_v[5:])]
+        utt.assert_allclose(numpy.concatenate(chunks), expected)
+
+    def test_reset_snapshot_restore(self):
+        h0 = asarrayX(self.rng.uniform(size=(4,)))
+        stream = theano.scan_stream(lambda x_t, h_tm1: h_tm1 + x_t,
+                                    sequences=[self.x],
+                                    outputs_info=[h0])
+        first = stream(self.x_v[:4])
+        snapshot = stream.snapshot()
+        utt.assert_allclose(snapshot[0], first[-1])
+        second = stream(self.x_v[4:8])
+        stream.restore(snapshot)
+        utt.assert_allclose(stream(self.x_v[4:8]), second)
+        stream.reset()
+        utt.assert_allclose(stream(self.x_v[:4]), first)
+        self.assertRaises(ValueError, stream.restore, [])
+
+    def test_non_sequence_input(self):
+        h0 = asarrayX(self.rng.uniform(size=(4,)))
+        W = tensor.matrix('W')
+        stream = theano.scan_stream(self.step,
+                                    sequences=[self.x],
+                                    outputs_info=[h0, None],
+                                    non_sequences=[W])
+        W_v = self.W.get_value()
+        chunks = [stream(self.x_v[:5], W_v), stream(self.x_v[5:], W_v)]
+        utt.assert_allclose(numpy.concatenate([c[0] for c in chunks]),
+                            self.full_scan(h0)[0])
+
+    def test_borrow_reuses_buffers(self):
+        h0 = asarrayX(self.rng.uniform(size=(4,)))
+        stream = theano.scan_stream(self.step,
+                                    sequences=[self.x],
+                                    outputs_info=[h0, None],
+                                    non_sequences=[self.W],
+                                    borrow=True)
+        expected = self.full_scan(h0)[0]
+        data = set()
+        for i in xrange(0, 12, 3):
+            out = stream(self.x_v[i:i + 3])[0]
+            utt.assert_allclose(out, expected[i:i + 3])
+            data.add(out.ctypes.data)
+        assert len(data) == 1, data
+
+
+class TestScanInnerFnCache(unittest.TestCase):
+
+    def setUp(self):
+        utt.seed_rng()
+        rng = numpy.random.RandomState(utt.fetch_seed())
+        self.Ws = [theano.shared(asarrayX(rng.uniform(-.1, .1, size=(4, 4))))
+                   for i in xrange(3)]
+        self.x = tensor.matrix('x')
+        self.x_v = asarrayX(rng.uniform(size=(5, 4)))
+
+    def stacked_layers(self):
+        h = self.x
+        for W in self.Ws:
+            h, _ = theano.scan(
+                lambda x_t, h_tm1, W: tensor.tanh(tensor.dot(h_tm1, W) + x_t),
+                sequences=[h],
+                outputs_info=[tensor.zeros_like(self.x[0])],
+                non_sequences=[W])
+        return theano.function([self.x], h, mode=mode_with_opt)
+
+    def scan_nodes(self, f):
+        return [node for node in f.maker.fgraph.toposort()
+                if isinstance(node.op, theano.scan_module.scan_op.Scan)]
+
+    def test_shared_between_layers(self):
+        f = self.stacked_layers()
+        nodes = self.scan_nodes(f)
+        assert len(nodes) == 3
+        assert len(set(id(node.op.fn.maker) for node in nodes)) == 1
+        assert len(set(id(node.op.fn) for node in nodes)) == 3
+        out = f(self.x_v)
+
+        cache_size = theano.config.scan.inner_fn_cache_size
+        theano.config.scan.inner_fn_cache_size = 0
+        try:
+            f_ref = self.stacked_layers()
+        finally:
+            theano.config.scan.inner_fn_cache_size = cache_size
+        nodes = self.scan_nodes(f_ref)
+        assert len(set(id(node.op.fn.maker) for node in nodes)) == 3
+        utt.assert_allclose(out, f_ref(self.x_v))
+
+    def test_shared_between_functions(self):
+        f1 = self.stacked_layers()
+        f2 = self.stacked_layers()
+        fn1 = self.scan_nodes(f1)[0].op.fn
+        fn2 = self.scan_nodes(f2)[0].op.fn
+        assert fn1.maker is fn2.maker
+        assert fn1 is not fn2
+        utt.assert_allclose(f1(self.x_v), f2(self.x_v))
+
+    def test_concurrent_functions(self):
+        # The functions sharing an inner graph can be called at the same
+        # time from different threads.
+        rng = numpy.random.RandomState(utt.fetch_seed())
+        W = theano.shared(asarrayX(rng.uniform(-.1, .1, size=(100, 100))))
+        h0 = tensor.vector('h0')
+        fs = []
+        for i in xrange(2):
+            h, _ = theano.scan(
+                lambda h_tm1: tensor.tanh(tensor.dot(h_tm1, W) + 0.5 * h_tm1),
+                outputs_info=[h0],
+                n_steps=30)
+            fs.append(theano.function([h0], h, mode=mode_with_opt))
+        fns = [self.scan_nodes(f)[0].op.fn for f in fs]
+        assert fns[0].maker is fns[1].maker
+        h0_vs = [asarrayX(rng.uniform(size=(100,))) for i in xrange(2)]
+        expected = [f(h0_v) for f, h0_v in zip(fs, h0_vs)]
+        errors = []
+
+        def run(f, h0_v, expected):
+            try:
+                for i in xrange(20):
+                    utt.assert_allclose(f(h0_v), expected)
+            except Exception, e:
+                errors.append(e)
+        threads = [threading.Thread(target=run, args=args)
+                   for args in zip(fs, h0_vs, expected)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert not errors, errors
+
+    def test_no_strong_reference(self):
+        # The cache does not keep the inner functions of deleted
+        # functions alive. The cache is emptied first, so that the inner
+        # function is not one of the ops of an other test still alive.
+        cache = theano.scan_module.scan_op._inner_fn_cache
+        entries = cache[:]
+        del cache[:]
+        try:
+            f = self.stacked_layers()
+            fn_ref = weakref.ref(self.scan_nodes(f)[0].op.fn)
+            del f
+            gc.collect()
+            assert fn_ref() is None
+        finally:
+            cache[:] = entries + cache
+
+
+class TestScanParallel(unittest.TestCase):
+
+    def setUp(self):
+        utt.seed_rng()
+        rng = numpy.random.RandomState(utt.fetch_seed())
+        self.x = tensor.matrix('x')
+        self.W = theano.shared(asarrayX(rng.uniform(-1, 1, size=(5, 6))))
+        self.x_v = asarrayX(rng.uniform(size=(23, 5)))
+        self.mode = mode_with_opt
+
+    def step(self, x_t, W):
+        return tensor.tanh(tensor.dot(x_t, W)), x_t.sum()
+
+    def compile(self, n_jobs):
+        outs, _ = theano.map(self.step,
+                             sequences=[self.x],
+                             non_sequences=[self.W],
+                             n_jobs=n_jobs)
+        f = theano.function([self.x], outs, mode=self.mode)
+        scan_nodes = [node for node in f.maker.fgraph.toposort()
+                      if isinstance(node.op,
+                                    theano.scan_module.scan_op.Scan)]
+        assert len(scan_nodes) == 1
+        assert scan_nodes[0].op.n_jobs == n_jobs
+        return f, scan_nodes[0].op
+
+    def test_same_as_serial(self):
+        f, op = self.compile(3)
+        f_ref, _ = self.compile(1)
+        expected = f_ref(self.x_v)
+        for x_v in [self.x_v, self.x_v[:7], self.x_v]:
+            out = f(x_v)
+            assert len(op._parallel_fns) == 3
+            for o, e in zip(out, f_ref(x_v)):
+                assert o.shape == e.shape
+                assert numpy.all(o == e)
+
+    def test_few_steps(self):
+        f, op = self.compile(4)
+        f_ref, _ = self.compile(1)
+        for n in [1, 2, 3]:
+            for o, e in zip(f(self.x_v[:n]), f_ref(self.x_v[:n])):
+                assert numpy.all(o == e)
+
+    def test_grad(self):
+        outs, _ = theano.map(self.step,
+                             sequences=[self.x],
+                             non_sequences=[self.W],
+                             n_jobs=2)
+        cost = outs[0].sum() + outs[1].sum()
+        f = theano.function([self.x], tensor.grad(cost, [self.x, self.W]),
+                            mode=self.mode)
+        outs, _ = theano.map(self.step,
+                             sequences=[self.x],
+                             non_sequences=[self.W])
+        cost = outs[0].sum() + outs[1].sum()
+        f_ref = theano.function([self.x],
+                                tensor.grad(cost, [self.x, self.W]),
+                                mode=self.mode)
+        for o, e in zip(f(self.x_v), f_ref(self.x_v)):
+            utt.assert_allclose(o, e)
+
+    def test_states_not_supported(self):
+        self.assertRaises(ValueError, theano.scan,
+                          lambda x_t, h_tm1: h_tm1 + x_t,
+                          sequences=[self.x],
+                          outputs_info=[tensor.zeros_like(self.x[0])],
+                          n_jobs=2)
+        self.assertRaises(ValueError, theano.map, self.step,
+                          sequences=[self.x], non_sequences=[self.W],
+                          n_jobs=0)
@@ -418,3 +418,86 @@ class TestPushOutSumOfDot():
         output_no_opt = f_no_opt(input1_value, input2_value, input3_value)
 
         utt.assert_allclose(output_opt, output_no_opt)
+
+
+class TestScanVectorizeMap(unittest.TestCase):
+
+    def setUp(self):
+        utt.seed_rng()
+        self.mode = mode.including('scan_vectorize_map')
+        self.mode_loop = self.mode.excluding('scan_vectorize_map')
+        self.rng = numpy.random.RandomState(utt.fetch_seed())
+
+    def check(self, inputs, out, values, vectorized=True):
+        if not isinstance(out, list):
+            out = [out]
+        f = theano.function(inputs, out, mode=self.mode)
+        f_loop = theano.function(inputs, out, mode=self.mode_loop)
+        scans = [n for n in f.maker.fgraph.toposort()
+                 if isinstance(n.op, Scan)]
+        if vectorized:
+            assert len(scans) == 0
+        else:
+            assert len(scans) == 1
+        for v, v_loop in zip(f(*values), f_loop(*values)):
+            utt.assert_allclose(v, v_loop)
+
+    def test_elemwise_dot(self):
+        x = T.matrix('x')
+        W = T.matrix('W')
+        b = T.vector('b')
+        out, _ = theano.map(
+            lambda x_t, W, b: T.nnet.sigmoid(T.dot(x_t, W) + b),
+            sequences=[x], non_sequences=[W, b])
+        self.check([x, W, b], out,
+                   [self.rng.uniform(size=(7, 4)).astype(config.floatX),
+                    self.rng.uniform(size=(4, 3)).astype(config.floatX),
+                    self.rng.uniform(size=(3,)).astype(config.floatX)])
+
+    def test_dot_two_sequences(self):
+        A = T.tensor3('A')
+        x = T.matrix('x')
+        out, _ = theano.map(lambda A_t, x_t: T.dot(A_t, x_t),
+                            sequences=[A, x])
+        self.check([A, x], out,
+                   [self.rng.uniform(size=(7, 3, 4)).astype(config.floatX),
+                    self.rng.uniform(size=(7, 4)).astype(config.floatX)])
+
+    def test_reductions(self):
+        A = T.tensor3('A')
+        out, _ = theano.map(
+            lambda A_t: (A_t.sum(axis=1) + A_t.max(axis=0) +
+                         A_t.prod(axis=-1) + T.all(A_t > .5, axis=0) +
+                         T.argmax(A_t.sum(axis=0)) + A_t.shape[0]),
+            sequences=[A])
+        self.check([A], out,
+                   [self.rng.uniform(size=(7, 4, 4)).astype(config.floatX)])
+
+    def test_per_step_index(self):
+        x = T.matrix('x')
+        t = T.ivector('t')
+        out, _ = theano.map(lambda x_t, t_t: -T.log(x_t[t_t + 1]),
+                            sequences=[x, t])
+        self.check([x, t], out,
+                   [self.rng.uniform(size=(7, 4)).astype(config.floatX),
+                    self.rng.randint(0, 3, size=(7,)).astype('int32')])
+
+    def test_output_not_depending_on_step(self):
+        x = T.vector('x')
+        b = T.vector('b')
+        outs, _ = theano.map(lambda x_t, b: [x_t * 2, b + 1],
+                             sequences=[x], non_sequences=[b])
+        self.check([x, b], outs,
+                   [self.rng.uniform(size=(7,)).astype(config.floatX),
+                    self.rng.uniform(size=(3,)).astype(config.floatX)])
+
+    def test_fallback(self):
+        # The stop of the slice depends on the step: the loop is kept
+        x = T.matrix('x')
+        t = T.ivector('t')
+        out, _ = theano.map(lambda x_t, t_t: x_t[:t_t].sum(),
+                            sequences=[x, t])
+        self.check([x, t], out,
+                   [self.rng.uniform(size=(7, 4)).astype(config.floatX),
+                    self.rng.randint(0, 4, size=(7,)).astype('int32')],
+                   vectorized=False)
@@ -15,12 +15,21 @@ import scipy.sparse
 
 import theano
 from theano import gof, tensor, compile, scalar, config
+from theano.configparser import AddConfigVar, BoolParam
 from theano.gof.python25 import all
 from theano.gradient import DisconnectedType
 from theano.sparse.utils import hash_from_sparse
 import theano.tests.unittest_tools as utt
 from theano.gradient import grad_not_implemented, grad_undefined
-from theano.sparse.type import SparseType, _is_sparse
+from theano.sparse.type import SparseType, _is_sparse, _from_arrays
+
+AddConfigVar('sparse.structured_grad',
+             "Make the ops that can compute a regular or a structured grad "
+             "(sp_sum, dot of a sparse and a dense matrix) compute a "
+             "structured one by default, so the gradients with respect to "
+             "sparse matrices keep their sparsity pattern",
+             BoolParam(False),
+             in_c_key=False)
 
 sparse_formats = ['csc', 'csr']
 
@@ -1000,6 +1009,37 @@ csc_from_dense = SparseFromDense('csc')
 """
 
 
+def csr_from_arrays(data, indices, indptr, shape):
+    """Build a scipy csr matrix on the arrays of its internal
+    representation, without copying them.
+
+    It is meant for data loaders building minibatches: the tuple
+    ``(data, indices, indptr, shape)`` can also be given directly to a
+    Theano function as the value of a csr input.
+
+    :param data: Numpy vector of the non-zero elements.
+    :param indices: Numpy vector of the column of each element.
+    :param indptr: Numpy vector of the index in `data` of the first
+                   element of each row.
+    :param shape: Number of rows and columns of the matrix.
+
+    :return: A scipy csr matrix using `data`, `indices` and `indptr`.
+
+    :note: `indices` and `indptr` are only copied if they are not int32.
+           The arrays are not checked.
+    """
+    return _from_arrays('csr', data, indices, indptr, shape)
+
+
+def csc_from_arrays(data, indices, indptr, shape):
+    """Build a scipy csc matrix on the arrays of its internal
+    representation, without copying them.
+
+    See `csr_from_arrays`.
+    """
+    return _from_arrays('csc', data, indices, indptr, shape)
+
+
 # Indexing
 class GetItemList(gof.op.Op):
 
@@ -1048,6 +1088,28 @@ returning them as a new sparse matrix.
 """
 
 
+def csr_gather_rows(data, indices, indptr, shape, rows):
+    """Select rows of a csr matrix given by its internal representation,
+    returning them as a new csr matrix.
+
+    This builds the minibatches of a large csr dataset, whose arrays can
+    be memory-mapped numpy arrays held in shared variables. When a C++
+    compiler is available, the rows are copied by C code working on the
+    arrays, so the whole dataset is never converted or copied.
+
+    :param data: One dimensional tensor of the non-zero elements of the
+                 dataset.
+    :param indices: Int32 vector of the column of each element.
+    :param indptr: Int32 vector of the index of the first element of
+                   each row.
+    :param shape: Vector of the number of rows and columns.
+    :param rows: Vector of integers, the rows to select.
+
+    :return: A csr matrix holding the selected rows, in their order.
+    """
+    return get_item_list(CSR(data, indices, indptr, shape), rows)
+
+
 class GetItemListGrad(gof.op.Op):
 
     def __eq__(self, other):
@@ -1272,6 +1334,14 @@ class GetItem2d(gof.op.Op):
         assert _is_sparse(x)
         out[0] = x[start1:stop1, start2:stop2]
 
+    def connection_pattern(self, node):
+        return [[True]] + [[False]] * (len(node.inputs) - 1)
+
+    def grad(self, inputs, (gz, )):
+        x = inputs[0]
+        return ([get_item_2d_grad(x, gz, *inputs[1:])] +
+                [DisconnectedType()() for i in inputs[1:]])
+
     def __str__(self):
         return self.__class__.__name__
 
@@ -1300,7 +1370,56 @@ when sparse vectors are supported.
 
 :return: The corresponding slice in `x`.
 
-:note: The grad is not implemented for this op.
+:note: The grad implemented is regular. It is a sparse matrix holding
+       the elements of the gradient of the slice, so it keeps the
+       sparsity of that gradient.
+"""
+
+
+class GetItem2dGrad(gof.op.Op):
+    # See doc in instance of this Op or function after this class definition.
+    def __eq__(self, other):
+        return (type(self) == type(other))
+
+    def __hash__(self):
+        return hash(type(self))
+
+    def infer_shape(self, node, shapes):
+        return [shapes[0]]
+
+    def make_node(self, x, gz, start1, stop1, start2, stop2):
+        x = as_sparse_variable(x)
+        gz = as_sparse_variable(gz)
+        assert x.format in ["csr", "csc"]
+        return gof.Apply(self, [x, gz, start1, stop1, start2, stop2],
+                         [x.type()])
+
+    def perform(self, node, (x, gz, start1, stop1, start2, stop2), (out, )):
+        assert _is_sparse(x) and _is_sparse(gz)
+        # Offsets of the slice in x, with the bounds python would use
+        row = slice(start1, stop1).indices(x.shape[0])[0]
+        col = slice(start2, stop2).indices(x.shape[1])[0]
+        gz = gz.tocoo()
+        y = scipy.sparse.coo_matrix(
+            (gz.data.astype(node.outputs[0].dtype),
+             (gz.row + row, gz.col + col)), shape=x.shape)
+        out[0] = y.asformat(x.format)
+
+    def __str__(self):
+        return self.__class__.__name__
+
+get_item_2d_grad = GetItem2dGrad()
+"""Gradient of `get_item_2d`.
+
+:param x: Sparse matrix sliced by `get_item_2d`.
+:param gz: Gradient of the slice, a sparse matrix.
+:param start1: Start of the slice of the rows, or None.
+:param stop1: Stop of the slice of the rows, or None.
+:param start2: Start of the slice of the columns, or None.
+:param stop2: Stop of the slice of the columns, or None.
+
+:return: A sparse matrix of the shape and format of `x`, holding the
+         elements of `gz` at their position in `x`.
 """
 
 
@@ -1677,7 +1796,7 @@ class SpSum(gof.op.Op):
         return self.__class__.__name__ + "{axis=%s}" % str(self.axis)
 
 
-def sp_sum(x, axis=None, sparse_grad=False):
+def sp_sum(x, axis=None, sparse_grad=None):
     """Calculate the sum of a sparse matrix along the specified
     axis.
 
@@ -1686,7 +1805,8 @@ def sp_sum(x, axis=None, sparse_grad=False):
 
     :param x: Sparse matrix.
     :param axis: Axis along which the sum is applied. Integer or `None`.
-    :param sparse_grad: `True` to have a structured grad. Boolean.
+    :param sparse_grad: `True` to have a structured grad. Boolean. If
+                        `None`, `config.sparse.structured_grad` is used.
 
     :return: The sum of `x` in a dense format.
 
@@ -1698,6 +1818,8 @@ def sp_sum(x, axis=None, sparse_grad=False):
            matrix.
     """
 
+    if sparse_grad is None:
+        sparse_grad = config.sparse.structured_grad
     return SpSum(axis, sparse_grad)(x)
 
 
@@ -1860,6 +1982,49 @@ def clean(x):
     return ensure_sorted_indices(remove0(x))
 
 
+class SumDuplicates(gof.op.Op):
+    # See doc in instance of this Op after the class definition.
+    def __eq__(self, other):
+        return type(self) == type(other)
+
+    def __hash__(self):
+        return hash(type(self))
+
+    def __str__(self):
+        return self.__class__.__name__
+
+    def make_node(self, x):
+        x = as_sparse_variable(x)
+        assert x.format in ["csr", "csc"]
+        return gof.Apply(self, [x], [x.type()])
+
+    def perform(self, node, (x, ), (z, )):
+        c = x.copy()
+        c.sum_duplicates()
+        z[0] = c
+
+    def grad(self, inputs, output_grad):
+        return [output_grad[0]]
+
+    def infer_shape(self, node, i0_shapes):
+        return i0_shapes
+sum_duplicates = SumDuplicates()
+"""Sum the entries of a sparse matrix stored at the same position, and
+re-sort its indices.
+
+A sparse matrix can hold several entries for the same position (its
+value is their sum). `sum_duplicates` returns the matrix in the
+canonical format built by `csr_from_dense` and `csc_from_dense`,
+except for the explicit zeros (see `remove0`).
+
+:param x: A sparse matrix.
+
+:return: The same as `x` with one entry per position and indices sorted.
+
+:note: The grad implemented is regular, i.e. not structured.
+"""
+
+
 class AddSS(gof.op.Op):
     #add(sparse, sparse).
     #see the doc of add() for more detail.
@@ -3675,10 +3840,10 @@ than `dot` because SamplingDot requires `x` to be a `m`x`k` matrix while
 
 :param x: Tensor matrix.
 :param y: Tensor matrix.
-:param p: Sparse matrix in csr format.
+:param p: Sparse matrix in csr or csc format.
 
-:return: A dense matrix containing the dot product of `x` by `y`.T only
-    where `p` is 1.
+:return: A sparse matrix in the format of `p` containing the dot product
+    of `x` by `y`.T only where `p` is 1.
 
 :note: The grad implemented is regular, i.e. not structured.
 """
@@ -3768,13 +3933,23 @@ class Dot(gof.op.Op):
     def grad(self, (x, y), (gz,)):
         assert _is_sparse_variable(x) or _is_sparse_variable(y)
         rval = []
+        # With structured grads, the grad of the sparse input of a
+        # product of matrices is only computed on its sparsity pattern.
+        structured = (config.sparse.structured_grad and
+                      x.ndim == 2 and y.ndim == 2)
 
         if _is_dense_variable(y):
-            rval.append(tensor.dot(gz, y.T))
+            if structured:
+                rval.append(sampling_dot(gz, y, sp_ones_like(x)))
+            else:
+                rval.append(tensor.dot(gz, y.T))
         else:
             rval.append(dot(gz, y.T))
         if _is_dense_variable(x):
-            rval.append(tensor.dot(x.T, gz))
+            if structured:
+                rval.append(sampling_dot(x.T, gz.T, sp_ones_like(y)))
+            else:
+                rval.append(tensor.dot(x.T, gz))
         else:
             rval.append(dot(x.T, gz))
 
@@ -3792,7 +3967,10 @@ def dot(x, y):
 
     :return: The dot product `x`.`y` in a dense format.
 
-    :note: The grad implemented is regular, i.e. not structured.
+    :note: The grad implemented is regular, i.e. not structured, unless
+           `config.sparse.structured_grad` is True and both inputs are
+           matrices. The grad with respect to a sparse matrix is then
+           structured and sparse.
     :note: At least one of `x` or `y` must be a sparse matrix.
     :note: At least one of `x` or `y` must be a sparse matrix.
     :note: When the operation has the form dot(csr_matrix, dense)
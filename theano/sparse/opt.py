@@ -14,6 +14,64 @@ from theano.sparse import basic as sparse
 
 _is_sparse_variable = sparse._is_sparse_variable
 
+# C code giving to each thread of the OpenMP versions of the products of
+# sparse and dense matrices a block of rows holding about the same number
+# of non-zero elements.
+_nnz_split_code = """
+#ifndef THEANO_SPARSE_NNZ_SPLIT
+#define THEANO_SPARSE_NNZ_SPLIT
+// First row of the block `part` out of `n_parts` blocks of consecutive
+// rows of a CSR matrix, with index pointer array `ptr` of stride `sptr`,
+// that hold about the same number of non-zero elements.
+static npy_intp sparse_nnz_split(const npy_int32* ptr, npy_intp sptr,
+                                 npy_intp n_rows, int part, int n_parts)
+{
+    if (part <= 0)
+        return 0;
+    if (part >= n_parts)
+        return n_rows;
+    const npy_int64 first = ptr[0];
+    const npy_int64 target = first +
+        ((npy_int64)(ptr[n_rows * sptr] - first) * part) / n_parts;
+    // Smallest row starting at or after the target
+    npy_intp lo = 0;
+    npy_intp hi = n_rows;
+    while (lo < hi)
+    {
+        const npy_intp mid = lo + (hi - lo) / 2;
+        if (ptr[mid * sptr] < target)
+            lo = mid + 1;
+        else
+            hi = mid;
+    }
+    return lo;
+}
+#endif
+"""
+
+# Declares the number of threads of the parallel region and the index of
+# the current one.
+_thread_ids_code = """
+                int n_threads = 1;
+                int thread = 0;
+#ifdef _OPENMP
+                n_threads = omp_get_num_threads();
+                thread = omp_get_thread_num();
+#endif
+"""
+
+
+def _omp_parallel(op, work):
+    """
+    Return the pragma starting the parallel region of the C code of `op`,
+    which runs on several threads when the number of multiplications
+    `work` (a C expression) reaches config.openmp_sparse_minsize.
+    """
+    if not op.openmp:
+        return ""
+    return "#pragma omp parallel if(%s >= %d)" % (
+        work, theano.config.openmp_sparse_minsize)
+
 # This is tested in tests/test_opt.py:test_local_csm_properties_csm
 @gof.local_optimizer([csm_properties])
 def local_csm_properties_csm(node):
@@ -187,6 +245,43 @@ def local_dense_from_sparse_sparse_from_dense(node):
             return inp.owner.inputs
 
 
+# Gradients of sparse graphs often go through dense matrices and back. The
+# two optimizations below remove these round trips, so the memory used by
+# the gradients scales with their number of non-zero elements.
+@register_canonicalize
+@register_specialize
+@gof.local_optimizer([sparse.SparseFromDense])
+def local_sparse_from_dense_dense_from_sparse(node):
+    """SparseFromDense(DenseFromSparse(x)) -> Remove0(SumDuplicates(x))
+
+    Like SparseFromDense, SumDuplicates sums the entries of `x` at the
+    same position and sorts its indices, then Remove0 drops the explicit
+    zeros.
+    """
+    if isinstance(node.op, sparse.SparseFromDense):
+        inp = node.inputs[0]
+        if inp.owner and isinstance(inp.owner.op, sparse.DenseFromSparse):
+            x = inp.owner.inputs[0]
+            if x.type == node.outputs[0].type:
+                return [sparse.remove0(sparse.sum_duplicates(x))]
+    return False
+
+
+@register_canonicalize
+@register_specialize
+@gof.local_optimizer([sparse.AddSD])
+def local_addsd_dense_from_sparse(node):
+    """AddSD(x, DenseFromSparse(y)) -> DenseFromSparse(AddSS(x, y))"""
+    if isinstance(node.op, sparse.AddSD):
+        x, y = node.inputs
+        if (y.owner and isinstance(y.owner.op, sparse.DenseFromSparse) and
+                node.outputs[0].broadcastable == (False, False)):
+            z = sparse.add_s_s(x, y.owner.inputs[0])
+            if z.dtype == node.outputs[0].dtype:
+                return [sparse.dense_from_sparse(z)]
+    return False
+
+
 @gof.local_optimizer([sparse.AddSD])
 def local_addsd_ccode(node):
     """
@@ -202,7 +297,7 @@ theano.compile.optdb.register('local_addsd_ccode',
                               61, 'fast_run')
 
 
-class StructuredDotCSC(gof.Op):
+class StructuredDotCSC(gof.OpenMPOp):
     """Structured Dot CSC is like dot, except that only the
     gradient wrt non-zero elements of the sparse matrix
     `a` are calculated and propagated.
@@ -217,6 +312,8 @@ class StructuredDotCSC(gof.Op):
 
     :note: The grad implemented is structured.
     :note: This op is used as an optimization for StructuredDot.
+    :note: With openmp, the columns of the output are split among the
+           threads, which all go over the non-zero elements of `a`.
     """
 
     def __eq__(self, other):
@@ -264,6 +361,8 @@ class StructuredDotCSC(gof.Op):
         typenum_z = node.outputs[0].type.dtype_specs()[2]  # retrieve dtype number
         typenum_a_val = node.inputs[0].type.dtype_specs()[2]  # retrieve dtype number
         typenum_b = node.inputs[4].type.dtype_specs()[2]  # retrieve dtype number
+        omp_parallel = _omp_parallel(self, "nnz * N")
+        thread_ids = _thread_ids_code
 
         rval = """
 
@@ -324,13 +423,19 @@ class StructuredDotCSC(gof.Op):
             // pointers to access actual data in the arrays passed as params.
             dtype_%(z)s*     __restrict__ Dz   = (dtype_%(z)s*)PyArray_DATA(%(z)s);
             const dtype_%(a_val)s* __restrict__ Dval = (dtype_%(a_val)s*)PyArray_DATA(%(a_val)s);
-            const npy_int32 * __restrict__ Dind = (npy_int32*)PyArray_DATA(%(a_ind)s;
-            const npy_int32 * __restrict__ Dptr = (npy_int32*)PyArray_DATA(%(a_ptr)s;
+            const npy_int32 * __restrict__ Dind = (npy_int32*)PyArray_DATA(%(a_ind)s);
+            const npy_int32 * __restrict__ Dptr = (npy_int32*)PyArray_DATA(%(a_ptr)s);
 
-            //npy_intp nnz = PyArray_DIMS(%(a_ind)s)[0];
+            const npy_intp nnz = Dptr[K * Sptr] - Dptr[0];
 
-            //clear the output array
-            memset(Dz, 0, M*N*sizeof(dtype_%(z)s));
+            // Check the row indices before the loop, which can not fail
+            // inside the parallel region
+            for (npy_intp m_idx = Dptr[0]; m_idx < Dptr[K * Sptr]; ++m_idx)
+            {
+                //RESOLVE: a.shape[0] equals z.shape[0], why is this not an equality constraint?
+                if (Dind[m_idx * Sind] < 0 || Dind[m_idx * Sind] >= M)
+                {PyErr_SetString(PyExc_NotImplementedError, "illegal row index in a"); %(fail)s;}
+            }
 
             //iterate over the sparse array, making the most of an entry wherever we find it.
             //
@@ -345,39 +450,54 @@ class StructuredDotCSC(gof.Op):
             //     for n
             //        z[m, n] += a[m, k] * b[k, n]
 
-            // loop over inner dimension
-            for (npy_int32 k = 0; k < K; ++k)
+            // The columns n_begin to n_end - 1 of the output are computed
+            // by the current thread
+            %(omp_parallel)s
             {
-                // get pointer to k-th row of dense matrix
-                const dtype_%(b)s* __restrict__ bk = (dtype_%(b)s*)(PyArray_BYTES(%(b)s) + PyArray_STRIDES(%(b)s)[0] * k);
+                %(thread_ids)s
+                const npy_intp n_begin = (N * thread) / n_threads;
+                const npy_intp n_end = (N * (thread + 1)) / n_threads;
 
-                // loop over sparse column indices through index pointer array
-                // (amounts to looping over rows M of sparse matrix)
-
-                for (npy_int32 m_idx = Dptr[k * Sptr]; m_idx < Dptr[(k+1) * Sptr]; ++m_idx)
+                //clear the output columns
+                for (npy_intp m = 0; m < M; ++m)
                 {
-                    npy_int32 m = Dind[m_idx * Sind]; // row index of non-null value for column K
-                    const dtype_%(a_val)s Amk = Dval[m_idx * Sval]; // actual value at that location
-
-                    // pointer to m-th row of the output matrix Z
                     dtype_%(z)s* __restrict__ zm = (dtype_%(z)s*)(PyArray_BYTES(%(z)s) + PyArray_STRIDES(%(z)s)[0] * m);
+                    for (npy_intp n = n_begin; n < n_end; ++n)
+                    {
+                        zm[n*Szn] = 0;
+                    }
+                }
 
-                    //RESOLVE: a.shape[0] equals z.shape[0], why is this not an equality constraint?
-                    if (m >= PyArray_DIMS(%(z)s)[0])
-                    {PyErr_SetString(PyExc_NotImplementedError, "illegal row index in a"); %(fail)s;}
+                // loop over inner dimension
+                for (npy_int32 k = 0; k < K; ++k)
+                {
+                    // get pointer to k-th row of dense matrix
+                    const dtype_%(b)s* __restrict__ bk = (dtype_%(b)s*)(PyArray_BYTES(%(b)s) + PyArray_STRIDES(%(b)s)[0] * k);
 
-                    // loop over final dimension (cols of dense matrix) and perform dot product
-                    if ((Szn == 1) && (Sbn == 1)) {
-                        for(npy_int32 n = 0; n < N; ++n)
-                        {
-                            zm[n] += Amk * bk[n];
-                        }
-                    }
-                    else
+                    // loop over sparse column indices through index pointer array
+                    // (amounts to looping over rows M of sparse matrix)
+
+                    for (npy_int32 m_idx = Dptr[k * Sptr]; m_idx < Dptr[(k+1) * Sptr]; ++m_idx)
                     {
-                        for(npy_int32 n = 0; n < N; ++n)
+                        npy_int32 m = Dind[m_idx * Sind]; // row index of non-null value for column K
+                        const dtype_%(a_val)s Amk = Dval[m_idx * Sval]; // actual value at that location
+
+                        // pointer to m-th row of the output matrix Z
+                        dtype_%(z)s* __restrict__ zm = (dtype_%(z)s*)(PyArray_BYTES(%(z)s) + PyArray_STRIDES(%(z)s)[0] * m);
+
+                        // loop over final dimension (cols of dense matrix) and perform dot product
+                        if ((Szn == 1) && (Sbn == 1)) {
+                            for(npy_intp n = n_begin; n < n_end; ++n)
+                            {
+                                zm[n] += Amk * bk[n];
+                            }
+                        }
+                        else
                         {
-                            zm[n*Szn] += Amk * bk[n*Sbn];
+                            for(npy_intp n = n_begin; n < n_end; ++n)
+                            {
+                                zm[n*Szn] += Amk * bk[n*Sbn];
+                            }
                         }
                     }
                 }
@@ -388,11 +508,11 @@ class StructuredDotCSC(gof.Op):
         return rval
 
     def c_code_cache_version(self):
-        return (2,)
+        return (3, self.openmp, theano.config.openmp_sparse_minsize)
 sd_csc = StructuredDotCSC()
 
 
-class StructuredDotCSR(gof.Op):
+class StructuredDotCSR(gof.OpenMPOp):
     """Structured Dot CSR is like dot, except that only the
     gradient wrt non-zero elements of the sparse matrix
     `a` are calculated and propagated.
@@ -407,6 +527,8 @@ class StructuredDotCSR(gof.Op):
 
     :note: The grad implemented is structured.
     :note: This op is used as an optimization for StructuredDot.
+    :note: With openmp, the rows of `a` are split among the threads in
+           blocks holding about the same number of non-zero elements.
     """
 
     def __eq__(self, other):
@@ -450,6 +572,8 @@ class StructuredDotCSR(gof.Op):
         """
         # retrieve dtype number
         typenum_z = tensor.TensorType(self.dtype_out, []).dtype_specs()[2]
+        omp_parallel = _omp_parallel(self, "nnz * N")
+        thread_ids = _thread_ids_code
         if node.inputs[0].type.dtype in ('complex64', 'complex128'):
             raise NotImplementedError('Complex types are not supported for a_val')
         if node.inputs[3].type.dtype in ('complex64', 'complex128'):
@@ -503,10 +627,7 @@ class StructuredDotCSR(gof.Op):
             const npy_int32 * __restrict__ Dind = (npy_int32*)PyArray_DATA(%(a_ind)s);
             const npy_int32 * __restrict__ Dptr = (npy_int32*)PyArray_DATA(%(a_ptr)s);
 
-            //npy_intp nnz = PyArray_DIMS(%(a_ind)s)[0];
-
-            //clear the output array
-            memset(Dz, 0, M*N*sizeof(dtype_%(z)s));
+            const npy_intp nnz = Dptr[M * Sptr] - Dptr[0];
 
             //iterate over the sparse array, making the most of an entry wherever we find it.
             // Normal matrix matrix multiply:
@@ -520,26 +641,40 @@ class StructuredDotCSR(gof.Op):
             //     for n
             //        z[m, n] += a[m, k] * b[k, n]
 
-            // loop over inner dimension
-            for (npy_int64 m = 0; m < M; ++m)
+            // The rows m_begin to m_end - 1 are computed by the current
+            // thread
+            %(omp_parallel)s
             {
-                // pointer to m-th row of the output matrix Z
-                dtype_%(z)s* __restrict__ zm = (dtype_%(z)s*)(PyArray_BYTES(%(z)s) + PyArray_STRIDES(%(z)s)[0] * m);
+                %(thread_ids)s
+                const npy_intp m_begin = sparse_nnz_split(Dptr, Sptr, M, thread, n_threads);
+                const npy_intp m_end = sparse_nnz_split(Dptr, Sptr, M, thread + 1, n_threads);
 
-                // loop over sparse rows indices through index pointer array
-                // (amounts to looping over cols k of sparse matrix)
-                for (npy_int32 k_idx = Dptr[m * Sptr]; k_idx < Dptr[(m+1) * Sptr]; ++k_idx)
+                for (npy_intp m = m_begin; m < m_end; ++m)
                 {
-                    npy_int32 k = Dind[k_idx * Sind]; // col index of non-null value for row m
-                    const dtype_%(a_val)s Amk = Dval[k_idx * Sval]; // actual value at that location
+                    // pointer to m-th row of the output matrix Z
+                    dtype_%(z)s* __restrict__ zm = (dtype_%(z)s*)(PyArray_BYTES(%(z)s) + PyArray_STRIDES(%(z)s)[0] * m);
 
-                    // get pointer to k-th row of dense matrix
-                    const dtype_%(b)s* __restrict__ bk = (dtype_%(b)s*)(PyArray_BYTES(%(b)s) + PyArray_STRIDES(%(b)s)[0] * k);
+                    //clear the output row
+                    for(npy_intp n = 0; n < N; ++n)
+                    {
+                        zm[n*Szn] = 0;
+                    }
 
-                    // loop over final dimension (cols of dense matrix) and perform dot product
-                    for(npy_int32 n = 0; n < N; ++n)
+                    // loop over sparse rows indices through index pointer array
+                    // (amounts to looping over cols k of sparse matrix)
+                    for (npy_int32 k_idx = Dptr[m * Sptr]; k_idx < Dptr[(m+1) * Sptr]; ++k_idx)
                     {
-                        zm[n*Szn] += Amk * bk[n*Sbn];
+                        npy_int32 k = Dind[k_idx * Sind]; // col index of non-null value for row m
+                        const dtype_%(a_val)s Amk = Dval[k_idx * Sval]; // actual value at that location
+
+                        // get pointer to k-th row of dense matrix
+                        const dtype_%(b)s* __restrict__ bk = (dtype_%(b)s*)(PyArray_BYTES(%(b)s) + PyArray_STRIDES(%(b)s)[0] * k);
+
+                        // loop over final dimension (cols of dense matrix) and perform dot product
+                        for(npy_intp n = 0; n < N; ++n)
+                        {
+                            zm[n*Szn] += Amk * bk[n*Sbn];
+                        }
                     }
                 }
             }
@@ -547,8 +682,11 @@ class StructuredDotCSR(gof.Op):
 
         """ % dict(locals(), **sub)
 
+    def c_support_code(self):
+        return _nnz_split_code
+
     def c_code_cache_version(self):
-        return (1,)
+        return (2, self.openmp, theano.config.openmp_sparse_minsize)
 sd_csr = StructuredDotCSR()
 
 
@@ -576,7 +714,7 @@ def local_structured_dot(node):
 #register_specialize(local_structured_dot)
 
 
-class UsmmCscDense(gof.Op):
+class UsmmCscDense(gof.OpenMPOp):
     """Performs the expression is `alpha` * `x` `y` + `z`.
 
     :param x: Matrix variable.
@@ -589,9 +727,12 @@ class UsmmCscDense(gof.Op):
     :note: The grad is not implemented for this op.
     :note: Optimized version os Usmm when `x` is in csc format and
            `y` is dense.
+    :note: With openmp, the columns of the output are split among the
+           threads, which all go over the non-zero elements of `x`.
     """
 
-    def __init__(self, inplace):
+    def __init__(self, inplace, openmp=None):
+        super(UsmmCscDense, self).__init__(openmp=openmp)
         self.inplace = inplace
         if inplace:
             self.destroy_map = {0: [6]}
@@ -655,7 +796,8 @@ class UsmmCscDense(gof.Op):
         return blas.ldflags()
 
     def c_compile_args(self):
-        return blas.ldflags(libs=False, flags=True)
+        return (blas.ldflags(libs=False, flags=True) +
+                super(UsmmCscDense, self).c_compile_args())
 
     def c_lib_dirs(self):
         return blas.ldflags(libs=False, libs_dir=True)
@@ -688,6 +830,8 @@ class UsmmCscDense(gof.Op):
         typenum_zn = node.outputs[0].type.dtype_specs()[2]
 
         inplace = int(self.inplace)
+        omp_parallel = _omp_parallel(self, "nnz * N")
+        thread_ids = _thread_ids_code
 
         rval = """
 
@@ -792,26 +936,38 @@ class UsmmCscDense(gof.Op):
                 }
             }
 
-            for (npy_int32 k = 0; k < K; ++k)
+            const npy_intp nnz = Dptr[K * Sptr] - Dptr[0];
+            int inc_y = Sy;
+            int inc_z = Szn;
+
+            // The columns n_begin to n_end - 1 of the output are computed
+            // by the current thread
+            %(omp_parallel)s
             {
-                for (npy_int32 m_idx = Dptr[k * Sptr]; m_idx < Dptr[(k+1)*Sptr]; ++m_idx)
+                %(thread_ids)s
+                const npy_intp n_begin = (N * thread) / n_threads;
+                const npy_intp n_end = (N * (thread + 1)) / n_threads;
+                int n_cols = n_end - n_begin;
+
+                for (npy_int32 k = 0; k < K && n_cols > 0; ++k)
                 {
-                    const npy_int32 m = Dind[m_idx * Sind]; // row index of non-null value for column K
+                    for (npy_int32 m_idx = Dptr[k * Sptr]; m_idx < Dptr[(k+1)*Sptr]; ++m_idx)
+                    {
+                        const npy_int32 m = Dind[m_idx * Sind]; // row index of non-null value for column K
 
-                    const dtype_%(x_val)s Amk = alpha * Dval[m_idx * Sval]; // actual value at that location
+                        const dtype_%(x_val)s Amk = alpha * Dval[m_idx * Sval]; // actual value at that location
 
-                    dtype_%(y)s* y_row = (dtype_%(y)s*)(PyArray_BYTES(%(y)s) + PyArray_STRIDES(%(y)s)[0] * k);
-                    // axpy expects pointer to the beginning of memory arrays,
-                    // so when the stride is negative, we need to get the
-                    // last element
-                    if (Sy < 0)
-                        y_row += (K - 1) * Sy;
+                        dtype_%(y)s* y_row = (dtype_%(y)s*)(PyArray_BYTES(%(y)s) + PyArray_STRIDES(%(y)s)[0] * k);
+                        // axpy expects pointer to the beginning of memory arrays,
+                        // so when the stride is negative, we need to get the
+                        // last element
+                        y_row += (Sy < 0 ? n_end - 1 : n_begin) * Sy;
 
-                    dtype_%(zn)s* z_row = (dtype_%(zn)s*)(PyArray_BYTES(%(zn)s) + PyArray_STRIDES(%(zn)s)[0] * m);
-                    if (Szn < 0)
-                        z_row += (N - 1) * Szn;
+                        dtype_%(zn)s* z_row = (dtype_%(zn)s*)(PyArray_BYTES(%(zn)s) + PyArray_STRIDES(%(zn)s)[0] * m);
+                        z_row += (Szn < 0 ? n_end - 1 : n_begin) * Szn;
 
-                    %(axpy)s((int*)&N, (%(conv_type)s*)&Amk, (%(conv_type)s*)y_row, (int*)&Sy, (%(conv_type)s*)z_row, (int*)&Szn);
+                        %(axpy)s(&n_cols, (%(conv_type)s*)&Amk, (%(conv_type)s*)y_row, &inc_y, (%(conv_type)s*)z_row, &inc_z);
+                    }
                 }
             }
         }
@@ -820,7 +976,8 @@ class UsmmCscDense(gof.Op):
         return rval
 
     def c_code_cache_version(self):
-        return (1, blas.blas_header_version())
+        return (2, blas.blas_header_version(), self.openmp,
+                theano.config.openmp_sparse_minsize)
 usmm_csc_dense = UsmmCscDense(inplace=False)
 usmm_csc_dense_inplace = UsmmCscDense(inplace=True)
 
@@ -1586,7 +1743,7 @@ def local_structured_add_s_v(node):
 register_specialize(local_structured_add_s_v, 'cxx_only')
 
 
-class SamplingDotCSR(gof.Op):
+class SamplingDotCSR(gof.OpenMPOp):
     """Operand optimized for calculating the dot product dot(`x`, `y`.T) = `z`
     when you only want to calculate a subset of `z`.
 
@@ -1618,6 +1775,8 @@ class SamplingDotCSR(gof.Op):
            in the graph to be able to call blas function as they don't
            allow mixed dtype.
     :note: This op is used as an optimization for SamplingDot.
+    :note: With openmp, the rows of `p` are split among the threads in
+           blocks holding about the same number of non-zero elements.
     """
 
     def __eq__(self, other):
@@ -1654,16 +1813,18 @@ class SamplingDotCSR(gof.Op):
         ])
 
     def c_code_cache_version(self):
-        return (2, blas.blas_header_version())
+        return (3, blas.blas_header_version(), self.openmp,
+                theano.config.openmp_sparse_minsize)
 
     def c_support_code(self):
-        return blas.blas_header_text()
+        return blas.blas_header_text() + _nnz_split_code
 
     def c_libraries(self):
         return blas.ldflags()
 
     def c_compile_args(self):
-        return blas.ldflags(libs=False, flags=True)
+        return (blas.ldflags(libs=False, flags=True) +
+                super(SamplingDotCSR, self).c_compile_args())
 
     def c_lib_dirs(self):
         return blas.ldflags(libs=False, libs_dir=True)
@@ -1702,6 +1863,8 @@ class SamplingDotCSR(gof.Op):
                                        []).dtype_specs()[2]
         typenum_zp = tensor.TensorType(node.outputs[2].dtype,
                                        []).dtype_specs()[2]
+        omp_parallel = _omp_parallel(self, "nnz * K")
+        thread_ids = _thread_ids_code
 
         rval = """
         if (PyArray_NDIM(%(x)s) != 2) {
@@ -1797,15 +1960,26 @@ PyErr_SetString(PyExc_NotImplementedError, "rank(y) != 2"); %(fail)s;}
             memcpy(Dzi, Dpi, PyArray_DIMS(%(p_ind)s)[0]*sizeof(dtype_%(p_ind)s));
             memcpy(Dzp, Dpp, PyArray_DIMS(%(p_ptr)s)[0]*sizeof(dtype_%(p_ptr)s));
 
-            for (npy_int32 m = 0; m < M; ++m) {
-                for (npy_int32 n_idx = Dpp[m * Sdpp]; n_idx < Dpp[(m+1)*Sdpp]; ++n_idx) {
-                    const npy_int32 n = Dpi[n_idx * Sdpi]; // row index of non-null value for column K
+            const npy_intp nnz = Dpp[M * Sdpp] - Dpp[0];
 
-                    const dtype_%(x)s* x_row = (dtype_%(x)s*)(PyArray_BYTES(%(x)s) + PyArray_STRIDES(%(x)s)[0] * m);
+            // The rows m_begin to m_end - 1 are computed by the current
+            // thread
+            %(omp_parallel)s
+            {
+                %(thread_ids)s
+                const npy_intp m_begin = sparse_nnz_split((const npy_int32*)Dpp, Sdpp, M, thread, n_threads);
+                const npy_intp m_end = sparse_nnz_split((const npy_int32*)Dpp, Sdpp, M, thread + 1, n_threads);
+
+                for (npy_intp m = m_begin; m < m_end; ++m) {
+                    for (npy_int32 n_idx = Dpp[m * Sdpp]; n_idx < Dpp[(m+1)*Sdpp]; ++n_idx) {
+                        const npy_int32 n = Dpi[n_idx * Sdpi]; // row index of non-null value for column K
 
-                    const dtype_%(y)s* y_col = (dtype_%(y)s*)(PyArray_BYTES(%(y)s) + PyArray_STRIDES(%(y)s)[0] * n);
+                        const dtype_%(x)s* x_row = (dtype_%(x)s*)(PyArray_BYTES(%(x)s) + PyArray_STRIDES(%(x)s)[0] * m);
 
-                    Dzd[n_idx * Sdzd] = Dpd[n_idx * Sdpd] * %(cdot)s((int*)&K, (const %(conv_type)s*)x_row, (int*)&Sdx, (const %(conv_type)s*)y_col, (int*)&Sdy);
+                        const dtype_%(y)s* y_col = (dtype_%(y)s*)(PyArray_BYTES(%(y)s) + PyArray_STRIDES(%(y)s)[0] * n);
+
+                        Dzd[n_idx * Sdzd] = Dpd[n_idx * Sdpd] * %(cdot)s((int*)&K, (const %(conv_type)s*)x_row, (int*)&Sdx, (const %(conv_type)s*)y_col, (int*)&Sdy);
+                    }
                 }
             }
         }
@@ -1823,15 +1997,1351 @@ def local_sampling_dot_csr(node):
         return
     if node.op == sparse.sampling_dot:
         x, y, p = node.inputs
+        p_data, p_ind, p_ptr, p_shape = sparse.csm_properties(p)
         if p.type.format == 'csr':
-            p_data, p_ind, p_ptr, p_shape = sparse.csm_properties(p)
-
             z_data, z_ind, z_ptr = sampling_dot_csr(x, y, p_data,
                 p_ind, p_ptr, p_shape[1])
 
             return [sparse.CSR(z_data, z_ind, z_ptr, p_shape)]
+        elif p.type.format == 'csc':
+            # The transpose of the result is the sampling dot of `y` and
+            # `x` with the transpose of `p`, whose csr properties are the
+            # csc properties of `p`.
+            z_data, z_ind, z_ptr = sampling_dot_csr(y, x, p_data,
+                p_ind, p_ptr, p_shape[0])
+
+            return [sparse.CSC(z_data, z_ind, z_ptr, p_shape)]
     return False
 
 register_specialize(local_sampling_dot_csr,
                     'cxx_only',
                     name='local_sampling_dot_csr')
+
+
+# C code shared by the C implementations of the sparse ops below, which
+# work on the data, indices and indptr of matrices in csr or csc format.
+_csx_support_code = """
+#ifndef THEANO_SPARSE_CSX_SUPPORT
+#define THEANO_SPARSE_CSX_SUPPORT
+// Check that indptr is non-decreasing and that it only points into the
+// first nnz_max elements of data and indices.
+static int csx_check_indptr(const npy_int32* ptr, npy_intp Sptr,
+                            npy_intp n_major, npy_intp nnz_max)
+{
+    if (ptr[0] < 0 || ptr[n_major * Sptr] > nnz_max) {
+        PyErr_SetString(PyExc_ValueError,
+                        "indptr points outside of data or indices");
+        return 1;
+    }
+    for (npy_intp i = 0; i < n_major; ++i) {
+        if (ptr[i * Sptr] > ptr[(i + 1) * Sptr]) {
+            PyErr_SetString(PyExc_ValueError, "indptr is not sorted");
+            return 1;
+        }
+    }
+    return 0;
+}
+
+// Bring the bounds of the slice start:stop over n elements in [0, n], as
+// python does.
+static void csx_canonical_slice(npy_int64* start, npy_int64* stop,
+                                npy_intp n)
+{
+    if (*start < 0) {
+        *start += n;
+        if (*start < 0)
+            *start = 0;
+    } else if (*start > n) {
+        *start = n;
+    }
+    if (*stop < 0) {
+        *stop += n;
+        if (*stop < 0)
+            *stop = 0;
+    } else if (*stop > n) {
+        *stop = n;
+    }
+    if (*stop < *start)
+        *stop = *start;
+}
+
+// Make *out a contiguous vector of n elements of type typenum, reusing it
+// if it already is one.
+static int csx_alloc_vector(PyArrayObject** out, npy_intp n, int typenum)
+{
+    if (*out && PyArray_NDIM(*out) == 1 && PyArray_DIMS(*out)[0] == n &&
+        PyArray_TYPE(*out) == typenum && PyArray_ISCONTIGUOUS(*out))
+        return 0;
+    Py_XDECREF(*out);
+    *out = (PyArrayObject*) PyArray_SimpleNew(1, &n, typenum);
+    if (!*out) {
+        PyErr_SetString(PyExc_MemoryError,
+                        "Could not allocate output memory.");
+        return 1;
+    }
+    return 0;
+}
+#endif
+"""
+
+
+def _csx_check_code(data, indices, indptr, fail):
+    """Return C code checking the types of the properties of a sparse
+    matrix given to a C op."""
+    return """
+        if (PyArray_NDIM(%(data)s) != 1 || PyArray_NDIM(%(indices)s) != 1 ||
+            PyArray_NDIM(%(indptr)s) != 1) {
+            PyErr_SetString(PyExc_NotImplementedError,
+                            "rank(data), rank(indices) and rank(indptr) must be 1");
+            %(fail)s;
+        }
+        if (PyArray_TYPE(%(indices)s) != NPY_INT32 ||
+            PyArray_TYPE(%(indptr)s) != NPY_INT32) {
+            PyErr_SetString(PyExc_NotImplementedError,
+                            "indices and indptr must be int32");
+            %(fail)s;
+        }
+        if (PyArray_DIMS(%(indptr)s)[0] < 1) {
+            PyErr_SetString(PyExc_ValueError, "indptr is empty");
+            %(fail)s;
+        }
+    """ % locals()
+
+
+def _csx_declare_code(prefix, data, indices, indptr, fail):
+    """Return C code declaring pointers and strides to the properties of a
+    sparse matrix, named after `prefix`, and checking its indptr.
+
+    It declares `<prefix>_d`, `<prefix>_i` and `<prefix>_p`, with the strides
+    `S<prefix>_d`, `S<prefix>_i` and `S<prefix>_p` in number of elements,
+    and the number of rows (csr) or columns (csc) `<prefix>_n_major`.
+    """
+    return """
+            const dtype_%(data)s* const __restrict__ %(prefix)s_d = (dtype_%(data)s*)PyArray_DATA(%(data)s);
+            const npy_int32* const __restrict__ %(prefix)s_i = (npy_int32*)PyArray_DATA(%(indices)s);
+            const npy_int32* const __restrict__ %(prefix)s_p = (npy_int32*)PyArray_DATA(%(indptr)s);
+            const npy_intp S%(prefix)s_d = PyArray_STRIDES(%(data)s)[0] / PyArray_DESCR(%(data)s)->elsize;
+            const npy_intp S%(prefix)s_i = PyArray_STRIDES(%(indices)s)[0] / PyArray_DESCR(%(indices)s)->elsize;
+            const npy_intp S%(prefix)s_p = PyArray_STRIDES(%(indptr)s)[0] / PyArray_DESCR(%(indptr)s)->elsize;
+            const npy_intp %(prefix)s_n_major = PyArray_DIMS(%(indptr)s)[0] - 1;
+            if (csx_check_indptr(%(prefix)s_p, S%(prefix)s_p, %(prefix)s_n_major,
+                                 PyArray_DIMS(%(data)s)[0] < PyArray_DIMS(%(indices)s)[0] ?
+                                 PyArray_DIMS(%(data)s)[0] : PyArray_DIMS(%(indices)s)[0])) {
+                %(fail)s;
+            }
+    """ % locals()
+
+
+class ElemwiseSSCSx(gof.Op):
+    """Element wise addition or multiplication of two sparse matrices in
+    the same format.
+
+    :param x_data: Sparse matrix data.
+    :param x_indices: Sparse matrix indices.
+    :param x_indptr: Sparse matrix indptr.
+    :param x_n: Number of columns of `x` in csr format, of rows in csc
+                format.
+    :param y_data: Sparse matrix data.
+    :param y_indices: Sparse matrix indices.
+    :param y_indptr: Sparse matrix indptr.
+    :param y_n: Number of columns of `y` in csr format, of rows in csc
+                format.
+
+    :return: The data, indices and indptr of the result, in the format of
+             the inputs.
+
+    :note: As in scipy, the result does not hold the elements equal to
+           zero. Its indices are sorted if the ones of both inputs are.
+    :note: This op is used as an optimization for AddSS and MulSS.
+    """
+
+    def __init__(self, operation):
+        if operation not in ('add', 'mul'):
+            raise ValueError("operation must be one of: 'add', 'mul'",
+                             operation)
+        self.operation = operation
+
+    def __eq__(self, other):
+        return type(self) == type(other) and self.operation == other.operation
+
+    def __hash__(self):
+        return hash(type(self)) ^ hash(self.operation)
+
+    def __str__(self):
+        return "%s{%s}" % (self.__class__.__name__, self.operation)
+
+    def make_node(self, x_data, x_indices, x_indptr, x_n,
+                  y_data, y_indices, y_indptr, y_n):
+        inputs = map(tensor.as_tensor_variable,
+                     [x_data, x_indices, x_indptr, x_n,
+                      y_data, y_indices, y_indptr, y_n])
+        out_dtype = scalar.upcast(inputs[0].type.dtype, inputs[4].type.dtype)
+        return gof.Apply(self, inputs,
+                         [tensor.tensor(out_dtype, (False,)),
+                          tensor.ivector(), tensor.ivector()])
+
+    def c_support_code(self):
+        return _csx_support_code
+
+    def c_code_cache_version(self):
+        return (1,)
+
+    def c_code(self, node, name, inputs, outputs, sub):
+        (x_data, x_ind, x_ptr, x_n, y_data, y_ind, y_ptr, y_n) = inputs
+        z_data, z_ind, z_ptr = outputs
+        for var in [node.inputs[0], node.inputs[4]]:
+            if var.type.dtype in ('complex64', 'complex128'):
+                raise NotImplementedError('Complex types are not supported')
+        fail = sub['fail']
+        typenum_z = node.outputs[0].type.dtype_specs()[2]
+        operator = {'add': '+', 'mul': '*'}[self.operation]
+        x_checks = _csx_check_code(x_data, x_ind, x_ptr, fail)
+        y_checks = _csx_check_code(y_data, y_ind, y_ptr, fail)
+        x_declare = _csx_declare_code('x', x_data, x_ind, x_ptr, fail)
+        y_declare = _csx_declare_code('y', y_data, y_ind, y_ptr, fail)
+        # Add the element r of index j to the result, if it is not zero
+        emit = """if (r != 0) {
+                            tmp_i[nnz] = j;
+                            tmp_d[nnz] = r;
+                            ++nnz;
+                        }"""
+
+        return """
+        %(x_checks)s
+        %(y_checks)s
+        { //makes it compile even though labels jump over variable definitions.
+            %(x_declare)s
+            %(y_declare)s
+            const npy_intp n_major = x_n_major;
+            const npy_intp n_minor = ((dtype_%(x_n)s*)PyArray_DATA(%(x_n)s))[0];
+            if (y_n_major != n_major ||
+                ((dtype_%(y_n)s*)PyArray_DATA(%(y_n)s))[0] != n_minor) {
+                PyErr_SetString(PyExc_ValueError,
+                                "The shapes of the sparse matrices do not match");
+                %(fail)s;
+            }
+            if (csx_alloc_vector(&%(z_ptr)s, n_major + 1, NPY_INT32)) {
+                %(fail)s;
+            }
+            npy_int32* const __restrict__ zp = (npy_int32*)PyArray_DATA(%(z_ptr)s);
+
+            // The result is built in buffers that can hold both inputs,
+            // then copied in outputs of the right size.
+            const npy_intp cap = (x_p[n_major * Sx_p] - x_p[0]) +
+                                 (y_p[n_major * Sy_p] - y_p[0]) + 1;
+            npy_int32* tmp_i = (npy_int32*)malloc(cap * sizeof(npy_int32));
+            dtype_%(z_data)s* tmp_d = (dtype_%(z_data)s*)malloc(cap * sizeof(dtype_%(z_data)s));
+            // Dense accumulators of the rows whose indices are not sorted,
+            // with the list of the indices they hold.
+            npy_intp* next = (npy_intp*)malloc((n_minor + 1) * sizeof(npy_intp));
+            dtype_%(x_data)s* A = (dtype_%(x_data)s*)calloc(n_minor + 1, sizeof(dtype_%(x_data)s));
+            dtype_%(y_data)s* B = (dtype_%(y_data)s*)calloc(n_minor + 1, sizeof(dtype_%(y_data)s));
+            if (!tmp_i || !tmp_d || !next || !A || !B) {
+                free(tmp_i); free(tmp_d); free(next); free(A); free(B);
+                PyErr_NoMemory();
+                %(fail)s;
+            }
+            for (npy_intp j = 0; j < n_minor; ++j)
+                next[j] = -1;
+
+            npy_intp nnz = 0;
+            int bad_index = 0;
+            zp[0] = 0;
+            for (npy_intp i = 0; i < n_major && !bad_index; ++i) {
+                const npy_intp x_begin = x_p[i * Sx_p], x_end = x_p[(i + 1) * Sx_p];
+                const npy_intp y_begin = y_p[i * Sy_p], y_end = y_p[(i + 1) * Sy_p];
+                int sorted = 1;
+                for (npy_intp k = x_begin; k < x_end; ++k) {
+                    const npy_intp j = x_i[k * Sx_i];
+                    if (j < 0 || j >= n_minor)
+                        bad_index = 1;
+                    if (k > x_begin && j <= x_i[(k - 1) * Sx_i])
+                        sorted = 0;
+                }
+                for (npy_intp k = y_begin; k < y_end; ++k) {
+                    const npy_intp j = y_i[k * Sy_i];
+                    if (j < 0 || j >= n_minor)
+                        bad_index = 1;
+                    if (k > y_begin && j <= y_i[(k - 1) * Sy_i])
+                        sorted = 0;
+                }
+                if (bad_index)
+                    break;
+
+                if (sorted) {
+                    // Merge the two rows
+                    npy_intp a = x_begin, b = y_begin;
+                    while (a < x_end || b < y_end) {
+                        const npy_intp ja = a < x_end ? x_i[a * Sx_i] : n_minor;
+                        const npy_intp jb = b < y_end ? y_i[b * Sy_i] : n_minor;
+                        npy_intp j;
+                        dtype_%(z_data)s r;
+                        if (ja == jb) {
+                            j = ja;
+                            r = ((dtype_%(z_data)s)x_d[a * Sx_d]) %(operator)s ((dtype_%(z_data)s)y_d[b * Sy_d]);
+                            ++a;
+                            ++b;
+                        } else if (ja < jb) {
+                            j = ja;
+                            r = ((dtype_%(z_data)s)x_d[a * Sx_d]) %(operator)s ((dtype_%(z_data)s)0);
+                            ++a;
+                        } else {
+                            j = jb;
+                            r = ((dtype_%(z_data)s)0) %(operator)s ((dtype_%(z_data)s)y_d[b * Sy_d]);
+                            ++b;
+                        }
+                        %(emit)s
+                    }
+                } else {
+                    // Accumulate the two rows, which may hold duplicates,
+                    // in A and B
+                    npy_intp head = -2;
+                    npy_intp length = 0;
+                    for (npy_intp k = x_begin; k < x_end; ++k) {
+                        const npy_intp j = x_i[k * Sx_i];
+                        A[j] += x_d[k * Sx_d];
+                        if (next[j] == -1) {
+                            next[j] = head;
+                            head = j;
+                            ++length;
+                        }
+                    }
+                    for (npy_intp k = y_begin; k < y_end; ++k) {
+                        const npy_intp j = y_i[k * Sy_i];
+                        B[j] += y_d[k * Sy_d];
+                        if (next[j] == -1) {
+                            next[j] = head;
+                            head = j;
+                            ++length;
+                        }
+                    }
+                    for (npy_intp l = 0; l < length; ++l) {
+                        const npy_intp j = head;
+                        const dtype_%(z_data)s r = ((dtype_%(z_data)s)A[j]) %(operator)s ((dtype_%(z_data)s)B[j]);
+                        %(emit)s
+                        head = next[j];
+                        next[j] = -1;
+                        A[j] = 0;
+                        B[j] = 0;
+                    }
+                }
+                zp[i + 1] = nnz;
+            }
+            free(next);
+            free(A);
+            free(B);
+            if (bad_index) {
+                free(tmp_i);
+                free(tmp_d);
+                PyErr_SetString(PyExc_ValueError, "index out of bounds");
+                %(fail)s;
+            }
+            if (csx_alloc_vector(&%(z_ind)s, nnz, NPY_INT32) ||
+                csx_alloc_vector(&%(z_data)s, nnz, %(typenum_z)s)) {
+                free(tmp_i);
+                free(tmp_d);
+                %(fail)s;
+            }
+            memcpy(PyArray_DATA(%(z_ind)s), tmp_i, nnz * sizeof(npy_int32));
+            memcpy(PyArray_DATA(%(z_data)s), tmp_d, nnz * sizeof(dtype_%(z_data)s));
+            free(tmp_i);
+            free(tmp_d);
+        }
+        """ % dict(locals(), **sub)
+add_s_s_csx = ElemwiseSSCSx('add')
+mul_s_s_csx = ElemwiseSSCSx('mul')
+
+
+# register a specialization to replace AddSS -> ElemwiseSSCSx{add} and
+# MulSS -> ElemwiseSSCSx{mul}
+@gof.local_optimizer([sparse.add_s_s, sparse.mul_s_s])
+def local_elemwise_s_s_csx(node):
+    if node.op in (sparse.add_s_s, sparse.mul_s_s):
+        x, y = node.inputs
+        if x.type.format != y.type.format:
+            return False
+        if (x.type.dtype in sparse.complex_dtypes or
+                y.type.dtype in sparse.complex_dtypes):
+            return False
+        if x.type.format == 'csr':
+            CSx = sparse.CSR
+            minor = 1
+        else:
+            CSx = sparse.CSC
+            minor = 0
+        if node.op == sparse.add_s_s:
+            op = add_s_s_csx
+        else:
+            op = mul_s_s_csx
+
+        x_val, x_ind, x_ptr, x_shape = sparse.csm_properties(x)
+        y_val, y_ind, y_ptr, y_shape = sparse.csm_properties(y)
+
+        z_val, z_ind, z_ptr = op(x_val, x_ind, x_ptr, x_shape[minor],
+                                 y_val, y_ind, y_ptr, y_shape[minor])
+
+        return [CSx(z_val, z_ind, z_ptr, x_shape)]
+
+    return False
+register_specialize(local_elemwise_s_s_csx, 'cxx_only')
+
+
+class SpGEMMCSR(gof.OpenMPOp):
+    """Product of two sparse matrices in csr format, with a sparse result.
+
+    It computes the structure of the result in a first pass, then its
+    values in a second pass, directly in outputs of the right size.
+
+    :param x_data: Sparse matrix data.
+    :param x_indices: Sparse matrix indices.
+    :param x_indptr: Sparse matrix indptr.
+    :param x_ncols: Number of columns of `x`.
+    :param y_data: Sparse matrix data.
+    :param y_indices: Sparse matrix indices.
+    :param y_indptr: Sparse matrix indptr.
+    :param y_ncols: Number of columns of `y`.
+
+    :return: The data, indices and indptr of the product of `x` and `y`
+             in csr format.
+
+    :note: The product of two matrices in csc format is the product of
+           their transposes in csr format in the reverse order, so this op
+           also computes it.
+    :note: The indices of the result are not sorted, and it holds the
+           elements which are zero because of cancellations, as the
+           result of the first pass only depends on the structure of the
+           inputs.
+    :note: This op is used as an optimization for TrueDot, StructuredDot
+           and Dot with two sparse inputs.
+    :note: With openmp, the rows of `x` are split among the threads in
+           blocks holding about the same number of non-zero elements.
+    """
+
+    def __eq__(self, other):
+        return type(self) == type(other)
+
+    def __hash__(self):
+        return hash(type(self))
+
+    def __str__(self):
+        return self.__class__.__name__
+
+    def make_node(self, x_data, x_indices, x_indptr, x_ncols,
+                  y_data, y_indices, y_indptr, y_ncols):
+        inputs = map(tensor.as_tensor_variable,
+                     [x_data, x_indices, x_indptr, x_ncols,
+                      y_data, y_indices, y_indptr, y_ncols])
+        out_dtype = scalar.upcast(inputs[0].type.dtype, inputs[4].type.dtype)
+        return gof.Apply(self, inputs,
+                         [tensor.tensor(out_dtype, (False,)),
+                          tensor.ivector(), tensor.ivector()])
+
+    def c_support_code(self):
+        return _csx_support_code + _nnz_split_code
+
+    def c_code_cache_version(self):
+        return (1, self.openmp, theano.config.openmp_sparse_minsize)
+
+    def c_code(self, node, name, inputs, outputs, sub):
+        (x_data, x_ind, x_ptr, x_n, y_data, y_ind, y_ptr, y_n) = inputs
+        z_data, z_ind, z_ptr = outputs
+        for var in [node.inputs[0], node.inputs[4]]:
+            if var.type.dtype in ('complex64', 'complex128'):
+                raise NotImplementedError('Complex types are not supported')
+        fail = sub['fail']
+        typenum_z = node.outputs[0].type.dtype_specs()[2]
+        x_checks = _csx_check_code(x_data, x_ind, x_ptr, fail)
+        y_checks = _csx_check_code(y_data, y_ind, y_ptr, fail)
+        x_declare = _csx_declare_code('x', x_data, x_ind, x_ptr, fail)
+        y_declare = _csx_declare_code('y', y_data, y_ind, y_ptr, fail)
+        omp_parallel = _omp_parallel(self, "work")
+        thread_ids = _thread_ids_code
+
+        return """
+        %(x_checks)s
+        %(y_checks)s
+        { //makes it compile even though labels jump over variable definitions.
+            %(x_declare)s
+            %(y_declare)s
+            const npy_intp M = x_n_major;
+            const npy_intp N = ((dtype_%(y_n)s*)PyArray_DATA(%(y_n)s))[0];
+            if (((dtype_%(x_n)s*)PyArray_DATA(%(x_n)s))[0] != y_n_major) {
+                PyErr_SetString(PyExc_ValueError,
+                                "The shapes of the sparse matrices do not match");
+                %(fail)s;
+            }
+            if (csx_alloc_vector(&%(z_ptr)s, M + 1, NPY_INT32)) {
+                %(fail)s;
+            }
+            npy_int32* const __restrict__ zp = (npy_int32*)PyArray_DATA(%(z_ptr)s);
+
+            // Estimation of the number of multiplications
+            const npy_intp x_nnz = x_p[M * Sx_p] - x_p[0];
+            const npy_intp y_nnz = y_p[y_n_major * Sy_p] - y_p[0];
+            const npy_intp work = y_n_major > 0 ? x_nnz * (y_nnz / y_n_major + 1) : 0;
+
+            // First pass: the number of elements of each row of the
+            // result, in zp[i + 1]. mark[j] is the last row holding
+            // column j.
+            int bad_index = 0;
+            int no_memory = 0;
+            %(omp_parallel)s
+            {
+                %(thread_ids)s
+                const npy_intp i_begin = sparse_nnz_split(x_p, Sx_p, M, thread, n_threads);
+                const npy_intp i_end = sparse_nnz_split(x_p, Sx_p, M, thread + 1, n_threads);
+                npy_intp* mark = (npy_intp*)malloc((N + 1) * sizeof(npy_intp));
+                if (!mark) {
+                    no_memory = 1;
+                } else {
+                    for (npy_intp j = 0; j < N; ++j)
+                        mark[j] = -1;
+                    for (npy_intp i = i_begin; i < i_end && !bad_index; ++i) {
+                        npy_int32 count = 0;
+                        for (npy_intp a = x_p[i * Sx_p]; a < x_p[(i + 1) * Sx_p]; ++a) {
+                            const npy_intp k = x_i[a * Sx_i];
+                            if (k < 0 || k >= y_n_major) {
+                                bad_index = 1;
+                                break;
+                            }
+                            for (npy_intp b = y_p[k * Sy_p]; b < y_p[(k + 1) * Sy_p]; ++b) {
+                                const npy_intp j = y_i[b * Sy_i];
+                                if (j < 0 || j >= N) {
+                                    bad_index = 1;
+                                    break;
+                                }
+                                if (mark[j] != i) {
+                                    mark[j] = i;
+                                    ++count;
+                                }
+                            }
+                        }
+                        zp[i + 1] = count;
+                    }
+                    free(mark);
+                }
+            }
+            if (no_memory) {
+                PyErr_NoMemory();
+                %(fail)s;
+            }
+            if (bad_index) {
+                PyErr_SetString(PyExc_ValueError, "index out of bounds");
+                %(fail)s;
+            }
+            zp[0] = 0;
+            for (npy_intp i = 0; i < M; ++i) {
+                if ((npy_int64)zp[i] + zp[i + 1] > NPY_MAX_INT32) {
+                    PyErr_SetString(PyExc_ValueError,
+                                    "The result has too many non-zero elements");
+                    %(fail)s;
+                }
+                zp[i + 1] += zp[i];
+            }
+            if (csx_alloc_vector(&%(z_ind)s, zp[M], NPY_INT32) ||
+                csx_alloc_vector(&%(z_data)s, zp[M], %(typenum_z)s)) {
+                %(fail)s;
+            }
+            npy_int32* const __restrict__ zi = (npy_int32*)PyArray_DATA(%(z_ind)s);
+            dtype_%(z_data)s* const __restrict__ zd = (dtype_%(z_data)s*)PyArray_DATA(%(z_data)s);
+
+            // Second pass: the values of the result. pos[j] is the last
+            // position of column j in the output, which belongs to row i
+            // when it is at least zp[i].
+            %(omp_parallel)s
+            {
+                %(thread_ids)s
+                const npy_intp i_begin = sparse_nnz_split(x_p, Sx_p, M, thread, n_threads);
+                const npy_intp i_end = sparse_nnz_split(x_p, Sx_p, M, thread + 1, n_threads);
+                npy_intp* pos = (npy_intp*)malloc((N + 1) * sizeof(npy_intp));
+                if (!pos) {
+                    no_memory = 1;
+                } else {
+                    for (npy_intp j = 0; j < N; ++j)
+                        pos[j] = -1;
+                    for (npy_intp i = i_begin; i < i_end; ++i) {
+                        npy_intp o = zp[i];
+                        for (npy_intp a = x_p[i * Sx_p]; a < x_p[(i + 1) * Sx_p]; ++a) {
+                            const npy_intp k = x_i[a * Sx_i];
+                            const dtype_%(z_data)s v = x_d[a * Sx_d];
+                            for (npy_intp b = y_p[k * Sy_p]; b < y_p[(k + 1) * Sy_p]; ++b) {
+                                const npy_intp j = y_i[b * Sy_i];
+                                if (pos[j] < zp[i]) {
+                                    pos[j] = o;
+                                    zi[o] = j;
+                                    zd[o] = v * y_d[b * Sy_d];
+                                    ++o;
+                                } else {
+                                    zd[pos[j]] += v * y_d[b * Sy_d];
+                                }
+                            }
+                        }
+                    }
+                    free(pos);
+                }
+            }
+            if (no_memory) {
+                PyErr_NoMemory();
+                %(fail)s;
+            }
+        }
+        """ % dict(locals(), **sub)
+spgemm_csr = SpGEMMCSR()
+
+
+# register a specialization to replace TrueDot, StructuredDot and Dot of two
+# sparse matrices in the same format by SpGEMMCSR
+@gof.local_optimizer([sparse.TrueDot, sparse._structured_dot, sparse._dot])
+def local_spgemm_csr(node):
+    if (isinstance(node.op, sparse.TrueDot) or
+            node.op in (sparse._structured_dot, sparse._dot)):
+        x, y = node.inputs
+        if not (_is_sparse_variable(x) and _is_sparse_variable(y)):
+            return False
+        if (x.type.format != y.type.format or
+                x.type.format not in ('csr', 'csc')):
+            return False
+        if (x.type.dtype in sparse.complex_dtypes or
+                y.type.dtype in sparse.complex_dtypes):
+            return False
+
+        x_val, x_ind, x_ptr, x_shape = sparse.csm_properties(x)
+        y_val, y_ind, y_ptr, y_shape = sparse.csm_properties(y)
+        z_shape = tensor.stack(x_shape[0], y_shape[1])
+        if x.type.format == 'csr':
+            CSx = sparse.CSR
+            z_val, z_ind, z_ptr = spgemm_csr(x_val, x_ind, x_ptr, x_shape[1],
+                                             y_val, y_ind, y_ptr, y_shape[1])
+        else:
+            # The transpose of the product in csr format
+            CSx = sparse.CSC
+            z_val, z_ind, z_ptr = spgemm_csr(y_val, y_ind, y_ptr, y_shape[0],
+                                             x_val, x_ind, x_ptr, x_shape[0])
+        z = CSx(z_val, z_ind, z_ptr, z_shape)
+        if z.type.dtype != node.outputs[0].type.dtype:
+            return False
+        if node.op == sparse._dot:
+            z = sparse.dense_from_sparse(z)
+        return [z]
+
+    return False
+register_specialize(local_spgemm_csr, 'cxx_only')
+
+
+class SpSumCSx(gof.Op):
+    """Sum of the elements of a sparse matrix in csr or csc format.
+
+    :param a_data: Sparse matrix data.
+    :param a_indices: Sparse matrix indices.
+    :param a_indptr: Sparse matrix indptr.
+    :param n: Length of the result when `axis` is 'indices': the number of
+              columns of a csr matrix, of rows of a csc matrix.
+
+    :return: The sum of all the elements when `axis` is None, the sum of
+             the elements of each row (csr) or column (csc) when `axis`
+             is 'indptr', the sum of the elements of each column (csr) or
+             row (csc) when `axis` is 'indices'.
+
+    :note: This op is used as an optimization for SpSum.
+    """
+
+    def __init__(self, axis):
+        if axis not in (None, 'indptr', 'indices'):
+            raise ValueError("axis must be one of: None, 'indptr', "
+                             "'indices'", axis)
+        self.axis = axis
+
+    def __eq__(self, other):
+        return type(self) == type(other) and self.axis == other.axis
+
+    def __hash__(self):
+        return hash(type(self)) ^ hash(self.axis)
+
+    def __str__(self):
+        return "%s{axis=%s}" % (self.__class__.__name__, self.axis)
+
+    def make_node(self, a_data, a_indices, a_indptr, n=None):
+        inputs = [a_data, a_indices, a_indptr]
+        if self.axis == 'indices':
+            assert n is not None
+            inputs.append(n)
+        inputs = map(tensor.as_tensor_variable, inputs)
+        if self.axis is None:
+            b = ()
+        else:
+            b = (False,)
+        return gof.Apply(self, inputs,
+                         [tensor.tensor(inputs[0].type.dtype, b)])
+
+    def c_support_code(self):
+        return _csx_support_code
+
+    def c_code_cache_version(self):
+        return (1,)
+
+    def c_code(self, node, name, inputs, outputs, sub):
+        _data, _indices, _indptr = inputs[:3]
+        _zout, = outputs
+        if node.inputs[0].type.dtype in ('complex64', 'complex128'):
+            raise NotImplementedError('Complex types are not supported')
+        fail = sub['fail']
+        typenum_z = node.outputs[0].type.dtype_specs()[2]
+        checks = _csx_check_code(_data, _indices, _indptr, fail)
+        declare = _csx_declare_code('a', _data, _indices, _indptr, fail)
+
+        if self.axis is None:
+            body = """
+            if (!%(_zout)s || PyArray_NDIM(%(_zout)s) != 0) {
+                Py_XDECREF(%(_zout)s);
+                %(_zout)s = (PyArrayObject*) PyArray_SimpleNew(0, NULL, %(typenum_z)s);
+                if (!%(_zout)s) {
+                    PyErr_SetString(PyExc_MemoryError,
+                        "Could not allocate output memory.");
+                    %(fail)s;
+                }
+            }
+            dtype_%(_zout)s sum = 0;
+            for (npy_intp k = a_p[0]; k < a_p[a_n_major * Sa_p]; ++k)
+                sum += a_d[k * Sa_d];
+            ((dtype_%(_zout)s*)PyArray_DATA(%(_zout)s))[0] = sum;
+            """
+        elif self.axis == 'indptr':
+            body = """
+            if (csx_alloc_vector(&%(_zout)s, a_n_major, %(typenum_z)s)) {
+                %(fail)s;
+            }
+            dtype_%(_zout)s* const __restrict__ zout = (dtype_%(_zout)s*)PyArray_DATA(%(_zout)s);
+            for (npy_intp i = 0; i < a_n_major; ++i) {
+                dtype_%(_zout)s sum = 0;
+                for (npy_intp k = a_p[i * Sa_p]; k < a_p[(i + 1) * Sa_p]; ++k)
+                    sum += a_d[k * Sa_d];
+                zout[i] = sum;
+            }
+            """
+        else:
+            _n = inputs[3]
+            body = """
+            const npy_intp n = ((dtype_%(_n)s*)PyArray_DATA(%(_n)s))[0];
+            if (csx_alloc_vector(&%(_zout)s, n, %(typenum_z)s)) {
+                %(fail)s;
+            }
+            dtype_%(_zout)s* const __restrict__ zout = (dtype_%(_zout)s*)PyArray_DATA(%(_zout)s);
+            memset(zout, 0, n * sizeof(dtype_%(_zout)s));
+            for (npy_intp k = a_p[0]; k < a_p[a_n_major * Sa_p]; ++k) {
+                const npy_intp j = a_i[k * Sa_i];
+                if (j < 0 || j >= n) {
+                    PyErr_SetString(PyExc_ValueError, "index out of bounds");
+                    %(fail)s;
+                }
+                zout[j] += a_d[k * Sa_d];
+            }
+            """
+        body = body % dict(locals(), **sub)
+
+        return """
+        %(checks)s
+        { //makes it compile even though labels jump over variable definitions.
+            %(declare)s
+            %(body)s
+        }
+        """ % locals()
+
+
+# register a specialization to replace SpSum -> SpSumCSx
+@gof.local_optimizer([sparse.SpSum])
+def local_sp_sum_csx(node):
+    if isinstance(node.op, sparse.SpSum):
+        x, = node.inputs
+        if x.type.dtype in sparse.complex_dtypes:
+            return False
+        a_val, a_ind, a_ptr, a_shape = sparse.csm_properties(x)
+        if node.op.axis is None:
+            return [SpSumCSx(None)(a_val, a_ind, a_ptr)]
+        # Axis of the rows (csr) or columns (csc)
+        major = {'csr': 0, 'csc': 1}[x.type.format]
+        if node.op.axis != major:
+            return [SpSumCSx('indptr')(a_val, a_ind, a_ptr)]
+        return [SpSumCSx('indices')(a_val, a_ind, a_ptr,
+                                    a_shape[1 - major])]
+
+    return False
+register_specialize(local_sp_sum_csx, 'cxx_only')
+
+
+class GetItem2dCSx(gof.Op):
+    """Slice of a sparse matrix in csr or csc format.
+
+    :param a_data: Sparse matrix data.
+    :param a_indices: Sparse matrix indices.
+    :param a_indptr: Sparse matrix indptr.
+    :param n_minor: Number of columns of a csr matrix, of rows of a csc
+                    matrix.
+    :param major_start: Start of the slice of the rows (csr) or columns
+                        (csc).
+    :param major_stop: Stop of the slice of the rows (csr) or columns (csc).
+    :param minor_start: Start of the slice of the columns (csr) or rows
+                        (csc).
+    :param minor_stop: Stop of the slice of the columns (csr) or rows (csc).
+
+    :return: The data, indices and indptr of the slice, and its number of
+             rows and columns, in that order for csr and in the reverse
+             order for csc.
+
+    :note: The bounds of the slices follow python conventions.
+    :note: This op is used as an optimization for GetItem2d.
+    """
+
+    def __eq__(self, other):
+        return (type(self) == type(other))
+
+    def __hash__(self):
+        return hash(type(self))
+
+    def __str__(self):
+        return self.__class__.__name__
+
+    def make_node(self, a_data, a_indices, a_indptr, n_minor,
+                  major_start, major_stop, minor_start, minor_stop):
+        inputs = map(tensor.as_tensor_variable,
+                     [a_data, a_indices, a_indptr, n_minor])
+        for bound in [major_start, major_stop, minor_start, minor_stop]:
+            bound = tensor.as_tensor_variable(bound)
+            assert bound.type.ndim == 0 and bound.type.dtype == 'int64'
+            inputs.append(bound)
+        return gof.Apply(self, inputs,
+                         [tensor.tensor(inputs[0].type.dtype, (False,)),
+                          tensor.ivector(), tensor.ivector(),
+                          tensor.ivector()])
+
+    def c_support_code(self):
+        return _csx_support_code
+
+    def c_code_cache_version(self):
+        return (1,)
+
+    def c_code(self, node, name, inputs, outputs, sub):
+        (_data, _indices, _indptr, _n_minor,
+         _major_start, _major_stop, _minor_start, _minor_stop) = inputs
+        z_data, z_ind, z_ptr, z_shape = outputs
+        fail = sub['fail']
+        typenum_z = node.outputs[0].type.dtype_specs()[2]
+        checks = _csx_check_code(_data, _indices, _indptr, fail)
+        declare = _csx_declare_code('a', _data, _indices, _indptr, fail)
+
+        return """
+        %(checks)s
+        { //makes it compile even though labels jump over variable definitions.
+            %(declare)s
+            const npy_intp n_minor = ((dtype_%(_n_minor)s*)PyArray_DATA(%(_n_minor)s))[0];
+            npy_int64 a0 = ((npy_int64*)PyArray_DATA(%(_major_start)s))[0];
+            npy_int64 a1 = ((npy_int64*)PyArray_DATA(%(_major_stop)s))[0];
+            npy_int64 b0 = ((npy_int64*)PyArray_DATA(%(_minor_start)s))[0];
+            npy_int64 b1 = ((npy_int64*)PyArray_DATA(%(_minor_stop)s))[0];
+            csx_canonical_slice(&a0, &a1, a_n_major);
+            csx_canonical_slice(&b0, &b1, n_minor);
+            const npy_intp n_major_out = a1 - a0;
+            const int full_minor = (b0 == 0 && b1 == n_minor);
+
+            if (csx_alloc_vector(&%(z_ptr)s, n_major_out + 1, NPY_INT32) ||
+                csx_alloc_vector(&%(z_shape)s, 2, NPY_INT32)) {
+                %(fail)s;
+            }
+            npy_int32* const __restrict__ zp = (npy_int32*)PyArray_DATA(%(z_ptr)s);
+            ((npy_int32*)PyArray_DATA(%(z_shape)s))[0] = n_major_out;
+            ((npy_int32*)PyArray_DATA(%(z_shape)s))[1] = b1 - b0;
+
+            // Count the elements of every row (csr) or column (csc) of the
+            // slice, then copy them.
+            zp[0] = 0;
+            for (npy_intp r = 0; r < n_major_out; ++r) {
+                const npy_intp begin = a_p[(a0 + r) * Sa_p];
+                const npy_intp end = a_p[(a0 + r + 1) * Sa_p];
+                npy_intp count = end - begin;
+                if (!full_minor) {
+                    count = 0;
+                    for (npy_intp k = begin; k < end; ++k) {
+                        const npy_intp j = a_i[k * Sa_i];
+                        count += (j >= b0 && j < b1);
+                    }
+                }
+                zp[r + 1] = zp[r] + count;
+            }
+            if (csx_alloc_vector(&%(z_ind)s, zp[n_major_out], NPY_INT32) ||
+                csx_alloc_vector(&%(z_data)s, zp[n_major_out], %(typenum_z)s)) {
+                %(fail)s;
+            }
+            npy_int32* const __restrict__ zi = (npy_int32*)PyArray_DATA(%(z_ind)s);
+            dtype_%(z_data)s* const __restrict__ zd = (dtype_%(z_data)s*)PyArray_DATA(%(z_data)s);
+            npy_intp o = 0;
+            for (npy_intp r = 0; r < n_major_out; ++r) {
+                for (npy_intp k = a_p[(a0 + r) * Sa_p]; k < a_p[(a0 + r + 1) * Sa_p]; ++k) {
+                    const npy_intp j = a_i[k * Sa_i];
+                    if (full_minor || (j >= b0 && j < b1)) {
+                        zi[o] = j - b0;
+                        zd[o] = a_d[k * Sa_d];
+                        ++o;
+                    }
+                }
+            }
+        }
+        """ % dict(locals(), **sub)
+get_item_2d_csx = GetItem2dCSx()
+
+
+# register a specialization to replace GetItem2d -> GetItem2dCSx
+@gof.local_optimizer([sparse.get_item_2d])
+def local_get_item_2d_csx(node):
+    if node.op == sparse.get_item_2d:
+        x = node.inputs[0]
+        bounds = []
+        for bound, default in zip(node.inputs[1:],
+                                  [0, numpy.iinfo('int64').max] * 2):
+            if isinstance(bound, gof.Constant) and bound.data is None:
+                bound = default
+            bounds.append(tensor.cast(bound, 'int64'))
+        if x.type.format == 'csr':
+            CSx = sparse.CSR
+            minor = 1
+        else:
+            CSx = sparse.CSC
+            minor = 0
+            bounds = bounds[2:] + bounds[:2]
+
+        a_val, a_ind, a_ptr, a_shape = sparse.csm_properties(x)
+        z_val, z_ind, z_ptr, z_shape = get_item_2d_csx(
+            a_val, a_ind, a_ptr, a_shape[minor], *bounds)
+        if minor == 0:
+            z_shape = z_shape[::-1]
+
+        return [CSx(z_val, z_ind, z_ptr, z_shape)]
+
+    return False
+register_specialize(local_get_item_2d_csx, 'cxx_only')
+
+
+class GetItemListCSR(gof.Op):
+    """Selection of rows of a sparse matrix in csr format.
+
+    :param a_data: Sparse matrix data.
+    :param a_indices: Sparse matrix indices.
+    :param a_indptr: Sparse matrix indptr.
+    :param index: Tensor type int64 vector of the selected rows.
+
+    :return: The data, indices and indptr of the selected rows.
+
+    :note: Negative indices count from the end, as in python.
+    :note: This op is used as an optimization for GetItemList.
+    """
+
+    def __eq__(self, other):
+        return (type(self) == type(other))
+
+    def __hash__(self):
+        return hash(type(self))
+
+    def __str__(self):
+        return self.__class__.__name__
+
+    def make_node(self, a_data, a_indices, a_indptr, index):
+        inputs = map(tensor.as_tensor_variable,
+                     [a_data, a_indices, a_indptr, index])
+        assert inputs[3].type.ndim == 1 and inputs[3].type.dtype == 'int64'
+        return gof.Apply(self, inputs,
+                         [tensor.tensor(inputs[0].type.dtype, (False,)),
+                          tensor.ivector(), tensor.ivector()])
+
+    def c_support_code(self):
+        return _csx_support_code
+
+    def c_code_cache_version(self):
+        return (1,)
+
+    def c_code(self, node, name, inputs, outputs, sub):
+        _data, _indices, _indptr, _index = inputs
+        z_data, z_ind, z_ptr = outputs
+        fail = sub['fail']
+        typenum_z = node.outputs[0].type.dtype_specs()[2]
+        checks = _csx_check_code(_data, _indices, _indptr, fail)
+        declare = _csx_declare_code('a', _data, _indices, _indptr, fail)
+
+        return """
+        %(checks)s
+        if (PyArray_NDIM(%(_index)s) != 1) {
+            PyErr_SetString(PyExc_NotImplementedError, "rank(index) != 1");
+            %(fail)s;
+        }
+        { //makes it compile even though labels jump over variable definitions.
+            %(declare)s
+            const npy_int64* const __restrict__ index = (npy_int64*)PyArray_DATA(%(_index)s);
+            const npy_intp Sindex = PyArray_STRIDES(%(_index)s)[0] / PyArray_DESCR(%(_index)s)->elsize;
+            const npy_intp m = PyArray_DIMS(%(_index)s)[0];
+
+            if (csx_alloc_vector(&%(z_ptr)s, m + 1, NPY_INT32)) {
+                %(fail)s;
+            }
+            npy_int32* const __restrict__ zp = (npy_int32*)PyArray_DATA(%(z_ptr)s);
+            zp[0] = 0;
+            for (npy_intp r = 0; r < m; ++r) {
+                npy_int64 i = index[r * Sindex];
+                if (i < 0)
+                    i += a_n_major;
+                if (i < 0 || i >= a_n_major) {
+                    PyErr_Format(PyExc_IndexError,
+                                 "row index %%lld out of bounds",
+                                 (long long)index[r * Sindex]);
+                    %(fail)s;
+                }
+                zp[r + 1] = zp[r] + a_p[(i + 1) * Sa_p] - a_p[i * Sa_p];
+            }
+            if (csx_alloc_vector(&%(z_ind)s, zp[m], NPY_INT32) ||
+                csx_alloc_vector(&%(z_data)s, zp[m], %(typenum_z)s)) {
+                %(fail)s;
+            }
+            npy_int32* const __restrict__ zi = (npy_int32*)PyArray_DATA(%(z_ind)s);
+            dtype_%(z_data)s* const __restrict__ zd = (dtype_%(z_data)s*)PyArray_DATA(%(z_data)s);
+            for (npy_intp r = 0; r < m; ++r) {
+                npy_int64 i = index[r * Sindex];
+                if (i < 0)
+                    i += a_n_major;
+                npy_intp o = zp[r];
+                for (npy_intp k = a_p[i * Sa_p]; k < a_p[(i + 1) * Sa_p]; ++k, ++o) {
+                    zi[o] = a_i[k * Sa_i];
+                    zd[o] = a_d[k * Sa_d];
+                }
+            }
+        }
+        """ % dict(locals(), **sub)
+get_item_list_csr = GetItemListCSR()
+
+
+# register a specialization to replace GetItemList -> GetItemListCSR
+@gof.local_optimizer([sparse.get_item_list])
+def local_get_item_list_csr(node):
+    if node.op == sparse.get_item_list:
+        x, index = node.inputs
+        if x.type.format != 'csr':
+            return False
+
+        a_val, a_ind, a_ptr, a_shape = sparse.csm_properties(x)
+        index = tensor.cast(index, 'int64')
+        z_val, z_ind, z_ptr = get_item_list_csr(a_val, a_ind, a_ptr, index)
+        z_shape = tensor.cast(tensor.stack(index.shape[0], a_shape[1]),
+                              'int32')
+
+        return [sparse.CSR(z_val, z_ind, z_ptr, z_shape)]
+
+    return False
+register_specialize(local_get_item_list_csr, 'cxx_only')
+
+
+class StackCSx(gof.Op):
+    """Stacking of sparse matrices in csr format along their rows, or in
+    csc format along their columns.
+
+    :param blocks: For every matrix, its data, indices, indptr and number
+                   of columns (csr) or rows (csc), in that order.
+
+    :return: The data, indices and indptr of the stacked matrix, whose
+             data is of type `dtype`.
+
+    :note: This op is used as an optimization for VStack of csr matrices
+           and HStack of csc matrices.
+    """
+
+    def __init__(self, dtype):
+        self.dtype = dtype
+
+    def __eq__(self, other):
+        return type(self) == type(other) and self.dtype == other.dtype
+
+    def __hash__(self):
+        return hash(type(self)) ^ hash(self.dtype)
+
+    def __str__(self):
+        return "%s{%s}" % (self.__class__.__name__, self.dtype)
+
+    def make_node(self, *blocks):
+        if not blocks or len(blocks) % 4:
+            raise ValueError('StackCSx expects 4 inputs per sparse matrix')
+        inputs = map(tensor.as_tensor_variable, blocks)
+        return gof.Apply(self, inputs,
+                         [tensor.tensor(self.dtype, (False,)),
+                          tensor.ivector(), tensor.ivector()])
+
+    def c_support_code(self):
+        return _csx_support_code
+
+    def c_code_cache_version(self):
+        return (1,)
+
+    def c_code(self, node, name, inputs, outputs, sub):
+        z_data, z_ind, z_ptr = outputs
+        fail = sub['fail']
+        typenum_z = node.outputs[0].type.dtype_specs()[2]
+        if self.dtype in ('complex64', 'complex128'):
+            raise NotImplementedError('Complex types are not supported')
+        n_blocks = len(inputs) // 4
+        checks = []
+        sizes = []
+        copies = []
+        for b in xrange(n_blocks):
+            _data, _indices, _indptr, _n_minor = inputs[4 * b:4 * b + 4]
+            prefix = 'a%d' % b
+            declare = _csx_declare_code(prefix, _data, _indices, _indptr,
+                                        fail)
+            checks.append(_csx_check_code(_data, _indices, _indptr, fail))
+            sizes.append("""
+            {
+                %(declare)s
+                if (((dtype_%(_n_minor)s*)PyArray_DATA(%(_n_minor)s))[0] != n_minor) {
+                    PyErr_SetString(PyExc_ValueError,
+                                    "The shapes of the sparse matrices do not match");
+                    %(fail)s;
+                }
+                n_major += %(prefix)s_n_major;
+                nnz += %(prefix)s_p[%(prefix)s_n_major * S%(prefix)s_p] - %(prefix)s_p[0];
+            }""" % locals())
+            copies.append("""
+            {
+                %(declare)s
+                for (npy_intp i = 0; i < %(prefix)s_n_major; ++i) {
+                    for (npy_intp k = %(prefix)s_p[i * S%(prefix)s_p]; k < %(prefix)s_p[(i + 1) * S%(prefix)s_p]; ++k, ++o) {
+                        zi[o] = %(prefix)s_i[k * S%(prefix)s_i];
+                        zd[o] = %(prefix)s_d[k * S%(prefix)s_d];
+                    }
+                    zp[++row] = o;
+                }
+            }""" % locals())
+        checks = ''.join(checks)
+        sizes = ''.join(sizes)
+        copies = ''.join(copies)
+        n_minor0 = inputs[3]
+
+        return """
+        %(checks)s
+        { //makes it compile even though labels jump over variable definitions.
+            const npy_intp n_minor = ((dtype_%(n_minor0)s*)PyArray_DATA(%(n_minor0)s))[0];
+            npy_intp n_major = 0;
+            npy_intp nnz = 0;
+            %(sizes)s
+            if (csx_alloc_vector(&%(z_ptr)s, n_major + 1, NPY_INT32) ||
+                csx_alloc_vector(&%(z_ind)s, nnz, NPY_INT32) ||
+                csx_alloc_vector(&%(z_data)s, nnz, %(typenum_z)s)) {
+                %(fail)s;
+            }
+            npy_int32* const __restrict__ zp = (npy_int32*)PyArray_DATA(%(z_ptr)s);
+            npy_int32* const __restrict__ zi = (npy_int32*)PyArray_DATA(%(z_ind)s);
+            dtype_%(z_data)s* const __restrict__ zd = (dtype_%(z_data)s*)PyArray_DATA(%(z_data)s);
+            npy_intp row = 0;
+            npy_intp o = 0;
+            zp[0] = 0;
+            %(copies)s
+        }
+        """ % dict(locals(), **sub)
+
+
+# register a specialization to replace VStack of csr matrices and HStack
+# of csc matrices -> StackCSx
+@gof.local_optimizer([sparse.HStack, sparse.VStack])
+def local_stack_csx(node):
+    if isinstance(node.op, sparse.HStack):
+        if isinstance(node.op, sparse.VStack):
+            format = 'csr'
+            major = 0
+        else:
+            format = 'csc'
+            major = 1
+        if node.op.format != format or node.op.dtype in sparse.complex_dtypes:
+            return False
+        if any(x.type.format != format or
+               x.type.dtype in sparse.complex_dtypes for x in node.inputs):
+            return False
+
+        inputs = []
+        shapes = []
+        for x in node.inputs:
+            a_val, a_ind, a_ptr, a_shape = sparse.csm_properties(x)
+            inputs += [a_val, a_ind, a_ptr, a_shape[1 - major]]
+            shapes.append(a_shape)
+        z_val, z_ind, z_ptr = StackCSx(node.op.dtype)(*inputs)
+        n_major = tensor.add(*[s[major] for s in shapes])
+        if major == 0:
+            z_shape = tensor.stack(n_major, shapes[0][1])
+        else:
+            z_shape = tensor.stack(shapes[0][0], n_major)
+        z_shape = tensor.cast(z_shape, 'int32')
+
+        return [sparse.CSM(format)(z_val, z_ind, z_ptr, z_shape)]
+
+    return False
+register_specialize(local_stack_csx, 'cxx_only')
+
+
+class EnsureSortedIndicesCSx(gof.Op):
+    """Sort the indices of every row (csr) or column (csc) of a sparse
+    matrix.
+
+    :param a_data: Sparse matrix data.
+    :param a_indices: Sparse matrix indices.
+    :param a_indptr: Sparse matrix indptr.
+
+    :return: The data and indices of the matrix with sorted indices. Its
+             indptr is `a_indptr`.
+
+    :note: This op is used as an optimization for EnsureSortedIndices.
+    """
+
+    def __eq__(self, other):
+        return (type(self) == type(other))
+
+    def __hash__(self):
+        return hash(type(self))
+
+    def __str__(self):
+        return self.__class__.__name__
+
+    def make_node(self, a_data, a_indices, a_indptr):
+        inputs = map(tensor.as_tensor_variable, [a_data, a_indices, a_indptr])
+        return gof.Apply(self, inputs,
+                         [tensor.tensor(inputs[0].type.dtype, (False,)),
+                          tensor.ivector()])
+
+    def c_support_code(self):
+        return _csx_support_code + """
+#ifndef THEANO_SPARSE_INDEX_POS
+#define THEANO_SPARSE_INDEX_POS
+typedef struct {
+    npy_int32 index;
+    npy_intp pos;
+} csx_index_pos;
+
+static int csx_index_pos_cmp(const void* a, const void* b)
+{
+    const csx_index_pos* x = (const csx_index_pos*)a;
+    const csx_index_pos* y = (const csx_index_pos*)b;
+    if (x->index != y->index)
+        return x->index < y->index ? -1 : 1;
+    return x->pos < y->pos ? -1 : (x->pos > y->pos);
+}
+#endif
+"""
+
+    def c_code_cache_version(self):
+        return (1,)
+
+    def c_code(self, node, name, inputs, outputs, sub):
+        _data, _indices, _indptr = inputs
+        z_data, z_ind = outputs
+        fail = sub['fail']
+        typenum_z = node.outputs[0].type.dtype_specs()[2]
+        checks = _csx_check_code(_data, _indices, _indptr, fail)
+        declare = _csx_declare_code('a', _data, _indices, _indptr, fail)
+
+        return """
+        %(checks)s
+        { //makes it compile even though labels jump over variable definitions.
+            %(declare)s
+            const npy_intp nnz = a_p[a_n_major * Sa_p];
+            if (csx_alloc_vector(&%(z_ind)s, nnz, NPY_INT32) ||
+                csx_alloc_vector(&%(z_data)s, nnz, %(typenum_z)s)) {
+                %(fail)s;
+            }
+            npy_int32* const __restrict__ zi = (npy_int32*)PyArray_DATA(%(z_ind)s);
+            dtype_%(z_data)s* const __restrict__ zd = (dtype_%(z_data)s*)PyArray_DATA(%(z_data)s);
+            npy_intp max_length = 0;
+            for (npy_intp k = 0; k < nnz; ++k) {
+                zi[k] = a_i[k * Sa_i];
+                zd[k] = a_d[k * Sa_d];
+            }
+            for (npy_intp i = 0; i < a_n_major; ++i) {
+                const npy_intp length = a_p[(i + 1) * Sa_p] - a_p[i * Sa_p];
+                if (length > max_length)
+                    max_length = length;
+            }
+            csx_index_pos* order = NULL;
+            dtype_%(z_data)s* tmp_d = NULL;
+            if (max_length > 16) {
+                order = (csx_index_pos*)malloc(max_length * sizeof(csx_index_pos));
+                tmp_d = (dtype_%(z_data)s*)malloc(max_length * sizeof(dtype_%(z_data)s));
+                if (!order || !tmp_d) {
+                    free(order);
+                    free(tmp_d);
+                    PyErr_NoMemory();
+                    %(fail)s;
+                }
+            }
+            for (npy_intp i = 0; i < a_n_major; ++i) {
+                const npy_intp begin = a_p[i * Sa_p];
+                const npy_intp end = a_p[(i + 1) * Sa_p];
+                npy_intp k = begin + 1;
+                while (k < end && zi[k - 1] <= zi[k])
+                    ++k;
+                if (k >= end)
+                    continue;
+                if (end - begin <= 16) {
+                    // Insertion sort of the short rows
+                    for (k = begin + 1; k < end; ++k) {
+                        const npy_int32 index = zi[k];
+                        const dtype_%(z_data)s value = zd[k];
+                        npy_intp l = k;
+                        for (; l > begin && zi[l - 1] > index; --l) {
+                            zi[l] = zi[l - 1];
+                            zd[l] = zd[l - 1];
+                        }
+                        zi[l] = index;
+                        zd[l] = value;
+                    }
+                } else {
+                    for (k = begin; k < end; ++k) {
+                        order[k - begin].index = zi[k];
+                        order[k - begin].pos = k;
+                    }
+                    qsort(order, end - begin, sizeof(csx_index_pos),
+                          csx_index_pos_cmp);
+                    for (k = begin; k < end; ++k)
+                        tmp_d[k - begin] = zd[order[k - begin].pos];
+                    for (k = begin; k < end; ++k) {
+                        zi[k] = order[k - begin].index;
+                        zd[k] = tmp_d[k - begin];
+                    }
+                }
+            }
+            free(order);
+            free(tmp_d);
+        }
+        """ % dict(locals(), **sub)
+ensure_sorted_indices_csx = EnsureSortedIndicesCSx()
+
+
+# register a specialization to replace
+# EnsureSortedIndices -> EnsureSortedIndicesCSx
+@gof.local_optimizer([sparse.EnsureSortedIndices])
+def local_ensure_sorted_indices_csx(node):
+    if isinstance(node.op, sparse.EnsureSortedIndices):
+        x, = node.inputs
+        CSx = sparse.CSM(x.type.format)
+
+        a_val, a_ind, a_ptr, a_shape = sparse.csm_properties(x)
+        z_val, z_ind = ensure_sorted_indices_csx(a_val, a_ind, a_ptr)
+
+        return [CSx(z_val, z_ind, a_ptr, a_shape)]
+
+    return False
+register_specialize(local_ensure_sorted_indices_csx, 'cxx_only')
+
+
+# register a specialization to replace
+# transpose(CSR(data, indices, indptr, shape)) ->
+# CSC(data, indices, indptr, shape[::-1]), and the reverse
+@gof.local_optimizer([sparse.transpose])
+def local_transpose_csm(node):
+    if node.op == sparse.transpose:
+        x, = node.inputs
+        if (x.owner and isinstance(x.owner.op, sparse.CSM) and
+                x.owner.op.kmap is None):
+            a_val, a_ind, a_ptr, a_shape = x.owner.inputs
+            CSx = sparse.CSM({'csr': 'csc', 'csc': 'csr'}[x.owner.op.format])
+            return [CSx(a_val, a_ind, a_ptr, a_shape[::-1])]
+
+    return False
+register_specialize(local_transpose_csm)
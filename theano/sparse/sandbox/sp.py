@@ -16,7 +16,8 @@ import theano
 import theano.sparse
 from theano import sparse, gof, Op, tensor
 from theano.gof.python25 import all, any
-from theano.sparse.basic import Remove0, remove0
+from theano.sparse.basic import Remove0, remove0, _structured_dot
+from theano.sparse.opt import local_structured_dot
 
 # To maintain compatibility
 from theano.sparse import (
@@ -52,6 +53,9 @@ class ConvolutionIndices(Op):
         return convolution_indices.evaluate(inshp, kshp, (dx, dy),
                                             mode=mode, ws=True)
 
+    # Results of evaluate, by arguments
+    _cache = {}
+
     # img_shape and ker_shape are (height,width)
     @staticmethod
     def evaluate(inshp, kshp, (dx, dy)=(1, 1), nkern=1, mode='valid', ws=True):
@@ -79,24 +83,26 @@ class ConvolutionIndices(Op):
         :rtype: tuple(indices, indptr, logical_shape, sp_type, out_img_shp)
         :returns: the structure of a sparse matrix, and the logical dimensions
                   of the image which will be the result of filtering.
+
+        :note: The result is computed once for each set of arguments, and
+               its arrays are read-only.
         """
         N = numpy
 
         # inshp contains either 2 entries (height,width) or 3 (nfeatures,h,w)
         # in the first case, default nfeatures to 1
         if N.size(inshp) == 2:
-            inshp = (1,) + inshp
+            inshp = (1,) + tuple(inshp)
+
+        key = (tuple(int(i) for i in inshp), tuple(int(k) for k in kshp),
+               int(dx), int(dy), int(nkern), mode, bool(ws))
+        if key in ConvolutionIndices._cache:
+            return ConvolutionIndices._cache[key]
 
         inshp = N.array(inshp)
         kshp = N.array(kshp)
         ksize = N.prod(kshp)
 
-        kern = ksize - 1 - N.arange(ksize)
-
-        # size of output image if doing proper convolution
-        # (mode='full',dx=dy=0) outshp is the actual output shape
-        # given the parameters
-        fulloutshp = inshp[1:] + kshp - 1
         if mode == 'valid':
             s = -1
         else:
@@ -111,150 +117,83 @@ class ConvolutionIndices(Op):
         outsize = N.prod(outshp)
         insize = N.prod(inshp)
 
-        # range of output units over which to iterate
-        if mode == 'valid':
-            lbound = N.array([kshp[0] - 1, kshp[1] - 1])
-            ubound = lbound + (inshp[1:] - kshp + 1)
-        else:
-            lbound = N.zeros(2)
-            ubound = fulloutshp
-
-        # coordinates of image in "fulloutshp" coordinates
-        topleft = N.array([kshp[0] - 1, kshp[1] - 1])
-        # bound when counting the receptive field
-        botright = topleft + inshp[1:]
-
         # sparse matrix specifics...
         if ws:
             spmatshp = (outsize * N.prod(kshp) * inshp[0], insize)
         else:
             spmatshp = (nkern * outsize, insize)
-        spmat = scipy_sparse.lil_matrix(spmatshp)
-
-        # loop over output image pixels
-        z, zz = 0, 0
-
-        # incremented every time we write something to the sparse
-        # matrix this is used to track the ordering of filter tap
-        # coefficient in sparse column ordering
-        tapi, ntaps = 0, 0
-
-        # Note: looping over the number of kernels could've been done
-        # more efficiently as the last step (when writing to
-        # spmat). However, this messes up the ordering of the column
-        # values (order in which you write the values determines how
-        # the vectorized data will get used later one)
-
-        for fmapi in xrange(inshp[0]):  # loop over input features
-            # loop over number of kernels (nkern=1 for weight sharing)
-            for n in xrange(nkern):
-
-                # FOR EACH OUTPUT PIXEL...
-                # loop over output image height
-                for oy in N.arange(lbound[0], ubound[0], dy):
-                     # loop over output image width
-                    for ox in N.arange(lbound[1], ubound[1], dx):
-
-                       # kern[l] is filter value to apply at (oj,oi)
-                       # for (iy,ix)
-                        l = 0
-
-                        # ... ITERATE OVER INPUT UNITS IN RECEPTIVE FIELD
-                        for ky in oy + N.arange(kshp[0]):
-                            for kx in ox + N.arange(kshp[1]):
-
-                                # verify if we are still within image
-                                # boundaries. Equivalent to
-                                # zero-padding of the input image
-                                if (all((ky, kx) >= topleft) and
-                                    all((ky, kx) < botright)):
-
-                                    # convert to "valid" input space
-                                    # coords used to determine column
-                                    # index to write to in sparse mat
-                                    iy, ix = N.array((ky, kx)) - topleft
-                                    # determine raster-index of input pixel...
-
-                                    # taking into account multiple
-                                    # input features
-                                    col = iy * inshp[2] + ix + \
-                                          fmapi * N.prod(inshp[1:])
-
-                                    # convert oy,ox values to output
-                                    # space coordinates
-                                    if mode == 'full':
-                                        (y, x) = (oy, ox)
-                                    else:
-                                        (y, x) = (oy, ox) - topleft
-                                    # taking into account step size
-                                    (y, x) = N.array([y, x]) / (dy, dx)
-
-                                    # convert to row index of sparse matrix
-                                    if ws:
-                                        row = ((y * outshp[1] + x) *
-                                               inshp[0] * ksize + l + fmapi *
-                                               ksize)
-                                    else:
-                                        row = y * outshp[1] + x
-
-                                    # Store something at that location
-                                    # in sparse matrix.  The written
-                                    # value is only useful for the
-                                    # sparse case. It will determine
-                                    # the way kernel taps are mapped
-                                    # onto the sparse columns (idea of
-                                    # kernel map)
-                                    # n*... only for sparse
-                                    spmat[row + n * outsize, col] = tapi + 1
-
-                                    # total number of active taps
-                                    # (used for kmap)
-                                    ntaps += 1
-
-                                # absolute tap index (total number of taps)
-                                tapi += 1
-                                # move on to next filter tap l=(l+1)%ksize
-                                l += 1
-
-        if spmat.format != 'csc':
-            spmat = spmat.tocsc().sorted_indices()
-        else:
-            # BUG ALERT: scipy0.6 has bug where data and indices are written in
-            # reverse column ordering.
-            # Explicit call to sorted_indices removes this problem.
-            spmat = spmat.sorted_indices()
 
+        # One entry per filter tap, in the order of the loops over the
+        # input features, the kernels (nkern=1 for weight sharing), the
+        # output pixels (y, x) and the taps (ky, kx) of their receptive
+        # field. tapi, the position of a tap in this order, tracks the
+        # ordering of filter tap coefficients in sparse column ordering.
+        fmapi, n, y, x, ky, kx = N.indices(
+            (inshp[0], nkern, outshp[0], outshp[1], kshp[0], kshp[1])
+        ).reshape(6, -1)
+        tapi = N.arange(fmapi.size)
+
+        # Coordinates of the input pixel of each tap. In 'full' mode, the
+        # image is zero-padded by the size of the kernel minus one.
+        iy = y * dy + ky
+        ix = x * dx + kx
+        if mode == 'full':
+            iy -= kshp[0] - 1
+            ix -= kshp[1] - 1
+
+            # Only keep the taps within the image boundaries
+            inside = ((iy >= 0) & (iy < inshp[1]) &
+                      (ix >= 0) & (ix < inshp[2]))
+            fmapi, n, y, x, ky, kx, iy, ix, tapi = [
+                a[inside] for a in (fmapi, n, y, x, ky, kx, iy, ix, tapi)]
+
+        # raster-index of the input pixel, taking into account multiple
+        # input features
+        col = iy * inshp[2] + ix + fmapi * N.prod(inshp[1:])
+        # row index of the output pixel in the sparse matrix
+        if ws:
+            l = ky * kshp[1] + kx
+            row = ((y * outshp[1] + x) * inshp[0] * ksize + l +
+                   fmapi * ksize)
+        else:
+            row = y * outshp[1] + x
+        row += n * outsize
+
+        # sort the taps in csc order. spmat.data is the position of each
+        # element in the arrays above.
+        spmat = scipy_sparse.coo_matrix((N.arange(row.size), (row, col)),
+                                        shape=spmatshp).tocsc()
+        spmat.sort_indices()
+        order = spmat.data
+        indices = N.asarray(spmat.indices, dtype='int32')
+        indptr = N.asarray(spmat.indptr, dtype='int32')
+
+        # The kernel map gives the tap of each element of the sparse
+        # matrix, in csc order.
         if ws:
             kmap = None
         else:
-            kmap = N.zeros(ntaps, dtype='int')
-            k = 0
-            #print 'TEMPORARY BUGFIX: REMOVE !!!'
-            for j in xrange(spmat.shape[1]):
-                for i_idx in xrange(spmat.indptr[j], spmat.indptr[j + 1]):
-                    if spmat.data[i_idx] != 0:
-                        # this is == spmat[i,j] - 1
-                        kmap[k] = spmat.data[i_idx] - 1
-                        k += 1
+            kmap = N.asarray(tapi[order], dtype='int')
 
         # when in valid mode, it is more efficient to store in sparse row
         # TODO: need to implement structured dot for csr matrix
-        assert spmat.format == 'csc'
         sptype = 'csc'
-        #sptype = 'csr' if mode=='valid' else 'csc'
-        if 0 and mode == 'valid':
-            spmat = spmat.tocsr()
 
-        rval = (spmat.indices[:spmat.size],
-                spmat.indptr, spmatshp, sptype, outshp)
+        rval = (indices, indptr, spmatshp, sptype, outshp)
         if kmap is not None:
             rval += (kmap,)
 
+        # The result is shared by all the callers
+        for a in rval:
+            if isinstance(a, N.ndarray):
+                a.flags.writeable = False
+        ConvolutionIndices._cache[key] = rval
         return rval
 
     def perform(self, node, (inshp, kshp),\
                 (out_indices, out_indptr, spmat_shape)):
-        indices, indptr, spmatshp, outshp = self.evaluate(inshp, kshp)
+        indices, indptr, spmatshp, sptype, outshp = self.evaluate(inshp,
+                                                                 kshp)
         out_indices[0] = indices
         out_indptr[0] = indptr
         spmat_shape[0] = numpy.asarray(spmatshp)
@@ -262,6 +201,27 @@ class ConvolutionIndices(Op):
 convolution_indices = ConvolutionIndices()
 
 
+@gof.local_optimizer([_structured_dot])
+def local_structured_dot_csm(node):
+    """StructuredDot -> StructuredDotCSC when the sparse matrix is built
+    from constant indices, as the ones of ConvolutionIndices.
+
+    The structure of the matrix is fixed, so the shapes are checked when
+    the function is built.
+    """
+    if node.op == _structured_dot:
+        a, b = node.inputs
+        if a.type.format != 'csc':
+            return False
+        if (isinstance(a, gof.Constant) or
+                (a.owner and isinstance(a.owner.op, sparse.CSM) and
+                 all(isinstance(i, gof.Constant)
+                     for i in a.owner.inputs[1:]))):
+            return local_structured_dot.transform(node)
+    return False
+register_specialize(local_structured_dot_csm)
+
+
 def applySparseFilter(kerns, kshp, nkern, images, imgshp,
                       step=(1, 1), bias=None, mode='valid'):
     """
@@ -336,6 +336,34 @@ class TestSP(unittest.TestCase):
             utt.verify_grad(mp, [imval.reshape(imval.shape[0],-1)])
 
 
+    def test_convolution_indices(self):
+        # The structure is computed once per set of arguments, and the
+        # filter application uses the C implementation of StructuredDot.
+        imshp = (2, 9, 7)
+        kshp = (3, 2)
+        rval = sp.convolution_indices.sparse_eval(imshp, kshp, 3,
+                                                  (2, 1), 'full')
+        assert sp.convolution_indices.sparse_eval(imshp, kshp, 3,
+                                                  (2, 1), 'full') is rval
+        indices, indptr, spmatshp, sptype, outshp, kmap = rval
+        assert not indices.flags.writeable
+        assert not kmap.flags.writeable
+        assert len(indices) == len(kmap) == indptr[-1]
+
+        kerns = tensor.dvector()
+        images = tensor.dmatrix()
+        output, outshp = sp.applySparseFilter(kerns, kshp, 3, images, imshp,
+                                              (2, 1), mode='full')
+        f = function([kerns, images], output)
+        if theano.config.cxx:
+            assert any(isinstance(node.op, theano.sparse.opt.StructuredDotCSC)
+                       for node in f.maker.fgraph.toposort())
+        rng = numpy.random.RandomState(utt.fetch_seed())
+        kvals = rng.rand(imshp[0] * numpy.prod(kshp) * numpy.prod(outshp))
+        imvals = rng.rand(4, numpy.prod(imshp))
+        spmat = sparse.csc_matrix((kvals[kmap], indices, indptr), spmatshp)
+        utt.assert_allclose(f(kvals, imvals), (spmat * imvals.T).T)
+
     def test_CSMGrad(self):
         imshp = (3,3)
         nkern = 1 # per output pixel
@@ -1,3 +1,6 @@
+import os
+import shutil
+from tempfile import mkdtemp
 import time
 import unittest
 
@@ -41,6 +44,7 @@ from theano.sparse import (
     SamplingDot, sampling_dot,
     Diag, diag, SquareDiagonal, square_diagonal,
     EnsureSortedIndices, ensure_sorted_indices, clean,
+    SumDuplicates, sum_duplicates,
     ConstructSparseFromList, construct_sparse_from_list,
     TrueDot, true_dot, eq, neq, le, ge, gt, lt)
 
@@ -316,7 +320,7 @@ class SparseInferShapeTester(utt.InferShapeTester):
                                                config.floatX, 3)),
                                  sp.csr_matrix(random_lil((10, 40),
                                                config.floatX, 3))],
-                                AddSS)
+                                (AddSS, sparse.opt.ElemwiseSSCSx))
 
     def test_add_sd(self):
         x = SparseType('csr', dtype=config.floatX)()
@@ -337,7 +341,7 @@ class SparseInferShapeTester(utt.InferShapeTester):
                                 [sp.csr_matrix(random_lil((10, 40),
                                                config.floatX, 3)),
                                 ] * 2,
-                                MulSS)
+                                (MulSS, sparse.opt.ElemwiseSSCSx))
 
     def test_mul_sd(self):
         x = SparseType('csr', dtype=config.floatX)()
@@ -368,7 +372,7 @@ class SparseInferShapeTester(utt.InferShapeTester):
                                config.floatX, 3)),
                  sp.csc_matrix(random_lil((5, 3),
                                config.floatX, 3))],
-                Dot)
+                (Dot, sparse.opt.SpGEMMCSR))
 
     def test_structured_dot(self):
         x = SparseType('csc', dtype=config.floatX)()
@@ -380,7 +384,7 @@ class SparseInferShapeTester(utt.InferShapeTester):
                                config.floatX, 3)),
                  sp.csc_matrix(random_lil((5, 3),
                                config.floatX, 3))],
-                StructuredDot)
+                (StructuredDot, sparse.opt.SpGEMMCSR))
 
     def test_structured_dot_grad(self):
         # We also need the grad of CSM to be implemetned.
@@ -837,6 +841,29 @@ class T_conversion(unittest.TestCase):
             self.assertRaises(TypeError, self.check_format_ndim, format, 3)
             self.assertRaises(TypeError, self.check_format_ndim, format, 4)
 
+    def test_from_arrays(self):
+        for format, from_arrays in [('csr', sparse.csr_from_arrays),
+                                    ('csc', sparse.csc_from_arrays)]:
+            v = as_sparse_format(random_lil((5, 7), config.floatX, 10),
+                                 format)
+            m = from_arrays(v.data, v.indices, v.indptr, v.shape)
+            assert m.format == format
+            for name in ['data', 'indices', 'indptr']:
+                assert numpy.may_share_memory(getattr(m, name),
+                                              getattr(v, name))
+            assert numpy.all(m.toarray() == v.toarray())
+
+            # The arrays can be given as value of a sparse input
+            x = theano.sparse.matrix(format)
+            f = theano.function([x], x * 2)
+            out = f((v.data, v.indices, v.indptr, v.shape))
+            utt.assert_allclose(out.toarray(), 2 * v.toarray())
+            out = f([v.data, v.indices.astype('int64'), v.indptr, v.shape])
+            utt.assert_allclose(out.toarray(), 2 * v.toarray())
+            self.assertRaises(TypeError, f,
+                              (v.data.astype('int8'), v.indices, v.indptr,
+                               v.shape))
+
 
 class test_csm_properties(unittest.TestCase):
     def setUp(self):
@@ -1244,6 +1271,29 @@ class DotTests(utt.InferShapeTester):
                                     [x_v, y_v],
                                     (Dot, Usmm, UsmmCscDense))
 
+    def test_structured_grad(self):
+        # With config.sparse.structured_grad, the grad with respect to the
+        # sparse input is sparse and only computed on its sparsity pattern.
+        y = theano.tensor.matrix('y')
+        orig = theano.config.sparse.structured_grad
+        try:
+            theano.config.sparse.structured_grad = True
+            for x, x_v in [(theano.sparse.csr_matrix('x'), self.x_csr),
+                           (theano.sparse.csc_matrix('x'), self.x_csc)]:
+                for out in [theano.sparse.dot(x, y),
+                            theano.sparse.dot(y.T, x.T)]:
+                    gx = theano.grad(theano.tensor.sum(out ** 2), x)
+                    assert gx.type == x.type
+                    f = theano.function([x, y], gx)
+                    tested = f(x_v, self.y)
+                    dense = 2 * numpy.dot(x_v * self.y, self.y.T)
+                    expected = x_v.toarray() * dense
+                    assert tested.format == x_v.format
+                    assert tested.nnz == x_v.nnz
+                    utt.assert_allclose(expected, tested.toarray())
+        finally:
+            theano.config.sparse.structured_grad = orig
+
     def test_csc_dense(self):
         x = theano.sparse.csc_matrix('x')
         y = theano.tensor.matrix('y')
@@ -1774,7 +1824,7 @@ class SpSumTester(utt.InferShapeTester):
                 self._compile_and_check(variable,
                                         [self.op(variable[0], axis=axis)],
                                         data,
-                                        self.op_class)
+                                        (self.op_class, sparse.opt.SpSumCSx))
 
     def test_grad(self):
         for format in sparse.sparse_formats:
@@ -1787,6 +1837,18 @@ class SpSumTester(utt.InferShapeTester):
                         data,
                         structured=struct)
 
+    def test_config_structured_grad(self):
+        x = sparse.csr_matrix()
+        orig = theano.config.sparse.structured_grad
+        try:
+            for struct in [True, False]:
+                theano.config.sparse.structured_grad = struct
+                assert self.op(x).owner.op.structured == struct
+                assert self.op(x, sparse_grad=not struct).owner.op.structured \
+                    == (not struct)
+        finally:
+            theano.config.sparse.structured_grad = orig
+
 
 class DiagTester(utt.InferShapeTester):
     def setUp(self):
@@ -1895,7 +1957,8 @@ class EnsureSortedIndicesTester(utt.InferShapeTester):
                 self._compile_and_check(variable,
                                         [self.op(*variable)],
                                         data,
-                                        self.op_class)
+                                        (self.op_class,
+                                         sparse.opt.EnsureSortedIndicesCSx))
 
     def test_grad(self):
         for format in sparse.sparse_formats:
@@ -1941,6 +2004,52 @@ class CleanTester(utt.InferShapeTester):
                     structured=False)
 
 
+class SumDuplicatesTester(utt.InferShapeTester):
+    def setUp(self):
+        super(SumDuplicatesTester, self).setUp()
+        self.op_class = SumDuplicates
+        self.op = sum_duplicates
+
+    def duplicates(self, format):
+        # Unsorted indices, with two entries at (1, 2) and a pair of
+        # entries at (0, 0) summing to zero.
+        data = numpy.asarray([1., -1., 2., 3., 4., 5.], dtype=config.floatX)
+        indices = numpy.asarray([0, 0, 2, 1, 2, 0], dtype='int32')
+        indptr = numpy.asarray([0, 2, 5, 6], dtype='int32')
+        return getattr(sp, format + '_matrix')((data, indices, indptr),
+                                               shape=(3, 3))
+
+    def test_op(self):
+        for format in sparse.sparse_formats:
+            x = getattr(sparse, format + '_matrix')()
+            f = theano.function([x], self.op(x))
+            x_v = self.duplicates(format)
+            tested = f(x_v)
+            assert tested.format == format
+            assert tested.has_sorted_indices
+            assert tested.nnz == 4
+            # The input is not modified.
+            assert x_v.nnz == 6
+            utt.assert_allclose(x_v.toarray(), tested.toarray())
+
+    def test_infer_shape(self):
+        for format in sparse.sparse_formats:
+            x = getattr(sparse, format + '_matrix')()
+            self._compile_and_check([x],
+                                    [self.op(x)],
+                                    [self.duplicates(format)],
+                                    self.op_class)
+
+    def test_grad(self):
+        for format in sparse.sparse_formats:
+            for shape in zip(range(5, 9), range(3, 7)[::-1]):
+                variable, data = sparse_random_inputs(format, shape=shape)
+                verify_grad_sparse(
+                    self.op,
+                    data,
+                    structured=False)
+
+
 class Remove0Tester(utt.InferShapeTester):
     def setUp(self):
         super(Remove0Tester, self).setUp()
@@ -2052,6 +2161,34 @@ class Test_getitem(unittest.TestCase):
 
         self.assertRaises(IndexError, f, A[0])
 
+    def test_csr_gather_rows(self):
+        v = as_sparse_format(random_lil((30, 7), config.floatX, 60), 'csr')
+        tmpdir = mkdtemp()
+        try:
+            # The dataset is memory-mapped, as a large one would be
+            arrays = []
+            for name in ['data', 'indices', 'indptr']:
+                fname = os.path.join(tmpdir, name + '.npy')
+                numpy.save(fname, getattr(v, name))
+                arrays.append(theano.shared(numpy.load(fname, mmap_mode='r'),
+                                            borrow=True))
+            rows = tensor.lvector()
+            f = theano.function([rows], sparse.csr_gather_rows(
+                arrays[0], arrays[1], arrays[2], v.shape, rows))
+            if theano.config.cxx:
+                # The whole dataset is not converted to a scipy matrix
+                assert not any(isinstance(node.op, (sparse.CSMProperties,
+                                                    sparse.GetItemList))
+                               for node in f.maker.fgraph.toposort())
+            for idx in [[3, 1, 29, 3], [], range(30)]:
+                out = f(idx)
+                assert out.format == 'csr'
+                assert out.shape == (len(idx), 7)
+                assert numpy.all(out.toarray() == v[idx].toarray())
+            del f, arrays
+        finally:
+            shutil.rmtree(tmpdir)
+
     def test_get_item_list_grad(self):
         op = theano.sparse.basic.GetItemList()
         def op_with_fixed_index(x):
@@ -2103,6 +2240,23 @@ class Test_getitem(unittest.TestCase):
 
         verify_grad_sparse(op_with_fixed_index, x_val)
 
+    def test_get_item_2d_grad(self):
+        for format in sparse.sparse_formats:
+            x, x_val = sparse_random_inputs(format, (6, 7))
+            for op in [lambda x: x[1:3, 2:-1], lambda x: x[:, 4:],
+                       lambda x: x[-4:]]:
+                verify_grad_sparse(op, x_val)
+
+            # The grad is sparse and only holds the elements of the slice
+            x = x[0]
+            gx = theano.grad(theano.sparse.sp_sum(x[1:3, 2:-1] * 2), x)
+            assert gx.type == x.type
+            out = theano.function([x], gx)(x_val[0])
+            expected = numpy.zeros((6, 7))
+            expected[1:3, 2:-1] = 2
+            assert out.nnz == 2 * 4
+            utt.assert_allclose(expected, out.toarray())
+
     def test_GetItem2D(self):
         sparse_formats = ('csc', 'csr')
         for format in sparse_formats:
@@ -2396,7 +2550,7 @@ class _HVStackTester(utt.InferShapeTester):
                                     [self.op_class(dtype='float64')
                                      (*self.x[format])],
                                     self.mat[format],
-                                    self.op_class)
+                                    (self.op_class, sparse.opt.StackCSx))
 
     def test_grad(self):
         for format in sparse.sparse_formats:
@@ -2980,7 +3134,8 @@ class TrueDotTester(utt.InferShapeTester):
                 self._compile_and_check(variable,
                                         [self.op(*variable)],
                                         data,
-                                        self.op_class)
+                                        (self.op_class,
+                                         sparse.opt.SpGEMMCSR))
 
     def test_grad(self):
         for format in sparse.sparse_formats:
@@ -10,6 +10,7 @@ import theano
 from theano import sparse, config, tensor
 from theano.sparse import enable_sparse
 from theano.gof.python25 import any
+from theano.tests import unittest_tools as utt
 if not enable_sparse:
     raise SkipTest('Optional package sparse disabled')
 
@@ -122,7 +123,13 @@ def test_local_sampling_dot_csr():
     mode = theano.compile.mode.get_default_mode()
     mode = mode.including("specialize", "local_sampling_dot_csr")
 
-    for sp_format in ['csr']:  # Not implemented for other format
+    rng = numpy.random.RandomState(utt.fetch_seed())
+    x_val = numpy.asarray(rng.uniform(-1, 1, size=(10, 5)),
+                          dtype=config.floatX)
+    y_val = numpy.asarray(rng.uniform(-1, 1, size=(40, 5)),
+                          dtype=config.floatX)
+
+    for sp_format in ['csr', 'csc']:
         inputs = [tensor.matrix(),
                   tensor.matrix(),
                   getattr(theano.sparse, sp_format + '_matrix')()]
@@ -134,6 +141,12 @@ def test_local_sampling_dot_csr():
         if theano.config.blas.ldflags:
             assert not any(isinstance(node.op, sparse.SamplingDot) for node
                        in f.maker.fgraph.toposort())
+            p_val = getattr(sp, sp_format + '_matrix')(
+                random_lil((10, 40), config.floatX, 30))
+            out = f(x_val, y_val, p_val)
+            assert out.format == sp_format
+            utt.assert_allclose(out.toarray(),
+                                p_val.toarray() * numpy.dot(x_val, y_val.T))
         else:
             # SamplingDotCSR's C implementation needs blas, so it should not
             # be inserted
@@ -153,3 +166,328 @@ def test_local_dense_from_sparse_sparse_from_dense():
         # We should just have a deep copy.
         assert len(f.maker.fgraph.apply_nodes) == 1
         f([[1, 2], [3, 4]])
+
+
+def test_local_sparse_from_dense_dense_from_sparse():
+    mode = theano.compile.mode.get_default_mode()
+    mode = mode.including("local_sparse_from_dense_dense_from_sparse")
+    for format in sparse.sparse_formats:
+        x = getattr(sparse, format + '_matrix')()
+        s = sparse.SparseFromDense(format)(sparse.dense_from_sparse(x))
+        f = theano.function([x], s, mode=mode)
+        assert not any(isinstance(node.op, (sparse.DenseFromSparse,
+                                            sparse.SparseFromDense))
+                       for node in f.maker.fgraph.toposort())
+        v = getattr(sp, format + '_matrix')(
+            random_lil((10, 40), config.floatX, 3))
+        v.data[0] = 0
+        out = f(v)
+        assert out.format == format
+        assert out.nnz == v.nnz - 1
+        utt.assert_allclose(v.toarray(), out.toarray())
+
+        # Unsorted indices and duplicate entries, two of them summing to
+        # zero, give the same matrix as the round trip.
+        v = getattr(sp, format + '_matrix')(
+            (numpy.asarray([1, -1, 2, 3, 4], dtype=config.floatX),
+             numpy.asarray([1, 1, 2, 0, 2], dtype='int32'),
+             numpy.asarray([0, 2, 5, 5], dtype='int32')),
+            shape=(3, 3))
+        out = f(v)
+        expected = getattr(sp, format + '_matrix')(v.toarray())
+        assert out.has_sorted_indices
+        assert numpy.all(out.indices == expected.indices)
+        assert numpy.all(out.indptr == expected.indptr)
+        utt.assert_allclose(out.data, expected.data)
+
+
+def test_local_addsd_dense_from_sparse():
+    mode = theano.compile.mode.get_default_mode()
+    mode = mode.including("local_addsd_dense_from_sparse")
+    for format in sparse.sparse_formats:
+        x = getattr(sparse, format + '_matrix')()
+        y = getattr(sparse, format + '_matrix')()
+        f = theano.function([x, y], x + sparse.dense_from_sparse(y),
+                            mode=mode)
+        assert not any(isinstance(node.op, (sparse.AddSD,
+                                            sparse.opt.AddSD_ccode))
+                       for node in f.maker.fgraph.toposort())
+        x_v = getattr(sp, format + '_matrix')(
+            random_lil((10, 40), config.floatX, 3))
+        y_v = getattr(sp, format + '_matrix')(
+            random_lil((10, 40), config.floatX, 3))
+        utt.assert_allclose((x_v + y_v).toarray(), f(x_v, y_v))
+
+
+def test_sparse_openmp():
+    # The C ops with and without openmp, on matrices whose rows have very
+    # different numbers of non-zero elements, as in power-law graphs.
+    if not theano.config.cxx:
+        raise SkipTest("G++ not available, so we need to skip this test.")
+    rng = numpy.random.RandomState(utt.fetch_seed())
+    n_rows, n_cols, n_dense = 61, 53, 7
+    row_nnz = numpy.minimum(rng.zipf(1.5, size=n_rows), n_cols)
+    dense = numpy.zeros((n_rows, n_cols), dtype=config.floatX)
+    for i, nnz in enumerate(row_nnz):
+        cols = rng.permutation(n_cols)[:nnz]
+        dense[i, cols] = rng.uniform(-1, 1, size=nnz)
+    x_csr = sp.csr_matrix(dense)
+    x_csc = sp.csc_matrix(dense)
+    y_val = numpy.asarray(rng.uniform(-1, 1, size=(n_cols, n_dense)),
+                          dtype=config.floatX)
+    y_t_val = numpy.asarray(rng.uniform(-1, 1, size=(n_rows, n_dense)),
+                            dtype=config.floatX)
+    z_val = numpy.asarray(rng.uniform(-1, 1, size=(n_rows, n_dense)),
+                          dtype=config.floatX)
+    a_val = numpy.asarray(rng.uniform(-1, 1, size=(n_rows, n_cols)),
+                          dtype=config.floatX)
+    b_val = numpy.asarray(rng.uniform(-1, 1, size=(n_cols, n_cols)),
+                          dtype=config.floatX)
+    alpha_val = numpy.asarray([[0.5]], dtype=config.floatX)
+    mode = theano.compile.mode.get_default_mode().excluding('inplace')
+
+    def compile_ops(openmp):
+        y = tensor.matrix()
+        z = tensor.matrix()
+        a = tensor.matrix()
+        b = tensor.matrix()
+        alpha = tensor.TensorType(config.floatX, (True, True))()
+        x = sparse.csr_matrix()
+        x_val, x_ind, x_ptr, x_shape = sparse.csm_properties(x)
+        xc = sparse.csc_matrix()
+        xc_val, xc_ind, xc_ptr, xc_shape = sparse.csm_properties(xc)
+        outs = [sparse.opt.StructuredDotCSR(openmp=openmp)(
+                    x_val, x_ind, x_ptr, y),
+                sparse.opt.StructuredDotCSC(openmp=openmp)(
+                    xc_val, xc_ind, xc_ptr, xc_shape[0], y)]
+        # The csc properties of xc are the csr properties of xc.T
+        z_val, z_ind, z_ptr = sparse.opt.SpGEMMCSR(openmp=openmp)(
+            x_val, x_ind, x_ptr, x_shape[1],
+            xc_val, xc_ind, xc_ptr, xc_shape[0])
+        outs.append(sparse.CSR(z_val, z_ind, z_ptr,
+                               tensor.stack(x_shape[0], xc_shape[0])))
+        if theano.config.blas.ldflags:
+            outs.append(sparse.opt.UsmmCscDense(inplace=False,
+                                                openmp=openmp)(
+                alpha, xc_val, xc_ind, xc_ptr, xc_shape[0], y, z))
+            p_val, p_ind, p_ptr = sparse.opt.SamplingDotCSR(openmp=openmp)(
+                a, b, x_val, x_ind, x_ptr, x_shape[1])[:3]
+            outs.append(sparse.CSR(p_val, p_ind, p_ptr, x_shape))
+        return theano.function([x, xc, y, alpha, z, a, b], outs, mode=mode,
+                               on_unused_input='ignore')
+
+    expected = [x_csr * y_val, x_csc * y_val, x_csr * x_csr.T,
+                0.5 * (x_csc * y_val) + z_val,
+                x_csr.multiply(numpy.dot(a_val, b_val.T))]
+    orig_minsize = config.openmp_sparse_minsize
+    try:
+        config.openmp_sparse_minsize = 0
+        for openmp in [False, True]:
+            f = compile_ops(openmp)
+            outs = f(x_csr, x_csc, y_val, alpha_val, z_val, a_val, b_val)
+            for out, e in zip(outs, expected):
+                if sp.issparse(out):
+                    out = out.toarray()
+                if sp.issparse(e):
+                    e = e.toarray()
+                utt.assert_allclose(out, numpy.asarray(e))
+    finally:
+        config.openmp_sparse_minsize = orig_minsize
+
+
+def _unsorted_csx(format, shape, dtype, rng, nnz=30):
+    # A random matrix whose rows (csr) or columns (csc) hold unsorted
+    # indices and duplicate elements.
+    v = getattr(sp, format + '_matrix')(random_lil(shape, dtype, nnz))
+    data, indices, indptr = [], [], [0]
+    for i in xrange(len(v.indptr) - 1):
+        begin, end = v.indptr[i], v.indptr[i + 1]
+        d = list(v.data[begin:end])
+        ind = list(v.indices[begin:end])
+        if d:
+            # Split the first element in two
+            d[0] /= 2
+            d.append(d[0])
+            ind.append(ind[0])
+        perm = rng.permutation(len(d))
+        data.extend(numpy.asarray(d)[perm])
+        indices.extend(numpy.asarray(ind, dtype='int32')[perm])
+        indptr.append(len(data))
+    return getattr(sp, format + '_matrix')(
+        (numpy.asarray(data, dtype=dtype),
+         numpy.asarray(indices, dtype='int32'),
+         numpy.asarray(indptr, dtype='int32')), shape)
+
+
+def _check_csx_opt(inputs, output, values, op, opt):
+    # Compare the C op inserted by `opt` to the python implementation.
+    mode = theano.compile.mode.get_default_mode()
+    f = theano.function(inputs, output,
+                        mode=mode.including("specialize", opt),
+                        on_unused_input='ignore')
+    f_py = theano.function(inputs, output,
+                           mode=mode.excluding(opt),
+                           on_unused_input='ignore')
+    assert not any(isinstance(node.op, op)
+                   for node in f.maker.fgraph.toposort())
+    out = f(*values)
+    expected = f_py(*values)
+    if sp.issparse(expected):
+        assert out.format == expected.format
+        assert out.shape == expected.shape
+        out = out.toarray()
+        expected = expected.toarray()
+    utt.assert_allclose(expected, out)
+
+
+def test_local_elemwise_s_s_csx():
+    if not theano.config.cxx:
+        raise SkipTest("G++ not available, so we need to skip this test.")
+    rng = numpy.random.RandomState(utt.fetch_seed())
+    for format in sparse.sparse_formats:
+        x = getattr(sparse, format + '_matrix')()
+        y = getattr(sparse, format + '_matrix')()
+        x_val = getattr(sp, format + '_matrix')(
+            random_lil((10, 40), config.floatX, 30))
+        y_val = getattr(sp, format + '_matrix')(
+            random_lil((10, 40), config.floatX, 30))
+        for x_v, y_v in [(x_val, y_val), (x_val, -x_val),
+                         (_unsorted_csx(format, (10, 40),
+                                        config.floatX, rng), y_val)]:
+            for op in [sparse.add_s_s, sparse.mul_s_s]:
+                _check_csx_opt([x, y], op(x, y), [x_v, y_v],
+                               type(op), "local_elemwise_s_s_csx")
+
+
+def test_local_spgemm_csr():
+    if not theano.config.cxx:
+        raise SkipTest("G++ not available, so we need to skip this test.")
+    rng = numpy.random.RandomState(utt.fetch_seed())
+    for format in sparse.sparse_formats:
+        x = getattr(sparse, format + '_matrix')()
+        y = getattr(sparse, format + '_matrix')()
+        x_val = getattr(sp, format + '_matrix')(
+            random_lil((10, 40), config.floatX, 30))
+        y_val = getattr(sp, format + '_matrix')(
+            random_lil((40, 15), config.floatX, 60))
+        for x_v, y_v in [(x_val, y_val),
+                         (_unsorted_csx(format, (10, 40),
+                                        config.floatX, rng), y_val),
+                         (x_val, getattr(sp, format + '_matrix')((40, 15),
+                                     dtype=config.floatX))]:
+            for out, op in [(sparse.true_dot(x, y), sparse.TrueDot),
+                            (sparse.structured_dot(x, y),
+                             sparse.StructuredDot),
+                            (sparse.dot(x, y), sparse.Dot)]:
+                _check_csx_opt([x, y], out, [x_v, y_v],
+                               op, "local_spgemm_csr")
+
+
+def test_local_sp_sum_csx():
+    if not theano.config.cxx:
+        raise SkipTest("G++ not available, so we need to skip this test.")
+    rng = numpy.random.RandomState(utt.fetch_seed())
+    for format in sparse.sparse_formats:
+        x = getattr(sparse, format + '_matrix')()
+        x_val = _unsorted_csx(format, (10, 40), config.floatX, rng)
+        for axis in [None, 0, 1]:
+            _check_csx_opt([x], sparse.sp_sum(x, axis=axis), [x_val],
+                           sparse.SpSum, "local_sp_sum_csx")
+
+
+def test_local_get_item_2d_csx():
+    if not theano.config.cxx:
+        raise SkipTest("G++ not available, so we need to skip this test.")
+    rng = numpy.random.RandomState(utt.fetch_seed())
+    a, b = tensor.iscalars('a', 'b')
+    for format in sparse.sparse_formats:
+        x = getattr(sparse, format + '_matrix')()
+        x_val = _unsorted_csx(format, (10, 40), config.floatX, rng)
+        for out in [x[a:b, 3:-2], x[2:, :b], x[:b], x[a:b, -30:-2]]:
+            for a_v, b_v in [(1, 7), (-9, 8), (0, 10), (4, 4)]:
+                _check_csx_opt([x, a, b], out, [x_val, a_v, b_v],
+                               sparse.GetItem2d, "local_get_item_2d_csx")
+
+
+def test_local_get_item_list_csr():
+    if not theano.config.cxx:
+        raise SkipTest("G++ not available, so we need to skip this test.")
+    rng = numpy.random.RandomState(utt.fetch_seed())
+    x = sparse.csr_matrix()
+    index = tensor.ivector()
+    x_val = _unsorted_csx('csr', (10, 40), config.floatX, rng)
+    _check_csx_opt([x, index], sparse.get_item_list(x, index),
+                   [x_val, [0, 9, -1, 3, 3]],
+                   sparse.GetItemList, "local_get_item_list_csr")
+
+    mode = theano.compile.mode.get_default_mode().including(
+        "specialize", "local_get_item_list_csr")
+    f = theano.function([x, index], sparse.get_item_list(x, index),
+                        mode=mode)
+    try:
+        f(x_val, [10])
+        assert False
+    except IndexError:
+        pass
+
+
+def test_local_stack_csx():
+    if not theano.config.cxx:
+        raise SkipTest("G++ not available, so we need to skip this test.")
+    rng = numpy.random.RandomState(utt.fetch_seed())
+    for format, stack, shapes in [('csr', sparse.vstack, [(3, 9), (5, 9)]),
+                                  ('csc', sparse.hstack, [(9, 3), (9, 5)])]:
+        x = getattr(sparse, format + '_matrix')()
+        y = getattr(sparse, format + '_matrix')('float64')
+        x_val = _unsorted_csx(format, shapes[0], config.floatX, rng)
+        y_val = getattr(sp, format + '_matrix')(
+            random_lil(shapes[1], 'float64', 10))
+        for dtype in [config.floatX, 'float64']:
+            _check_csx_opt([x, y], stack([x, y, x], format=format,
+                                         dtype=dtype),
+                           [x_val, y_val], type(stack([x, y]).owner.op),
+                           "local_stack_csx")
+
+
+def test_local_ensure_sorted_indices_csx():
+    if not theano.config.cxx:
+        raise SkipTest("G++ not available, so we need to skip this test.")
+    rng = numpy.random.RandomState(utt.fetch_seed())
+    mode = theano.compile.mode.get_default_mode().including(
+        "specialize", "local_ensure_sorted_indices_csx")
+    for format in sparse.sparse_formats:
+        x = getattr(sparse, format + '_matrix')()
+        x_val = _unsorted_csx(format, (10, 40), config.floatX, rng)
+        # Long rows (csr) or columns (csc) are sorted with qsort
+        long_val = _unsorted_csx(format, (40, 40), config.floatX, rng,
+                                 nnz=1000)
+        for v in [x_val, long_val]:
+            _check_csx_opt([x], sparse.ensure_sorted_indices(x), [v],
+                           sparse.EnsureSortedIndices,
+                           "local_ensure_sorted_indices_csx")
+            f = theano.function([x], sparse.ensure_sorted_indices(x),
+                                mode=mode)
+            out = f(v)
+            for i in xrange(len(out.indptr) - 1):
+                ind = out.indices[out.indptr[i]:out.indptr[i + 1]]
+                assert numpy.all(ind[1:] >= ind[:-1])
+
+
+def test_local_transpose_csm():
+    data = tensor.vector()
+    indices, indptr, shape = (tensor.ivector(), tensor.ivector(),
+                              tensor.ivector())
+    mode = theano.compile.mode.get_default_mode()
+    mode = mode.including("specialize", "local_transpose_csm")
+    for CS, cast in [(sparse.CSC, sp.csc_matrix),
+                     (sparse.CSR, sp.csr_matrix)]:
+        f = theano.function([data, indices, indptr, shape],
+                            sparse.transpose(CS(data, indices, indptr,
+                                                shape)),
+                            mode=mode)
+        assert not any(isinstance(node.op, sparse.Transpose)
+                       for node in f.maker.fgraph.toposort())
+        v = cast(random_lil((10, 40), config.floatX, 3))
+        out = f(v.data, v.indices, v.indptr, v.shape)
+        assert out.shape == (40, 10)
+        utt.assert_allclose(out.toarray(), v.toarray().T)
@@ -22,6 +22,19 @@ def _is_sparse(x):
     return isinstance(x, scipy.sparse.spmatrix)
 
 
+def _from_arrays(format, data, indices, indptr, shape):
+    """Return a scipy sparse matrix in csr or csc `format` built on the
+    given arrays.
+
+    The arrays are not copied, except `indices` and `indptr` when they
+    are not int32 vectors, and their content is not checked.
+    """
+    indices = theano._asarray(indices, dtype='int32')
+    indptr = theano._asarray(indptr, dtype='int32')
+    return SparseType.format_cls[format]((data, indices, indptr),
+                                         shape=tuple(shape), copy=False)
+
+
 class SparseType(gof.Type):
     """
     @type dtype: numpy dtype string such as 'int64' or 'float64' (among others)
@@ -75,6 +88,18 @@ class SparseType(gof.Type):
         if strict:
             raise TypeError("%s is not sparse, or not the right dtype (is %s, "
                             "expected %s)" % (value, value.dtype, self.dtype))
+        if (isinstance(value, (tuple, list)) and len(value) == 4 and
+                self.format in ('csr', 'csc')):
+            # (data, indices, indptr, shape), as given by a data loader:
+            # build the matrix on these arrays without copying them.
+            data, indices, indptr, shape = value
+            data = numpy.asarray(data)
+            if str(data.dtype) != self.dtype:
+                if not allow_downcast:
+                    raise TypeError("Expected %s dtype but got %s" %
+                                    (self.dtype, str(data.dtype)))
+                data = theano._asarray(data, dtype=self.dtype)
+            return _from_arrays(self.format, data, indices, indptr, shape)
         # The input format could be converted here
         if allow_downcast:
             sp = self.format_cls[self.format](value, dtype=self.dtype)
@@ -3050,16 +3050,35 @@ def batched_dot(x, y):
     :param x: A Tensor with sizes e.g.: for  3D (dim1, dim3, dim2)
     :param y: A Tensor with sizes e.g.: for 3D (dim1, dim2, dim4)
     This function computes the dot product between the two tensors, by
-    iterating over the first dimension using scan.
+    iterating over the first dimension.
     Returns a tensor of size e.g. if it is 3D: (dim1, dim3, dim4)
     Example:
     >>> first = tensor.tensor3('first')
     >>> second = tensor.tensor3('second')
     >>> result = batched_dot(first, second)
+    :note: When x and y are matrices or 3D tensors, this uses the
+    `BatchedDot` op, which calls gemm on each pair of matrices. Otherwise
+    this uses scan.
     :note:  This is a subset of numpy.einsum, but we do not provide it for now.
     But numpy einsum is slower than dot or tensordot:
     http://mail.scipy.org/pipermail/numpy-discussion/2012-October/064259.html
     """
+    x = as_tensor_variable(x)
+    y = as_tensor_variable(y)
+    if x.ndim in (2, 3) and y.ndim in (2, 3):
+        x3 = x
+        if x.ndim == 2:
+            x3 = x.dimshuffle(0, 'x', 1)
+        y3 = y
+        if y.ndim == 2:
+            y3 = y.dimshuffle(0, 1, 'x')
+        result = theano.tensor.blas._batched_dot(x3, y3)
+        if y.ndim == 2:
+            result = result[:, :, 0]
+        if x.ndim == 2:
+            result = result[:, 0]
+        return result
+
     result, updates = theano.scan(
         fn=lambda x_mat, y_mat:
         theano.tensor.dot(x_mat, y_mat),
@@ -3093,25 +3112,42 @@ def batched_tensordot(x, y, axes=2):
 
     A hybrid of batch_dot and tensordot, this function computes the
     tensordot product between the two tensors, by iterating over the
-    first dimension using scan to perform a sequence of tensordots.
+    first dimension to perform a sequence of tensordots.
+
+    The summed axes and the other ones are transposed and reshaped so
+    that this is done by a single `BatchedDot`.
     """
+    x = as_tensor_variable(x)
+    y = as_tensor_variable(y)
     if isinstance(axes, (list, numpy.ndarray)):
-        if isinstance(axes, list):
-            axes = numpy.asarray(axes)
-        else:
-            axes = axes.copy()
-        assert numpy.greater(axes, 0).all(), (
+        x_axes = [int(a) for a in axes[0]]
+        y_axes = [int(a) for a in axes[1]]
+        assert python_all([a > 0 for a in x_axes + y_axes]), (
             "All axes should be greater than one, as the "
             "first axis is iterated over (batch-wise scan)")
-        axes -= 1
+    else:
+        x_axes = range(x.ndim - axes, x.ndim)
+        y_axes = range(1, axes + 1)
+    if len(x_axes) != len(y_axes):
+        raise ValueError('batched_tensordot: x and y must sum over the '
+                         'same number of axes', x_axes, y_axes)
+    x_free = [a for a in range(1, x.ndim) if a not in x_axes]
+    y_free = [a for a in range(1, y.ndim) if a not in y_axes]
+
+    def size(t, dims):
+        rval = constant(1, dtype='int64')
+        for d in dims:
+            rval = rval * t.shape[d]
+        return rval
 
-    result, updates = theano.scan(
-        fn=lambda x_mat, y_mat:
-        theano.tensor.tensordot(x_mat, y_mat, axes),
-        outputs_info=None,
-        sequences=[x, y],
-        non_sequences=None)
-    return result
+    x3 = x.dimshuffle([0] + x_free + x_axes).reshape(
+        (x.shape[0], size(x, x_free), size(x, x_axes)), ndim=3)
+    y3 = y.dimshuffle([0] + y_axes + y_free).reshape(
+        (y.shape[0], size(y, y_axes), size(y, y_free)), ndim=3)
+    result = theano.tensor.blas._batched_dot(x3, y3)
+    shape = ([x.shape[0]] + [x.shape[a] for a in x_free] +
+             [y.shape[a] for a in y_free])
+    return result.reshape(shape, ndim=len(shape))
 
 
 def split(x, splits_size, n_splits, axis=0):
@@ -3290,6 +3326,77 @@ def patternbroadcast(x, broadcastable):
     return theano.tensor.opt.apply_rebroadcast_opt(rval)
 
 
+class JoinDestinations(object):
+    """
+    Give the producers of the inputs of a `Join` node views of its next
+    output, so that they compute their value directly in it.
+
+    The shape of the next output is guessed from the previous call. When
+    it changes, the producers do not use the views (they don't have the
+    right shape) and `join` falls back on a regular concatenation.
+
+    See `Op.make_thunk` and `theano.gof.link.wrap_output_destinations`.
+    """
+    def __init__(self, node, inputs):
+        self.inputs = inputs
+        self.dtype = node.outputs[0].type.dtype
+        self.ndim = node.outputs[0].type.ndim
+        # The axis and the input sizes along it from the previous call
+        self.axis = None
+        self.sizes = None
+        self.shape = None
+        self.buffer = None
+        self.views = {}
+
+    def destination(self, i):
+        if self.sizes is None:
+            return None
+        if self.buffer is None:
+            self.buffer = numpy.empty(self.shape, dtype=self.dtype)
+            key = [slice(None)] * self.ndim
+            start = 0
+            self.views = {}
+            for j, size in enumerate(self.sizes):
+                key[self.axis] = slice(start, start + size)
+                if j + 1 in self.inputs:
+                    self.views[j + 1] = self.buffer[tuple(key)]
+                start += size
+        return self.views[i]
+
+    def join(self, axis, tensors):
+        """Return the concatenation of `tensors` along `axis`."""
+        buf, views = self.buffer, self.views
+        self.buffer, self.views = None, {}
+        axis = int(axis)
+        if axis < 0:
+            axis += self.ndim
+        sizes = [t.shape[axis] for t in tensors]
+        if (buf is not None and axis == self.axis and sizes == self.sizes):
+            key = [slice(None)] * self.ndim
+            start = 0
+            for j, t in enumerate(tensors):
+                key[axis] = slice(start, start + sizes[j])
+                start += sizes[j]
+                if views.get(j + 1) is t:
+                    # It was computed in place.
+                    continue
+                dst = buf[tuple(key)]
+                if dst.shape != t.shape:
+                    # Let numpy raise the error
+                    buf = None
+                    break
+                dst[...] = t
+        else:
+            buf = None
+        if buf is None:
+            buf = theano._asarray(numpy.concatenate(tensors, axis=axis),
+                                  dtype=self.dtype)
+        self.axis = axis
+        self.sizes = sizes
+        self.shape = buf.shape
+        return buf
+
+
 class Join(Op):
     """
     Concatenate multiple `TensorVariable`s along some axis.
@@ -3424,6 +3531,39 @@ class Join(Op):
         out[0] = theano._asarray(numpy.concatenate(tensors, axis=axis),
                                  dtype=node.outputs[0].type.dtype)
 
+    def make_thunk(self, node, storage_map, compute_map, no_recycling):
+        # The inputs that can be computed directly in our output.
+        out_dtype = node.outputs[0].type.dtype
+        inputs = []
+        for i in range(1, len(node.inputs)):
+            var = node.inputs[i]
+            if (var.owner is not None and
+                    isinstance(var.type, TensorType) and
+                    var.type.dtype == out_dtype and
+                    len(getattr(var, 'clients', [])) == 1 and
+                    var.owner.op.accepts_output_destination(
+                        var.owner, var.owner.outputs.index(var))):
+                inputs.append(i)
+        if not inputs:
+            return super(Join, self).make_thunk(node, storage_map,
+                                                compute_map, no_recycling)
+
+        destinations = JoinDestinations(node, inputs)
+        node_input_storage = [storage_map[r] for r in node.inputs]
+        node_output_storage = [storage_map[r] for r in node.outputs]
+
+        def rval():
+            axis = node_input_storage[0][0]
+            tensors = [x[0] for x in node_input_storage[1:]]
+            node_output_storage[0][0] = destinations.join(axis, tensors)
+            compute_map[node.outputs[0]][0] = True
+
+        rval.inputs = node_input_storage
+        rval.outputs = node_output_storage
+        rval.input_destinations = destinations
+        rval.lazy = False
+        return rval
+
     def c_code_cache_version(self):
         return (2,)
 
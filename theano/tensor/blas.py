@@ -139,7 +139,7 @@ except ImportError:
     pass
 
 from theano.configparser import config, AddConfigVar, StrParam
-from theano.gof import (utils, Op, view_roots,
+from theano.gof import (utils, Op, OpenMPOp, view_roots,
                         local_optimizer, Optimizer,
                         InconsistencyError, toolbox, SequenceDB,
                         EquilibriumOptimizer, Apply,
@@ -764,6 +764,10 @@ class GemmRelated(Op):
                 int Nz0 = Nz[0], Nz1 = Nz[1], Nx1 = Nx[1];
                 //std::cerr << (unit/256) MOD 16 << (unit / 16) MOD 16 << unit MOD 16<< '\\n';
                 //double t0 = time_time();
+                int bad_unit = 0;
+                // The product does not touch any python object, so other
+                // threads can run while it is computed.
+                Py_BEGIN_ALLOW_THREADS
                 switch(unit)
                 {
                     case 0x000: sgemm_(&N, &N, &Nz1, &Nz0, &Nx1, &a, y, &sy_0, x, &sx_0, &b, z, &sz_0); break;
@@ -774,8 +778,14 @@ class GemmRelated(Op):
                     case 0x101: sgemm_(&N, &T, &Nz0, &Nz1, &Nx1, &a, x, &sx_1, y, &sy_0, &b, z, &sz_1); break;
                     case 0x011: sgemm_(&T, &N, &Nz0, &Nz1, &Nx1, &a, x, &sx_0, y, &sy_1, &b, z, &sz_1); break;
                     case 0x111: sgemm_(&N, &N, &Nz0, &Nz1, &Nx1, &a, x, &sx_1, y, &sy_1, &b, z, &sz_1); break;
-                    default: PyErr_SetString(PyExc_ValueError, "some matrix has no unit stride"); %(fail)s;
+                    default: bad_unit = 1;
                 };
+                Py_END_ALLOW_THREADS
+                if (bad_unit)
+                {
+                    PyErr_SetString(PyExc_ValueError, "some matrix has no unit stride");
+                    %(fail)s;
+                }
                 //fprintf(stderr, "Calling sgemm %%i %%i %%i %%i took %%f\\n", unit, Nz1, Nz0, Nx1, time_time() - t0);
         """
 
@@ -803,6 +813,8 @@ class GemmRelated(Op):
                 //sx_0, sx_1,
                 //sz_0, sz_1
                 //);
+                int bad_unit = 0;
+                Py_BEGIN_ALLOW_THREADS
                 switch(unit)
                 {
                     case 0x000: dgemm_(&N, &N, &Nz1, &Nz0, &Nx1, &a, y,
@@ -821,10 +833,15 @@ class GemmRelated(Op):
                                        &sx_0, y, &sy_1, &b, z, &sz_1); break;
                     case 0x111: dgemm_(&N, &N, &Nz0, &Nz1, &Nx1, &a, x,
                                        &sx_1, y, &sy_1, &b, z, &sz_1); break;
-                    default: PyErr_SetString(PyExc_ValueError,
-                                             "some matrix has no unit stride");
-                             %(fail)s;
+                    default: bad_unit = 1;
                 };
+                Py_END_ALLOW_THREADS
+                if (bad_unit)
+                {
+                    PyErr_SetString(PyExc_ValueError,
+                                    "some matrix has no unit stride");
+                    %(fail)s;
+                }
                 //fprintf(stderr, "Calling dgemm %%i %%i %%i %%i took %%f\\n",
                 //        unit, Nz1, Nz0, Nx1, time_time()- t0);
         """
@@ -857,7 +874,7 @@ class GemmRelated(Op):
             self.end_switch_typenum), '')
 
     def build_gemm_version(self):
-        return (13, blas_header_version())
+        return (14, blas_header_version())
 
 
 class Gemm(GemmRelated):
@@ -1619,6 +1636,11 @@ class Dot22(GemmRelated):
     def __str__(self):
         return self.__class__.__name__
 
+    def accepts_output_destination(self, node, i):
+        # The C code reuses any z of the right shape, and the gemm call
+        # handles the strides of a row or column slice.
+        return True
+
     setup_z_Nz_Sz = """
         if ((NULL == %(_zout)s)
             || (PyArray_DIMS(%(_zout)s)[0] != PyArray_DIMS(%(_x)s)[0])
@@ -1673,6 +1695,237 @@ class Dot22(GemmRelated):
 _dot22 = Dot22()
 
 
+class BatchedDot(OpenMPOp):
+    """Compute the matrix products of two 3D tensors along their first
+    dimension: z[i] = dot(x[i], y[i]).
+
+    The C code calls gemm on each pair of matrices, without copying them
+    when their last two dimensions have a unit stride. When the matrices
+    are small, the loop over the batch is parallelized with OpenMP.
+    """
+    __props__ = ()
+
+    # Above this number of multiply-add per product, we let the BLAS
+    # use the threads.
+    openmp_max_size = 128 ** 3
+
+    def make_node(self, x, y):
+        x = T.as_tensor_variable(x)
+        y = T.as_tensor_variable(y)
+        if x.ndim != 3 or y.ndim != 3:
+            raise TypeError('BatchedDot inputs must be 3D tensors',
+                            x.type, y.type)
+        dtype = theano.scalar.upcast(x.dtype, y.dtype)
+        bz = (x.broadcastable[0] and y.broadcastable[0],
+              x.broadcastable[1], y.broadcastable[2])
+        return Apply(self, [x, y], [T.tensor(dtype, bz)])
+
+    def perform(self, node, inp, out):
+        x, y = inp
+        z, = out
+        if x.shape[0] != y.shape[0]:
+            raise ValueError('BatchedDot: the batch sizes differ',
+                             x.shape, y.shape)
+        shape = (x.shape[0], x.shape[1], y.shape[2])
+        if z[0] is None or z[0].shape != shape:
+            z[0] = numpy.empty(shape, dtype=node.outputs[0].dtype)
+        for i in xrange(x.shape[0]):
+            z[0][i] = numpy.dot(x[i], y[i])
+
+    def grad(self, inp, grads):
+        x, y = inp
+        gz, = grads
+        xgrad = self(gz, y.dimshuffle(0, 2, 1))
+        ygrad = self(x.dimshuffle(0, 2, 1), gz)
+        if xgrad.dtype != x.dtype:
+            xgrad = T.cast(xgrad, x.dtype)
+        if ygrad.dtype != y.dtype:
+            ygrad = T.cast(ygrad, y.dtype)
+        return [xgrad, ygrad]
+
+    def R_op(self, inputs, eval_points):
+        x, y = inputs
+        ex, ey = eval_points
+        if ex is None and ey is None:
+            return [None]
+        rval = None
+        if ex is not None:
+            rval = self(ex, y)
+        if ey is not None:
+            t = self(x, ey)
+            if rval is None:
+                rval = t
+            else:
+                rval = rval + t
+        return [rval]
+
+    def infer_shape(self, node, shapes):
+        xshp, yshp = shapes
+        return [(xshp[0], xshp[1], yshp[2])]
+
+    def c_support_code(self):
+        return blas_header_text() + """
+        // Return 0 if the last two dimensions of `a` can be given to gemm
+        // as a row-major matrix, 1 if as a column-major one and -1 if it
+        // must be copied first. Set *ld to its leading dimension.
+        static int batched_dot_layout(PyArrayObject* a, int* ld)
+        {
+            npy_intp es = PyArray_ITEMSIZE(a);
+            npy_intp* N = PyArray_DIMS(a);
+            npy_intp* S = PyArray_STRIDES(a);
+            if (!PyArray_ISALIGNED(a) || S[0] % es)
+                return -1;
+            if ((N[2] <= 1 || S[2] == es) &&
+                (N[1] <= 1 || (S[1] > 0 && S[1] % es == 0 &&
+                               S[1] / es >= N[2])))
+            {
+                *ld = (N[1] > 1) ? S[1] / es : (N[2] > 1 ? N[2] : 1);
+                return 0;
+            }
+            if ((N[1] <= 1 || S[1] == es) &&
+                (N[2] <= 1 || (S[2] > 0 && S[2] % es == 0 &&
+                               S[2] / es >= N[1])))
+            {
+                *ld = (N[2] > 1) ? S[2] / es : (N[1] > 1 ? N[1] : 1);
+                return 1;
+            }
+            return -1;
+        }
+        """
+
+    def c_headers(self):
+        return super(BatchedDot, self).c_headers()
+
+    def c_libraries(self):
+        return ldflags()
+
+    def c_compile_args(self):
+        return (ldflags(libs=False, flags=True) +
+                super(BatchedDot, self).c_compile_args())
+
+    def c_lib_dirs(self):
+        return ldflags(libs=False, libs_dir=True)
+
+    def c_header_dirs(self):
+        return ldflags(libs=False, include_dir=True)
+
+    def c_code(self, node, name, inp, out, sub):
+        _x, _y = inp
+        _z, = out
+        fail = sub['fail']
+        dtype = node.outputs[0].dtype
+        if (dtype not in ('float32', 'float64') or
+                node.inputs[0].dtype != dtype or
+                node.inputs[1].dtype != dtype or
+                not ldflags()):
+            raise utils.MethodNotDefined('%s.c_code' %
+                                         self.__class__.__name__)
+        ctype = {'float32': 'float', 'float64': 'double'}[dtype]
+        gemm = {'float32': 'sgemm_', 'float64': 'dgemm_'}[dtype]
+        typenum = {'float32': 'NPY_FLOAT32', 'float64': 'NPY_FLOAT64'}[dtype]
+        omp = ''
+        if self.openmp:
+            omp = ('#pragma omp parallel for '
+                   'if(B > 1 && (npy_intp)M * N * K <= %d)' %
+                   self.openmp_max_size)
+        return """
+        {
+        PyArrayObject* xs = %(_x)s;
+        PyArrayObject* ys = %(_y)s;
+        PyArrayObject* x_copy = NULL;
+        PyArrayObject* y_copy = NULL;
+        int ldx, ldy, ldz;
+        int xlayout, ylayout;
+        npy_intp* Nx = PyArray_DIMS(xs);
+        npy_intp* Ny = PyArray_DIMS(ys);
+        npy_intp dims[3];
+
+        if (Nx[0] != Ny[0]) {
+            PyErr_Format(PyExc_ValueError,
+                "BatchedDot: x has a batch size of %%ld but y of %%ld",
+                (long int)Nx[0], (long int)Ny[0]);
+            %(fail)s;
+        }
+        if (Nx[2] != Ny[1]) {
+            PyErr_Format(PyExc_ValueError,
+                "Shape mismatch: x has %%ld cols but y has %%ld rows",
+                (long int)Nx[2], (long int)Ny[1]);
+            %(fail)s;
+        }
+        dims[0] = Nx[0];
+        dims[1] = Nx[1];
+        dims[2] = Ny[2];
+
+        if (NULL == %(_z)s
+            || !PyArray_CompareLists(PyArray_DIMS(%(_z)s), dims, 3)
+            || !PyArray_ISWRITEABLE(%(_z)s)
+            || batched_dot_layout(%(_z)s, &ldz) != 0)
+        {
+            Py_XDECREF(%(_z)s);
+            %(_z)s = (PyArrayObject*)PyArray_EMPTY(3, dims, %(typenum)s, 0);
+            if (!%(_z)s) {
+                PyErr_SetString(PyExc_MemoryError,
+                                "failed to alloc BatchedDot output");
+                %(fail)s
+            }
+            batched_dot_layout(%(_z)s, &ldz);
+        }
+
+        xlayout = batched_dot_layout(xs, &ldx);
+        if (xlayout < 0) {
+            x_copy = PyArray_GETCONTIGUOUS(xs);
+            if (!x_copy)
+                %(fail)s
+            xs = x_copy;
+            xlayout = batched_dot_layout(xs, &ldx);
+        }
+        ylayout = batched_dot_layout(ys, &ldy);
+        if (ylayout < 0) {
+            y_copy = PyArray_GETCONTIGUOUS(ys);
+            if (!y_copy) {
+                Py_XDECREF(x_copy);
+                %(fail)s
+            }
+            ys = y_copy;
+            ylayout = batched_dot_layout(ys, &ldy);
+        }
+
+        if (dims[1] > 0 && dims[2] > 0 && Nx[2] == 0) {
+            PyArray_FILLWBYTE(%(_z)s, 0);
+        }
+        else if (dims[0] > 0 && dims[1] > 0 && dims[2] > 0) {
+            // z is row-major, so we compute z^T = y^T x^T in the
+            // column-major convention of the BLAS.
+            char opx = xlayout ? 'T' : 'N';
+            char opy = ylayout ? 'T' : 'N';
+            int M = dims[1], N = dims[2], K = Nx[2];
+            npy_intp B = dims[0];
+            %(ctype)s one = 1, zero = 0;
+            char* x_data = PyArray_BYTES(xs);
+            char* y_data = PyArray_BYTES(ys);
+            char* z_data = PyArray_BYTES(%(_z)s);
+            npy_intp sx = PyArray_STRIDES(xs)[0];
+            npy_intp sy = PyArray_STRIDES(ys)[0];
+            npy_intp sz = PyArray_STRIDES(%(_z)s)[0];
+            %(omp)s
+            for (npy_intp i = 0; i < B; ++i) {
+                %(gemm)s(&opy, &opx, &N, &M, &K, &one,
+                         (%(ctype)s*)(y_data + i * sy), &ldy,
+                         (%(ctype)s*)(x_data + i * sx), &ldx, &zero,
+                         (%(ctype)s*)(z_data + i * sz), &ldz);
+            }
+        }
+        Py_XDECREF(x_copy);
+        Py_XDECREF(y_copy);
+        }
+        """ % locals()
+
+    def c_code_cache_version(self):
+        return (1, blas_header_version())
+
+_batched_dot = BatchedDot()
+
+
 @local_optimizer([T.Dot])
 def local_dot_to_dot22(node):
     # This works for tensor.outer too because basic.outer is a macro that
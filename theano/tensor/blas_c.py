@@ -3,7 +3,10 @@ import numpy
 from theano import config
 
 from theano.tensor.opt import in2out
+from theano.gof import utils
 from theano.tensor.blas import ldflags, blas_header_text, blas_header_version
+from theano.tensor.blas_headers import (lapack_header_text,
+                                        lapack_header_version, detect_lapack)
 from theano.tensor.blas import (
     blas_optdb, optdb, local_optimizer, EquilibriumOptimizer)
 from theano.tensor.blas import Ger, ger, ger_destructive
@@ -29,6 +32,27 @@ class BaseBLAS(object):
         return blas_header_text()
 
 
+class BaseLapack(BaseBLAS):
+    """Mixin for the Ops whose C code calls LAPACK.
+
+    The LAPACK routines are taken from the BLAS library, so the C code is
+    only available when `detect_lapack` found them there. Otherwise, and
+    for dtypes other than float32 and float64, `lapack_prefix` raises
+    MethodNotDefined and the Op uses its Python implementation.
+    """
+    def c_support_code(self):
+        return lapack_header_text()
+
+    def lapack_prefix(self, *dtypes):
+        """Return the LAPACK routine prefix ('s' or 'd') for `dtypes`,
+        which must all be equal."""
+        if (not detect_lapack() or len(set(dtypes)) != 1 or
+                dtypes[0] not in ('float32', 'float64')):
+            raise utils.MethodNotDefined('%s.c_code' %
+                                         self.__class__.__name__)
+        return {'float32': 's', 'float64': 'd'}[dtypes[0]]
+
+
 # ##### ####### #######
 # GER
 # ##### ####### #######
@@ -970,6 +970,105 @@ def blas_header_version():
     return version
 
 
+_lapack_routines = ['potrf', 'getrf', 'getrs', 'getri', 'trtrs', 'syevd']
+
+
+def lapack_header_text():
+    """C header for the LAPACK routines used by the linear algebra Ops.
+
+    They come from the same library as BLAS (see `detect_lapack`).
+    """
+    header = """
+    extern "C"
+    {
+    """
+    for p, t in [('s', 'float'), ('d', 'double')]:
+        header += """
+        void %(p)spotrf_(char* uplo, int* n, %(t)s* a, int* lda, int* info);
+        void %(p)sgetrf_(int* m, int* n, %(t)s* a, int* lda, int* ipiv,
+                         int* info);
+        void %(p)sgetrs_(char* trans, int* n, int* nrhs, %(t)s* a, int* lda,
+                         int* ipiv, %(t)s* b, int* ldb, int* info);
+        void %(p)sgetri_(int* n, %(t)s* a, int* lda, int* ipiv,
+                         %(t)s* work, int* lwork, int* info);
+        void %(p)strtrs_(char* uplo, char* trans, char* diag, int* n,
+                         int* nrhs, %(t)s* a, int* lda, %(t)s* b, int* ldb,
+                         int* info);
+        void %(p)ssyevd_(char* jobz, char* uplo, int* n, %(t)s* a, int* lda,
+                         %(t)s* w, %(t)s* work, int* lwork, int* iwork,
+                         int* liwork, int* info);
+        """ % locals()
+    header += """
+    }
+
+    // Set a numpy.linalg.LinAlgError, like numpy and scipy do.
+    static void lapack_linalg_error(const char* msg)
+    {
+        PyObject* linalg = PyImport_ImportModule("numpy.linalg");
+        PyObject* err = NULL;
+        if (linalg)
+            err = PyObject_GetAttrString(linalg, "LinAlgError");
+        if (err)
+            PyErr_SetString(err, msg);
+        else if (!PyErr_Occurred())
+            PyErr_SetString(PyExc_ValueError, msg);
+        Py_XDECREF(err);
+        Py_XDECREF(linalg);
+    }
+    """
+    return header
+
+
+def lapack_header_version():
+    return (1,)
+
+
+def detect_lapack():
+    """
+    Return True if the LAPACK routines we use can be linked with the
+    BLAS flags (config.blas.ldflags). This is the case for OpenBLAS, MKL
+    and most ATLAS installations, but not for a reference BLAS.
+
+    The result is cached in detect_lapack.present.
+    """
+    if detect_lapack.tested:
+        return detect_lapack.present
+    detect_lapack.tested = True
+    if not config.blas.ldflags:
+        _logger.info('No BLAS flags, so no LAPACK')
+        return False
+
+    flags = config.blas.ldflags.split()
+    for f in list(flags):
+        if f.startswith('-L'):
+            flags.append('-Wl,-rpath,' + f[2:])
+    calls = "\n".join(["(void)&%s%s_;" % (p, r)
+                        for p in 'sd' for r in _lapack_routines])
+    test_code = textwrap.dedent("""\
+        extern "C" {
+        %s
+        }
+        int main(int argc, char** argv)
+        {
+        %s
+            return 0;
+        }
+        """) % ("\n".join(["void %s%s_();" % (p, r)
+                           for p in 'sd' for r in _lapack_routines]),
+                calls)
+    detect_lapack.present = bool(GCC_compiler.try_compile_tmp(
+        test_code, tmp_prefix='detect_lapack_', flags=flags,
+        try_run=False))
+    if not detect_lapack.present:
+        _logger.info('The LAPACK routines can not be linked with '
+                     'config.blas.ldflags, the linear algebra Ops will '
+                     'use their Python implementation')
+    return detect_lapack.present
+
+detect_lapack.tested = False
+detect_lapack.present = False
+
+
 def ____gemm_code(check_ab, a_init, b_init):
     mod = '%'
     return """
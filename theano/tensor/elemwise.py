@@ -878,6 +878,11 @@ class Elemwise(OpenMPOp):
                 storage[0] = variable
             i += 1
 
+    def accepts_output_destination(self, node, i):
+        # The C code computes into any output of the right shape (see
+        # make_alloc), but not the inplace outputs.
+        return i not in self.inplace_pattern
+
     def infer_shape(self, node, i_shapes):
         rval = []
         for o in node.outputs:
@@ -1178,7 +1183,7 @@ class Elemwise(OpenMPOp):
         return support_code
 
     def c_code_cache_version_apply(self, node):
-        version = [11]  # the version corresponding to the c code in this Op
+        version = [13]  # the version corresponding to the c code in this Op
 
         # now we insert versions for the ops on which we depend...
         scalar_node = Apply(self.scalar_op,
@@ -1188,6 +1193,10 @@ class Elemwise(OpenMPOp):
         for i in node.inputs + node.outputs:
             version.append(get_scalar_type(dtype=i.type.dtype).c_code_cache_version())
         version.append(('openmp', self.openmp))
+        if self.openmp:
+            # The size above which the loops run in parallel is in the code
+            version.append(('openmp_elemwise_minsize',
+                            config.openmp_elemwise_minsize))
         if all(version):
             return tuple(version)
         else:
@@ -1215,6 +1224,36 @@ class Elemwise(OpenMPOp):
 ### CAReduce ###
 ################
 
+def _careduce_c_identity(scalar_op, dtype):
+    """Return the C identity of the reduction scalar_op for dtype.
+
+    :returns: (identity, scal_name). scal_name is None, except for
+        maximum and minimum, which have no identity: their identity is
+        the smallest (biggest) value of dtype, so the caller must
+        check that the reduced axes are not empty.
+    """
+    if hasattr(scalar_op, 'identity'):
+        return scalar_op.identity, None
+    elif scalar_op == scalar.maximum:
+        if dtype in ["float32", "float64"]:
+            identity = "-__builtin_inf()"
+        elif dtype.startswith("uint"):
+            # numpy1.5.1 don't define NPY_MIN_UINT*
+            identity = "0"
+        else:
+            identity = "NPY_MIN_" + str(dtype).upper()
+        return identity, 'maximum'
+    elif scalar_op == scalar.minimum:
+        if dtype in ["float32", "float64"]:
+            identity = "__builtin_inf()"
+        else:
+            identity = "NPY_MAX_" + str(dtype).upper()
+        return identity, 'minimum'
+    else:
+        raise TypeError(
+                "The CAReduce.scalar_op must have an identity field.")
+
+
 class CAReduce(Op):
     """
     CAReduce = Commutative Associative Reduce
@@ -1509,24 +1548,9 @@ class CAReduce(Op):
                     [range(nnested) + ['x'] * len(axis)],
                     [adtype], dict(sub, lv0=aname))
 
-        if hasattr(self.scalar_op, 'identity'):
-            identity = self.scalar_op.identity
-        elif self.scalar_op in [scalar.maximum, scalar.minimum]:
-            if self.scalar_op == scalar.maximum:
-                scal_name = 'maximum'
-                if input.type.dtype in ["float32", "float64"]:
-                    identity = "-__builtin_inf()"
-                elif input.type.dtype.startswith("uint"):
-                    # numpy1.5.1 don't define NPY_MIN_UINT*
-                    identity = "0"
-                else:
-                    identity = "NPY_MIN_" + str(input.type.dtype).upper()
-            if self.scalar_op == scalar.minimum:
-                scal_name = 'minimum'
-                if input.type.dtype in ["float32", "float64"]:
-                    identity = "__builtin_inf()"
-                else:
-                    identity = "NPY_MAX_" + str(input.type.dtype).upper()
+        identity, scal_name = _careduce_c_identity(self.scalar_op,
+                                                   input.type.dtype)
+        if scal_name is not None:
             fail = sub["fail"]
             pattern = [0] * len(node.inputs[0].broadcastable)
             axis = self.axis
@@ -1545,9 +1569,6 @@ for(int i=0;i<PyArray_NDIM(%(iname)s);i++){
   }
 }
                    """ % locals()
-        else:
-            raise TypeError(
-                    "The CAReduce.scalar_op must have an identity field.")
 
         task0_decl = (
                 "%(dtype)s& %(name)s_i = *%(name)s_iter;\n"
@@ -1608,7 +1629,7 @@ for(int i=0;i<PyArray_NDIM(%(iname)s);i++){
         return ['<vector>', '<algorithm>']
 
     def c_code_cache_version_apply(self, node):
-        version = [5]  # the version corresponding to the c code in this Op
+        version = [6]  # the version corresponding to the c code in this Op
 
         # now we insert versions for the ops on which we depend...
         scalar_node = Apply(self.scalar_op,
@@ -2111,3 +2132,319 @@ class ProdWithoutZeros(CAReduceDtype):
     def __init__(self, axis=None, dtype=None, acc_dtype=None):
         CAReduceDtype.__init__(self, mul_without_zeros, axis=axis,
                                dtype=dtype, acc_dtype=acc_dtype)
+
+
+class FusedCAReduce(Op):
+    """
+    Reduces the outputs of an elemwise scalar operation, without
+    allocating them.
+
+    FusedCAReduce(scalar_ops, axis, pre_scalar_op)(*inputs) computes
+    the same thing as:
+
+      outs = Elemwise(pre_scalar_op)(*inputs)
+      [CAReduce(scalar_ops[i], axis)(outs[i]) for i in range(len(outs))]
+
+    but in only one loop over the inputs: each element of the outputs
+    of pre_scalar_op is accumulated as soon as it is computed. So we
+    don't write and then reread a temporary of the size of the inputs.
+    All the outputs are reduced over the same axis.
+
+    This op is only introduced by the optimization
+    local_careduce_fusion, after the gradient is computed, so it
+    doesn't implement grad.
+    """
+
+    def __init__(self, scalar_ops, axis, pre_scalar_op,
+                 dtypes, acc_dtypes):
+        """
+        :param scalar_ops: list of binary scalar ops, one for each
+            output of pre_scalar_op. They must be commutative and
+            associative.
+
+        :param axis: list of dimensions that we reduce (as in the output
+            of CAReduce.make_node, they must be positive).
+
+        :param pre_scalar_op: the scalar op that compute the values to
+            reduce.
+
+        :param dtypes: the dtype of each output.
+
+        :param acc_dtypes: the dtype of the accumulator of each output.
+        """
+        if len(scalar_ops) != pre_scalar_op.nout:
+            raise ValueError("FusedCAReduce needs one reduction scalar op"
+                             " per output of pre_scalar_op")
+        for scalar_op in scalar_ops:
+            if scalar_op.nin not in [-1, 2] or scalar_op.nout != 1:
+                raise NotImplementedError((
+                    "FusedCAReduce only supports binary functions with a"
+                    " single output."))
+        self.scalar_ops = tuple(scalar_ops)
+        self.axis = tuple(sorted(set(int(a) for a in axis)))
+        self.pre_scalar_op = pre_scalar_op
+        self.dtypes = tuple(dtypes)
+        self.acc_dtypes = tuple(acc_dtypes)
+
+    def __eq__(self, other):
+        return (type(self) == type(other)
+                and self.scalar_ops == other.scalar_ops
+                and self.axis == other.axis
+                and self.pre_scalar_op == other.pre_scalar_op
+                and self.dtypes == other.dtypes
+                and self.acc_dtypes == other.acc_dtypes)
+
+    def __hash__(self):
+        return hash((type(self), self.scalar_ops, self.axis,
+                     self.pre_scalar_op, self.dtypes, self.acc_dtypes))
+
+    def __str__(self):
+        return "FusedCAReduce{pre=%s,red=%s}{%s}" % (
+            self.pre_scalar_op,
+            ", ".join(str(s) for s in self.scalar_ops),
+            ", ".join(str(x) for x in self.axis))
+
+    def make_node(self, *inputs):
+        inputs = map(as_tensor_variable, inputs)
+        ndim = inputs[0].type.ndim
+        if any(i.type.ndim != ndim for i in inputs):
+            raise TypeError("All the inputs of FusedCAReduce must have the"
+                            " same number of dimensions", inputs)
+        for axis in self.axis:
+            if axis >= ndim:
+                raise ValueError((
+                    'Not enough dimensions on %s to reduce on axis %s'
+                    % (inputs[0], axis)))
+        # The inputs are broadcasted as in Elemwise
+        broadcastable = [all(bcast) for bcast in
+                         zip(*[i.type.broadcastable for i in inputs])]
+        broadcastable = [b for i, b in enumerate(broadcastable)
+                         if i not in self.axis]
+        outputs = [TensorType(dtype=dtype, broadcastable=broadcastable)()
+                   for dtype in self.dtypes]
+        return Apply(self, inputs, outputs)
+
+    def perform(self, node, inputs, output_storage):
+        # The python implementation computes the full elemwise
+        # outputs, and then reduces each of them.
+        elemwise = Elemwise(self.pre_scalar_op)
+        e_node = elemwise.make_node(*node.inputs)
+        e_storage = [[None] for o in e_node.outputs]
+        elemwise.perform(e_node, inputs, e_storage)
+        for i, e_out in enumerate(e_node.outputs):
+            reduce_op = CAReduceDtype(self.scalar_ops[i], axis=self.axis,
+                                      dtype=self.dtypes[i],
+                                      acc_dtype=self.acc_dtypes[i])
+            reduce_op.perform(reduce_op.make_node(e_out),
+                              e_storage[i], [output_storage[i]])
+
+    def infer_shape(self, node, shapes):
+        shape = []
+        for dim, bcast in enumerate(zip(*[i.type.broadcastable
+                                          for i in node.inputs])):
+            if dim in self.axis:
+                continue
+            for i, b in enumerate(bcast):
+                if not b:
+                    shape.append(shapes[i][dim])
+                    break
+            else:
+                shape.append(1)
+        return [tuple(shape)] * len(node.outputs)
+
+    def _scalar_nodes(self, node):
+        """
+        Return the scalar Apply node of pre_scalar_op and the ones of
+        each reduction.
+        """
+        pre_inputs = [get_scalar_type(dtype=i.type.dtype)()
+                      for i in node.inputs]
+        pre_outputs = [o.type() for o in
+                       self.pre_scalar_op.make_node(*pre_inputs).outputs]
+        pre_node = Apply(self.pre_scalar_op, pre_inputs, pre_outputs)
+        red_nodes = []
+        for scalar_op, acc_dtype, pre_out in zip(self.scalar_ops,
+                                                 self.acc_dtypes,
+                                                 pre_outputs):
+            red_nodes.append(Apply(
+                scalar_op,
+                [get_scalar_type(dtype=acc_dtype)(), pre_out.type()],
+                [get_scalar_type(dtype=acc_dtype)()]))
+        return pre_node, red_nodes
+
+    def _c_all(self, node, name, inames, onames, sub):
+        _inames = inames
+        inames = gof.utils.uniq(inames)
+        inputs = gof.utils.uniq(node.inputs)
+        assert len(inames) == len(inputs)
+
+        idtypes = [input.type.dtype_specs()[1] for input in inputs]
+        ndim = inputs[0].type.ndim
+        axis = self.axis
+        order1 = [i for i in xrange(ndim) if i not in axis]
+        order = order1 + list(axis)
+        nnested = len(order1)
+        # for each input: order, but with 'x' at all broadcastable
+        # positions
+        orders = [[input.type.broadcastable[i] and 'x' or i for i in order]
+                  for input in inputs]
+        out_order = range(nnested) + ['x'] * len(axis)
+
+        sub = dict(sub)
+        for i, iname in enumerate(inames):
+            sub['lv%i' % i] = iname
+
+        decl = cgen.make_declare(orders, idtypes, sub)
+        checks = cgen.make_checks(orders, idtypes, sub)
+
+        pre_node, red_nodes = self._scalar_nodes(node)
+
+        alloc = ""
+        end = ""
+        anames = []
+        adtypes = []
+        identities = []
+        scal_names = []
+        for j, (output, oname) in enumerate(izip(node.outputs, onames)):
+            odtype = output.type.dtype_specs()[1]
+            alloc += cgen.make_declare([out_order], [odtype],
+                                       dict(sub, lv0=oname))
+            alloc += cgen.make_alloc([o[:nnested] for o in orders], odtype,
+                                     dict(sub, olv=oname))
+            alloc += cgen.make_checks([out_order], [odtype],
+                                      dict(sub, lv0=oname))
+            if self.acc_dtypes[j] != output.type.dtype:
+                # Create an accumulator variable different from the output
+                acc_type = TensorType(broadcastable=output.broadcastable,
+                                      dtype=self.acc_dtypes[j])
+                aname = "acc%i" % j
+                adtype = acc_type.dtype_specs()[1]
+                decl += acc_type.c_declare(aname, sub)
+                decl += acc_type.c_init(aname, sub)
+                alloc += cgen.make_declare([out_order], [adtype],
+                                           dict(sub, lv0=aname))
+                alloc += cgen.make_alloc([o[:nnested] for o in orders],
+                                         adtype, dict(sub, olv=aname))
+                alloc += cgen.make_checks([out_order], [adtype],
+                                          dict(sub, lv0=aname))
+                end += """
+                PyArray_CopyInto(%(oname)s, %(aname)s);
+                """ % locals()
+                end += acc_type.c_cleanup(aname, sub)
+            else:
+                # the output is the accumulator variable
+                aname = oname
+                adtype = odtype
+            identity, scal_name = _careduce_c_identity(
+                self.scalar_ops[j], pre_node.outputs[j].type.dtype)
+            anames.append(aname)
+            adtypes.append(adtype)
+            identities.append(identity)
+            if scal_name is not None:
+                scal_names.append(scal_name)
+
+        if scal_names:
+            # maximum and minimum have no identity, the reduced axes
+            # must not be empty.
+            fail = sub["fail"]
+            scal_name = scal_names[0]
+            pattern_ = ", ".join(str(int(i in axis)) for i in xrange(ndim))
+            decl += """int tosum[]={%(pattern_)s};""" % locals()
+            for iname in inames:
+                alloc += """
+for(int i=0;i<PyArray_NDIM(%(iname)s);i++){
+  if(PyArray_DIMS(%(iname)s)[i]==0 && tosum[i]){
+    PyErr_Format(PyExc_ValueError,
+         "Input of FusedCAReduce{%(scal_name)s} has zero-size on axis %%d",i);
+    %(fail)s;
+  }
+}
+                   """ % locals()
+
+        task0_decl = "".join([
+                "%(dtype)s& %(name)s_i = *%(name)s_iter;\n"
+                "%(name)s_i = %(identity)s;\n"
+                % dict(dtype=adtype, name=aname, identity=identity)
+                for aname, adtype, identity in izip(anames, adtypes,
+                                                    identities)])
+
+        pre_names = ["%s_pre%i" % (name, j) for j in xrange(len(anames))]
+        task1_decl = "".join([
+                "%(dtype)s& %(name)s_i = *%(name)s_iter;\n"
+                % dict(dtype=idtype, name=iname)
+                for iname, idtype in izip(inames, idtypes)])
+        task1_decl += "".join([
+                "%s %s;\n" % (o.type.dtype_specs()[1], pname)
+                for o, pname in izip(pre_node.outputs, pre_names)])
+        task1_code = self.pre_scalar_op.c_code(
+                pre_node,
+                name + '_scalar_pre_',
+                ["%s_i" % s for s in _inames],
+                pre_names,
+                sub)
+        for red_node, aname, pname in izip(red_nodes, anames, pre_names):
+            task1_code += "\n" + red_node.op.c_code(
+                red_node,
+                None,
+                ["%s_i" % aname, pname],
+                ["%s_i" % aname],
+                sub)
+        code1 = """
+        {
+            %(task1_decl)s
+            %(task1_code)s
+        }
+        """ % locals()
+
+        if len(axis) == 1:
+            all_code = [("", "")] * nnested + [(task0_decl, code1), ""]
+        else:
+            all_code = (
+                    [("", "")] * nnested
+                    + [(task0_decl, "")]
+                    + [("", "")] * (len(axis) - 2)
+                    + [("", code1), ""])
+        loop = cgen.make_loop_careduce(
+                orders + [out_order] * len(anames),
+                idtypes + adtypes, all_code,
+                dict(sub, **dict(('lv%i' % (len(inames) + j), aname)
+                                 for j, aname in enumerate(anames))))
+
+        return decl, checks, alloc, loop, end
+
+    def c_code(self, node, name, inames, onames, sub):
+        code = "\n".join(self._c_all(node, name, inames, onames, sub))
+        return code
+
+    def c_headers(self):
+        return ['<vector>', '<algorithm>']
+
+    def c_support_code(self):
+        support_code = [self.pre_scalar_op.c_support_code()]
+        for scalar_op in self.scalar_ops:
+            support_code.append(scalar_op.c_support_code())
+        # remove duplicate code blocks
+        return "\n".join(sorted(set(support_code)))
+
+    def c_support_code_apply(self, node, nodename):
+        support_code = self.pre_scalar_op.c_support_code_apply(
+            node, nodename + '_scalar_pre_')
+        return support_code
+
+    def c_code_cache_version_apply(self, node):
+        version = [2]  # the version corresponding to the c code in this Op
+
+        # now we insert versions for the ops on which we depend...
+        pre_node, red_nodes = self._scalar_nodes(node)
+        version.append(
+            self.pre_scalar_op.c_code_cache_version_apply(pre_node))
+        for red_node in red_nodes:
+            version.append(
+                red_node.op.c_code_cache_version_apply(red_node))
+        for i in node.inputs + node.outputs:
+            version.append(
+                get_scalar_type(dtype=i.type.dtype).c_code_cache_version())
+        if all(version):
+            return tuple(version)
+        else:
+            return ()
@@ -154,6 +154,13 @@ def make_alloc(loop_orders, dtype, sub, fortran='0'):
                                                     %(type)s,
                                                     %(fortran)s);
         }
+        else if (PyArray_NDIM(%(olv)s) == %(nd)s &&
+                 PyArray_CompareLists(PyArray_DIMS(%(olv)s), dims, %(nd)s) &&
+                 PyArray_ISBEHAVED(%(olv)s)) {
+            // Keep it, even if it is a view: the loops work with any
+            // strides. This is how we compute directly in a destination
+            // given by the consumer of this output (e.g. a Join).
+        }
         else {
             PyArray_Dims new_dims;
             new_dims.len = %(nd)s;
@@ -242,7 +249,8 @@ def make_loop(loop_orders, dtypes, loop_tasks, sub, openmp=None):
     return "{%s}" % s
 
 
-def make_reordered_loop(init_loop_orders, olv_index, dtypes, inner_task, sub, openmp=None):
+def make_reordered_loop(init_loop_orders, olv_index, dtypes, inner_task, sub,
+                        openmp=None, tile_size=32):
     '''A bit like make_loop, but when only the inner-most loop executes code.
 
     All the loops will be reordered so that the loops over the output tensor
@@ -251,6 +259,26 @@ def make_reordered_loop(init_loop_orders, olv_index, dtypes, inner_task, sub, op
     will be on its rows; if it's f_contiguous, it will be on its columns.
 
     The output tensor's index among the loop variables is indicated by olv_index.
+
+    Once reordered, the following is also done at run time:
+
+    - Loops of length 1 are dropped, and two consecutive loops are
+      collapsed into a single one when, for every variable, the stride
+      of the outer loop is the stride of the inner loop times its
+      length. The inner-most loop then runs over the longest contiguous
+      (or uniformly strided) chunk of memory we can find.
+    - If, on the two inner-most loops, the memory access of one of the
+      variables is transposed compared to the order of the loops
+      (for instance, x.T + y with x and y c_contiguous), these two loops
+      are tiled in blocks of tile_size x tile_size elements, so that the
+      block of every variable stays in the cache.
+    - With openmp, all the loops but the inner-most one (or all the
+      loops over tiles) are collapsed in a single parallel loop, enabled
+      when the total number of elements is at least
+      config.openmp_elemwise_minsize.
+
+    The generated loops are all perfectly nested, which is what allows
+    to collapse them.
     '''
 
     # Number of variables
@@ -313,24 +341,12 @@ def make_reordered_loop(init_loop_orders, olv_index, dtypes, inner_task, sub, op
         totals.append(total)
 
     declare_totals = """
-    int init_totals[%(nnested)s] = {%(totals)s};
+    npy_intp init_totals[%(nnested)s] = {%(totals)s};
     """ % dict(
             nnested = nnested,
             totals = ', '.join(totals)
             )
 
-    # Sort totals to match the new order that was computed by sorting
-    # the loop vector. One integer variable per loop is declared.
-    declare_totals += """
-    %(ovar)s_loops_it = %(ovar)s_loops.begin();
-    """ % locals()
-
-    for i in xrange(nnested):
-        declare_totals += """
-        int TOTAL_%(i)i = init_totals[%(ovar)s_loops_it->second];
-        ++%(ovar)s_loops_it;
-        """ % locals()
-
     ## Get sorted strides
     # Get strides in the initial order
     def get_loop_strides(loop_order, i):
@@ -351,7 +367,7 @@ def make_reordered_loop(init_loop_orders, olv_index, dtypes, inner_task, sub, op
 
     # We declare the initial strides as a 2D array, nvars x nnested
     declare_strides = """
-    int init_strides[%(nvars)i][%(nnested)i] = {
+    npy_intp init_strides[%(nvars)i][%(nnested)i] = {
         %(strides)s
     };""" % dict(
             nvars = nvars,
@@ -361,21 +377,74 @@ def make_reordered_loop(init_loop_orders, olv_index, dtypes, inner_task, sub, op
                 for i, lo in enumerate(init_loop_orders)
                 if len(lo)>0))
 
-    # Declare (sorted) stride and for each variable
-    # we iterate from innermost loop to outermost loop
-    declare_strides += """
-    std::vector< std::pair<int, int> >::reverse_iterator %(ovar)s_loops_rit;
+    # Sort the totals and the strides of each variable to match the new
+    # order that was computed by sorting the loop vector.
+    sort_loops = """
+    npy_intp loop_totals[%(nnested)i];
+    npy_intp loop_strides[%(nvars)i][%(nnested)i];
+    for (int l = 0; l < %(nnested)i; ++l) {
+        int init_l = %(ovar)s_loops[l].second;
+        loop_totals[l] = init_totals[init_l];
+        for (int v = 0; v < %(nvars)i; ++v) {
+            loop_strides[v][l] = init_strides[v][init_l];
+        }
+    }
     """ % locals()
 
-    for i in xrange(nvars):
-        var = sub["lv%i" % i]
-        declare_strides += """
-        %(ovar)s_loops_rit = %(ovar)s_loops.rbegin();""" % locals()
-        for j in reversed(range(nnested)):
-            declare_strides += """
-            int %(var)s_stride_l%(j)i = init_strides[%(i)i][%(ovar)s_loops_rit->second];
-            ++%(ovar)s_loops_rit;
-            """ % locals()
+    # Drop the loops of length 1 and collapse the consecutive loops
+    # that can be iterated as one. We go from the inner-most loop
+    # (which can only grow) to the outer-most one, and fill the
+    # remaining outer loops with loops of length 1.
+    collapse_loops = """
+    {
+        int dst = %(nnested)i - 1;
+        for (int src = %(nnested)i - 2; src >= 0; --src) {
+            if (loop_totals[src] == 1)
+                continue;
+            bool mergeable = true;
+            for (int v = 0; v < %(nvars)i; ++v) {
+                if (loop_strides[v][src] !=
+                        loop_strides[v][dst] * loop_totals[dst]) {
+                    mergeable = false;
+                    break;
+                }
+            }
+            if (loop_totals[dst] == 1) {
+                loop_totals[dst] = loop_totals[src];
+                for (int v = 0; v < %(nvars)i; ++v)
+                    loop_strides[v][dst] = loop_strides[v][src];
+            } else if (mergeable) {
+                loop_totals[dst] *= loop_totals[src];
+            } else {
+                --dst;
+                loop_totals[dst] = loop_totals[src];
+                for (int v = 0; v < %(nvars)i; ++v)
+                    loop_strides[v][dst] = loop_strides[v][src];
+            }
+        }
+        for (int l = 0; l < dst; ++l) {
+            loop_totals[l] = 1;
+            for (int v = 0; v < %(nvars)i; ++v)
+                loop_strides[v][l] = 0;
+        }
+    }
+    """ % locals()
+
+    # One variable per loop for the totals, and per (variable, loop)
+    # for the strides, so that the compiler sees them as constants
+    # inside the loops.
+    declare_loops = ""
+    for i in xrange(nnested):
+        declare_loops += """
+        npy_intp TOTAL_%(i)i = loop_totals[%(i)i];""" % locals()
+    for j in xrange(nvars):
+        var = sub["lv%i" % j]
+        for i in xrange(nnested):
+            declare_loops += """
+            npy_intp %(var)s_stride_l%(i)i = loop_strides[%(j)i][%(i)i];""" % locals()
+    declare_loops += """
+    npy_intp total_size = 1%s;
+    """ % ''.join('*TOTAL_%i' % i for i in xrange(nnested))
 
     declare_iter = ""
     for i, dtype in enumerate(dtypes):
@@ -386,40 +455,95 @@ def make_reordered_loop(init_loop_orders, olv_index, dtypes, inner_task, sub, op
     for j , dtype in enumerate(dtypes):
         var = sub["lv%i" % j]
         pointer_update += "%(dtype)s &%(var)s_i = * ( %(var)s_iter"%locals()
-        tot_jump = ''
         for i in reversed(range(nnested)):
             iterv = 'ITER_%i' % i
             pointer_update += "+%(var)s_stride_l%(i)i*%(iterv)s" % locals()
         pointer_update += ");\n"
 
-    loop = inner_task
-    for i in reversed(range(nnested)):
+    def omp_pragma(ncollapse):
+        if not openmp or ncollapse < 1:
+            return ""
+        openmp_elemwise_minsize = theano.config.openmp_elemwise_minsize
+        pragma = "#pragma omp parallel for"
+        if ncollapse > 1:
+            pragma += " collapse(%i)" % ncollapse
+        pragma += " if(total_size >= %i)\n" % openmp_elemwise_minsize
+        return pragma
+
+    def loop_over(i, start, end, body):
         iterv = 'ITER_%i' % i
-        total = 'TOTAL_%i' % i
-        update = ''
-        forloop = ''
-        # The pointers are defined only in the most inner loop
-        if i == nnested-1:
-            update = pointer_update
-        if i == 0:
-            if openmp:
-                openmp_elemwise_minsize= theano.config.openmp_elemwise_minsize
-                forloop += """#pragma omp parallel for if( %(total)s >=%(openmp_elemwise_minsize)s)\n""" % locals()
-        forloop += "for(int %(iterv)s = 0; %(iterv)s<%(total)s; %(iterv)s++)" % locals()
-
-        loop = """
-        %(forloop)s
+        return """
+        for(npy_intp %(iterv)s = %(start)s; %(iterv)s<%(end)s; %(iterv)s++)
         { // begin loop %(i)i
-            %(update)s
-            %(loop)s 
+            %(body)s
         } // end loop %(i)i
         """ % locals()
 
+    inner_code = """
+    %(pointer_update)s
+    %(inner_task)s
+    """ % locals()
+
+    # The plain loops, on which all loops but the inner-most one are run
+    # in parallel.
+    loop = inner_code
+    for i in reversed(range(nnested)):
+        loop = loop_over(i, '0', 'TOTAL_%i' % i, loop)
+    loop = omp_pragma(max(nnested - 1, 1)) + loop
+
+    if nnested >= 2:
+        # The tiled loops, over the two inner-most loops
+        a = nnested - 2
+        b = nnested - 1
+        tiled = loop_over(b, 'TILE_%i' % b, 'TILE_END_%i' % b, inner_code)
+        tiled = loop_over(a, 'TILE_%i' % a, 'TILE_END_%i' % a, tiled)
+        tiled = """
+        for(npy_intp TILE_%(a)i = 0; TILE_%(a)i<TOTAL_%(a)i; TILE_%(a)i += %(tile_size)i)
+        { // begin tile loop %(a)i
+            for(npy_intp TILE_%(b)i = 0; TILE_%(b)i<TOTAL_%(b)i; TILE_%(b)i += %(tile_size)i)
+            { // begin tile loop %(b)i
+                npy_intp TILE_END_%(a)i = std::min<npy_intp>(
+                    TILE_%(a)i + %(tile_size)i, TOTAL_%(a)i);
+                npy_intp TILE_END_%(b)i = std::min<npy_intp>(
+                    TILE_%(b)i + %(tile_size)i, TOTAL_%(b)i);
+                %(tiled)s
+            } // end tile loop %(b)i
+        } // end tile loop %(a)i
+        """ % locals()
+        for i in reversed(range(a)):
+            tiled = loop_over(i, '0', 'TOTAL_%i' % i, tiled)
+        tiled = omp_pragma(nnested) + tiled
+
+        # A variable is transposed compared to the loop order if its
+        # stride on the inner-most loop is bigger than on the one
+        # outside it.
+        transposed = []
+        for j in xrange(nvars):
+            var = sub["lv%i" % j]
+            sa = "%(var)s_stride_l%(a)i" % locals()
+            sb = "%(var)s_stride_l%(b)i" % locals()
+            transposed.append(
+                "(%(sa)s != 0 && %(sb)s != 0 && "
+                "(%(sa)s < 0 ? -%(sa)s : %(sa)s) < "
+                "(%(sb)s < 0 ? -%(sb)s : %(sb)s))" % locals())
+        transposed = ' ||\n'.join(transposed)
+        loop = """
+        if (TOTAL_%(a)i >= %(tile_size)i && TOTAL_%(b)i >= %(tile_size)i &&
+            (%(transposed)s)) {
+            %(tiled)s
+        } else {
+            %(loop)s
+        }
+        """ % locals()
+
     return '\n'.join([
             '{',
             order_loops,
             declare_totals,
             declare_strides,
+            sort_loops,
+            collapse_loops,
+            declare_loops,
             declare_iter,
             loop,
             '}\n',
@@ -4,7 +4,7 @@ import theano
 logger = logging.getLogger(__name__)
 import numpy
 
-from theano.gof import Op, Apply
+from theano.gof import Op, Apply, utils
 
 from theano.tensor import as_tensor_variable, dot, DimShuffle, Dot
 from theano.tensor.blas import Dot22
@@ -14,6 +14,9 @@ from theano.gof import local_optimizer
 from theano.gof.opt import Optimizer
 from theano.gradient import DisconnectedType
 from theano.tensor import basic as tensor
+from theano.tensor.blas_c import BaseLapack
+from theano.tensor.blas_headers import lapack_header_version
+from theano.tensor.slinalg import Solve, solve, imported_scipy
 
 
 class MatrixPinv(Op):
@@ -48,7 +51,7 @@ class MatrixPinv(Op):
 pinv = MatrixPinv()
 
 
-class MatrixInverse(Op):
+class MatrixInverse(BaseLapack, Op):
     """Computes the inverse of a matrix :math:`A`.
 
     Given a square matrix :math:`A`, ``matrix_inverse`` returns a square
@@ -114,6 +117,76 @@ class MatrixInverse(Op):
     def infer_shape(self, node, shapes):
         return shapes
 
+    def c_code(self, node, name, inputs, outputs, sub):
+        x, = inputs
+        z, = outputs
+        fail = sub['fail']
+        p = self.lapack_prefix(node.inputs[0].dtype)
+        ctype = {'s': 'float', 'd': 'double'}[p]
+        # The inverse of the transpose LAPACK sees is the transpose of the
+        # inverse, so we can work directly on a C-contiguous copy.
+        return """
+        {
+            int n = PyArray_DIMS(%(x)s)[0];
+            int lda = (n > 1) ? n : 1;
+            int info = 0;
+            int lwork = -1;
+            %(ctype)s work_size = 0;
+            %(ctype)s* work = NULL;
+            int* ipiv = NULL;
+            if (PyArray_DIMS(%(x)s)[1] != n)
+            {
+                PyErr_SetString(PyExc_ValueError,
+                                "MatrixInverse: the matrix must be square");
+                %(fail)s
+            }
+            Py_XDECREF(%(z)s);
+            %(z)s = (PyArrayObject*)PyArray_NewCopy(%(x)s, NPY_CORDER);
+            if (!%(z)s)
+                %(fail)s
+            if (n)
+            {
+                %(ctype)s* a = (%(ctype)s*)PyArray_DATA(%(z)s);
+                ipiv = (int*)malloc(sizeof(int) * n);
+                if (!ipiv)
+                {
+                    PyErr_NoMemory();
+                    %(fail)s
+                }
+                %(p)sgetrf_(&n, &n, a, &lda, ipiv, &info);
+                if (info == 0)
+                {
+                    %(p)sgetri_(&n, a, &lda, ipiv, &work_size, &lwork, &info);
+                    lwork = (int)work_size;
+                    work = (%(ctype)s*)malloc(sizeof(%(ctype)s) * lwork);
+                    if (!work)
+                    {
+                        free(ipiv);
+                        PyErr_NoMemory();
+                        %(fail)s
+                    }
+                    %(p)sgetri_(&n, a, &lda, ipiv, work, &lwork, &info);
+                    free(work);
+                }
+                free(ipiv);
+            }
+            if (info > 0)
+            {
+                lapack_linalg_error("Singular matrix");
+                %(fail)s
+            }
+            if (info < 0)
+            {
+                PyErr_Format(PyExc_ValueError,
+                             "MatrixInverse: LAPACK returned %%d", info);
+                %(fail)s
+            }
+        }
+        """ % locals()
+
+    def c_code_cache_version(self):
+        return (1, lapack_header_version())
+
 matrix_inverse = MatrixInverse()
 
 
@@ -254,10 +327,12 @@ def trace(X):
     return extract_diag(X).sum()
 
 
-class Det(Op):
+class Det(BaseLapack, Op):
     """Matrix determinant
     Input should be a square matrix
     """
+    __props__ = ()
+
     def make_node(self, x):
         x = as_tensor_variable(x)
         assert x.ndim == 2
@@ -281,6 +356,73 @@ class Det(Op):
 
     def __str__(self):
         return "Det"
+
+    def c_code(self, node, name, inputs, outputs, sub):
+        x, = inputs
+        z, = outputs
+        fail = sub['fail']
+        p = self.lapack_prefix(node.inputs[0].dtype)
+        ctype = {'s': 'float', 'd': 'double'}[p]
+        # det(A) == det(A.T), so the layout LAPACK sees does not matter.
+        return """
+        {
+            int n = PyArray_DIMS(%(x)s)[0];
+            int lda = (n > 1) ? n : 1;
+            int info = 0;
+            %(ctype)s det = 1;
+            PyArrayObject* a_c = NULL;
+            int* ipiv = NULL;
+            if (PyArray_DIMS(%(x)s)[1] != n)
+            {
+                PyErr_SetString(PyExc_ValueError,
+                                "Det: the matrix must be square");
+                %(fail)s
+            }
+            if (!%(z)s)
+            {
+                %(z)s = (PyArrayObject*)PyArray_EMPTY(
+                    0, NULL, PyArray_TYPE(%(x)s), 0);
+                if (!%(z)s)
+                    %(fail)s
+            }
+            if (n)
+            {
+                %(ctype)s* a;
+                a_c = (PyArrayObject*)PyArray_NewCopy(%(x)s, NPY_CORDER);
+                ipiv = (int*)malloc(sizeof(int) * n);
+                if (!a_c || !ipiv)
+                {
+                    Py_XDECREF(a_c);
+                    free(ipiv);
+                    if (!PyErr_Occurred())
+                        PyErr_NoMemory();
+                    %(fail)s
+                }
+                a = (%(ctype)s*)PyArray_DATA(a_c);
+                // info > 0 means an exactly zero pivot, so det is 0.
+                %(p)sgetrf_(&n, &n, a, &lda, ipiv, &info);
+                for (int i = 0; i < n; ++i)
+                {
+                    det *= a[i * n + i];
+                    if (ipiv[i] != i + 1)
+                        det = -det;
+                }
+                Py_DECREF(a_c);
+                free(ipiv);
+            }
+            if (info < 0)
+            {
+                PyErr_Format(PyExc_ValueError,
+                             "Det: LAPACK returned %%d", info);
+                %(fail)s
+            }
+            *(%(ctype)s*)PyArray_DATA(%(z)s) = det;
+        }
+        """ % locals()
+
+    def c_code_cache_version(self):
+        return (1, lapack_header_version())
+
 det = Det()
 
 
@@ -308,7 +450,7 @@ class Eig(Op):
 eig = Eig()
 
 
-class Eigh(Eig):
+class Eigh(BaseLapack, Eig):
     """
     Return the eigenvalues and eigenvectors of a Hermitian or symmetric matrix.
 
@@ -336,6 +478,84 @@ class Eigh(Eig):
     def perform(self, node, (x,), (w, v)):
         w[0], v[0] = self._numop(x, self.UPLO)
 
+    def c_code(self, node, name, inputs, outputs, sub):
+        x, = inputs
+        w, v = outputs
+        fail = sub['fail']
+        p = self.lapack_prefix(*[o.dtype for o in node.inputs + node.outputs])
+        if p != 'd':
+            # ssyevd is less accurate than what numpy.linalg.eigh returns
+            # for float32, which the users of this Op have come to rely on.
+            raise utils.MethodNotDefined('Eigh.c_code')
+        ctype = {'s': 'float', 'd': 'double'}[p]
+        uplo = self.UPLO
+        # LAPACK works on a Fortran-ordered copy of x. The eigenvectors
+        # overwrite it as columns, like numpy returns them.
+        return """
+        {
+            npy_intp dims[1];
+            int n = PyArray_DIMS(%(x)s)[0];
+            int lda = (n > 1) ? n : 1;
+            int info = 0;
+            int lwork = -1, liwork = -1;
+            int iwork_size = 0;
+            %(ctype)s work_size = 0;
+            %(ctype)s* work = NULL;
+            int* iwork = NULL;
+            char jobz = 'V', uplo = '%(uplo)s';
+            if (PyArray_DIMS(%(x)s)[1] != n)
+            {
+                PyErr_SetString(PyExc_ValueError,
+                                "Eigh: the matrix must be square");
+                %(fail)s
+            }
+            dims[0] = n;
+            Py_XDECREF(%(v)s);
+            Py_XDECREF(%(w)s);
+            %(v)s = (PyArrayObject*)PyArray_NewCopy(%(x)s, NPY_FORTRANORDER);
+            %(w)s = (PyArrayObject*)PyArray_EMPTY(
+                1, dims, PyArray_TYPE(%(x)s), 0);
+            if (!%(v)s || !%(w)s)
+                %(fail)s
+            if (n)
+            {
+                %(ctype)s* a = (%(ctype)s*)PyArray_DATA(%(v)s);
+                %(ctype)s* ev = (%(ctype)s*)PyArray_DATA(%(w)s);
+                %(p)ssyevd_(&jobz, &uplo, &n, a, &lda, ev, &work_size,
+                            &lwork, &iwork_size, &liwork, &info);
+                lwork = (int)work_size;
+                liwork = iwork_size;
+                work = (%(ctype)s*)malloc(sizeof(%(ctype)s) * lwork);
+                iwork = (int*)malloc(sizeof(int) * liwork);
+                if (!work || !iwork)
+                {
+                    free(work);
+                    free(iwork);
+                    PyErr_NoMemory();
+                    %(fail)s
+                }
+                %(p)ssyevd_(&jobz, &uplo, &n, a, &lda, ev, work,
+                            &lwork, iwork, &liwork, &info);
+                free(work);
+                free(iwork);
+            }
+            if (info > 0)
+            {
+                lapack_linalg_error("Eigenvalues did not converge");
+                %(fail)s
+            }
+            if (info < 0)
+            {
+                PyErr_Format(PyExc_ValueError,
+                             "Eigh: LAPACK returned %%d", info);
+                %(fail)s
+            }
+        }
+        """ % locals()
+
+    def c_code_cache_version(self):
+        return (1, lapack_header_version())
+
     def grad(self, inputs, g_outputs):
         r"""The gradient function should return
 
@@ -618,14 +838,21 @@ def svd(a, full_matrices=1, compute_uv=1):
     return SVD(full_matrices, compute_uv)(a)
 
 
-def test_matrix_inverse_solve():
+@register_stabilize
+@local_optimizer([Dot, Dot22])
+def inv_as_solve(node):
+    """
+    Replace dot(matrix_inverse(A), b) by solve(A, b), which is faster and
+    more stable.
+    """
     if not imported_scipy:
-        raise SkipTest("Scipy needed for the Solve op.")
-    A = theano.tensor.dmatrix('A')
-    b = theano.tensor.dmatrix('b')
-    node = matrix_inverse(A).dot(b).owner
-    [out] = inv_as_solve.transform(node)
-    assert isinstance(out.owner.op, Solve)
+        return False
+    if isinstance(node.op, (Dot, Dot22)):
+        l, r = node.inputs
+        if l.owner and isinstance(l.owner.op, MatrixInverse):
+            return [solve(l.owner.inputs[0], r)]
+        if r.owner and isinstance(r.owner.op, MatrixInverse):
+            return [solve(r.owner.inputs[0].T, l.T).T]
 
 
 class lstsq(Op):
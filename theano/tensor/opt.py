@@ -24,7 +24,8 @@ from theano.gof import Variable, Constant
 from theano.gof.python25 import maxsize
 from theano.gof.utils import MethodNotDefined
 from theano.configparser import config
-from theano.tensor.elemwise import Elemwise, DimShuffle
+from theano.tensor.elemwise import (Elemwise, DimShuffle, CAReduce,
+                                    CAReduceDtype, Sum, Prod, FusedCAReduce)
 from theano.tensor.subtensor import (get_idx_list, get_canonical_form_slice,
                                      Subtensor, IncSubtensor, make_constant,
                                      AdvancedIncSubtensor1,
@@ -5511,6 +5512,165 @@ def local_add_mul_fusion(node):
             l.remove(inp)
             return [node.op(*(l + inp.owner.inputs))]
 
+
+def local_careduce_fusion(node):
+    """Fuse a CAReduce with the Elemwise that computes its input.
+
+    sum((x - y) ** 2) is computed in one loop over x and y, without
+    allocating (x - y) ** 2. This is done only when the reduction is
+    the only client of the Elemwise.
+    """
+    if type(node.op) not in (CAReduce, CAReduceDtype, Sum, Prod):
+        return False
+    inp = node.inputs[0]
+    if (not inp.owner or
+        type(inp.owner.op) is not Elemwise or
+        len(inp.owner.outputs) != 1 or
+        inp.owner.op.inplace_pattern or
+        len(inp.clients) != 1 or
+        inp.ndim == 0):
+        return False
+    axis = node.op.axis
+    if axis is None:
+        axis = range(inp.ndim)
+    if len(axis) == 0:
+        return False
+
+    elem_node = inp.owner
+    scalar_op = node.op.scalar_op
+    # Check that we can generate the c code of the scalar ops.
+    s_inputs = [scalar.get_scalar_type(i.dtype).make_variable()
+                for i in elem_node.inputs]
+    try:
+        s_out = elem_node.op.scalar_op.make_node(*s_inputs)
+        elem_node.op.scalar_op.c_code(s_out,
+                                      "test_presence_of_c_code",
+                                      ["x" for x in s_inputs],
+                                      ["z" for z in s_out.outputs], {})
+        s_red = scalar_op.make_node(*(s_out.outputs * 2))
+        scalar_op.c_code(s_red, "test_presence_of_c_code",
+                         ["x", "y"], ["z"], {})
+    except (MethodNotDefined, NotImplementedError):
+        _logger.info(("%s does not implement the c_code function."
+                      " As well as being potentially slow, this"
+                      " disables the fusion of this reduction.") %
+                     str(elem_node.op.scalar_op))
+        return False
+
+    out = node.outputs[0]
+    acc_dtype = getattr(node.op, 'acc_dtype', None)
+    if acc_dtype is None:
+        acc_dtype = out.dtype
+    try:
+        op = FusedCAReduce([scalar_op], axis, elem_node.op.scalar_op,
+                           dtypes=[out.dtype], acc_dtypes=[acc_dtype])
+    except NotImplementedError:
+        return False
+    new_out = op(*elem_node.inputs)
+    assert new_out.type == out.type
+    return [new_out]
+
+
+class FusedCAReduceMerge(Optimizer):
+    """Merge reductions that loop over the same inputs.
+
+    max(x) and sum(exp(x)) are computed with only one loop over x.
+    Two FusedCAReduce (or a FusedCAReduce and a CAReduce, or two
+    CAReduce) are merged when they reduce the same axis, have the same
+    broadcastable pattern, share inputs that are not broadcastable in
+    every dimension (so they loop over the same shape) and none of them
+    depends on the other.
+    """
+    def add_requirements(self, fgraph):
+        fgraph.attach_feature(toolbox.ReplaceValidate())
+
+    @staticmethod
+    def as_fused(node):
+        """Return the FusedCAReduce equivalent to node, or None."""
+        if isinstance(node.op, FusedCAReduce):
+            return node.op
+        if (type(node.op) not in (CAReduce, CAReduceDtype, Sum, Prod) or
+            node.inputs[0].ndim == 0):
+            return None
+        axis = node.op.axis
+        if axis is None:
+            axis = range(node.inputs[0].ndim)
+        if len(axis) == 0:
+            return None
+        out = node.outputs[0]
+        acc_dtype = getattr(node.op, 'acc_dtype', None)
+        if acc_dtype is None:
+            acc_dtype = out.dtype
+        return FusedCAReduce([node.op.scalar_op], axis, scalar.identity,
+                             dtypes=[out.dtype], acc_dtypes=[acc_dtype])
+
+    @staticmethod
+    def loop_pattern(op, node):
+        return (op.axis,
+                tuple(all(bcast) for bcast in
+                      zip(*[i.broadcastable for i in node.inputs])))
+
+    @staticmethod
+    def same_loop_shape(node1, node2):
+        """Return True if the shared inputs of node1 and node2 give the
+        length of all the dimensions of their loops."""
+        shared = set(node1.inputs).intersection(node2.inputs)
+        return all(any(not i.broadcastable[d] for i in shared)
+                   for d in xrange(node1.inputs[0].ndim))
+
+    def merge(self, node1, op1, node2, op2):
+        inputs = list(node1.inputs)
+        for i in node2.inputs:
+            if i not in inputs:
+                inputs.append(i)
+        s_inputs = [scalar.get_scalar_type(i.dtype).make_variable()
+                    for i in inputs]
+        s_outputs = []
+        for node, op in ((node1, op1), (node2, op2)):
+            s_in = [s_inputs[inputs.index(i)] for i in node.inputs]
+            s_outputs.extend(op.pre_scalar_op.make_node(*s_in).outputs)
+        pre_scalar_op = scalar.Composite(s_inputs, s_outputs)
+        op = FusedCAReduce(op1.scalar_ops + op2.scalar_ops, op1.axis,
+                           pre_scalar_op,
+                           dtypes=op1.dtypes + op2.dtypes,
+                           acc_dtypes=op1.acc_dtypes + op2.acc_dtypes)
+        return op(*inputs, return_list=True)
+
+    def apply(self, fgraph):
+        # The candidates are collected in one pass over the toposort.
+        # Each one is merged in the first earlier group of the same loop
+        # pattern that it can be merged with, or starts a new group.
+        # A node can't be an ancestor of the nodes before it in the
+        # toposort, so we only check that it doesn't depend on the group.
+        groups = {}
+        for node in fgraph.toposort():
+            op = self.as_fused(node)
+            if op is None:
+                continue
+            pattern = self.loop_pattern(op, node)
+            ancestors = None
+            for group in groups.setdefault(pattern, []):
+                node1, op1 = group
+                if (not set(node1.inputs).intersection(node.inputs) or
+                    not self.same_loop_shape(node1, node)):
+                    continue
+                if ancestors is None:
+                    ancestors = set(graph.ancestors(node.inputs))
+                if any(o in ancestors for o in node1.outputs):
+                    continue
+                new_outputs = self.merge(node1, op1, node, op)
+                try:
+                    fgraph.replace_all_validate(
+                        zip(node1.outputs + node.outputs, new_outputs),
+                        reason=self.__class__.__name__)
+                except InconsistencyError:
+                    continue
+                new_node = new_outputs[0].owner
+                group[:] = [new_node, new_node.op]
+                break
+            else:
+                groups[pattern].append([node, op])
+
 if config.tensor.local_elemwise_fusion:
     _logger.debug("enabling optimization fusion elemwise in fast_run")
     #Must be after gpu(48.5) and before AddDestroyHandler(49.5)
@@ -5521,6 +5681,12 @@ if config.tensor.local_elemwise_fusion:
     fuse_seqopt.register('composite_elemwise_fusion',
                          FusionOptimizer(local_elemwise_fusion),
                          1, 'fast_run', 'fusion')
+    fuse_seqopt.register('careduce_fusion',
+                         FusionOptimizer(local_careduce_fusion),
+                         2, 'fast_run', 'fusion')
+    fuse_seqopt.register('fused_careduce_merge',
+                         FusedCAReduceMerge(),
+                         3, 'fast_run', 'fusion')
     compile.optdb.register('elemwise_fusion',
                            fuse_seqopt, 49,
                            'fast_run', 'fusion', 'local_elemwise_fusion',
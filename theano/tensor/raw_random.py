@@ -408,35 +408,29 @@ def _generate_broadcasting_indices(out_shape, *shapes):
     the right-most dimensions are ignored.
     '''
     all_shapes = (out_shape,) + shapes
-    # Will contain the return value: a list of indices for each argument
-    ret_indices = [[()] for shape in all_shapes]
+    if len(out_shape) == 0:
+        return [[()] for shape in all_shapes]
 
+    # Verify the shapes are compatible along each dimension
     for dim in xrange(len(out_shape)):
-        # Temporary list to generate the indices
-        _ret_indices = [[] for shape in all_shapes]
-
-        out_range = range(out_shape[dim])
-
-        # Verify the shapes are compatible along that dimension
-        # and generate the appropriate range: out_range, or [0, ..., 0]
-        ranges = [out_range]
         for shape in shapes:
-            if shape[dim] == out_shape[dim]:
-                ranges.append(out_range)
-            elif shape[dim] == 1:  # broadcast
-                ranges.append([0] * out_shape[dim])
-            else:
+            if shape[dim] != out_shape[dim] and shape[dim] != 1:
                 raise ValueError(
                     'shape[%i] (%i) should be equal to out_shape[%i] (%i) or'
                     ' to 1'
                     % (dim, shape[dim], dim, out_shape[dim]), shape,
                     out_shape, shapes)
 
-        for prev_index in zip(*ret_indices):
-            for dim_index in zip(*ranges):
-                for i in xrange(len(all_shapes)):
-                    _ret_indices[i].append(prev_index[i] + (dim_index[i],))
-        ret_indices = _ret_indices
+    # The indices of out_shape, in the order of numpy.ndindex, with one
+    # column by dimension. The indices over broadcasted dimensions are 0.
+    out_indices = numpy.indices(out_shape).reshape(len(out_shape), -1).T
+    ret_indices = []
+    for shape in all_shapes:
+        indices = out_indices.copy()
+        for dim in xrange(len(out_shape)):
+            if shape[dim] != out_shape[dim]:
+                indices[:, dim] = 0
+        ret_indices.append(map(tuple, indices.tolist()))
 
     return ret_indices
 
@@ -554,6 +548,12 @@ def random_integers_helper(random_state, low, high, size):
             dim_len = max(low.shape[dim], high.shape[dim])
             out_size = out_size + (dim_len,)
 
+    if low.size == 1 and high.size == 1:
+        # numpy draws the samples of one call in the order of the loop
+        # below, without the python overhead of each sample.
+        return random_state.random_integers(low=low.item(), high=high.item(),
+                                            size=out_size)
+
     # Build the indices over which to loop
     out = numpy.ndarray(out_size)
     broadcast_ind = _generate_broadcasting_indices(out_size, low.shape,
@@ -720,6 +720,30 @@ def permutation(random_state, size=None, n=1, ndim=None, dtype='int64'):
     return op(random_state, size, n)
 
 
+def _multinomial_pvals(pvi):
+    """
+    Return the float64 version of the probabilities `pvi` of one
+    multinomial, which numpy accepts.
+    """
+    # This might someday be fixed upstream
+    # Currently numpy raises an exception in this method if the sum
+    # of probabilities meets or exceeds 1.0.
+    # In  perfect arithmetic this would be correct, but in float32 or
+    # float64 it is too strict.
+    pisum = numpy.sum(pvi)
+    if 1.0 < pisum < 1.0 + 1e-5:  # correct if we went a little over
+        # because mtrand.pyx has a ValueError that will trigger if
+        # sum(pvals[:-1]) > 1.0
+        pvi = pvi * (1.0 - 5e-5)
+        #pvi = pvi * .9
+        pisum = numpy.sum(pvi)
+    elif pvi[-1] < 5e-5:  # will this even work?
+        pvi = pvi * (1.0 - 5e-5)
+        pisum = numpy.sum(pvi)
+    assert pisum <= 1.0, pisum
+    return pvi.astype('float64')
+
+
 def multinomial_helper(random_state, n, pvals, size):
     '''
     Helper function drawing from multinomial distributions.
@@ -762,6 +786,14 @@ def multinomial_helper(random_state, n, pvals, size):
             size = size + (dim_len,)
     out_size = size + (pvals.shape[-1],)
 
+    assert pvals.min() >= 0
+    if n.size == 1 and pvals[..., 0].size == 1:
+        # All the samples come from the same distribution. numpy draws the
+        # samples of one call in the order of the loop below, without the
+        # python overhead of each sample.
+        pvi = _multinomial_pvals(pvals.reshape(pvals.shape[-1]))
+        return random_state.multinomial(n=n.item(), pvals=pvi, size=size)
+
     # Build the indices over which to loop
     # Note that here, the rows (inner-most 1D subtensors) of pvals and out
     # are indexed, not their individual elements
@@ -770,28 +802,9 @@ def multinomial_helper(random_state, n, pvals, size):
                                                    pvals.shape[:-1])
     # Iterate over these indices, drawing from one multinomial at a
     # time from numpy
-    assert pvals.min() >= 0
     for mi, ni, pi in zip(*broadcast_ind):
-        pvi = pvals[pi]
-
-        # This might someday be fixed upstream
-        # Currently numpy raises an exception in this method if the sum
-        # of probabilities meets or exceeds 1.0.
-        # In  perfect arithmetic this would be correct, but in float32 or
-        # float64 it is too strict.
-        pisum = numpy.sum(pvi)
-        if 1.0 < pisum < 1.0 + 1e-5:  # correct if we went a little over
-            # because mtrand.pyx has a ValueError that will trigger if
-            # sum(pvals[:-1]) > 1.0
-            pvi = pvi * (1.0 - 5e-5)
-            #pvi = pvi * .9
-            pisum = numpy.sum(pvi)
-        elif pvi[-1] < 5e-5:  # will this even work?
-            pvi = pvi * (1.0 - 5e-5)
-            pisum = numpy.sum(pvi)
-        assert pisum <= 1.0, pisum
         out[mi] = random_state.multinomial(n=n[ni],
-                                           pvals=pvi.astype('float64'))
+                                           pvals=_multinomial_pvals(pvals[pi]))
     return out
 
 
@@ -874,6 +887,489 @@ optdb.register('random_make_inplace', opt.in2out(random_make_inplace,
                99, 'fast_run', 'inplace')
 
 
+# Constants of the Philox4x32-10 generator of Salmon et al., "Parallel
+# random numbers: as easy as 1, 2, 3" (SC11).
+PHILOX_M0 = 0xD2511F53
+PHILOX_M1 = 0xCD9E8D57
+PHILOX_W0 = 0x9E3779B9
+PHILOX_W1 = 0xBB67AE85
+
+
+def philox4x32(c0, c1, c2, c3, k0, k1):
+    """
+    Return the 4 uint32 words of the Philox4x32-10 function of the
+    counters (c0, c1, c2, c3) and of the key (k0, k1).
+
+    The counters can be arrays, the key must be 2 integers. This is the
+    python version of the C code of PhiloxFunction.
+    """
+    mask = numpy.uint64(0xFFFFFFFF)
+    c0, c1, c2, c3 = [numpy.asarray(c, dtype='uint64')
+                      for c in (c0, c1, c2, c3)]
+    k0 = numpy.uint64(k0)
+    k1 = numpy.uint64(k1)
+    for i in xrange(10):
+        p0 = numpy.uint64(PHILOX_M0) * c0
+        p1 = numpy.uint64(PHILOX_M1) * c2
+        c0, c1, c2, c3 = ((p1 >> numpy.uint64(32)) ^ c1 ^ k0, p1 & mask,
+                          (p0 >> numpy.uint64(32)) ^ c3 ^ k1, p0 & mask)
+        k0 = (k0 + numpy.uint64(PHILOX_W0)) & mask
+        k1 = (k1 + numpy.uint64(PHILOX_W1)) & mask
+    return [c.astype('uint32') for c in (c0, c1, c2, c3)]
+
+
+def philox_state(seed):
+    """
+    Return the initial state of a Philox generator, for the shared
+    variables of PhiloxFunction.
+
+    The state is a uint32 vector holding the key (2 words, from `seed`)
+    then the 64 bits counter of the next block to draw (2 words).
+    """
+    seed = int(seed)
+    return numpy.asarray([seed & 0xFFFFFFFF, (seed >> 32) & 0xFFFFFFFF,
+                          0, 0], dtype='uint32')
+
+
+class PhiloxFunction(gof.Op):
+    """
+    Op drawing uniform or normal samples from a Philox4x32-10
+    counter-based generator.
+
+    The sample i only depends on the key and on the counter of the state,
+    and on i. Each block of 4 words gives 4 float32 or 2 float64 uniform
+    samples in ]0, 1[. The normal samples are the Box-Muller transforms of
+    consecutive pairs of uniform samples. The output state is the input
+    state with the counter moved after the blocks used.
+
+    Unlike RandomFunction, the state is a plain uint32 vector, see
+    `philox_state`, and the samples are drawn in C without holding
+    python objects.
+    """
+
+    def __init__(self, distribution, outtype):
+        if distribution not in ('uniform', 'normal'):
+            raise ValueError('Unknown distribution', distribution)
+        if outtype.dtype not in ('float32', 'float64'):
+            raise TypeError('PhiloxFunction draws float32 or float64 samples',
+                            outtype)
+        self.distribution = distribution
+        self.outtype = outtype
+
+    def __eq__(self, other):
+        return (type(self) == type(other) and
+                self.distribution == other.distribution and
+                self.outtype == other.outtype)
+
+    def __hash__(self):
+        return (hash(type(self)) ^ hash(self.distribution) ^
+                hash(self.outtype))
+
+    def __str__(self):
+        return 'PhiloxFunction{%s,%s}' % (self.distribution,
+                                          self.outtype.dtype)
+
+    def make_node(self, state, shape):
+        """
+        :param state: a uint32 vector of length 4, see `philox_state`.
+
+        :param shape: an integer vector, the shape of the samples. Its
+        length must be the number of dimensions of `self.outtype`.
+        """
+        state = tensor.as_tensor_variable(state)
+        if state.type.dtype != 'uint32' or state.type.ndim != 1:
+            raise TypeError('state must be an uint32 vector', state)
+        shape = tensor.as_tensor_variable(shape, ndim=1)
+        if shape.type.dtype not in tensor.int_dtypes:
+            raise TypeError('shape must be an integer vector', shape)
+        return gof.Apply(self, [state, shape],
+                         [state.type(), self.outtype()])
+
+    def infer_shape(self, node, i_shapes):
+        shape = node.inputs[1]
+        return [i_shapes[0],
+                [shape[i] for i in xrange(node.outputs[1].ndim)]]
+
+    def samples_per_block(self):
+        if self.outtype.dtype == 'float32':
+            return 4
+        else:
+            return 2
+
+    def perform(self, node, inputs, out_):
+        state, shape = inputs
+        state_out, out = out_
+        if len(state) != 4:
+            raise ValueError('state must have length 4', state)
+        if len(shape) != self.outtype.ndim:
+            raise ValueError('Shape mismatch: self.outtype.ndim (%i) !='
+                             ' len(shape) (%i)'
+                             % (self.outtype.ndim, len(shape)))
+        shape = tuple(int(s) for s in shape)
+        n = int(numpy.prod(shape))
+        n_blocks = (n + self.samples_per_block() - 1) // self.samples_per_block()
+        counter = (int(state[2]) | (int(state[3]) << 32))
+        blocks = numpy.arange(n_blocks, dtype='uint64') + numpy.uint64(counter)
+        words = numpy.asarray(philox4x32(
+            blocks & numpy.uint64(0xFFFFFFFF), blocks >> numpy.uint64(32),
+            0, 0, state[0], state[1]), dtype='uint64').T
+
+        # The uniform samples of the blocks, in order.
+        dtype = self.outtype.dtype
+        if dtype == 'float32':
+            u = ((words >> numpy.uint64(9)) + 0.5) * 2. ** -23
+        else:
+            u = (((words[:, 0::2] >> numpy.uint64(6)) << numpy.uint64(26)) +
+                 (words[:, 1::2] >> numpy.uint64(6)) + 0.5) * 2. ** -52
+        u = u.astype(dtype).flatten()
+
+        if self.distribution == 'uniform':
+            rval = u[:n]
+        else:
+            r = numpy.sqrt(numpy.asarray(-2.0, dtype=dtype) *
+                           numpy.log(u[0::2]))
+            t = numpy.asarray(2.0 * numpy.pi, dtype=dtype) * u[1::2]
+            rval = numpy.empty_like(u)
+            rval[0::2] = r * numpy.cos(t)
+            rval[1::2] = r * numpy.sin(t)
+            rval = rval[:n]
+
+        counter = (counter + n_blocks) % 2 ** 64
+        state_out[0] = numpy.asarray([state[0], state[1],
+                                      counter & 0xFFFFFFFF, counter >> 32],
+                                     dtype='uint32')
+        out[0] = rval.reshape(shape)
+
+    def c_headers(self):
+        return ['<math.h>']
+
+    def c_support_code(self):
+        return """
+#ifndef THEANO_PHILOX4X32
+#define THEANO_PHILOX4X32
+// Philox4x32-10 function of the counter `ctr` and of the key (k0, k1).
+static inline void philox4x32_10(npy_uint32 ctr[4], npy_uint32 k0,
+                                 npy_uint32 k1)
+{
+    for (int i = 0; i < 10; ++i)
+    {
+        const npy_uint64 p0 = (npy_uint64)%(M0)sU * ctr[0];
+        const npy_uint64 p1 = (npy_uint64)%(M1)sU * ctr[2];
+        const npy_uint32 c1 = ctr[1];
+        const npy_uint32 c3 = ctr[3];
+        ctr[0] = (npy_uint32)(p1 >> 32) ^ c1 ^ k0;
+        ctr[1] = (npy_uint32)p1;
+        ctr[2] = (npy_uint32)(p0 >> 32) ^ c3 ^ k1;
+        ctr[3] = (npy_uint32)p0;
+        k0 += %(W0)sU;
+        k1 += %(W1)sU;
+    }
+}
+
+// Uniform samples in ]0, 1[ from 1 or 2 words.
+static inline float philox_float(npy_uint32 w)
+{
+    return ((w >> 9) + 0.5) * (1.0 / 8388608.0);
+}
+
+static inline double philox_double(npy_uint32 w0, npy_uint32 w1)
+{
+    return ((double)(((npy_uint64)(w0 >> 6) << 26) + (w1 >> 6)) + 0.5)
+        * (1.0 / 4503599627370496.0);
+}
+#endif
+""" % dict(M0=PHILOX_M0, M1=PHILOX_M1, W0=PHILOX_W0, W1=PHILOX_W1)
+
+    def c_code(self, node, name, inp, out, sub):
+        state, shape = inp
+        o_state, o_sample = out
+        ndim = self.outtype.ndim
+        o_type_num = numpy.asarray(0, dtype=self.outtype.dtype).dtype.num
+        per_block = self.samples_per_block()
+        fail = sub['fail']
+        if self.outtype.dtype == 'float32':
+            otype = 'float'
+            uniforms = """
+                u[0] = philox_float(ctr[0]);
+                u[1] = philox_float(ctr[1]);
+                u[2] = philox_float(ctr[2]);
+                u[3] = philox_float(ctr[3]);
+            """
+        else:
+            otype = 'double'
+            uniforms = """
+                u[0] = philox_double(ctr[0], ctr[1]);
+                u[1] = philox_double(ctr[2], ctr[3]);
+            """
+        if self.distribution == 'uniform':
+            samples = """
+                for (int j = 0; j < %(per_block)s && i + j < n; ++j)
+                    sample_data[i + j] = u[j];
+            """ % locals()
+        else:
+            samples = """
+                for (int j = 0; j < %(per_block)s && i + j < n; j += 2)
+                {
+                    const %(otype)s r = sqrt(minus_two * log(u[j]));
+                    const %(otype)s t = two_pi * u[j + 1];
+                    sample_data[i + j] = r * cos(t);
+                    if (i + j + 1 < n)
+                        sample_data[i + j + 1] = r * sin(t);
+                }
+            """ % locals()
+        return """
+        npy_intp odims[%(ndim)s];
+        npy_intp n = 1;
+        npy_uint32 key0, key1;
+        npy_uint64 counter, n_blocks;
+        %(otype)s * sample_data;
+        const %(otype)s minus_two = -2.0;
+        const %(otype)s two_pi = 2.0 * M_PI;
+
+        if (PyArray_DIMS(%(shape)s)[0] != %(ndim)s)
+        {
+            PyErr_Format(PyExc_ValueError,
+                         "shape must have length %%i (not %%i)",
+                         %(ndim)s, int(PyArray_DIMS(%(shape)s)[0]));
+            %(fail)s
+        }
+        for (int i = 0; i < %(ndim)s; ++i)
+        {
+            odims[i] = ((dtype_%(shape)s*)PyArray_GETPTR1(%(shape)s, i))[0];
+            n *= odims[i];
+        }
+        if (PyArray_DIMS(%(state)s)[0] != 4)
+        {
+            PyErr_SetString(PyExc_ValueError, "state must have length 4");
+            %(fail)s
+        }
+        key0 = ((npy_uint32*)PyArray_GETPTR1(%(state)s, 0))[0];
+        key1 = ((npy_uint32*)PyArray_GETPTR1(%(state)s, 1))[0];
+        counter = ((npy_uint64)((npy_uint32*)PyArray_GETPTR1(%(state)s, 3))[0] << 32)
+            | ((npy_uint32*)PyArray_GETPTR1(%(state)s, 2))[0];
+
+        if ((NULL == %(o_sample)s)
+            || !PyArray_ISCONTIGUOUS(%(o_sample)s)
+            || !PyArray_CompareLists(PyArray_DIMS(%(o_sample)s), odims,
+                                     %(ndim)s))
+        {
+            Py_XDECREF(%(o_sample)s);
+            %(o_sample)s = (PyArrayObject*)PyArray_SimpleNew(%(ndim)s, odims,
+                                                             %(o_type_num)s);
+            if (!%(o_sample)s)
+                %(fail)s
+        }
+        // The output state is always a new array, as the previous one can
+        // be the input state.
+        {
+            npy_intp four = 4;
+            Py_XDECREF(%(o_state)s);
+            %(o_state)s = (PyArrayObject*)PyArray_SimpleNew(1, &four,
+                                                            NPY_UINT32);
+            if (!%(o_state)s)
+                %(fail)s
+        }
+
+        sample_data = (%(otype)s*)PyArray_DATA(%(o_sample)s);
+        n_blocks = (n + %(per_block)s - 1) / %(per_block)s;
+        for (npy_uint64 b = 0; b < n_blocks; ++b)
+        {
+            const npy_uint64 block = counter + b;
+            const npy_intp i = b * %(per_block)s;
+            npy_uint32 ctr[4] = {(npy_uint32)block, (npy_uint32)(block >> 32),
+                                 0, 0};
+            %(otype)s u[4];
+            philox4x32_10(ctr, key0, key1);
+            %(uniforms)s
+            %(samples)s
+        }
+
+        counter += n_blocks;
+        ((npy_uint32*)PyArray_DATA(%(o_state)s))[0] = key0;
+        ((npy_uint32*)PyArray_DATA(%(o_state)s))[1] = key1;
+        ((npy_uint32*)PyArray_DATA(%(o_state)s))[2] = (npy_uint32)counter;
+        ((npy_uint32*)PyArray_DATA(%(o_state)s))[3] = (npy_uint32)(counter >> 32);
+        """ % locals()
+
+    def c_code_cache_version(self):
+        return (1,)
+
+    def grad(self, inputs, outputs):
+        return [theano.gradient.grad_undefined(self, k, inp,
+                        'No gradient defined through raw random numbers op')
+                for k, inp in enumerate(inputs)]
+
+    def R_op(self, inputs, eval_points):
+        return [None for i in eval_points]
+
+
+def _philox_draw(distribution, random_state, shape, broadcastable, dtype):
+    """
+    Return the new state and the samples of a PhiloxFunction.
+    """
+    op = PhiloxFunction(distribution,
+                        tensor.TensorType(dtype=dtype,
+                                          broadcastable=broadcastable))
+    return op(random_state, shape)
+
+
+def _left_pad(x, ndim):
+    """Add broadcastable dimensions on the left of `x` up to `ndim`."""
+    return x.dimshuffle(['x'] * (ndim - x.ndim) + range(x.ndim))
+
+
+def philox_uniform(random_state, size=None, low=0.0, high=1.0, ndim=None,
+                   dtype=None):
+    """
+    Same as `uniform`, but `random_state` is the state of a Philox
+    generator, see `philox_state`.
+    """
+    low = tensor.as_tensor_variable(low)
+    high = tensor.as_tensor_variable(high)
+    if dtype is None:
+        dtype = tensor.scal.upcast(theano.config.floatX, low.dtype, high.dtype)
+    ndim, size, bcast = _infer_ndim_bcast(ndim, size, low, high)
+    new_r, u = _philox_draw('uniform', random_state, size, bcast,
+                            tensor.scal.upcast('float32', dtype))
+    return new_r, tensor.cast(u * (high - low) + low, dtype)
+
+
+def philox_normal(random_state, size=None, avg=0.0, std=1.0, ndim=None,
+                  dtype=None):
+    """
+    Same as `normal`, but `random_state` is the state of a Philox
+    generator, see `philox_state`.
+    """
+    avg = tensor.as_tensor_variable(avg)
+    std = tensor.as_tensor_variable(std)
+    if dtype is None:
+        dtype = tensor.scal.upcast(theano.config.floatX, avg.dtype, std.dtype)
+    ndim, size, bcast = _infer_ndim_bcast(ndim, size, avg, std)
+    new_r, z = _philox_draw('normal', random_state, size, bcast,
+                            tensor.scal.upcast('float32', dtype))
+    return new_r, tensor.cast(avg + std * z, dtype)
+
+
+def philox_binomial(random_state, size=None, n=1, p=0.5, ndim=None,
+                    dtype='int64'):
+    """
+    Same as `binomial`, but `random_state` is the state of a Philox
+    generator, see `philox_state`.
+
+    The trials are drawn together, n.max() uniform samples for each
+    output element.
+    """
+    n = tensor.as_tensor_variable(n)
+    p = tensor.as_tensor_variable(p)
+    ndim, size, bcast = _infer_ndim_bcast(ndim, size, n, p)
+    u_dtype = tensor.scal.upcast(theano.config.floatX, p.dtype)
+    try:
+        n_val = tensor.get_scalar_constant_value(n)
+    except tensor.NotScalarConstantError:
+        n_val = None
+    if n_val == 1:
+        new_r, u = _philox_draw('uniform', random_state, size, bcast, u_dtype)
+        return new_r, tensor.cast(tensor.lt(u, p), dtype)
+
+    n_max = tensor.cast(tensor.max(n), 'int32')
+    new_r, u = _philox_draw('uniform', random_state,
+                            tensor.join(0, size, n_max.dimshuffle('x')),
+                            bcast + (False,), u_dtype)
+    trials = tensor.and_(
+        tensor.lt(u, _left_pad(p, ndim).dimshuffle(range(ndim) + ['x'])),
+        tensor.lt(tensor.arange(n_max),
+                  _left_pad(n, ndim).dimshuffle(range(ndim) + ['x'])))
+    return new_r, tensor.cast(tensor.sum(trials, axis=-1), dtype)
+
+
+def philox_random_integers(random_state, size=None, low=0, high=1, ndim=None,
+                           dtype='int64'):
+    """
+    Same as `random_integers`, but `random_state` is the state of a
+    Philox generator, see `philox_state`.
+    """
+    low = tensor.as_tensor_variable(low)
+    high = tensor.as_tensor_variable(high)
+    ndim, size, bcast = _infer_ndim_bcast(ndim, size, low, high)
+    new_r, u = _philox_draw('uniform', random_state, size, bcast, 'float64')
+    return new_r, tensor.cast(low + tensor.floor(u * (high - low + 1)), dtype)
+
+
+def philox_permutation(random_state, size=None, n=1, ndim=None,
+                       dtype='int64'):
+    """
+    Same as `permutation`, but `random_state` is the state of a Philox
+    generator, see `philox_state`.
+
+    All the permutations are drawn together, by sorting uniform samples.
+    """
+    if size is None or size == ():
+        if not(ndim is None or ndim == 1):
+            raise TypeError(
+                "You asked for just one permutation but asked for more then 1 dimensions.")
+        size = tensor.constant([], dtype='int32')
+        bcast = ()
+    else:
+        ndim, size, bcast = _infer_ndim_bcast(ndim, size)
+    n = tensor.cast(tensor.as_tensor_variable(n), 'int32')
+    new_r, u = _philox_draw('uniform', random_state,
+                            tensor.join(0, size, n.dimshuffle('x')),
+                            bcast + (False,), 'float64')
+    return new_r, tensor.cast(tensor.argsort(u, axis=-1), dtype)
+
+
+def philox_multinomial(random_state, size=None, n=1, pvals=[0.5, 0.5],
+                       ndim=None, dtype='int64'):
+    """
+    Same as `multinomial`, but `random_state` is the state of a Philox
+    generator, see `philox_state`.
+
+    All the experiments of all the multinomials are drawn together: each
+    uniform sample is compared to the cumulative sums of its pvals. This
+    uses memory proportional to n.max() * pvals.shape[-1] for each
+    multinomial.
+    """
+    n = tensor.as_tensor_variable(n)
+    pvals = tensor.as_tensor_variable(pvals)
+    # until ellipsis is implemented (argh)
+    tmp = pvals.T[0].T
+    ndim, size, bcast = _infer_ndim_bcast(ndim, size, n, tmp)
+    bcast = bcast + (pvals.type.broadcastable[-1],)
+
+    n_max = tensor.cast(tensor.max(n), 'int32')
+    new_r, u = _philox_draw('uniform', random_state,
+                            tensor.join(0, size, n_max.dimshuffle('x')),
+                            bcast[:-1] + (False,), 'float64')
+    # The category of each experiment is the number of cumulative sums
+    # below its sample. The last category takes the remaining samples.
+    cdf = tensor.cumsum(_left_pad(pvals, ndim + 1), axis=-1)
+    cdf = cdf / cdf.T[-1].T.dimshuffle(range(ndim) + ['x'])
+    category = tensor.sum(
+        tensor.ge(u.dimshuffle(range(ndim + 1) + ['x']),
+                  cdf.T[:-1].T.dimshuffle(range(ndim) + ['x', ndim])),
+        axis=-1)
+    valid = tensor.lt(tensor.arange(n_max),
+                      _left_pad(n, ndim).dimshuffle(range(ndim) + ['x']))
+    counts = tensor.sum(
+        tensor.and_(
+            tensor.eq(category.dimshuffle(range(ndim + 1) + ['x']),
+                      tensor.arange(pvals.shape[-1])),
+            valid.dimshuffle(range(ndim + 1) + ['x'])),
+        axis=-2)
+    return new_r, tensor.patternbroadcast(tensor.cast(counts, dtype), bcast)
+
+
+# The functions drawing from a Philox state in place of a RandomState.
+philox_functions = {
+    uniform: philox_uniform,
+    normal: philox_normal,
+    binomial: philox_binomial,
+    random_integers: philox_random_integers,
+    permutation: philox_permutation,
+    multinomial: philox_multinomial,
+}
+
+
 class RandomStreamsBase(object):
 
     def binomial(self, size=None, n=1, p=0.5, ndim=None, dtype='int64',
@@ -40,7 +40,7 @@ class RandomStreams(raw_random.RandomStreamsBase):
     def updates(self):
         return list(self.state_updates)
 
-    def __init__(self, seed=None):
+    def __init__(self, seed=None, generator='mt19937'):
         """
         :type seed: None or int
 
@@ -48,8 +48,20 @@ class RandomStreams(raw_random.RandomStreamsBase):
         instances after build.  See `RandomStreamsInstance.__init__`
         for more details.
 
+        :type generator: 'mt19937' or 'philox'
+
+        :param generator: with 'mt19937', the random variables draw from
+        numpy RandomState instances. With 'philox', they draw from the
+        uint32 vector states of a counter-based generator in C, see
+        `raw_random.PhiloxFunction`. choice and poisson are only
+        available with 'mt19937'.
+
         """
+        if generator not in ('mt19937', 'philox'):
+            raise ValueError('generator must be mt19937 or philox',
+                             generator)
         super(RandomStreams, self).__init__()
+        self.generator = generator
         # A list of pairs of the form (input_r, output_r).  This will be
         # over-ridden by the module instance to contain stream generators.
         self.state_updates = []
@@ -76,8 +88,12 @@ class RandomStreams(raw_random.RandomStreamsBase):
         seedgen = numpy.random.RandomState(seed)
         for old_r, new_r in self.state_updates:
             old_r_seed = seedgen.randint(2 ** 30)
-            old_r.set_value(numpy.random.RandomState(int(old_r_seed)),
-                    borrow=True)
+            if isinstance(old_r.type, raw_random.RandomStateType):
+                old_r.set_value(numpy.random.RandomState(int(old_r_seed)),
+                        borrow=True)
+            else:
+                old_r.set_value(raw_random.philox_state(old_r_seed),
+                                borrow=True)
 
     def __getitem__(self, item):
         """Retrieve the numpy RandomState instance associated with a
@@ -131,7 +147,15 @@ class RandomStreams(raw_random.RandomStreamsBase):
 
         """
         seed = int(self.gen_seedgen.randint(2 ** 30))
-        random_state_variable = shared(numpy.random.RandomState(seed))
+        if self.generator == 'philox':
+            if op not in raw_random.philox_functions:
+                raise NotImplementedError(
+                    '%s is not available with the philox generator' %
+                    getattr(op, '__name__', op))
+            op = raw_random.philox_functions[op]
+            random_state_variable = shared(raw_random.philox_state(seed))
+        else:
+            random_state_variable = shared(numpy.random.RandomState(seed))
         new_r, out = op(random_state_variable, *args, **kwargs)
         out.rng = random_state_variable
         out.update = (random_state_variable, new_r)
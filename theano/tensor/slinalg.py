@@ -4,11 +4,13 @@ logger = logging.getLogger(__name__)
 import numpy
 import warnings
 
-from theano.gof import Op, Apply
+from theano.gof import Op, Apply, utils
 
 from theano.tensor import as_tensor_variable, dot, DimShuffle, Dot
 from theano.tensor.blas import Dot22
-from theano import tensor
+from theano.tensor.blas_c import BaseLapack
+from theano.tensor.blas_headers import lapack_header_version
+from theano.tensor import basic as tensor
 import theano.tensor
 from theano.tensor.opt import (register_stabilize,
         register_specialize, register_canonicalize)
@@ -34,15 +36,17 @@ MATRIX_STRUCTURES = (
         'toeplitz',
         )
 
-class Cholesky(Op):
+class Cholesky(BaseLapack, Op):
     """
     Return a triangular matrix square root of positive semi-definite `x`
 
     L = cholesky(X, lower=True) implies dot(L, L.T) == X
+
+    `x` can also be a stack of matrices (3d tensor), in which case each
+    matrix along the leading dimension is factorized (see
+    `batched_cholesky`).
     """
     #TODO: inplace
-    #TODO: for specific dtypes
-    #TODO: LAPACK wrapper with in-place behavior, for solve also
 
     __props__ = ('lower', 'destructive')
 
@@ -57,21 +61,95 @@ class Cholesky(Op):
         assert imported_scipy, (
             "Scipy not available. Scipy is needed for the Cholesky op")
         x = as_tensor_variable(x)
-        assert x.ndim == 2
+        assert x.ndim in [2, 3]
         return Apply(self, [x], [x.type()])
 
     def perform(self, node, inputs, outputs):
         x = inputs[0]
         z = outputs[0]
-        z[0] = scipy.linalg.cholesky(x, lower=self.lower).astype(x.dtype)
+        if x.ndim == 3:
+            z[0] = numpy.empty_like(x)
+            for i in xrange(x.shape[0]):
+                z[0][i] = scipy.linalg.cholesky(x[i], lower=self.lower)
+        else:
+            z[0] = scipy.linalg.cholesky(x, lower=self.lower).astype(x.dtype)
 
     def grad(self, inputs, gradients):
         return [CholeskyGrad(self.lower)(inputs[0], self(inputs[0]),
                                          gradients[0])]
 
+    def c_code(self, node, name, inputs, outputs, sub):
+        x, = inputs
+        z, = outputs
+        fail = sub['fail']
+        p = self.lapack_prefix(node.inputs[0].dtype)
+        ctype = {'s': 'float', 'd': 'double'}[p]
+        # LAPACK sees the transpose of our C-contiguous matrices, so it
+        # must compute the other triangle.
+        uplo = 'U' if self.lower else 'L'
+        lower = int(self.lower)
+        return """
+        {
+            int nd = PyArray_NDIM(%(x)s);
+            npy_intp* dims = PyArray_DIMS(%(x)s);
+            npy_intp batch = (nd == 3) ? dims[0] : 1;
+            int n = dims[nd - 1];
+            int lda = (n > 1) ? n : 1;
+            int info = 0;
+            char uplo = '%(uplo)s';
+            if (dims[nd - 2] != n)
+            {
+                PyErr_SetString(PyExc_ValueError,
+                                "Cholesky: the matrices must be square");
+                %(fail)s
+            }
+            Py_XDECREF(%(z)s);
+            %(z)s = (PyArrayObject*)PyArray_NewCopy(%(x)s, NPY_CORDER);
+            if (!%(z)s)
+                %(fail)s
+            for (npy_intp b = 0; b < batch && info == 0; ++b)
+            {
+                %(ctype)s* a = (%(ctype)s*)PyArray_DATA(%(z)s) + b * n * n;
+                if (n)
+                    %(p)spotrf_(&uplo, &n, a, &lda, &info);
+                for (int i = 0; i < n; ++i)
+                    for (int j = 0; j < n; ++j)
+                        if (%(lower)s ? j > i : j < i)
+                            a[i * n + j] = 0;
+            }
+            if (info > 0)
+            {
+                lapack_linalg_error(
+                    "Cholesky: the matrix is not positive definite");
+                %(fail)s
+            }
+            if (info < 0)
+            {
+                PyErr_Format(PyExc_ValueError,
+                             "Cholesky: %(p)spotrf returned %%d", info);
+                %(fail)s
+            }
+        }
+        """ % locals()
+
+    def c_code_cache_version(self):
+        return (1, lapack_header_version())
+
 cholesky = Cholesky()
 
 
+def batched_cholesky(x, lower=True):
+    """
+    Cholesky factorization of each matrix of the 3d tensor `x`.
+
+    Returns a 3d tensor `L` such that L[i] = cholesky(x[i], lower).
+    """
+    x = as_tensor_variable(x)
+    if x.ndim != 3:
+        raise TypeError('batched_cholesky: x must be a 3d tensor', x.ndim)
+    return Cholesky(lower)(x)
+
+
 class CholeskyGrad(Op):
     """
     """
@@ -86,9 +164,9 @@ class CholeskyGrad(Op):
         x = as_tensor_variable(x)
         l = as_tensor_variable(l)
         dz = as_tensor_variable(dz)
-        assert x.ndim == 2
-        assert l.ndim == 2
-        assert dz.ndim == 2
+        assert x.ndim in [2, 3]
+        assert l.ndim == x.ndim
+        assert dz.ndim == x.ndim
         assert l.owner.op.lower == self.lower, (
             "lower/upper mismatch between Cholesky op and CholeskyGrad op"
         )
@@ -108,7 +186,15 @@ class CholeskyGrad(Op):
         L = inputs[1]
         dz = inputs[2]
         dx = outputs[0]
-        N = x.shape[0]
+        if x.ndim == 3:
+            dx[0] = numpy.empty_like(x)
+            for i in xrange(x.shape[0]):
+                dx[0][i] = self._grad(L[i], dz[i])
+        else:
+            dx[0] = self._grad(L, dz)
+
+    def _grad(self, L, dz):
+        N = L.shape[0]
         if self.lower:
             F = numpy.tril(dz)
             for k in xrange(N - 1, -1, -1):
@@ -122,7 +208,6 @@ class CholeskyGrad(Op):
                 F[k, k] /= (2 * L[k, k])
         else:
             F = numpy.triu(dz)
-            M = N - 1
             for k in xrange(N - 1, -1, -1):
                 for j in xrange(k + 1, N):
                     for i in xrange(j, N):
@@ -132,14 +217,88 @@ class CholeskyGrad(Op):
                     F[k, j] /= L[k, k]
                     F[k, k] -= L[k, j] * F[k, j]
                 F[k, k] /= (2 * L[k, k])
-        dx[0] = F
+        return F
 
     def infer_shape(self, node, shapes):
         return [shapes[0]]
 
-
-class Solve(Op):
-    """Solve a system of linear equations"""
+    def c_code(self, node, name, inputs, outputs, sub):
+        x, L, dz = inputs
+        dx, = outputs
+        fail = sub['fail']
+        dtypes = [v.dtype for v in node.inputs + node.outputs]
+        if (dtypes[0] not in ('float32', 'float64') or
+                len(set(dtypes)) != 1):
+            raise utils.MethodNotDefined('CholeskyGrad.c_code')
+        ctype = {'float32': 'float', 'float64': 'double'}[dtypes[0]]
+        lower = int(self.lower)
+        # Same loops as in perform(). For the upper factor, F and L are
+        # accessed through their transpose.
+        return """
+        {
+            int nd = PyArray_NDIM(%(L)s);
+            npy_intp batch = (nd == 3) ? PyArray_DIMS(%(L)s)[0] : 1;
+            npy_intp N = PyArray_DIMS(%(L)s)[nd - 1];
+            PyArrayObject* Lc = NULL;
+            if (!PyArray_SAMESHAPE(%(L)s, %(dz)s))
+            {
+                PyErr_SetString(PyExc_ValueError,
+                                "CholeskyGrad: L and dz shapes differ");
+                %(fail)s
+            }
+            Lc = PyArray_GETCONTIGUOUS(%(L)s);
+            if (!Lc)
+                %(fail)s
+            Py_XDECREF(%(dx)s);
+            %(dx)s = (PyArrayObject*)PyArray_NewCopy(%(dz)s, NPY_CORDER);
+            if (!%(dx)s)
+            {
+                Py_DECREF(Lc);
+                %(fail)s
+            }
+            for (npy_intp b = 0; b < batch; ++b)
+            {
+                const %(ctype)s* l = (%(ctype)s*)PyArray_DATA(Lc) + b * N * N;
+                %(ctype)s* f = (%(ctype)s*)PyArray_DATA(%(dx)s) + b * N * N;
+                npy_intp s0 = %(lower)s ? N : 1;
+                npy_intp s1 = %(lower)s ? 1 : N;
+                #define F_(i, j) f[(i) * s0 + (j) * s1]
+                #define L_(i, j) l[(i) * s0 + (j) * s1]
+                for (npy_intp i = 0; i < N; ++i)
+                    for (npy_intp j = i + 1; j < N; ++j)
+                        F_(i, j) = 0;
+                for (npy_intp k = N - 1; k >= 0; --k)
+                {
+                    for (npy_intp j = k + 1; j < N; ++j)
+                        for (npy_intp i = j; i < N; ++i)
+                        {
+                            F_(i, k) -= F_(i, j) * L_(j, k);
+                            F_(j, k) -= F_(i, j) * L_(i, k);
+                        }
+                    for (npy_intp j = k + 1; j < N; ++j)
+                    {
+                        F_(j, k) /= L_(k, k);
+                        F_(k, k) -= L_(j, k) * F_(j, k);
+                    }
+                    F_(k, k) /= (2 * L_(k, k));
+                }
+                #undef F_
+                #undef L_
+            }
+            Py_DECREF(Lc);
+        }
+        """ % locals()
+
+    def c_code_cache_version(self):
+        return (1,)
+
+
+class Solve(BaseLapack, Op):
+    """Solve a system of linear equations
+
+    `A` can also be a stack of matrices (3d tensor), with `b` a matrix
+    (one vector per system) or a 3d tensor (see `batched_solve`).
+    """
 
     __props__ = ('A_structure', 'lower', 'overwrite_A', 'overwrite_b')
 
@@ -163,41 +322,188 @@ class Solve(Op):
             "Scipy not available. Scipy is needed for the Solve op")
         A = as_tensor_variable(A)
         b = as_tensor_variable(b)
-        assert A.ndim == 2
-        assert b.ndim in [1, 2]
+        assert A.ndim in [2, 3]
+        assert b.ndim in [A.ndim - 1, A.ndim]
         otype = tensor.tensor(
                 broadcastable=b.broadcastable,
                 dtype=(A * b).dtype)
         return Apply(self, [A, b], [otype])
 
-    def perform(self, node, inputs, output_storage):
-        A, b = inputs
+    def _solve(self, A, b):
         if self.A_structure == 'lower_triangular':
-            rval = scipy.linalg.solve_triangular(
+            return scipy.linalg.solve_triangular(
                 A, b, lower=True)
         elif self.A_structure == 'upper_triangular':
-            rval = scipy.linalg.solve_triangular(
+            return scipy.linalg.solve_triangular(
                 A, b, lower=False)
         else:
-            rval = scipy.linalg.solve(A, b)
+            return scipy.linalg.solve(A, b)
+
+    def perform(self, node, inputs, output_storage):
+        A, b = inputs
+        if A.ndim == 3:
+            if A.shape[0] != b.shape[0]:
+                raise ValueError('Solve: A and b batch sizes differ',
+                                 A.shape[0], b.shape[0])
+            rval = numpy.empty(b.shape, dtype=node.outputs[0].dtype)
+            for i in xrange(A.shape[0]):
+                rval[i] = self._solve(A[i], b[i])
+        else:
+            rval = self._solve(A, b)
         output_storage[0][0] = rval
-        
+
     # computes shape of x where x = inv(A) * b
     def infer_shape(self, node, shapes):
         Ashape, Bshape = shapes
-        rows = Ashape[1]
-        if len(Bshape) == 1:  # b is a Vector
-            return [(rows,)]
+        rows = Ashape[-1]
+        if len(Bshape) < len(Ashape):  # b is a (stack of) vector
+            return [tuple(Bshape[:-1]) + (rows,)]
+        else:
+            cols = Bshape[-1]  # b is a (stack of) matrix
+            return [tuple(Bshape[:-2]) + (rows, cols)]
+
+    def c_code(self, node, name, inputs, outputs, sub):
+        A, b = inputs
+        z, = outputs
+        fail = sub['fail']
+        p = self.lapack_prefix(*[v.dtype for v in node.inputs + node.outputs])
+        ctype = {'s': 'float', 'd': 'double'}[p]
+        if self.A_structure in ('lower_triangular', 'upper_triangular'):
+            # LAPACK sees the transpose of our C-contiguous A.
+            uplo = {'lower_triangular': 'U',
+                    'upper_triangular': 'L'}[self.A_structure]
+            a_copy = 'PyArray_GETCONTIGUOUS(%(A)s)' % locals()
+            call = """
+                    %(p)strtrs_(&uplo, &trans, &diag, &n, &nrhs, a, &lda,
+                                work, &lda, &info);
+            """ % locals()
         else:
-            cols = Bshape[1]  # b is a Matrix
-            return [(rows, cols)]
+            uplo = 'N'
+            a_copy = 'PyArray_NewCopy(%(A)s, NPY_CORDER)' % locals()
+            call = """
+                    %(p)sgetrf_(&n, &n, a, &lda, ipiv, &info);
+                    if (info == 0)
+                        %(p)sgetrs_(&trans, &n, &nrhs, a, &lda, ipiv,
+                                    work, &lda, &info);
+            """ % locals()
+        return """
+        {
+            int a_nd = PyArray_NDIM(%(A)s);
+            int b_nd = PyArray_NDIM(%(b)s);
+            npy_intp* a_dims = PyArray_DIMS(%(A)s);
+            npy_intp* b_dims = PyArray_DIMS(%(b)s);
+            npy_intp batch = (a_nd == 3) ? a_dims[0] : 1;
+            int n = a_dims[a_nd - 1];
+            int nrhs = (b_nd == a_nd) ? b_dims[b_nd - 1] : 1;
+            int lda = (n > 1) ? n : 1;
+            int info = 0;
+            char uplo = '%(uplo)s', trans = 'T', diag = 'N';
+            PyArrayObject* a_c = NULL;
+            PyArrayObject* b_c = NULL;
+            %(ctype)s* work = NULL;
+            int* ipiv = NULL;
+            if (a_dims[a_nd - 2] != n || b_dims[a_nd - 2] != n ||
+                (a_nd == 3 && b_dims[0] != batch))
+            {
+                PyErr_SetString(PyExc_ValueError,
+                                "Solve: A and b shapes do not match");
+                %(fail)s
+            }
+            a_c = (PyArrayObject*)%(a_copy)s;
+            b_c = PyArray_GETCONTIGUOUS(%(b)s);
+            work = (%(ctype)s*)malloc(sizeof(%(ctype)s) * (n * nrhs + 1));
+            ipiv = (int*)malloc(sizeof(int) * (n + 1));
+            Py_XDECREF(%(z)s);
+            %(z)s = (PyArrayObject*)PyArray_EMPTY(
+                b_nd, b_dims, PyArray_TYPE(%(b)s), 0);
+            if (!a_c || !b_c || !work || !ipiv || !%(z)s)
+            {
+                Py_XDECREF(a_c);
+                Py_XDECREF(b_c);
+                free(work);
+                free(ipiv);
+                if (!PyErr_Occurred())
+                    PyErr_NoMemory();
+                %(fail)s
+            }
+            for (npy_intp k = 0; k < batch && info == 0; ++k)
+            {
+                %(ctype)s* a = (%(ctype)s*)PyArray_DATA(a_c) + k * n * n;
+                %(ctype)s* bk = (%(ctype)s*)PyArray_DATA(b_c) + k * n * nrhs;
+                %(ctype)s* zk = (%(ctype)s*)PyArray_DATA(%(z)s) + k * n * nrhs;
+                if (n == 0 || nrhs == 0)
+                    continue;
+                // LAPACK wants each right-hand side to be contiguous.
+                for (int i = 0; i < n; ++i)
+                    for (int j = 0; j < nrhs; ++j)
+                        work[i + j * n] = bk[i * nrhs + j];
+                %(call)s
+                for (int i = 0; i < n; ++i)
+                    for (int j = 0; j < nrhs; ++j)
+                        zk[i * nrhs + j] = work[i + j * n];
+            }
+            Py_DECREF(a_c);
+            Py_DECREF(b_c);
+            free(work);
+            free(ipiv);
+            if (info > 0)
+            {
+                lapack_linalg_error("Solve: the matrix is singular");
+                %(fail)s
+            }
+            if (info < 0)
+            {
+                PyErr_Format(PyExc_ValueError,
+                             "Solve: LAPACK returned %%d", info);
+                %(fail)s
+            }
+        }
+        """ % locals()
+
+    def c_code_cache_version(self):
+        return (1, lapack_header_version())
 
 solve = Solve()  # general solve
 
-#TODO : SolveTriangular
 
-#TODO: Optimizations to replace multiplication by matrix inverse
-#      with solve() Op (still unwritten)
+def batched_solve(A, b, A_structure='general'):
+    """
+    Solve the linear systems A[i] x[i] = b[i] for each i.
+
+    :param A: 3d tensor, a stack of square matrices.
+    :param b: matrix (one vector per system) or 3d tensor.
+    :param A_structure: as for `Solve`, e.g. 'lower_triangular'.
+    """
+    A = as_tensor_variable(A)
+    b = as_tensor_variable(b)
+    if A.ndim != 3:
+        raise TypeError('batched_solve: A must be a 3d tensor', A.ndim)
+    return Solve(A_structure)(A, b)
+
+
+@register_stabilize
+@register_canonicalize
+@local_optimizer([Solve])
+def tag_solve_triangular(node):
+    """
+    If a general solve() is applied to the output of a cholesky op, then
+    replace it with a triangular solve.
+    """
+    if (isinstance(node.op, Solve) and node.op.A_structure == 'general'):
+        A, b = node.inputs  # result is solution Ax=b
+        if A.owner and isinstance(A.owner.op, Cholesky):
+            if A.owner.op.lower:
+                return [Solve('lower_triangular')(A, b)]
+            else:
+                return [Solve('upper_triangular')(A, b)]
+        if (A.owner and isinstance(A.owner.op, DimShuffle)
+            and A.owner.op.new_order == (1, 0)):
+            A_T, = A.owner.inputs
+            if A_T.owner and isinstance(A_T.owner.op, Cholesky):
+                if A_T.owner.op.lower:
+                    return [Solve('upper_triangular')(A, b)]
+                else:
+                    return [Solve('lower_triangular')(A, b)]
 
 
 class Eigvalsh(Op):
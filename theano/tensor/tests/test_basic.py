@@ -3753,6 +3753,36 @@ class T_Join_and_Split(unittest.TestCase):
                               numpy.concatenate([T_shared.get_value(),
                                                  T_shared.get_value()]))
 
+    def test_join_computed_inputs(self):
+        # The inputs computed by an Elemwise can be written directly
+        # in the output of the join. Check that it still works when the
+        # shapes or the axis change between calls.
+        rng = numpy.random.RandomState(seed=utt.fetch_seed())
+        x = tensor.matrix()
+        y = tensor.matrix()
+        a = tensor.iscalar()
+        f = function([x, y, a], join(a, tensor.exp(x), x * y, y),
+                     mode=self.mode)
+        prev = None
+        for shp, axis in [((3, 4), 0), ((3, 4), 0), ((3, 4), 1),
+                          ((2, 4), 1), ((2, 4), 1), ((0, 4), 0),
+                          ((2, 4), -1)]:
+            xv = rng.rand(*shp).astype(self.floatX)
+            yv = rng.rand(*shp).astype(self.floatX)
+            out = f(xv, yv, axis)
+            assert numpy.allclose(out, numpy.concatenate(
+                [numpy.exp(xv), xv * yv, yv], axis=axis))
+            if prev is not None:
+                assert not numpy.may_share_memory(out, prev)
+            prev = out
+
+        # The CVM calls the C code of the producers directly, after
+        # putting the destination in their output storage.
+        if isinstance(f.fn, theano.gof.lazylinker_c.CLazyLinker):
+            wrapped = [t for t in f.fn.thunks if hasattr(t, 'pre_call')]
+            assert len(wrapped) == 2
+            assert all(hasattr(t, 'cthunk') for t in wrapped)
+
     def test_mixed_ndim_error(self):
         rng = numpy.random.RandomState(seed=utt.fetch_seed())
         v = self.shared(rng.rand(4).astype(self.floatX))
@@ -19,7 +19,8 @@ from theano.tensor.blas import (_dot22, _dot22scalar, res_is_a, _as_scalar,
                                 _is_real_matrix, _gemm_canonicalize,
                                 _factor_canonicalized, Gemm, Gemv,
                                 gemm_inplace, gemm_no_inplace,
-                                InconsistencyError, Ger, ger, ger_destructive)
+                                InconsistencyError, Ger, ger, ger_destructive,
+                                BatchedDot)
 from theano.tests import unittest_tools
 from test_basic import (as_tensor_variable, inplace_func,
                         compile, inplace)
@@ -1077,6 +1078,70 @@ def test_dot_w_self():
     f(numpy.asarray([[0, 1], [2, 3]], dtype=config.floatX))
 
 
+class TestBatchedDot(TestCase):
+    def setUp(self):
+        self.rng = numpy.random.RandomState(unittest_tools.fetch_seed())
+
+    def test_shapes_and_strides(self):
+        x = T.tensor3()
+        y = T.tensor3()
+        f = theano.function([x, y], BatchedDot()(x, y),
+                            mode=mode_not_fast_compile)
+        for x_shp, y_shp in [((5, 3, 4), (5, 4, 2)), ((1, 1, 4), (1, 4, 1)),
+                             ((3, 0, 4), (3, 4, 2)), ((3, 2, 0), (3, 0, 2)),
+                             ((0, 2, 3), (0, 3, 2))]:
+            xv = self.rng.rand(*x_shp).astype(config.floatX)
+            yv = self.rng.rand(*y_shp).astype(config.floatX)
+            expected = numpy.zeros((x_shp[0], x_shp[1], y_shp[2]))
+            for i in range(x_shp[0]):
+                expected[i] = numpy.dot(xv[i], yv[i])
+            # c contiguous, transposed matrices and strided batch
+            xt = xv.transpose(0, 2, 1).copy().transpose(0, 2, 1)
+            yt = yv.transpose(0, 2, 1).copy().transpose(0, 2, 1)
+            for xa, ya in [(xv, yv), (xt, yv), (xv, yt), (xt, yt)]:
+                assert numpy.allclose(f(xa, ya), expected)
+        xv = self.rng.rand(6, 3, 8).astype(config.floatX)
+        yv = self.rng.rand(6, 8, 2).astype(config.floatX)
+        out = f(xv[::2, :, ::2], yv[::2, ::2])
+        for i in range(3):
+            assert numpy.allclose(out[i],
+                                  numpy.dot(xv[2 * i, :, ::2],
+                                            yv[2 * i, ::2]))
+        self.assertRaises(ValueError, f, xv, yv[:5])
+        self.assertRaises(ValueError, f, xv, yv[:, :4])
+
+    def test_grad(self):
+        unittest_tools.verify_grad(BatchedDot(), [self.rng.rand(3, 4, 5),
+                                                  self.rng.rand(3, 5, 2)])
+
+    def test_infer_shape(self):
+        x = T.tensor3()
+        y = T.tensor3()
+        f = theano.function([x, y], BatchedDot()(x, y).shape,
+                            mode=mode_not_fast_compile)
+        assert not any(isinstance(node.op, BatchedDot)
+                       for node in f.maker.fgraph.toposort())
+        assert numpy.all(f(self.rng.rand(3, 4, 5).astype(config.floatX),
+                           self.rng.rand(3, 5, 2).astype(config.floatX)) ==
+                         [3, 4, 2])
+
+    def test_scan_of_dot(self):
+        # A scan that only computes a dot is replaced by a BatchedDot.
+        x = T.tensor3()
+        y = T.tensor3()
+        out, _ = theano.scan(lambda a, b: T.dot(b, a), sequences=[x, y])
+        f = theano.function([x, y], out, mode=mode_not_fast_compile)
+        topo = f.maker.fgraph.toposort()
+        if config.mode != 'FAST_COMPILE':
+            assert any(isinstance(node.op, BatchedDot) for node in topo)
+            assert not any(isinstance(node.op, theano.scan_module.scan_op.Scan)
+                           for node in topo)
+        xv = self.rng.rand(4, 3, 3).astype(config.floatX)
+        yv = self.rng.rand(5, 3, 3).astype(config.floatX)
+        expected = [numpy.dot(yv[i], xv[i]) for i in range(4)]
+        assert numpy.allclose(f(xv, yv), expected)
+
+
 ###############################################################################
 ## Tests for Gemv
 ###############################################################################
@@ -298,6 +298,29 @@ class test_Broadcast(unittest.TestCase):
             zv = xv + yv
             assert (f(xv, yv) == zv).all()
 
+    def test_transposed_strides(self):
+        # Layouts for which the C code collapses and tiles the loops.
+        if not theano.config.cxx:
+            raise SkipTest("G++ not available, so we need to skip this test.")
+        x = self.ctype('float64', [0, 0, 0])('x')
+        y = self.ctype('float64', [0, 0, 0])('y')
+        for linker, op in zip(self.linkers, [self.op, self.cop]):
+            e = op(scalar.add)(x, y)
+            f = linker().accept(FunctionGraph([x, y], [e])).make_function()
+            for xv, yv in [
+                    (self.rand_cval((3, 70, 45)),
+                     self.rand_cval((3, 45, 70)).transpose(0, 2, 1)),
+                    (self.rand_cval((70, 45, 3)).transpose(2, 0, 1),
+                     self.rand_cval((3, 70, 45))),
+                    (self.rand_cval((3, 140, 45))[:, ::2],
+                     self.rand_cval((3, 70, 45))),
+                    (self.rand_cval((6, 70, 45))[::2, ::-1],
+                     self.rand_cval((3, 70, 90))[:, :, ::2]),
+                    (self.rand_cval((1, 70, 45)),
+                     self.rand_cval((45, 70, 1)).transpose(2, 1, 0))]:
+                zv = xv + yv
+                assert (f(xv, yv) == zv).all()
+
     def test_same_inputs(self):
         if not theano.config.cxx:
             raise SkipTest("G++ not available, so we need to skip this test.")
@@ -1126,6 +1149,52 @@ class TestElemwise(unittest_tools.InferShapeTester):
                              mode=theano.compile.Mode(linker='py'))
         g(*[numpy.zeros(2 ** 11, config.floatX) for i in range(6)])
 
+    def test_openmp_strides(self):
+        # The parallel loops of the C code, on layouts for which the
+        # loops are collapsed, tiled or left as they are.
+        if not theano.config.cxx:
+            raise SkipTest("G++ not available, so we need to skip this test.")
+        orig_minsize = config.openmp_elemwise_minsize
+        config.openmp_elemwise_minsize = 10
+        try:
+            x = TensorType('float64', [False] * 3)('x')
+            y = TensorType('float64', [False] * 3)('y')
+            z = TensorType('float64', [True, False, False])('z')
+            e = Elemwise(scalar.add, openmp=True)(
+                Elemwise(scalar.mul, openmp=True)(x, y), z)
+            f = gof.CLinker().accept(
+                FunctionGraph([x, y, z], [e])).make_function()
+            rand = numpy.random.rand
+            for xv, yv, zv in [
+                    # transposed
+                    (rand(7, 45, 70).transpose(0, 2, 1),
+                     rand(7, 70, 45),
+                     rand(1, 70, 45)),
+                    (rand(45, 70, 7).transpose(2, 1, 0),
+                     rand(70, 7, 45).transpose(1, 0, 2),
+                     rand(45, 70, 1).transpose(2, 1, 0)),
+                    # mixed strides
+                    (rand(7, 140, 45)[:, ::2],
+                     rand(14, 70, 45)[::2, ::-1],
+                     rand(1, 70, 135)[:, :, ::3]),
+                    (rand(7, 70, 45)[:, :, ::-1],
+                     rand(7, 70, 90)[:, :, 1::2],
+                     rand(1, 70, 45)),
+                    # collapsible
+                    (rand(14, 70, 45)[::2],
+                     rand(21, 70, 45)[::3],
+                     rand(1, 70, 45)),
+                    (rand(7, 70, 45),
+                     rand(7, 70, 45),
+                     rand(1, 70, 45)),
+                    (rand(7, 1, 45),
+                     rand(7, 1, 90)[:, :, ::2],
+                     rand(1, 1, 45))]:
+                out = f(xv, yv, zv)
+                unittest_tools.assert_allclose(out, xv * yv + zv)
+        finally:
+            config.openmp_elemwise_minsize = orig_minsize
+
 
 def test_gt_grad():
     """A user test that failed.
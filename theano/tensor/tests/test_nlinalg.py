@@ -35,8 +35,10 @@ from theano.tensor.nlinalg import ( MatrixInverse,
                                     qr,
                                     matrix_power,
                                     norm,
-                                    svd
+                                    svd,
+                                    inv_as_solve
                                     )
+from theano.tensor.slinalg import Solve, imported_scipy
 
 from nose.plugins.skip import SkipTest
 from nose.plugins.attrib import attr
@@ -207,6 +209,38 @@ def test_det_shape():
     assert numpy.all(f(r).shape == f_shape(r))
 
 
+def test_det_strided_and_singular():
+    rng = numpy.random.RandomState(utt.fetch_seed())
+    r = rng.randn(5, 10).astype(config.floatX)
+    x = tensor.matrix()
+    f = theano.function([x], det(x))
+    # non-contiguous input, and odd number of row swaps
+    assert numpy.allclose(numpy.linalg.det(r[:, ::2]), f(r[:, ::2]))
+    assert numpy.allclose(numpy.linalg.det(r[:5, :5][::-1]),
+                          f(r[:5, :5][::-1]))
+    assert f(numpy.zeros((3, 3), dtype=config.floatX)) == 0
+
+
+def test_matrix_inverse_solve():
+    if not imported_scipy:
+        raise SkipTest("Scipy needed for the Solve op.")
+    A = tensor.dmatrix('A')
+    b = tensor.dmatrix('b')
+    node = matrix_inverse(A).dot(b).owner
+    [out] = inv_as_solve.transform(node)
+    assert isinstance(out.owner.op, Solve)
+
+    rng = numpy.random.RandomState(utt.fetch_seed())
+    A_val = rng.randn(4, 4) + 4 * numpy.eye(4)
+    b_val = rng.randn(3, 4)
+    f = function([A, b], tensor.dot(b, matrix_inverse(A)))
+    if config.mode != 'FAST_COMPILE':
+        assert not any(isinstance(node.op, MatrixInverse)
+                       for node in f.maker.fgraph.toposort())
+    assert numpy.allclose(f(A_val, b_val),
+                          numpy.dot(b_val, numpy.linalg.inv(A_val)))
+
+
 class test_diag(unittest.TestCase):
     """
     Test that linalg.diag has the same behavior as numpy.diag.
@@ -1138,9 +1138,10 @@ class test_fusion(unittest.TestCase):
         mode = copy.copy(compile.mode.get_default_mode())
         #we need the optimisation enabled and the canonicalize.
         #the canonicalize is needed to merge multiplication/addition by constant.
+        #the reduction fusion would change the number of nodes counted.
         mode._optimizer = mode._optimizer.including(
             'local_elemwise_fusion', 'composite_elemwise_fusion',
-            'canonicalize')
+            'canonicalize').excluding('careduce_fusion')
         self.do(mode, shared, shp)
 
     @attr('slow')
@@ -1149,9 +1150,10 @@ class test_fusion(unittest.TestCase):
         mode = copy.copy(compile.mode.get_default_mode())
         #we need the optimisation enabled and the canonicalize.
         #the canonicalize is needed to merge multiplication/addition by constant.
+        #the reduction fusion would change the number of nodes counted.
         mode._optimizer = mode._optimizer.including(
             'local_elemwise_fusion', 'composite_elemwise_fusion',
-            'canonicalize')
+            'canonicalize').excluding('careduce_fusion')
         self.do(mode, shared, shp)
 
     def test_gpu_fusion(self):
@@ -1290,6 +1292,115 @@ class test_fusion(unittest.TestCase):
         f(numpy.random.random((5, 5)), numpy.random.random((5, 5)),
             numpy.random.random((5, 5)))
 
+    def test_careduce_fusion(self):
+        mode = copy.copy(compile.mode.get_default_mode())
+        mode._optimizer = mode._optimizer.including(
+            'local_elemwise_fusion', 'composite_elemwise_fusion',
+            'careduce_fusion', 'canonicalize')
+
+        x, y = dmatrices('xy')
+        r = T.row('r', dtype='float64')
+        xv = numpy.random.rand(5, 6)
+        yv = numpy.random.rand(5, 6)
+        rv = numpy.random.rand(1, 6)
+        for out, inputs, vals, expected in [
+                (((x - y) ** 2).sum(), [x, y], [xv, yv],
+                 ((xv - yv) ** 2).sum()),
+                (((x - y) ** 2).sum(axis=0), [x, y], [xv, yv],
+                 ((xv - yv) ** 2).sum(axis=0)),
+                (T.exp(x + r).sum(axis=1), [x, r], [xv, rv],
+                 numpy.exp(xv + rv).sum(axis=1)),
+                (T.max(x * r, axis=1), [x, r], [xv, rv],
+                 (xv * rv).max(axis=1)),
+                (T.prod(x + 1, axis=[0, 1]), [x], [xv],
+                 (xv + 1).prod()),
+                (T.cast(x * 10, 'int8').sum(axis=0), [x], [xv],
+                 (xv * 10).astype('int8').sum(axis=0))]:
+            f = theano.function(inputs, out, mode=mode)
+            topo = f.maker.fgraph.toposort()
+            assert any(isinstance(n.op, T.elemwise.FusedCAReduce)
+                       for n in topo)
+            assert not any(isinstance(n.op, (T.Elemwise, T.CAReduce))
+                           for n in topo)
+            utt.assert_allclose(f(*vals), expected)
+            assert f(*vals).dtype == out.dtype
+
+        # The elemwise output is used elsewhere, we don't fuse
+        e = T.exp(x)
+        f = theano.function([x], [e.sum(), e], mode=mode)
+        topo = f.maker.fgraph.toposort()
+        assert not any(isinstance(n.op, T.elemwise.FusedCAReduce)
+                       for n in topo)
+
+    def test_careduce_fusion_merge(self):
+        mode = copy.copy(compile.mode.get_default_mode())
+        mode._optimizer = mode._optimizer.including(
+            'local_elemwise_fusion', 'composite_elemwise_fusion',
+            'careduce_fusion', 'fused_careduce_merge', 'canonicalize')
+
+        x = dmatrix('x')
+        xv = numpy.random.rand(5, 6)
+        m = T.max(abs(x), axis=1)
+        s = T.exp(x).sum(axis=1)
+        f = theano.function([x], [m, s], mode=mode)
+        topo = f.maker.fgraph.toposort()
+        fused = [n for n in topo
+                 if isinstance(n.op, T.elemwise.FusedCAReduce)]
+        assert len(fused) == 1
+        assert len(fused[0].outputs) == 2
+        mv, sv = f(xv)
+        utt.assert_allclose(mv, abs(xv).max(axis=1))
+        utt.assert_allclose(sv, numpy.exp(xv).sum(axis=1))
+
+        # A CAReduce without elemwise is merged too.
+        f = theano.function([x], [T.max(x, axis=1), s], mode=mode)
+        topo = f.maker.fgraph.toposort()
+        assert len(topo) == 1
+        assert isinstance(topo[0].op, T.elemwise.FusedCAReduce)
+        mv, sv = f(xv)
+        utt.assert_allclose(mv, xv.max(axis=1))
+        utt.assert_allclose(sv, numpy.exp(xv).sum(axis=1))
+
+        # More than two reductions end up in the same node.
+        f = theano.function([x], [T.max(x, axis=1), T.min(x, axis=1), s],
+                            mode=mode)
+        topo = f.maker.fgraph.toposort()
+        assert len(topo) == 1
+        assert len(topo[0].outputs) == 3
+        mv, nv, sv = f(xv)
+        utt.assert_allclose(mv, xv.max(axis=1))
+        utt.assert_allclose(nv, xv.min(axis=1))
+        utt.assert_allclose(sv, numpy.exp(xv).sum(axis=1))
+
+        # log-sum-exp: the sum depends on the max, we can't merge them.
+        m = T.max(x, axis=1)
+        lse = T.log(T.exp(x - m.dimshuffle(0, 'x')).sum(axis=1)) + m
+        f = theano.function([x], lse, mode=mode)
+        topo = f.maker.fgraph.toposort()
+        fused = [n for n in topo
+                 if isinstance(n.op, T.elemwise.FusedCAReduce)]
+        assert all(len(n.outputs) == 1 for n in fused)
+        xm = xv.max(axis=1)
+        utt.assert_allclose(
+            f(xv), numpy.log(numpy.exp(xv - xm[:, None]).sum(axis=1)) + xm)
+
+        # The shared input is broadcasted along the reduced axis, the
+        # loops can have different lengths.
+        y = dmatrix('y')
+        z = dmatrix('z')
+        r = T.row('r', dtype='float64')
+        f = theano.function([y, z, r], [(y * r).sum(axis=0),
+                                        (z + r).sum(axis=0)], mode=mode)
+        fused = [n for n in f.maker.fgraph.toposort()
+                 if isinstance(n.op, T.elemwise.FusedCAReduce)]
+        assert all(len(n.outputs) == 1 for n in fused)
+        yv = numpy.random.rand(3, 6)
+        zv = numpy.random.rand(4, 6)
+        rv = numpy.random.rand(1, 6)
+        out = f(yv, zv, rv)
+        utt.assert_allclose(out[0], (yv * rv).sum(axis=0))
+        utt.assert_allclose(out[1], (zv + rv).sum(axis=0))
+
     def speed_fusion_gpu(self):
         import theano.sandbox.cuda as cuda
         self.speed_fusion(shared_fn=cuda.
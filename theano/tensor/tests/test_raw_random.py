@@ -1181,6 +1181,51 @@ class T_random_function(utt.InferShapeTester):
         """
 
 
+    def test_philox4x32(self):
+        # Known answers of Random123
+        for args, words in [
+            ([0] * 6, [0x6627e8d5, 0xe169c58d, 0xbc57ac4c, 0x9b00dbd8]),
+            ([0xffffffff] * 6,
+             [0x408f276d, 0x41c83b0e, 0xa20bc7c6, 0x6d5451fd]),
+            ([0x243f6a88, 0x85a308d3, 0x13198a2e, 0x03707344, 0xa4093822,
+              0x299f31d0],
+             [0xd16cfe09, 0x94fdcceb, 0x5001e420, 0x24126ea1])]:
+            assert [int(w) for w in philox4x32(*args)] == words
+
+    def test_philox_function(self):
+        # The C code and the python code give the same samples and states,
+        # also when the counter crosses 2**32.
+        state_val = numpy.asarray([12345, 7, 2 ** 32 - 3, 3], dtype='uint32')
+        py_mode = compile.Mode(linker='py', optimizer='fast_run')
+        for distribution in ['uniform', 'normal']:
+            for dtype in ['float32', 'float64']:
+                for shape in [(), (7,), (3, 5)]:
+                    op = PhiloxFunction(distribution, tensor.TensorType(
+                        dtype, (False,) * len(shape)))
+                    post_s, out = op(state_val,
+                                     numpy.asarray(shape, dtype='int32'))
+                    c_val = compile.function([], [post_s, out])()
+                    py_val = compile.function([], [post_s, out],
+                                              mode=py_mode)()
+                    assert numpy.all(c_val[0] == py_val[0])
+                    assert c_val[1].dtype == dtype
+                    assert c_val[1].shape == shape
+                    utt.assert_allclose(c_val[1], py_val[1])
+                    n_blocks = (numpy.prod(shape) +
+                                op.samples_per_block() - 1) // \
+                        op.samples_per_block()
+                    assert numpy.all(c_val[0] == [12345, 7,
+                                                  (n_blocks - 3) % 2 ** 32,
+                                                  3 + (n_blocks >= 3)])
+                    if distribution == 'uniform':
+                        assert numpy.all((c_val[1] > 0) & (c_val[1] < 1))
+
+        state = tensor.vector(dtype='uint32')
+        shape = ivector()
+        post_s, out = PhiloxFunction('normal', tensor.dmatrix)(state, shape)
+        self._compile_and_check([state, shape], [post_s, out],
+                                [state_val, [4, 3]], PhiloxFunction)
+
 if __name__ == '__main__':
     from theano.tests import main
     main("test_raw_random")
@@ -816,6 +816,49 @@ class T_SharedRandomStreams(unittest.TestCase):
         numpy.testing.assert_array_almost_equal(f1(), f2(), decimal=6)
 
 
+    def test_philox(self):
+        random = RandomStreams(utt.fetch_seed(), generator='philox')
+        pvals = tensor.matrix()
+        n = tensor.ivector()
+        outs = [random.uniform((300, 100), low=-1, high=3),
+                random.normal((300, 100), avg=1, std=2),
+                random.binomial((300, 100), p=0.3),
+                random.binomial(n=n, p=0.3),
+                random.random_integers((300, 100), low=-3, high=4),
+                random.permutation((100,), n=30),
+                random.multinomial(n=20, pvals=pvals),
+                random.multinomial(n=n, pvals=pvals)]
+        assert isinstance(outs[0].rng.get_value(borrow=True), numpy.ndarray)
+        fn = function([pvals, n], outs)
+        pvals_val = numpy.random.dirichlet([1] * 10, size=3000)
+        pvals_val = pvals_val.astype(config.floatX)
+        n_val = numpy.random.randint(0, 10, size=3000).astype('int32')
+        vals = fn(pvals_val, n_val)
+
+        assert numpy.all((vals[0] > -1) & (vals[0] < 3))
+        assert abs(vals[0].mean() - 1) < 0.02
+        assert abs(vals[1].mean() - 1) < 0.05
+        assert abs(vals[1].std() - 2) < 0.05
+        assert abs(vals[2].mean() - 0.3) < 0.01
+        assert numpy.all((vals[3] >= 0) & (vals[3] <= n_val))
+        assert abs(vals[3].sum() - 0.3 * n_val.sum()) < 0.03 * n_val.sum()
+        assert sorted(numpy.unique(vals[4])) == range(-3, 5)
+        assert numpy.all(numpy.sort(vals[5], axis=1) == numpy.arange(30))
+        assert numpy.all(vals[6].sum(axis=1) == 20)
+        assert numpy.all(vals[7].sum(axis=1) == n_val)
+        assert numpy.allclose(vals[6].mean(axis=0) / 20,
+                              pvals_val.mean(axis=0), atol=0.01)
+
+        # Each call moves the counters, and seed resets them.
+        vals2 = fn(pvals_val, n_val)
+        assert numpy.any(vals2[0] != vals[0])
+        random.seed(utt.fetch_seed())
+        vals3 = fn(pvals_val, n_val)
+        for v, v3 in zip(vals, vals3):
+            assert numpy.all(v == v3)
+
+        self.assertRaises(NotImplementedError, random.poisson, (3,), 2.)
+
 if __name__ == '__main__':
     from theano.tests import main
     main("test_shared_randomstreams")
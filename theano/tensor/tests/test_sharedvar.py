@@ -532,7 +532,7 @@ def makeSharedTester(shared_constructor_,
             f()
             #[Gemm{inplace}(<TensorType(float64, matrix)>, 0.01, <TensorType(float64, matrix)>, <TensorType(float64, matrix)>, 2e-06)]
             if theano.config.mode!='FAST_COMPILE':
-                assert sum([node.op.__class__.__name__ in ["Gemm","GpuGemm","StructuredDot"] for node in topo])==1
+                assert sum([node.op.__class__.__name__ in ["Gemm","GpuGemm","StructuredDot","SpGEMMCSR"] for node in topo])==1
                 assert all(node.op == tensor.blas.gemm_inplace for node in topo if isinstance(node.op,tensor.blas.Gemm))
                 assert all(node.op.inplace for node in topo if node.op.__class__.__name__ == "GpuGemm")
             #Their is no inplace gemm for sparse
@@ -547,7 +547,7 @@ def makeSharedTester(shared_constructor_,
             shp=f()
             assert numpy.all(shp == (40,40))
             if theano.config.mode!='FAST_COMPILE':
-                assert sum([node.op.__class__.__name__ in ["Gemm","GpuGemm","StructuredDot"] for node in topo])==1
+                assert sum([node.op.__class__.__name__ in ["Gemm","GpuGemm","StructuredDot","SpGEMMCSR"] for node in topo])==1
                 assert all(node.op == tensor.blas.gemm_inplace for node in topo if isinstance(node.op,tensor.blas.Gemm))
                 assert all(node.op.inplace for node in topo if node.op.__class__.__name__ == "GpuGemm")
             #now test with the specify shape op in the inputs and outputs
@@ -563,7 +563,7 @@ def makeSharedTester(shared_constructor_,
             shp=f()
             assert numpy.all(shp == (40,40))
             if theano.config.mode!='FAST_COMPILE':
-                assert sum([node.op.__class__.__name__ in ["Gemm","GpuGemm","StructuredDot"] for node in topo])==1
+                assert sum([node.op.__class__.__name__ in ["Gemm","GpuGemm","StructuredDot","SpGEMMCSR"] for node in topo])==1
                 assert all(node.op == tensor.blas.gemm_inplace for node in topo if isinstance(node.op,tensor.blas.Gemm))
                 assert all(node.op.inplace for node in topo if node.op.__class__.__name__ == "GpuGemm")
         def test_values_eq(self):
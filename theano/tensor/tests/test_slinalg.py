@@ -15,9 +15,11 @@ from theano import config
 
 from theano.tensor.slinalg import ( Cholesky,
                                     cholesky,
+                                    batched_cholesky,
                                     CholeskyGrad,
                                     Solve,
                                     solve,
+                                    batched_solve,
                                     Eigvalsh,
                                     EigvalshGrad,
                                     eigvalsh,
@@ -92,6 +94,37 @@ def test_cholesky_grad():
                                    rng, eps=eps))
 
 
+def test_cholesky_not_pd():
+    if not imported_scipy:
+        raise SkipTest("Scipy needed for the Cholesky op.")
+    x = tensor.matrix()
+    f = function([x], cholesky(x))
+    assert_raises(numpy.linalg.LinAlgError, f,
+                  -numpy.eye(3, dtype=config.floatX))
+
+
+def test_batched_cholesky():
+    if not imported_scipy:
+        raise SkipTest("Scipy needed for the Cholesky op.")
+    rng = numpy.random.RandomState(utt.fetch_seed())
+    r = rng.randn(4, 5, 5).astype(config.floatX)
+    pd = numpy.asarray([numpy.dot(m, m.T) + numpy.eye(5) for m in r],
+                       dtype=config.floatX)
+    x = tensor.tensor3()
+    for lower in [True, False]:
+        l = batched_cholesky(x, lower)
+        f = function([x], [l, tensor.grad(l.sum(), x)])
+        m = tensor.matrix()
+        lm = Cholesky(lower)(m)
+        f_single = function([m], [lm, tensor.grad(lm.sum(), m)])
+        out, gout = f(pd)
+        for i in range(len(pd)):
+            single, gsingle = f_single(pd[i])
+            assert_allclose(out[i], single, rtol=1e-4)
+            assert_allclose(gout[i], gsingle, rtol=1e-3, atol=1e-4)
+    assert_raises(TypeError, batched_cholesky, tensor.matrix())
+
+
 @attr('slow')
 def test_cholesky_and_cholesky_grad_shape():
     if not imported_scipy:
@@ -229,6 +262,56 @@ class test_Solve(utt.InferShapeTester):
         assert numpy.allclose(scipy.linalg.solve_triangular(U_val, b_val, lower=False),
                               upper_solve_func(U_val, b_val))
 
+    def test_batched_solve(self):
+        if not imported_scipy:
+            raise SkipTest("Scipy needed for the Solve op.")
+        rng = numpy.random.RandomState(utt.fetch_seed())
+        A_val = numpy.asarray(rng.rand(3, 5, 5) + 5 * numpy.eye(5),
+                              dtype=config.floatX)
+        A = tensor.tensor3()
+        for b, b_val in [(tensor.tensor3(), rng.rand(3, 5, 2)),
+                         (tensor.matrix(), rng.rand(3, 5))]:
+            b_val = numpy.asarray(b_val, dtype=config.floatX)
+            for structure, tri in [('general', lambda a: a),
+                                   ('lower_triangular', numpy.tril),
+                                   ('upper_triangular', numpy.triu)]:
+                f = function([A, b], batched_solve(A, b, structure))
+                A_tri = numpy.asarray([tri(a) for a in A_val])
+                out = f(A_tri, b_val)
+                assert out.shape == b_val.shape
+                for i in range(3):
+                    assert_allclose(numpy.dot(A_tri[i], out[i]), b_val[i],
+                                    rtol=1e-3, atol=1e-4)
+            self._compile_and_check([A, b],
+                                    [batched_solve(A, b)],
+                                    [A_val, b_val],
+                                    self.op_class,
+                                    warn=False)
+
+    def test_singular(self):
+        if not imported_scipy:
+            raise SkipTest("Scipy needed for the Solve op.")
+        A = theano.tensor.matrix()
+        b = theano.tensor.vector()
+        f = function([A, b], self.op(A, b))
+        assert_raises(numpy.linalg.LinAlgError, f,
+                      numpy.zeros((3, 3), dtype=config.floatX),
+                      numpy.ones(3, dtype=config.floatX))
+
+
+def test_tag_solve_triangular():
+    if not imported_scipy:
+        raise SkipTest("Scipy needed for the Solve op.")
+    A = tensor.matrix('A')
+    x = tensor.vector('x')
+    for lower, structure in [(True, 'lower_triangular'),
+                             (False, 'upper_triangular')]:
+        f = function([A, x], solve(Cholesky(lower)(A), x))
+        if config.mode != 'FAST_COMPILE':
+            solves = [node.op for node in f.maker.fgraph.toposort()
+                      if isinstance(node.op, Solve)]
+            assert [op.A_structure for op in solves] == [structure]
+
 
 def test_expm():
     if not imported_scipy: